@@ -1,5 +1,6 @@
 from .erp_macro import test_erp_macro
 from .happojang_macro import test_happojang_macro
+from .macro_router import router as macro_router
 from .mall_list import fetch_mall_list
 from .one_one_price import test_one_one_price_calculation
 from .order_list import fetch_order_list
@@ -12,5 +13,6 @@ __all__ = [
     "request_product_create",
     "test_one_one_price_calculation",
     "test_erp_macro",
-    "test_happojang_macro"
+    "test_happojang_macro",
+    "macro_router",
 ]
\ No newline at end of file
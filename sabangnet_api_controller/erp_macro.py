@@ -1,8 +1,9 @@
 from pathlib import Path
 from core.db import get_async_session
+from utils.macros.batch_runner import run_macro
 
 
-async def test_erp_macro():
+def test_erp_macro():
 
     xlsx_base_path = Path("./files/excel/erp")
     try:
@@ -29,49 +30,35 @@ async def test_erp_macro():
         macro_file_path = ""
         if choice == "1":
             # 기타사이트_ERP_자동화
-            from utils.macros.ERP.etc_site_macro import ERPEtcSiteMacro
-
-            macro = ERPEtcSiteMacro(xlsx_file_path)
-            macro_file_path = macro.etc_site_macro_run()
+            macro_file_path = run_macro(xlsx_file_path, "erp.etc_site")
 
             print("기타사이트_ERP_자동화")
 
         elif choice == "2":
             # 지그재그_ERP_자동화
-            from utils.macros.ERP.zigzag_erp_macro import ERPZigzagMacro
-
-            zigzag_macro = ERPZigzagMacro(xlsx_file_path)
-            macro_file_path = zigzag_macro.zigzag_erp_macro_run()
+            macro_file_path = run_macro(xlsx_file_path, "erp.zigzag")
 
             print("지그재그_ERP_자동화")
 
         elif choice == "3":
             # 알리_ERP_자동화
-            from utils.macros.ERP.ali_erp_macro import ERPAliMacro
-
             # 알리 ERP 자동화 전체 프로세스 실행
-            ali_macro = ERPAliMacro(xlsx_file_path)
-            macro_file_path = ali_macro.ali_erp_macro_run()
+            macro_file_path = run_macro(xlsx_file_path, "erp.ali")
 
             print("알리_ERP_자동화")
 
         elif choice == "4":
             # 브랜디_ERP_자동화
-            from utils.macros.ERP.brandi_erp_macro import ERPBrandiMacro
-
             # 브랜디 ERP 자동화 전체 프로세스 실행
-            brandi_macro = ERPBrandiMacro(xlsx_file_path)
-            macro_file_path = brandi_macro.brandi_erp_macro_run()
+            macro_file_path = run_macro(xlsx_file_path, "erp.brandi")
 
             print("브랜디_ERP_자동화")
 
         elif choice == "5":
             # down_form_order table to excel
 
-            from utils.macros.ERP.g_a_erp_macro import ERPGmaAucMacro
             # # G,옥_ERP_자동화
-            gmarket_auction_macro = ERPGmaAucMacro(xlsx_file_path)
-            macro_file_path = gmarket_auction_macro.gauc_erp_macro_run()
+            macro_file_path = run_macro(xlsx_file_path, "erp.gauc")
 
             print("G,옥 ERP 자동화")
 
@@ -1,8 +1,9 @@
 import asyncio
 from pathlib import Path
 from core.db import get_async_session
+from utils.macros.batch_runner import run_macro
 
-async def test_happojang_macro():
+def test_happojang_macro():
     xlsx_base_path = Path("./files/excel/")
     try:
         print("합포장 자동화 테스트")
@@ -32,7 +33,6 @@ async def test_happojang_macro():
 
         if choice == "1":
 
-            from utils.macros.happojang.etc_site_merge_packaging import etc_site_merge_packaging
             # from utils.down_form_order_to_excel import DownFormOrderToExcel
 
             # down_form_order_to_excel = DownFormOrderToExcel(await get_async_session())
@@ -42,12 +42,11 @@ async def test_happojang_macro():
             # )
 
             # macro_file_path = etc_site_merge_packaging(file_path)
-            macro_file_path = etc_site_merge_packaging(xlsx_file_path)
+            macro_file_path = run_macro(xlsx_file_path, "happojang.etc_site")
             print("기타사이트 합포장 자동화")
 
         elif choice == "2":
 
-            from utils.macros.happojang.zigzag_merge_packaging import zigzag_merge_packaging
             # from utils.down_form_order_to_excel import DownFormOrderToExcel
 
             # down_form_order_to_excel = DownFormOrderToExcel(await get_async_session())
@@ -56,12 +55,11 @@ async def test_happojang_macro():
             #                                                                     file_name="test_down_form_order")
 
             # macro_file_path = zigzag_merge_packaging(file_path)
-            macro_file_path = zigzag_merge_packaging(xlsx_file_path)
+            macro_file_path = run_macro(xlsx_file_path, "happojang.zigzag")
             print("지그재그 합포장 자동화")
 
         elif choice == "3":
 
-            from utils.macros.happojang.ali_merge_packaging import ali_merge_packaging
             # from backup.down_form_order_to_excel import DownFormOrderToExcel
 
             # down_form_order_to_excel = DownFormOrderToExcel(await get_async_session())
@@ -71,12 +69,11 @@ async def test_happojang_macro():
             #                                                                     file_name="test_down_form_order")
 
             # macro_file_path = brandy_merge_packaging(file_path)
-            macro_file_path = ali_merge_packaging(xlsx_file_path)
+            macro_file_path = run_macro(xlsx_file_path, "happojang.ali")
             print("알리 합포장 자동화")
 
         elif choice == "4":
             
-            from utils.macros.happojang.brandy_merge_packaging import brandy_merge_packaging
             # from backup.down_form_order_to_excel import DownFormOrderToExcel
 
             # down_form_order_to_excel = DownFormOrderToExcel(await get_async_session())
@@ -86,12 +83,11 @@ async def test_happojang_macro():
             #                                                                     file_name="test_down_form_order")
 
             # macro_file_path = brandy_merge_packaging(file_path)
-            macro_file_path = brandy_merge_packaging(xlsx_file_path)
+            macro_file_path = run_macro(xlsx_file_path, "happojang.brandy")
 
             print("브랜디 합포장 자동화")
 
         elif choice == "5":
-            from utils.macros.happojang.gok_merge_packaging import gok_merge_packaging
             # from backup.down_form_order_to_excel import DownFormOrderToExcel
 
             # down_form_order_to_excel = DownFormOrderToExcel(await get_async_session())
@@ -99,7 +95,7 @@ async def test_happojang_macro():
             #                                                                     file_path="./files/excel",
             #                                                                     file_name="test_down_form_order")
 
-            macro_file_path = gok_merge_packaging(xlsx_file_path)
+            macro_file_path = run_macro(xlsx_file_path, "happojang.gok")
             print("G,옥 합포장 자동화")
         else:
             print("마켓을 선택해 주세요. 1~5")
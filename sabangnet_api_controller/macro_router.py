@@ -0,0 +1,103 @@
+"""
+매크로 실행 API
+- /macro/runs: MacroExecutor 프로세스 풀에서 바로 실행 (응답은 작업 id, 상태는 조회 API 로 확인)
+- /macro/jobs: batch_process 기반 작업 큐 (예약 실행 / 진행률 / 취소)
+- 입력 파일은 files/excel/ 아래 경로만 허용 (예: "erp/[기본양식]-ERP용.xlsx")
+
+등록:
+    from controller.macro_router import router as macro_router
+    app.include_router(macro_router)
+
+    # 작업 큐 워커 루프 (프로세스마다 시작 가능, 작업은 worker_id / heartbeat 로 구분)
+    @app.on_event("startup")
+    async def start_macro_queue():
+        await MacroJobQueue.shared().start()
+"""
+
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from utils.macros.macro_executor import MacroExecutor, MacroQueueFullError
+from utils.macros.macro_job_queue import MacroJobQueue
+from utils.sabangnet_path_utils import SabangNetPathUtils
+
+
+class MacroRunRequest(BaseModel):
+    file_path: str
+    macro: str
+    options: dict | None = None
+
+
+class MacroJobRequest(MacroRunRequest):
+    run_after: datetime | None = None
+    created_by: str | None = None
+
+
+def _input_path(file_path: str) -> str:
+    """
+    files/excel/ 기준 상대 경로 → 절대 경로 (밖을 가리키거나 파일이 없으면 HTTPException)
+    """
+    base = SabangNetPathUtils.get_excel_file_path().resolve()
+    path = (base / file_path).resolve()
+    if not path.is_relative_to(base):
+        raise HTTPException(status_code=400, detail=f"files/excel/ 밖의 경로: {file_path}")
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=f"파일 없음: {file_path}")
+    return str(path)
+
+
+async def _shutdown() -> None:
+    await MacroJobQueue.shared().stop()
+    MacroExecutor.shared().shutdown()
+
+
+router = APIRouter(prefix="/macro", tags=["macro"], on_shutdown=[_shutdown])
+
+
+@router.post("/runs")
+async def submit_macro(request: MacroRunRequest):
+    try:
+        job_id = await MacroExecutor.shared().submit(_input_path(request.file_path), request.macro, request.options)
+    except MacroQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id}
+
+
+@router.get("/runs/{job_id}")
+async def macro_run_status(job_id: str):
+    try:
+        return MacroExecutor.shared().status(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/jobs")
+async def enqueue_macro(request: MacroJobRequest):
+    try:
+        batch_id = await MacroJobQueue.shared().enqueue(
+            _input_path(request.file_path), request.macro, request.options,
+            run_after=request.run_after, created_by=request.created_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"batch_id": batch_id}
+
+
+@router.get("/jobs/{batch_id}")
+async def macro_job_status(batch_id: int):
+    try:
+        return await MacroJobQueue.shared().status(batch_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.delete("/jobs/{batch_id}")
+async def cancel_macro_job(batch_id: int):
+    work_status = await MacroJobQueue.shared().cancel(batch_id)
+    if work_status is None:
+        raise HTTPException(status_code=404, detail=f"작업 없음: {batch_id}")
+    return {"batch_id": batch_id, "work_status": work_status}
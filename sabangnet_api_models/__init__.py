@@ -3,6 +3,7 @@ from models.certification_detail.certification_detail import CertificationDetail
 from models.count_executing_data.count_executing_data import CountExecuting
 from models.down_form_orders.down_form_order import BaseDownFormOrder
 from models.macro.macro_info import MacroInfo
+from models.macro.product_lookup import ProductLookup, ProductLookupSheet, ProductLookupVersion
 from models.mall_certification_handling.mall_certification_handling import MallCertificationHandling
 from models.mall_price.mall_price import MallPrice
 from models.one_one_price.one_one_price import OneOnePrice
@@ -28,3 +28,5 @@ class BatchProcess(Base):
     error_message: Mapped[str | None] = mapped_column(Text,comment="배치 프로세스 오류 메시지")
     created_by: Mapped[str | None] = mapped_column(String(100),comment="배치 프로세스 생성자 ID")
     work_status: Mapped[str | None] = mapped_column(String(14),comment="작업 상태")
+    worker_id: Mapped[str | None] = mapped_column(String(100),comment="실행 워커 ID (매크로 작업 큐, 호스트:pid)")
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime,comment="실행 워커 마지막 응답 시각 (매크로 작업 큐)")
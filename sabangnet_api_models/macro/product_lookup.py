@@ -0,0 +1,47 @@
+from models.base_model import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, ForeignKey, Integer, String, UniqueConstraint
+
+
+class ProductLookupSheet(Base):
+    """
+    매크로 VLOOKUP 인덱스 등록 테이블(product_lookup_sheet)의 ORM 매핑 모델
+    업로드 파일 Sheet1(A: 상품 텍스트 → B: 값) 탭 내용 해시 단위로 한 번만 등록
+    version: 등록 시점 버전 (증분 동기화 기준)
+    """
+
+    __tablename__ = "product_lookup_sheet"
+
+    sheet_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    source_file: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+class ProductLookup(Base):
+    """
+    매크로 VLOOKUP 인덱스 테이블(product_lookup)의 ORM 매핑 모델
+    Sheet1 해시별 (키 → 값) 항목 (파일 간 키가 섞이지 않도록 sheet_hash 단위로 저장)
+    """
+
+    __tablename__ = "product_lookup"
+    __table_args__ = (UniqueConstraint("sheet_hash", "lookup_key", name="product_lookup_sheet_hash_lookup_key_key"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    sheet_hash: Mapped[str] = mapped_column(
+        String(64), ForeignKey("product_lookup_sheet.sheet_hash", ondelete="CASCADE"), nullable=False
+    )
+    lookup_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    lookup_value: Mapped[str] = mapped_column(String(500), nullable=False)
+
+
+class ProductLookupVersion(Base):
+    """
+    product_lookup_sheet 등록 버전 카운터 테이블(product_lookup_version)의 ORM 매핑 모델
+    단일 행(id=1) - 등록 시 SELECT ... FOR UPDATE 로 잠근 뒤 증가 (등록 직렬화, 버전 순서 = 커밋 순서)
+    """
+
+    __tablename__ = "product_lookup_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
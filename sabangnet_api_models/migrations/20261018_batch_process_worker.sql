@@ -0,0 +1,20 @@
+-- 매크로 작업 큐 실행 워커 / heartbeat (models/batch_process.py: BatchProcess.worker_id, heartbeat_at)
+-- 적용: psql "$DATABASE_URL" -f 20261018_batch_process_worker.sql
+
+BEGIN;
+
+ALTER TABLE batch_process ADD COLUMN IF NOT EXISTS worker_id VARCHAR(100);
+ALTER TABLE batch_process ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+
+COMMENT ON COLUMN batch_process.worker_id IS '실행 워커 ID (매크로 작업 큐, 호스트:pid)';
+COMMENT ON COLUMN batch_process.heartbeat_at IS '실행 워커 마지막 응답 시각 (매크로 작업 큐)';
+
+-- 실행중 / 취소요청 작업의 heartbeat 조회 (다른 워커가 중단한 작업 복구)
+CREATE INDEX IF NOT EXISTS ix_batch_process_target_status ON batch_process (target_table, work_status);
+
+COMMIT;
+
+-- 되돌리기:
+-- DROP INDEX IF EXISTS ix_batch_process_target_status;
+-- ALTER TABLE batch_process DROP COLUMN IF EXISTS heartbeat_at;
+-- ALTER TABLE batch_process DROP COLUMN IF EXISTS worker_id;
@@ -0,0 +1,46 @@
+-- 매크로 VLOOKUP 인덱스 (models/macro/product_lookup.py: ProductLookupSheet, ProductLookup, ProductLookupVersion)
+-- 적용: psql "$DATABASE_URL" -f 20261018_product_lookup.sql
+
+BEGIN;
+
+-- Sheet1 탭 내용 해시 단위 등록 (같은 내용은 한 번만 등록)
+CREATE TABLE IF NOT EXISTS product_lookup_sheet (
+    sheet_hash   VARCHAR(64)  PRIMARY KEY,
+    version      BIGINT       NOT NULL,
+    entry_count  INTEGER      NOT NULL DEFAULT 0,
+    source_file  VARCHAR(255),
+    created_at   TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    updated_at   TIMESTAMPTZ  NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_product_lookup_sheet_version ON product_lookup_sheet (version);
+
+-- 해시별 (키 → 값) 항목
+CREATE TABLE IF NOT EXISTS product_lookup (
+    id           BIGSERIAL PRIMARY KEY,
+    sheet_hash   VARCHAR(64)  NOT NULL REFERENCES product_lookup_sheet (sheet_hash) ON DELETE CASCADE,
+    lookup_key   VARCHAR(500) NOT NULL,
+    lookup_value VARCHAR(500) NOT NULL,
+    created_at   TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    updated_at   TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    CONSTRAINT product_lookup_sheet_hash_lookup_key_key UNIQUE (sheet_hash, lookup_key)
+);
+
+-- 등록 버전 카운터 (단일 행, 등록 시 SELECT ... FOR UPDATE)
+CREATE TABLE IF NOT EXISTS product_lookup_version (
+    id         INTEGER     PRIMARY KEY,
+    version    BIGINT      NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO product_lookup_version (id, version)
+SELECT 1, COALESCE(MAX(version), 0) FROM product_lookup_sheet
+ON CONFLICT (id) DO NOTHING;
+
+COMMIT;
+
+-- 되돌리기:
+-- DROP TABLE IF EXISTS product_lookup_version;
+-- DROP TABLE IF EXISTS product_lookup;
+-- DROP TABLE IF EXISTS product_lookup_sheet;
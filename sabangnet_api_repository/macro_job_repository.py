@@ -0,0 +1,200 @@
+from datetime import datetime
+from sqlalchemy import select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.batch_process import BatchProcess
+
+
+# batch_process.target_table 값 (매크로 작업 큐 행 구분)
+MACRO_JOB_TARGET = "macro_job"
+
+# 매크로 작업 상태 (batch_process.work_status, 14자 이하)
+JOB_QUEUED = "매크로_대기"
+JOB_RUNNING = "매크로_실행중"
+JOB_CANCEL_REQUESTED = "매크로_취소요청"
+JOB_CANCELLED = "매크로_취소"
+JOB_DONE = "매크로_완료"
+JOB_FAILED = "매크로_실패"
+
+
+class MacroJobRepository:
+    """
+    batch_process 테이블 기반 매크로 작업 큐 (target_table = MACRO_JOB_TARGET 인 행)
+    - date_from: 예약 시작 시각 (대기 중) / 실제 시작 시각 (실행 후), date_to: 종료 시각
+    - total_records: 입력 행 수, success_records: 처리 행 수 (진행률)
+    - worker_id: 작업을 가져간 워커, heartbeat_at: 워커가 주기적으로 갱신 (여러 프로세스가 같은 큐를 처리)
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_job(self, job: BatchProcess) -> BatchProcess:
+        """
+        작업 등록 (work_status 는 JOB_QUEUED 로 저장)
+        :param job: target_table / work_status 를 제외한 BatchProcess 객체
+        :return: 저장된 BatchProcess ORM 객체 (batch_id 포함)
+        """
+        job.target_table = MACRO_JOB_TARGET
+        job.work_status = JOB_QUEUED
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get_job(self, batch_id: int) -> BatchProcess | None:
+        result = await self.session.execute(
+            select(BatchProcess).where(
+                BatchProcess.batch_id == batch_id,
+                BatchProcess.target_table == MACRO_JOB_TARGET,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def claim_jobs(self, limit: int, worker_id: str) -> list[BatchProcess]:
+        """
+        실행할 대기 작업을 등록 순으로 최대 limit 건 가져와 실행중으로 변경 (worker_id / heartbeat_at 기록)
+        - 예약 시각(date_from)이 지나지 않은 작업은 제외
+        - FOR UPDATE SKIP LOCKED: 다른 워커가 가져가는 중인 행은 건너뜀
+        :return: 실행중으로 변경된 BatchProcess 리스트
+        """
+        if limit <= 0:
+            return []
+        now = datetime.now()
+        stmt = (
+            select(BatchProcess)
+            .where(
+                BatchProcess.target_table == MACRO_JOB_TARGET,
+                BatchProcess.work_status == JOB_QUEUED,
+                or_(BatchProcess.date_from.is_(None), BatchProcess.date_from <= now),
+            )
+            .order_by(BatchProcess.batch_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        jobs = list(result.scalars().all())
+        for job in jobs:
+            job.work_status = JOB_RUNNING
+            job.date_from = now
+            job.success_records = 0
+            job.worker_id = worker_id
+            job.heartbeat_at = now
+        await self.session.commit()
+        for job in jobs:
+            await self.session.refresh(job)
+        return jobs
+
+    async def update_job(self, batch_id: int, owner: str | None = None, **values) -> bool:
+        """
+        작업 행 갱신 (예: success_records=1200, work_status=JOB_DONE)
+        :param owner: 지정 시 이 워커가 가져간 행만 갱신 (다른 워커가 복구해 다시 실행 중이면 무시)
+        :return: 갱신 여부
+        """
+        stmt = update(BatchProcess).where(BatchProcess.batch_id == batch_id)
+        if owner is not None:
+            stmt = stmt.where(BatchProcess.worker_id == owner)
+        result = await self.session.execute(stmt.values(**values))
+        await self.session.commit()
+        return bool(result.rowcount)
+
+    async def update_progress(self, progress: dict[int, int], worker_id: str) -> None:
+        """
+        이 워커가 실행 중인 작업의 처리 행 수 일괄 갱신
+        :param progress: {batch_id: success_records}
+        """
+        for batch_id, rows in progress.items():
+            await self.session.execute(
+                update(BatchProcess)
+                .where(
+                    BatchProcess.batch_id == batch_id,
+                    BatchProcess.work_status == JOB_RUNNING,
+                    BatchProcess.worker_id == worker_id,
+                )
+                .values(success_records=rows)
+            )
+        await self.session.commit()
+
+    async def heartbeat(self, batch_ids, worker_id: str) -> None:
+        """
+        이 워커가 가져간 작업의 heartbeat_at 갱신 (워커 루프 주기마다)
+        """
+        batch_ids = list(batch_ids)
+        if not batch_ids:
+            return
+        await self.session.execute(
+            update(BatchProcess)
+            .where(BatchProcess.batch_id.in_(batch_ids), BatchProcess.worker_id == worker_id)
+            .values(heartbeat_at=datetime.now())
+        )
+        await self.session.commit()
+
+    async def request_cancel(self, batch_id: int) -> str | None:
+        """
+        작업 취소 요청
+        - 대기 작업은 바로 취소, 실행중 작업은 취소요청으로 변경 (워커가 다음 단계 전에 중단)
+        :return: 변경 후 상태 (작업이 없으면 None, 이미 종료된 작업은 현재 상태)
+        """
+        result = await self.session.execute(
+            select(BatchProcess)
+            .where(BatchProcess.batch_id == batch_id, BatchProcess.target_table == MACRO_JOB_TARGET)
+            .with_for_update()
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            return None
+        if job.work_status == JOB_QUEUED:
+            job.work_status = JOB_CANCELLED
+            job.date_to = datetime.now()
+        elif job.work_status == JOB_RUNNING:
+            job.work_status = JOB_CANCEL_REQUESTED
+        await self.session.commit()
+        return job.work_status
+
+    async def get_cancel_requested(self, batch_ids) -> set[int]:
+        """
+        주어진 작업 중 취소요청 상태인 batch_id
+        """
+        batch_ids = list(batch_ids)
+        if not batch_ids:
+            return set()
+        result = await self.session.execute(
+            select(BatchProcess.batch_id).where(
+                BatchProcess.batch_id.in_(batch_ids),
+                BatchProcess.work_status == JOB_CANCEL_REQUESTED,
+            )
+        )
+        return set(result.scalars().all())
+
+    async def requeue_interrupted(self, stale_before: datetime, worker_id: str | None = None) -> int:
+        """
+        중단된 작업 복구 - 실행중 → 대기 (처음부터 다시 실행), 취소요청 → 취소
+        대상: heartbeat_at 이 stale_before 이전인 작업 (워커 종료 / 응답 없음)
+              + worker_id 지정 시 같은 ID 의 이전 워커가 가져간 작업 (워커 재시작)
+        살아 있는 다른 워커가 실행 중인 작업은 heartbeat 가 갱신되므로 제외
+        :return: 대기로 되돌린 작업 수
+        """
+        interrupted = or_(
+            BatchProcess.heartbeat_at.is_(None),
+            BatchProcess.heartbeat_at < stale_before,
+        )
+        if worker_id is not None:
+            interrupted = or_(interrupted, BatchProcess.worker_id == worker_id)
+        await self.session.execute(
+            update(BatchProcess)
+            .where(
+                BatchProcess.target_table == MACRO_JOB_TARGET,
+                BatchProcess.work_status == JOB_CANCEL_REQUESTED,
+                interrupted,
+            )
+            .values(work_status=JOB_CANCELLED, date_to=datetime.now(), worker_id=None)
+        )
+        result = await self.session.execute(
+            update(BatchProcess)
+            .where(
+                BatchProcess.target_table == MACRO_JOB_TARGET,
+                BatchProcess.work_status == JOB_RUNNING,
+                interrupted,
+            )
+            .values(work_status=JOB_QUEUED, success_records=0, worker_id=None, heartbeat_at=None)
+        )
+        await self.session.commit()
+        return result.rowcount or 0
@@ -0,0 +1,90 @@
+from sqlalchemy import select, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.macro.product_lookup import ProductLookup, ProductLookupSheet, ProductLookupVersion
+
+
+# product_lookup_version 카운터 행 id
+VERSION_ROW_ID = 1
+
+
+class ProductLookupRepository:
+    # PostgreSQL 파라미터 한계 고려 (3컬럼 × 1000행)
+    BATCH_SIZE = 1000
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_version(self) -> int:
+        """
+        현재 인덱스 버전 (등록된 해시가 없으면 0)
+        """
+        result = await self.session.execute(select(func.coalesce(func.max(ProductLookupSheet.version), 0)))
+        return result.scalar_one()
+
+    async def get_sheets_since(self, version: int = 0) -> list[tuple[str, int]]:
+        """
+        version 이후 등록된 (해시, 버전) 목록 (version=0 이면 전체)
+        """
+        result = await self.session.execute(
+            select(ProductLookupSheet.sheet_hash, ProductLookupSheet.version)
+            .where(ProductLookupSheet.version > version)
+            .order_by(ProductLookupSheet.version)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_sheet_entries(self, sheet_hash: str) -> dict[str, str]:
+        """
+        해시의 {키: 값} 매핑 (등록되지 않은 해시면 빈 매핑)
+        """
+        result = await self.session.execute(
+            select(ProductLookup.lookup_key, ProductLookup.lookup_value)
+            .where(ProductLookup.sheet_hash == sheet_hash)
+        )
+        return dict(result.all())
+
+    async def next_version(self) -> int:
+        """
+        등록 버전 발급 - 카운터 행을 트랜잭션 종료(commit / rollback)까지 잠가 등록을 직렬화
+        (다른 트랜잭션이 먼저 받은 낮은 버전이 나중에 커밋되어 get_sheets_since 에서 누락되는 문제 방지)
+        """
+        result = await self.session.execute(
+            select(ProductLookupVersion)
+            .where(ProductLookupVersion.id == VERSION_ROW_ID)
+            .with_for_update()
+        )
+        counter = result.scalar_one()
+        counter.version += 1
+        await self.session.flush()
+        return counter.version
+
+    async def add_sheet(self, sheet_hash: str, entries: dict[str, str], source_file: str | None = None) -> int:
+        """
+        해시의 매핑 등록 (이미 등록된 해시면 기록하지 않음)
+        return: 해시의 등록 버전
+        """
+        try:
+            version = await self.next_version()
+            # 카운터 잠금 이후 조회 → 동시에 같은 해시를 등록해도 한 번만 기록
+            result = await self.session.execute(
+                select(ProductLookupSheet.version).where(ProductLookupSheet.sheet_hash == sheet_hash)
+            )
+            registered = result.scalar_one_or_none()
+            if registered is not None:
+                # 등록 취소 → 버전 증가 취소
+                await self.session.rollback()
+                return registered
+            self.session.add(ProductLookupSheet(
+                sheet_hash=sheet_hash, version=version, entry_count=len(entries), source_file=source_file,
+            ))
+            await self.session.flush()
+            items = list(entries.items())
+            for i in range(0, len(items), self.BATCH_SIZE):
+                await self.session.execute(insert(ProductLookup), [
+                    {"sheet_hash": sheet_hash, "lookup_key": key, "lookup_value": value}
+                    for key, value in items[i:i + self.BATCH_SIZE]
+                ])
+            await self.session.commit()
+            return version
+        except Exception as e:
+            await self.session.rollback()
+            raise e
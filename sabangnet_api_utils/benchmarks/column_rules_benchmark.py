@@ -0,0 +1,207 @@
+"""
+컬럼 단위(벡터화) 규칙 검증 및 벤치마크
+- 고정 샘플(경계값) + 합성 주문 워크북(order_workbook) 열 값으로 셀 단위 규칙과 column_rules 결과(값, 타입, 표시 형식) 일치 검증
+- 규칙별 셀 단위 처리 vs 열 단위 처리 실행 시간 비교
+
+실행:
+    python -m utils.benchmarks.column_rules_benchmark --rows 100000
+"""
+
+import argparse
+import time
+
+import openpyxl
+
+from utils.benchmarks.order_workbook import make_order_workbook
+from utils.excels import column_rules
+from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.excel_handler import ExcelHandler
+
+
+# 경계값 샘플
+PHONE_FIXTURES = [
+    None, "", 0, " ", "01012345678", "010-1234-5678", "010 1234 5678", "0101234567",
+    "050812345678", "070123456789", "060123456789", "0212345678", "021234567", "0311234567",
+    "0641234567", "0651234567", "01112345678", "01512345678", "abc", "010-abcd-5678",
+    1012345678, 1012345678.0, "０１０12345678", "²1012345678", "-", "--",
+]
+INT_FIXTURES = [
+    None, "", " ", ".", ",", "..", ",,", "0", "00", " 12 ", "1,234", "1.5", "1,2.3",
+    "123456789012345", "1234567890123456", "12,345,678,901,234,567", "a1", "-1", "+1",
+    "1 2", 5, 5.5, True, "٣", "²",
+]
+NUMBER_FIXTURES = ["1", "1.5", " 2 ", "1e3", "1.0e3", "-3", "-3.7", "0", 4, 4.0, True, "1_000"]
+MODEL_FIXTURES = [None, "", 0, "상품 1개", "상품 1개 1개", "상품 11개", "상품", 1, "상품 1개A"]
+QUANTITY_FIXTURES = [
+    None, "", 0, "상품 * 1", "상품 * 3", " 상품 * 3 ", "상품 * 11", "상품 * 01", "상품 *  7",
+    "상품 * * 5", "a * b * 2", "a * b * 1", "상품*3", "상품 * x", "상품 * ", " * 2", "상품 * 1 ",
+    12, "상품 * ３",
+]
+JEJU_FIXTURES = [None, "", 0, "제주특별자치도 제주시", "서귀포시", "서울 제주빌딩", "경기도", 1]
+
+
+def _order_corpus(rows: int, seed: int = 0) -> dict[str, list]:
+    """
+    규칙별 입력 값 (합성 주문 워크북의 해당 열)
+    """
+    ws = make_order_workbook(None, rows, seed=seed, lookup_sheet=False).active
+
+    def column(letter: str) -> list:
+        return [cell.value for cell in ws[letter][1:]]
+
+    return {
+        "phone": column("H") + column("I"),
+        "int": column("P") + column("Q") + column("G"),
+        "number": column("P") + column("G"),
+        "model": column("F"),
+        "quantity": [part for value in column("Z") for part in value.split(" / ")],
+        "jeju": column("J"),
+    }
+
+
+def _cells(ws, values: list) -> list:
+    """
+    값을 실제 openpyxl 셀에 기록 (셀 단위 규칙 입력)
+    """
+    return [ws.cell(row=row, column=1, value=value) for row, value in enumerate(values, start=1)]
+
+
+def _legacy_quantity_suffix(cell) -> None:
+    """
+    기존 알리 ERP 매크로 F열 셀 단위 처리 (" * 1" 제거, " * N" → " N개")
+    """
+    if cell.value:
+        txt = str(cell.value).strip()
+        if txt.endswith(" * 1"):
+            cell.value = txt[:-4]
+        elif " * " in txt:
+            parts = txt.split(" * ")
+            if len(parts) >= 2:
+                suffix = parts[-1].strip()
+                if suffix.isdigit() and suffix != "1":
+                    base_text = " * ".join(parts[:-1])
+                    cell.value = f"{base_text} {suffix}개"
+
+
+def _cell_rules(ws) -> dict:
+    """
+    규칙 이름 → (셀 단위 처리(values) → (값, 표시 형식), 열 단위 처리)
+    """
+    ex = ExcelHandler(ws)
+    col_h = ExcelColumnHandler()
+
+    def per_value(func):
+        def run(values):
+            return [func(value) for value in values], None
+        return run
+
+    def per_cell(func):
+        def run(values):
+            cells = _cells(ws, values)
+            for cell in cells:
+                cell.number_format = "General"
+                func(cell)
+            return [cell.value for cell in cells], [cell.number_format for cell in cells]
+        return run
+
+    def vectorized(func, formats: bool = False):
+        def run(values):
+            if formats:
+                new_values, number_formats = func(values)
+                return new_values, [fmt or "General" for fmt in number_formats]
+            return func(values), None
+        return run
+
+    def jeju_scalar(value):
+        return bool(value and column_rules.JEJU_KEYWORD in str(value))
+
+    return {
+        "phone": (per_value(ex.format_phone_number),
+                  vectorized(column_rules.format_phone_numbers)),
+        "mobile": (per_cell(col_h.h_i_column),
+                   vectorized(column_rules.format_mobile_numbers)),
+        "int": (per_cell(col_h.convert_int_column),
+                vectorized(column_rules.convert_int_values, formats=True)),
+        "number": (per_value(col_h._convert_to_number),
+                   vectorized(column_rules.convert_to_numbers)),
+        "model": (per_value(ex.clean_model_name),
+                  vectorized(column_rules.clean_model_names)),
+        "quantity": (per_cell(_legacy_quantity_suffix),
+                     vectorized(column_rules.quantity_suffix)),
+        "jeju": (per_value(jeju_scalar),
+                 vectorized(column_rules.jeju_mask)),
+    }
+
+
+def _inputs(ws, values: list) -> list:
+    # 셀 단위 규칙과 같은 입력이 되도록 셀 기록 후 값 사용
+    return [cell.value for cell in _cells(ws, values)]
+
+
+def verify(rows: int = 10000, seed: int = 0) -> dict[str, int]:
+    """
+    규칙별 셀 단위 / 열 단위 결과 일치 검증
+    return: {규칙 이름: 검증 건수}
+    raise: AssertionError (불일치 시 첫 번째 차이 표시)
+    """
+    ws = openpyxl.Workbook().active
+    corpus = _order_corpus(rows, seed)
+    fixtures = {
+        "phone": PHONE_FIXTURES + corpus["phone"],
+        "mobile": PHONE_FIXTURES + corpus["phone"],
+        "int": INT_FIXTURES + corpus["int"],
+        "number": NUMBER_FIXTURES + corpus["number"],
+        "model": MODEL_FIXTURES + corpus["model"],
+        "quantity": QUANTITY_FIXTURES + corpus["quantity"],
+        "jeju": JEJU_FIXTURES + corpus["jeju"],
+    }
+    checked = {}
+    for name, (scalar, vector) in _cell_rules(ws).items():
+        values = _inputs(ws, fixtures[name])
+        exp_values, exp_formats = scalar(values)
+        act_values, act_formats = vector(values)
+        assert len(exp_values) == len(act_values) == len(values), f"[{name}] 결과 건수 불일치"
+        # 표시 형식은 열 단위 규칙이 반환하는 경우만 비교
+        if act_formats is None:
+            exp_formats = None
+        for idx, value in enumerate(values):
+            exp = (type(exp_values[idx]), exp_values[idx], exp_formats and exp_formats[idx])
+            act = (type(act_values[idx]), act_values[idx], act_formats and act_formats[idx])
+            assert exp == act, f"[{name}] {value!r}: 셀 단위 {exp!r} != 열 단위 {act!r}"
+        checked[name] = len(values)
+    return checked
+
+
+def run_benchmark(rows: int = 100000, seed: int = 0) -> dict[str, dict]:
+    """
+    return: {규칙 이름: {"cell": 초, "column": 초, "speedup": 배수}}
+    """
+    ws = openpyxl.Workbook().active
+    corpus = _order_corpus(rows, seed)
+    corpus["mobile"] = corpus["phone"]
+    results = {}
+    for name, (scalar, vector) in _cell_rules(ws).items():
+        values = _inputs(ws, corpus[name])
+        start = time.perf_counter()
+        scalar(values)
+        cell = time.perf_counter() - start
+        start = time.perf_counter()
+        vector(values)
+        column = time.perf_counter() - start
+        results[name] = {
+            "cell": round(cell, 4),
+            "column": round(column, 4),
+            "speedup": round(cell / column, 2) if column else None,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="컬럼 단위 규칙 검증 및 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for name, count in verify(min(args.rows, 10000), args.seed).items():
+        print(f"[{name}] {count:,}건 일치")
+    for name, result in run_benchmark(args.rows, args.seed).items():
+        print(f"[{name}] 셀 단위 {result['cell']:.4f}s / 열 단위 {result['column']:.4f}s (x{result['speedup']})")
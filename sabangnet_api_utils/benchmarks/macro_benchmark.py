@@ -0,0 +1,200 @@
+"""
+ERP / 합포장 매크로 벤치마크
+- 몰별 합성 주문 워크북(order_workbook)을 행 수별(기본 1k/10k)로 생성
+- 매크로마다 새 프로세스에서 입력 로드 → 처리 → 저장까지 실행 시간과 메모리(최대 RSS) 측정
+- 결과를 JSON 으로 저장하고 이전 결과(--compare)와 비교해 커밋 간 성능 변화 확인
+
+실행:
+    python -m utils.benchmarks.macro_benchmark --rows 1000 10000 --output macro_benchmark.json
+    python -m utils.benchmarks.macro_benchmark --rows 100000 --macros erp.ali happojang.ali --tracemalloc
+    python -m utils.benchmarks.macro_benchmark --compare old.json --output new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from utils.benchmarks.order_workbook import make_order_workbook
+from utils.macros.batch_runner import MACROS, run_macro
+
+
+# 매크로 → 합성 워크북 몰 구성
+MACRO_MALLS = {
+    "erp.etc_site": "etc_site",
+    "erp.zigzag": "zigzag",
+    "erp.ali": "ali",
+    "erp.brandi": "brandi",
+    "erp.gauc": "gauc",
+    "happojang.etc_site": "etc_site",
+    "happojang.zigzag": "zigzag",
+    "happojang.ali": "ali",
+    "happojang.brandy": "brandi",
+    "happojang.gok": "gauc",
+}
+
+DEFAULT_ROWS = [1000, 10000]
+
+
+def _rss_mb() -> float:
+    """
+    현재 프로세스 최대 RSS (MB, Linux: KB 단위 / macOS: byte 단위)
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(src_path: str, macro: str, use_tracemalloc: bool = False) -> dict:
+    """
+    워커 프로세스: 입력 사본으로 매크로 1회 실행 후 측정값 반환
+    """
+    work_dir = tempfile.mkdtemp(prefix="macro_bench_")
+    work_path = os.path.join(work_dir, Path(src_path).name)
+    shutil.copyfile(src_path, work_path)
+    # 매크로 모듈 import 비용은 측정에서 제외
+    module_name = MACROS[macro][0]
+    __import__(module_name)
+
+    result = {"status": "failed", "seconds": None, "peak_rss_mb": None, "rss_delta_mb": None,
+              "tracemalloc_peak_mb": None, "error": None}
+    rss_before = _rss_mb()
+    if use_tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        output = run_macro(work_path, macro)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["status"] = "ok"
+        if output and os.path.exists(output) and not output.startswith(work_dir):
+            os.remove(output)
+    except Exception as e:
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if use_tracemalloc:
+            result["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    result["peak_rss_mb"] = round(_rss_mb(), 1)
+    result["rss_delta_mb"] = round(result["peak_rss_mb"] - rss_before, 1)
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(
+    rows_list: list[int] | None = None,
+    macros: list[str] | None = None,
+    repeat: int = 1,
+    use_tracemalloc: bool = False,
+    seed: int = 0,
+) -> dict:
+    """
+    return: {"commit", "created_at", "python", "results": [{"macro", "rows", "seconds", "peak_rss_mb", ...}]}
+    - 반복 실행 시 최소 실행 시간 / 최대 메모리 기록
+    """
+    rows_list = rows_list or DEFAULT_ROWS
+    macros = macros or list(MACRO_MALLS)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = {}
+        for rows in rows_list:
+            for macro in macros:
+                mall = MACRO_MALLS[macro]
+                if (mall, rows) not in sources:
+                    path = os.path.join(tmp, f"{mall}_{rows}.xlsx")
+                    sources[(mall, rows)] = make_order_workbook(path, rows, mall=mall, seed=seed)
+
+                runs = []
+                for _ in range(repeat):
+                    # 매크로마다 새 프로세스 (최대 RSS 가 이전 실행의 영향을 받지 않도록)
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        runs.append(executor.submit(
+                            measure, sources[(mall, rows)], macro, use_tracemalloc).result())
+                ok = [run for run in runs if run["status"] == "ok"]
+                best = dict(min(ok, key=lambda run: run["seconds"]) if ok else runs[-1])
+                if ok:
+                    best["peak_rss_mb"] = max(run["peak_rss_mb"] for run in ok)
+                best.update(macro=macro, rows=rows, runs=[run["seconds"] for run in runs])
+                results.append(best)
+                _print_result(best)
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """
+    이전 결과 대비 실행 시간 / 메모리 비율 (1.0 초과: 느려짐·증가)
+    """
+    base = {(r["macro"], r["rows"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        old = base.get((result["macro"], result["rows"]))
+        if old is None or result["status"] != "ok" or old.get("status") != "ok":
+            continue
+        rows.append({
+            "macro": result["macro"],
+            "rows": result["rows"],
+            "seconds": (old["seconds"], result["seconds"]),
+            "time_ratio": round(result["seconds"] / old["seconds"], 2) if old["seconds"] else None,
+            "rss_ratio": round(result["peak_rss_mb"] / old["peak_rss_mb"], 2) if old["peak_rss_mb"] else None,
+        })
+    return rows
+
+
+def _print_result(result: dict) -> None:
+    if result["status"] == "ok":
+        print(f"[{result['macro']}] {result['rows']:,}행 {result['seconds']:.3f}s, "
+              f"최대 RSS {result['peak_rss_mb']:.1f}MB (+{result['rss_delta_mb']:.1f}MB)")
+    else:
+        print(f"[{result['macro']}] {result['rows']:,}행 실패: {result['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ERP / 합포장 매크로 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--macros", nargs="+", choices=sorted(MACRO_MALLS), default=None)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="파이썬 할당 최대치 측정 (실행 시간 증가)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="macro_benchmark.json")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.rows, args.macros, args.repeat, args.tracemalloc, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"비교 기준: {baseline.get('commit')} ({baseline.get('created_at')})")
+        for row in compare(report, baseline):
+            old, new = row["seconds"]
+            print(f"[{row['macro']}] {row['rows']:,}행 {old:.3f}s → {new:.3f}s "
+                  f"(x{row['time_ratio']}, 메모리 x{row['rss_ratio']})")
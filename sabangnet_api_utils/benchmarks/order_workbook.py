@@ -0,0 +1,140 @@
+"""
+벤치마크용 사방넷 다운로드 양식(주문) 합성 워크북
+- 헤더: ORDER_BASIC_ERP_EXCEL_FIELD_MAPPING (A~Z 26열)
+- 계정([오케이마트], [아이예스] 등)과 몰 이름 조합: 합포장 ACCOUNT_MAPPING / ETCSiteConfig 기준
+- "/" 로 묶인 다중 상품 주문, 제주 주소, 선/착불, Sheet1(상품번호 → 코드) VLOOKUP 탭 포함
+
+실행:
+    python -m utils.benchmarks.order_workbook ./bench.xlsx --rows 10000 --mall etc_site
+"""
+
+import argparse
+import random
+
+import openpyxl
+
+from utils.macros.happojang.etc_site_merge_packaging import ACCOUNT_MAPPING, ETCSiteConfig
+from utils.mappings.order_basic_erp_excel_field_mapping import ORDER_BASIC_ERP_EXCEL_FIELD_MAPPING
+
+
+HEADERS = list(ORDER_BASIC_ERP_EXCEL_FIELD_MAPPING.keys())
+
+# 계정명 (분리 시트 대상 계정 + 분리 대상이 아닌 계정 일부)
+ACCOUNTS = [account for accounts in ACCOUNT_MAPPING.values() for account in accounts] + ["기타계정"]
+
+# 몰 → 사이트 이름 목록
+MALL_SITES = {
+    "ali": ["알리익스프레스"],
+    "zigzag": ["지그재그"],
+    "brandi": ["브랜디"],
+    "gauc": ["G마켓", "옥션"],
+    "etc_site": sorted(
+        set(ETCSiteConfig.ORDER_NUMBER_LENGTHS) | ETCSiteConfig.DELIVERY_SPLIT_SITES
+        | ETCSiteConfig.FREE_DELIVERY_SITES | ETCSiteConfig.NUMERIC_SITES | {"11번가", "카카오톡스토어"}
+    ),
+}
+
+ADDRESSES = [
+    "서울특별시 강남구 테헤란로 {n}", "경기도 성남시 분당구 판교역로 {n}", "부산광역시 해운대구 우동 {n}",
+    "인천광역시 연수구 송도동 {n}", "대전광역시 유성구 대학로 {n}",
+]
+JEJU_ADDRESSES = ["제주특별자치도 제주시 연동 {n}", "제주특별자치도 서귀포시 중앙로 {n}"]
+PAYMENT_TYPES = ["신용", "선불", "착불"]
+
+# 상품번호 범위 (Sheet1 에는 일부만 등록 → VLOOKUP 미일치 케이스 포함)
+PRODUCT_COUNT = 500
+LOOKUP_RATIO = 0.9
+
+
+def _product_id(n: int) -> str:
+    return str(1005000000000 + n)
+
+
+def make_order_workbook(
+    file_path: str | None,
+    rows: int,
+    mall: str = "etc_site",
+    seed: int = 0,
+    multi_ratio: float = 0.15,
+    jeju_ratio: float = 0.05,
+    lookup_sheet: bool = True,
+):
+    """
+    합성 주문 워크북 생성 (첫 번째 시트: 주문, 두 번째 시트: Sheet1)
+    args:
+        file_path: 저장 경로 (None 이면 저장하지 않고 워크북 반환)
+        mall: MALL_SITES 키 (사이트 이름 구성)
+        multi_ratio: "/" 로 묶인 다중 상품 주문 비율
+        jeju_ratio: 제주 주소 비율
+        lookup_sheet: Sheet1(상품번호 → 코드) 탭 생성 여부
+    return: file_path (저장 시) 또는 openpyxl Workbook
+    예시:
+        make_order_workbook("./bench.xlsx", 10000, mall="zigzag")
+        ws = make_order_workbook(None, 1000).active
+    """
+    if mall not in MALL_SITES:
+        raise ValueError(f"알 수 없는 몰: {mall} (지원: {', '.join(MALL_SITES)})")
+    rnd = random.Random(seed)
+    sites = MALL_SITES[mall]
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Sheet"
+    ws.append(HEADERS)
+    for i in range(rows):
+        row_idx = i + 2
+        items = rnd.randint(2, 3) if rnd.random() < multi_ratio else 1
+        qtys = [rnd.randint(1, 3) for _ in range(items)]
+        products = [rnd.randint(0, PRODUCT_COUNT - 1) for _ in range(items)]
+        order_ids = [str(8100000000000000 + i * 4 + n) for n in range(items)]
+        amount = sum(rnd.randint(5000, 40000) for _ in range(items))
+        address = rnd.choice(JEJU_ADDRESSES if rnd.random() < jeju_ratio else ADDRESSES)
+
+        row = [None] * len(HEADERS)
+        row[0] = "=ROW()-1"                                                   # A 순번
+        row[1] = f"[{rnd.choice(ACCOUNTS)}]{rnd.choice(sites)}"               # B 사이트
+        row[2] = f"수취인{rnd.randint(0, rows // 3 + 1)}"                      # C 수취인명
+        row[3] = f"=U{row_idx}+V{row_idx}"                                    # D 금액
+        row[4] = "/".join(order_ids)                                          # E 주문번호
+        row[5] = "/".join(f"상품{p} {q}개" for p, q in zip(products, qtys))     # F 제품명
+        row[6] = sum(qtys)                                                    # G 수량
+        row[7] = f"010{rnd.randint(10000000, 99999999)}"                      # H 전화번호1
+        row[8] = rnd.choice([f"010-{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+                             f"02{rnd.randint(1000000, 9999999)}", None])       # I 전화번호2
+        row[9] = address.format(n=rnd.randint(1, 300))                        # J 수취인주소
+        row[10] = f"{rnd.randint(1000, 63999):05d}"                           # K 우편번호
+        row[11] = rnd.choice(PAYMENT_TYPES)                                   # L 선/착불
+        row[12] = _product_id(products[0])                                    # M 상품번호
+        row[13] = rnd.choice(["문 앞에 놓아주세요", "부재시 경비실", None])       # N 배송메시지
+        row[14] = amount - rnd.randint(500, 3000)                             # O 정산예정금액
+        row[15] = str(rnd.randint(100, 3000))                                 # P 서비스이용료
+        row[16] = str(rnd.randint(1, 99999))                                  # Q 장바구니번호
+        row[20] = amount                                                      # U 금액[배송비미포함]
+        row[21] = rnd.choice([0, 0, 3000, 6000])                              # V 배송비
+        row[22] = str(rnd.randint(100000, 999999))                            # W 사방넷품번코드
+        row[23] = "/".join(str(7000000 + i * 4 + n) for n in range(items))    # X 사방넷주문번호
+        row[24] = "/".join(f"수집상품{p}" for p in products)                     # Y 수집상품명
+        row[25] = " / ".join(f"상품{p} * {q}" for p, q in zip(products, qtys))  # Z 수집옵션
+        ws.append(row)
+
+    if lookup_sheet:
+        lookup = wb.create_sheet("Sheet1")
+        lookup.append(["상품번호", "코드"])
+        for n in range(PRODUCT_COUNT):
+            if rnd.random() < LOOKUP_RATIO:
+                lookup.append([_product_id(n), f"S{n:04d}"])
+
+    if file_path is None:
+        return wb
+    wb.save(file_path)
+    return file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 주문 워크북 생성")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--mall", choices=sorted(MALL_SITES), default="etc_site")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(make_order_workbook(args.path, args.rows, args.mall, args.seed))
@@ -0,0 +1,74 @@
+"""
+행 일괄 추출 벤치마크 (ExcelHandler.extract / read_rows)
+- 합성 주문 워크북(order_workbook, 기본 10,000행 × 26열) 생성
+- 기존 셀 단위 추출 vs iter_rows(values_only) vs ExcelHandler.extract 실행 시간 비교
+- 기존 _extract_headers_and_data 는 행마다 ws.max_column 을 다시 계산(전체 셀 순회)하므로
+  --legacy-rows 개 행만 측정 (전체 행 측정은 수 분 소요)
+
+실행:
+    python -m utils.benchmarks.row_extraction_benchmark --rows 10000
+"""
+
+import argparse
+import time
+
+from utils.benchmarks.order_workbook import make_order_workbook
+from utils.excels.excel_handler import ExcelHandler
+
+
+def _timed(func) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def legacy_cells(ws) -> list[list]:
+    """기존 to_dataframe 방식 (좌표마다 ws.cell 조회, 범위는 한 번만 계산)"""
+    end_row, end_col = ws.max_row, ws.max_column
+    return [[ws.cell(row=r, column=c).value for c in range(1, end_col + 1)] for r in range(2, end_row + 1)]
+
+
+def legacy_max_column(ws, rows: int) -> list[list]:
+    """기존 _extract_headers_and_data 방식 (행마다 ws.max_column 계산)"""
+    return [[ws.cell(row=r, column=c).value for c in range(1, ws.max_column + 1)] for r in range(2, rows + 2)]
+
+
+def run_benchmark(rows: int = 10000, legacy_rows: int = 500, repeat: int = 3, seed: int = 0) -> dict:
+    """
+    return: {"cells": 셀 수, 방식별 초, "speedup": extract 대비 셀 단위 배수}
+    """
+    ws = make_order_workbook(None, rows, seed=seed, lookup_sheet=False).active
+    cols = ws.max_column
+    ex = ExcelHandler(ws)
+
+    legacy, expected = min((_timed(lambda: legacy_cells(ws)) for _ in range(repeat)), key=lambda x: x[0])
+    iter_rows, _ = min(
+        (_timed(lambda: list(ws.iter_rows(min_row=2, max_col=cols, values_only=True))) for _ in range(repeat)),
+        key=lambda x: x[0])
+    extract, (_, result) = min((_timed(lambda: ex.extract(ws)) for _ in range(repeat)), key=lambda x: x[0])
+    assert [list(row) for row in result] == expected
+    max_column, _ = _timed(lambda: legacy_max_column(ws, legacy_rows))
+    return {
+        "cells": rows * cols,
+        "legacy": round(legacy, 3),
+        "iter_rows": round(iter_rows, 3),
+        "extract": round(extract, 3),
+        "legacy_max_column": round(max_column, 3),
+        "legacy_rows": legacy_rows,
+        "speedup": round(legacy / extract, 2) if extract else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="행 일괄 추출 벤치마크")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--legacy-rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    result = run_benchmark(args.rows, args.legacy_rows, args.repeat, args.seed)
+    print(f"셀 수: {result['cells']:,}")
+    print(f"셀 단위 ws.cell:          {result['legacy']:.3f}s")
+    print(f"iter_rows(values_only):   {result['iter_rows']:.3f}s")
+    print(f"ExcelHandler.extract:     {result['extract']:.3f}s (x{result['speedup']})")
+    print(f"행마다 max_column ({result['legacy_rows']:,}행): {result['legacy_max_column']:.3f}s")
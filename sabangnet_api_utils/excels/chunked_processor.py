@@ -0,0 +1,387 @@
+"""
+대용량 주문 파일 청크 처리
+- 원본을 read-only 로 고정 행 수(청크) 단위로 읽어 행 규칙(RowPipeline) 적용
+- 정렬은 메모리 상한을 넘으면 정렬된 런(run)을 임시 파일로 내보낸 뒤 병합 (외부 정렬)
+- 정렬된 행을 다시 청크 단위로 시트별 분류 → 분리 후 규칙 적용 → write-only 워크북에 바로 기록
+- 메모리 상한: 인자 memory_mb 또는 환경 변수 SABANGNET_MACRO_MEMORY_MB (기본값 512MB)
+
+원본 셀 서식은 읽지 않음 (읽기 전용 로드와 동일, 값과 열 너비만 유지)
+"""
+
+import heapq
+import os
+import pickle
+import re
+import sys
+import tempfile
+from copy import copy
+from typing import Callable, Iterable, Iterator
+
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+from utils.profiling import job_checkpoint, report_progress
+from utils.excels.columnar_sheet import ColumnarSheet
+from utils.excels.csv_reader import is_csv_file, iter_csv_rows, sheet_title
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.row_pipeline import RowPipeline
+from utils.excels.row_sort import row_key
+from utils.excels.streaming_reader import read_column_widths
+from utils.excels.style_registry import STYLES, DEFAULT_ROW_HEIGHT
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+MEMORY_ENV = "SABANGNET_MACRO_MEMORY_MB"
+DEFAULT_MEMORY_MB = 512
+DEFAULT_CHUNK_ROWS = 5000
+
+# 런 파일 기록 단위 (행 수)
+_RUN_BATCH = 1000
+# 행 크기 추정 표본 수 (청크별)
+_SIZE_SAMPLE = 50
+
+# 사이트 값의 [계정명] (ExcelHandler._group_rows_by_sheet 와 동일)
+_ACCOUNT_RE = re.compile(r'^\[([^\]]+)\]')
+
+
+def memory_budget_mb(memory_mb: float | None = None) -> float:
+    """
+    메모리 상한 (MB) - 인자 → 환경 변수 → 기본값 순
+    """
+    if memory_mb:
+        return float(memory_mb)
+    return float(os.environ.get(MEMORY_ENV) or DEFAULT_MEMORY_MB)
+
+
+def _row_bytes(rows: list) -> float:
+    """
+    행 1개의 대략적인 메모리 크기 (표본 평균, 리스트 + 값 객체)
+    """
+    sample = rows[:_SIZE_SAMPLE]
+    if not sample:
+        return 0.0
+    total = sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row) for row in sample)
+    return total / len(sample)
+
+
+class ChunkSheet(ColumnarSheet):
+    """
+    원본 행 번호를 유지하는 청크 단위 ColumnarSheet
+    - 1행(헤더)과 first_row ~ max_row 행만 메모리에 보관
+    - 셀 규칙의 ws[f"D{row}"], cell.row 가 전체 시트 기준 행 번호로 동작
+    예시:
+        chunk = ChunkSheet.from_chunk("자동화", headers, rows, first_row=5002)
+        pipeline.run(chunk, start_row=chunk.first_row)
+    """
+
+    first_row = 2
+
+    @classmethod
+    def from_chunk(cls, title: str, headers: list, rows: list, first_row: int) -> "ChunkSheet":
+        sheet = cls.from_rows(None, headers, rows)
+        sheet.title = title
+        sheet.first_row = first_row
+        sheet._length = sheet.max_row
+        sheet.max_row = first_row + len(rows) - 1
+        return sheet
+
+    def _index(self, row: int) -> int:
+        return 0 if row == 1 else row - self.first_row + 1
+
+    def get_value(self, letter: str, row: int):
+        col = self.columns.get(letter)
+        idx = self._index(row)
+        if col is None or not 0 <= idx < self._length:
+            return None
+        return col[idx]
+
+    def set_value(self, letter: str, row: int, value) -> None:
+        idx = self._index(row)
+        if not 0 <= idx < self._length:
+            raise IndexError(f"{letter}{row}: 청크 범위({self.first_row}~{self.max_row}행) 밖의 셀")
+        self._column(letter)[idx] = value
+
+    def _column(self, letter: str) -> list:
+        col = self.columns.get(letter)
+        if col is None:
+            col = self.columns[letter] = [None] * self._length
+            self.max_column = max(self.max_column, column_index_from_string(letter))
+            for c in range(1, self.max_column + 1):
+                self.columns.setdefault(get_column_letter(c), [None] * self._length)
+        return col
+
+    def reorder_rows(self, order: list[int], start_row: int = 2) -> None:
+        raise NotImplementedError("청크 시트는 행 재배치를 지원하지 않음 (SortedRuns 사용)")
+
+
+class SortedRuns:
+    """
+    메모리 상한 외부 정렬
+    - 버퍼가 상한을 넘으면 정렬 후 임시 파일(런)로 기록하고 버퍼 비움
+    - 반복 시 런과 남은 버퍼를 병합하여 정렬 순서대로 행 반환 (같은 키는 입력 순서 유지)
+    예시:
+        runs = SortedRuns(row_key([2, 3]), memory_mb=256)
+        for chunk in chunks:
+            runs.add(chunk)
+        for row in runs:
+            ...
+        runs.close()
+    """
+
+    def __init__(self, key: Callable, memory_mb: float | None = None, tmp_dir: str | None = None):
+        self.key = key
+        self.budget = memory_budget_mb(memory_mb) * 1024 * 1024
+        self.tmp_dir = tmp_dir
+        self.runs: list[str] = []
+        self.count = 0
+        self._buffer: list[tuple] = []
+        self._buffer_bytes = 0.0
+        self._dir: tempfile.TemporaryDirectory | None = None
+
+    def add(self, rows: list) -> None:
+        key = self.key
+        start = self.count
+        self._buffer.extend((key(row), seq, row) for seq, row in enumerate(rows, start=start))
+        self.count += len(rows)
+        # 키 튜플 포함 약 1.5배로 추정
+        self._buffer_bytes += _row_bytes(rows) * len(rows) * 1.5
+        if self._buffer_bytes > self.budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+        if self._dir is None:
+            self._dir = tempfile.TemporaryDirectory(prefix="sorted_runs_", dir=self.tmp_dir)
+        self._buffer.sort()
+        path = os.path.join(self._dir.name, f"run_{len(self.runs)}.pkl")
+        with open(path, "wb") as f:
+            for i in range(0, len(self._buffer), _RUN_BATCH):
+                pickle.dump(self._buffer[i:i + _RUN_BATCH], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.runs.append(path)
+        logger.info(f"정렬 런 기록: {path} ({len(self._buffer):,}행)")
+        self._buffer = []
+        self._buffer_bytes = 0.0
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[tuple]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    return
+                yield from batch
+
+    def __iter__(self) -> Iterator[list]:
+        self._buffer.sort()
+        if not self.runs:
+            for _, _, row in self._buffer:
+                yield row
+            return
+        streams = [self._read_run(path) for path in self.runs] + [iter(self._buffer)]
+        for _, _, row in heapq.merge(*streams):
+            yield row
+
+    def close(self) -> None:
+        self._buffer = []
+        if self._dir is not None:
+            self._dir.cleanup()
+            self._dir = None
+        self.runs = []
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _SheetOutput:
+    """
+    write-only 출력 시트 1개 (행 번호, 서식 캐시 관리)
+    """
+
+    def __init__(self, out_wb: Workbook, title: str, headers: list, widths: dict[str, float],
+                 body_style: str, grid_lines: bool = False):
+        self.title = title
+        self.ws = out_wb.create_sheet(title=title)
+        self.body = STYLES[body_style]
+        self.next_row = 2
+        self._style_cache: dict = {}
+        # 행 기록 전에 설정해야 하는 시트 속성
+        for letter, width in widths.items():
+            self.ws.column_dimensions[letter].width = width
+        self.ws.sheet_format.defaultRowHeight = DEFAULT_ROW_HEIGHT
+        self.ws.sheet_format.customHeight = True
+        if grid_lines:
+            self.ws.sheet_view.showGridLines = True
+        self.ws.row_dimensions[1].height = DEFAULT_ROW_HEIGHT
+        self.ws.append([self._cell(value, STYLES["header_white"], None) for value in headers])
+
+    def _cell(self, value, base: dict, overrides: dict | None):
+        key = (id(base), tuple(sorted(overrides.items())) if overrides else None)
+        cell = WriteOnlyCell(self.ws, value)
+        cached = self._style_cache.get(key)
+        if cached is not None:
+            cell._style = copy(cached)
+            return cell
+        for name, style in base.items():
+            setattr(cell, name, style)
+        if overrides:
+            for name, style in overrides.items():
+                setattr(cell, name, style)
+        self._style_cache[key] = copy(cell._style)
+        return cell
+
+    def write(self, chunk: ChunkSheet) -> None:
+        letters = [get_column_letter(c) for c in range(1, chunk.max_column + 1)]
+        columns = [chunk.columns[letter] for letter in letters]
+        styles = chunk._styles
+        for idx in range(1, chunk._length):
+            row = chunk.first_row + idx - 1
+            self.ws.append([
+                self._cell(col[idx], self.body, styles.get((letter, row)))
+                for letter, col in zip(letters, columns)
+            ])
+        self.next_row = chunk.max_row + 1
+
+
+class ChunkedSheetProcessor:
+    """
+    ERP 매크로 청크 처리 엔진
+    원본 → [청크별 분리 전 규칙] → 외부 정렬 → [청크별 시트 분류 → 분리 후 규칙 → 기록]
+    args:
+        file_path: 원본 엑셀 경로 (CSV / TSV 가능)
+        chunk_rows: 청크 행 수
+        memory_mb: 정렬 버퍼 메모리 상한 (기본값: 환경 변수 SABANGNET_MACRO_MEMORY_MB 또는 512)
+    예시:
+        processor = ChunkedSheetProcessor(file_path, chunk_rows=5000, memory_mb=256)
+        processor.process(output_path, pre=pre, post=post, sort_columns=[2, 3, 5],
+                          sheets_name=["OK", "IY"], site_to_sheet={"오케이마트": "OK", "아이예스": "IY"})
+
+    분리 후 규칙은 청크마다 실행되므로 행 단위(다른 행을 참조하지 않는) 규칙이어야 함
+    출력 시트: 자동화(정렬된 전체 행) + 계정 시트 (원본의 기타 시트는 기록하지 않음)
+    """
+
+    def __init__(self, file_path: str, sheet_index: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 memory_mb: float | None = None, tmp_dir: str | None = None):
+        self.file_path = file_path
+        self.sheet_index = sheet_index
+        self.chunk_rows = chunk_rows
+        self.memory_mb = memory_budget_mb(memory_mb)
+        self.tmp_dir = tmp_dir
+        self.headers: list = []
+        self.widths: dict[str, float] = {}
+        # 셀 규칙용 핸들러 (스타일 레지스트리 / 공용 메소드, 빈 워크북)
+        wb = Workbook()
+        self.ex = ExcelHandler(wb.active, wb)
+
+    def read_chunks(self, src_wb) -> Iterator[list]:
+        """
+        대상 시트를 청크 행 리스트 단위로 읽기 (헤더, 열 너비는 self 에 기록)
+        src_wb 가 None 이면 CSV / TSV 원본을 행 단위로 스트리밍
+        """
+        if src_wb is None:
+            self.widths = {}
+            rows = iter_csv_rows(self.file_path)
+        else:
+            src_ws = src_wb.worksheets[self.sheet_index]
+            self.widths = read_column_widths(src_ws)
+            rows = src_ws.iter_rows(values_only=True)
+        self.headers = list(next(rows, ()))
+        width = len(self.headers)
+        for batch in _batched(rows, self.chunk_rows):
+            # 행 길이를 헤더 기준으로 맞춤 (ws.max_column 기준 추출과 동일)
+            yield [list(row[:width]) + [None] * (width - len(row)) for row in batch]
+
+    def process(
+        self,
+        output_path: str,
+        sort_columns: list[int],
+        sheets_name: list[str],
+        site_to_sheet: dict,
+        pre: RowPipeline | None = None,
+        post: RowPipeline | None = None,
+        site_col_idx: int = 2,
+        lookup: Callable | None = None,
+    ) -> str:
+        """
+        args:
+            pre: 분리 전 규칙 (원본 청크별 실행)
+            post: 분리 후 규칙 (자동화/계정 시트 청크별 실행, sheets 조건은 시트명 기준)
+            lookup: read-only 원본 워크북을 받아 정렬 전에 호출 (예: Sheet1 VLOOKUP 인덱스 병합)
+        return: 저장 경로
+        """
+        runs = SortedRuns(row_key(sort_columns), self.memory_mb, self.tmp_dir)
+        # CSV / TSV 는 시트가 하나뿐이므로 lookup (Sheet1 탭) 생략
+        src_wb = None if is_csv_file(self.file_path) else openpyxl.load_workbook(self.file_path, read_only=True)
+        title = sheet_title(self.file_path) if src_wb is None else src_wb.worksheets[self.sheet_index].title
+        try:
+            if lookup is not None and src_wb is not None:
+                lookup(src_wb)
+            first_row = 2
+            for rows in self.read_chunks(src_wb):
+                job_checkpoint("청크 읽기")
+                if pre is not None:
+                    chunk = ChunkSheet.from_chunk(title, self.headers, rows, first_row)
+                    pre.run(chunk, start_row=first_row, end_row=chunk.max_row)
+                    rows = chunk.data_rows()
+                runs.add(rows)
+                first_row += len(rows)
+                report_progress(first_row - 2)
+        finally:
+            if src_wb is not None:
+                src_wb.close()
+        logger.info(f"[{os.path.basename(self.file_path)}] {runs.count:,}행 읽기 완료 "
+                    f"(정렬 런 {len(runs.runs)}개, 메모리 상한 {self.memory_mb:g}MB)")
+
+        try:
+            self._write_sorted(output_path, runs, sheets_name, site_to_sheet, post, site_col_idx)
+        finally:
+            runs.close()
+        return output_path
+
+    def _write_sorted(self, output_path, runs: SortedRuns, sheets_name, site_to_sheet, post, site_col_idx):
+        out_wb = Workbook(write_only=True)
+        auto = _SheetOutput(out_wb, "자동화", self.headers, self.widths, "body_reset", grid_lines=True)
+        # 계정 시트 열 너비는 자동화 시트(원본)와 동일
+        outputs = {name: _SheetOutput(out_wb, name, self.headers, self.widths, "body_row")
+                   for name in sheets_name if name != "자동화"}
+
+        site_idx = site_col_idx - 1
+        for rows in _batched(runs, self.chunk_rows):
+            job_checkpoint("청크 기록")
+            # 자동화 시트: 빈 값은 "" 로 기록 (preprocess_and_update_ws 와 동일)
+            auto_rows = [[v if v or v == 0 else "" for v in row] for row in rows]
+            self._emit(auto, auto_rows, post)
+
+            sheet_rows = {name: [] for name in outputs}
+            for row in rows:
+                site = str(row[site_idx]) if len(row) > site_idx and row[site_idx] else ""
+                match = _ACCOUNT_RE.match(site)
+                if match:
+                    target = site_to_sheet.get(match.group(1))
+                    if target in sheet_rows:
+                        sheet_rows[target].append(list(row))
+            for name, target_rows in sheet_rows.items():
+                if target_rows:
+                    self._emit(outputs[name], target_rows, post)
+
+        out_wb.save(output_path)
+
+    def _emit(self, output: _SheetOutput, rows: list, post: RowPipeline | None) -> None:
+        chunk = ChunkSheet.from_chunk(output.title, self.headers, rows, output.next_row)
+        if post is not None:
+            post.run(chunk, start_row=chunk.first_row, end_row=chunk.max_row)
+        output.write(chunk)
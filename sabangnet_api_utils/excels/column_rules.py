@@ -0,0 +1,249 @@
+"""
+컬럼 단위(벡터화) 규칙
+- ExcelColumnHandler / ExcelHandler 의 셀 단위 규칙과 결과가 동일한 열 전체 변환
+- 값 목록(list, Series 등)을 받아 pandas Series.str 연산으로 한 번에 변환 후 list 반환
+- transform_column() 으로 워크시트 또는 ColumnarSheet 의 열을 한 번에 읽고 반영
+"""
+
+import re
+from typing import Callable, Sequence
+
+import pandas as pd
+from openpyxl.utils import column_index_from_string
+
+from utils.excels.columnar_sheet import ColumnarSheet
+
+
+_INT_RE = re.compile(r"[0-9,\.]+")
+_NON_DIGIT_RE = re.compile(r"[^\d]")
+
+_MOBILE_PREFIXES = ["010", "011", "016", "017", "018", "019"]
+_VOIP_PREFIXES = ["050", "070"]
+_AREA_PREFIXES = [f"0{i}" for i in range(31, 65)]
+
+JEJU_KEYWORD = "제주"
+QUANTITY_SEP = " * "
+
+
+def _series(values: Sequence) -> pd.Series:
+    """
+    dtype 추론 없이 원본 파이썬 객체 그대로 담은 Series
+    """
+    return pd.Series(list(values), dtype=object)
+
+
+def _truthy(series: pd.Series) -> pd.Series:
+    """
+    셀 규칙의 `if value:` 조건
+    """
+    return series.map(bool).astype(bool)
+
+
+def _to_str(series: pd.Series) -> pd.Series:
+    """
+    셀 규칙의 str(value) (None → 'None')
+    """
+    return series.map(str).astype(object)
+
+
+def format_phone_numbers(values: Sequence) -> list:
+    """
+    ExcelHandler.format_phone_number 열 단위 버전
+    예시:
+        format_phone_numbers(["01012345678", "0212345678", None])
+        # ['010-1234-5678', '02-1234-5678', '']
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    text = (_to_str(series).str.replace("-", "", regex=False)
+            .str.replace(" ", "", regex=False).str.strip())
+    digits = text.str.isdigit().astype(bool)
+    length = text.str.len()
+    prefix = text.str[:3]
+    seoul = text.str.startswith("02").astype(bool)
+
+    out = text.copy()
+    # (조건, 앞자리 길이, 가운데 자리 길이)
+    patterns = [
+        (digits & (length == 12) & prefix.isin(_VOIP_PREFIXES), 4, 4),
+        (digits & (length == 11) & prefix.isin(_MOBILE_PREFIXES), 3, 4),
+        (digits & (length == 10) & seoul, 2, 4),
+        (digits & (length == 10) & ~seoul & prefix.isin(_AREA_PREFIXES), 3, 3),
+        (digits & (length == 9) & seoul, 2, 3),
+    ]
+    for mask, head, mid in patterns:
+        if mask.any():
+            part = text[mask]
+            out[mask] = (part.str[:head] + "-" + part.str[head:head + mid]
+                         + "-" + part.str[head + mid:])
+    out[~_truthy(series)] = ""
+    return out.tolist()
+
+
+def format_mobile_numbers(values: Sequence) -> list:
+    """
+    ExcelColumnHandler.h_i_column 열 단위 버전 (11자리 010 번호만 하이픈 포맷)
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    text = _to_str(series).str.replace("-", "", regex=False).str.strip()
+    mask = (_truthy(series) & (text.str.len() == 11)
+            & text.str.startswith("010").astype(bool) & text.str.isdigit().astype(bool))
+    out = series.copy()
+    if mask.any():
+        part = text[mask]
+        out[mask] = part.str[:3] + "-" + part.str[3:7] + "-" + part.str[7:]
+    return out.tolist()
+
+
+def convert_int_values(values: Sequence) -> tuple[list, list]:
+    """
+    ExcelColumnHandler.convert_int_column 열 단위 버전
+    return:
+        (값 목록, 표시 형식 목록) - 표시 형식이 None 이면 변경하지 않음
+    """
+    series = _series(values)
+    formats = pd.Series([None] * len(series), dtype=object)
+    if series.empty:
+        return [], []
+    is_str = series.map(lambda value: isinstance(value, str)).astype(bool)
+    out = series.copy()
+    if not is_str.any():
+        return out.tolist(), formats.tolist()
+
+    raw = series[is_str].str.strip()
+    matched = raw.str.fullmatch(_INT_RE).astype(bool)
+    cleaned = raw.str.replace(_NON_DIGIT_RE, "", regex=True)
+    # 15자리 초과시 문자열(텍스트 형식)로 유지
+    long_num = matched & (cleaned.str.len() >= 16)
+    numeric = matched & ~long_num & ~raw.isin([".", ","])
+
+    formats[long_num[long_num].index] = "@"
+    if numeric.any():
+        digits = cleaned[numeric].where(cleaned[numeric] != "", "0")
+        out[digits.index] = [int(d) for d in digits.tolist()]
+        formats[digits.index] = "0"
+    return out.tolist(), formats.tolist()
+
+
+def convert_to_numbers(values: Sequence) -> list:
+    """
+    ExcelColumnHandler._convert_to_number 열 단위 버전
+    - '.' 포함 시 float, 아니면 int
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    # object 배열 → float 캐스팅은 원소별 float() 와 동일한 변환 규칙 적용
+    floats = series.to_numpy(dtype=object).astype(float)
+    has_dot = _to_str(series).str.contains(".", regex=False).to_numpy(dtype=bool)
+    out = floats.astype(object)
+    out[~has_dot] = [int(value) for value in floats[~has_dot]]
+    return out.tolist()
+
+
+def clean_model_names(values: Sequence) -> list:
+    """
+    ExcelHandler.clean_model_name 열 단위 버전 (' 1개' 제거)
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    truthy = _truthy(series)
+    out = series.copy()
+    if truthy.any():
+        out[truthy] = _to_str(series[truthy]).str.replace(" 1개", "", regex=False)
+    return out.tolist()
+
+
+def quantity_suffix(values: Sequence) -> list:
+    """
+    수량 표기 변환 (알리 F열)
+    - '상품 * 1' → '상품'
+    - '상품 * 3' → '상품 3개'
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    truthy = _truthy(series)
+    out = series.copy()
+    if not truthy.any():
+        return out.tolist()
+
+    text = _to_str(series[truthy]).str.strip()
+    single = text.str.endswith(" * 1").astype(bool)
+    out[single[single].index] = text[single].str[:-4]
+
+    rest = text[~single & text.str.contains(QUANTITY_SEP, regex=False).astype(bool)]
+    if not rest.empty:
+        parts = rest.str.split(QUANTITY_SEP, regex=False)
+        suffix = parts.str[-1].str.strip()
+        multi = suffix.str.isdigit().astype(bool) & (suffix != "1")
+        if multi.any():
+            base = parts[multi].str[:-1].str.join(QUANTITY_SEP)
+            out[base.index] = base + " " + suffix[multi] + "개"
+    return out.tolist()
+
+
+def jeju_mask(values: Sequence, pattern: str | re.Pattern | None = None) -> list[bool]:
+    """
+    제주 주소 여부 목록
+    args:
+        pattern: 정규식 (기본값: '제주' 포함 여부, 예: re.compile(r"제주|서귀포"))
+    """
+    series = _series(values)
+    if series.empty:
+        return []
+    text = _to_str(series)
+    if pattern is None:
+        found = text.str.contains(JEJU_KEYWORD, regex=False)
+    else:
+        found = text.str.contains(pattern, regex=True)
+    return (_truthy(series) & found.astype(bool)).tolist()
+
+
+def transform_column(
+    ws,
+    column: str,
+    func: Callable[[list], list | tuple[list, list]],
+    start_row: int = 2,
+    end_row: int | None = None,
+) -> None:
+    """
+    열 전체를 한 번에 읽어 func 로 변환 후 반영
+    args:
+        ws: openpyxl 워크시트 또는 ColumnarSheet
+        column: 열 문자 (예: 'F')
+        func: 값 목록 → 값 목록 또는 (값 목록, 표시 형식 목록)
+    예시:
+        transform_column(ws, "P", convert_int_values)
+    """
+    if end_row is None:
+        end_row = ws.max_row
+    if end_row < start_row:
+        return
+    rows = range(start_row, end_row + 1)
+
+    if isinstance(ws, ColumnarSheet):
+        values = [ws.get_value(column, row) for row in rows]
+    else:
+        col_idx = column_index_from_string(column)
+        cells = ws._cells
+        values = []
+        for row in rows:
+            cell = cells.get((row, col_idx))
+            values.append(cell.value if cell is not None else None)
+
+    result = func(values)
+    new_values, formats = result if isinstance(result, tuple) else (result, None)
+
+    for row, old, new in zip(rows, values, new_values):
+        if new is not old:
+            ws[f"{column}{row}"].value = new
+    if formats is not None:
+        for row, number_format in zip(rows, formats):
+            if number_format is not None:
+                ws[f"{column}{row}"].number_format = number_format
+
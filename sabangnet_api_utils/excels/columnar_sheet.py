@@ -0,0 +1,250 @@
+"""
+컬럼 기반 인메모리 시트
+- 워크시트를 한 번에 읽어 열(column letter)별 리스트로 보관
+- ws[f"F{row}"] 와 같은 셀 접근을 리스트 인덱스로 대체
+- 값/서식 변경은 메모리에만 기록하고 flush() 시점에 openpyxl 워크시트로 일괄 반영
+"""
+
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+
+_DIGITS = "0123456789"
+
+
+def split_coordinate(coordinate: str) -> tuple[str, int]:
+    """
+    'F12' → ('F', 12)
+    openpyxl 정규식 파서 대신 문자열 연산으로 좌표 분리
+    """
+    col = coordinate.rstrip(_DIGITS)
+    return col.upper(), int(coordinate[len(col):])
+
+
+class ColumnarCell:
+    """
+    ColumnarSheet 의 셀 프록시
+    ExcelColumnHandler, ETC*Handler 등 기존 셀 단위 규칙이 그대로 동작하도록
+    openpyxl Cell 과 동일한 속성(value, row, column_letter, font, fill, alignment, number_format, border)을 제공
+    """
+    __slots__ = ("_sheet", "column_letter", "row")
+
+    _STYLE_ATTRS = ("font", "fill", "alignment", "number_format", "border")
+
+    def __init__(self, sheet: "ColumnarSheet", column_letter: str, row: int):
+        object.__setattr__(self, "_sheet", sheet)
+        object.__setattr__(self, "column_letter", column_letter)
+        object.__setattr__(self, "row", row)
+
+    @property
+    def column(self) -> int:
+        return column_index_from_string(self.column_letter)
+
+    @property
+    def coordinate(self) -> str:
+        return f"{self.column_letter}{self.row}"
+
+    @property
+    def value(self):
+        return self._sheet.get_value(self.column_letter, self.row)
+
+    @value.setter
+    def value(self, value):
+        self._sheet.set_value(self.column_letter, self.row, value)
+
+    def __getattr__(self, name):
+        # 서식 속성 조회 (변경된 서식이 없으면 None)
+        if name in ColumnarCell._STYLE_ATTRS:
+            return self._sheet.get_style(self.column_letter, self.row, name)
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in ColumnarCell._STYLE_ATTRS:
+            self._sheet.set_style(self.column_letter, self.row, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+
+class ColumnarSheet:
+    """
+    열 단위 인메모리 테이블
+    예시:
+        sheet = ColumnarSheet.from_worksheet(ws)
+        sheet["F2"].value = "상품명"        # 기존 셀 규칙 호환
+        sheet.column("F")[0]                # F2 값 (데이터 행 리스트)
+        sheet.flush()                       # 변경 사항을 ws 에 일괄 반영
+    """
+
+    def __init__(self, ws, columns: dict[str, list], max_row: int, max_column: int):
+        self.ws = ws
+        self.title = ws.title if ws is not None else "Sheet"
+        # columns[letter][row - 1] = 값 (헤더 포함)
+        self.columns = columns
+        self.max_row = max_row
+        self.max_column = max_column
+        self._dirty_columns: set[str] = set()
+        # None 으로 비운 셀 (ws.cell(value=None) 은 값을 지우지 않으므로 별도 관리)
+        self._cleared: set[tuple[str, int]] = set()
+        # {(letter, row): {"font": Font, ...}}
+        self._styles: dict[tuple[str, int], dict] = {}
+
+    @classmethod
+    def from_worksheet(cls, ws) -> "ColumnarSheet":
+        """
+        워크시트 전체를 values_only 로 한 번만 읽어 열 단위로 적재
+        """
+        max_row = ws.max_row
+        max_column = ws.max_column
+        letters = [get_column_letter(c) for c in range(1, max_column + 1)]
+        columns = {letter: [None] * max_row for letter in letters}
+        for r_idx, row in enumerate(ws.iter_rows(min_row=1, max_row=max_row,
+                                                 max_col=max_column, values_only=True)):
+            for letter, value in zip(letters, row):
+                columns[letter][r_idx] = value
+        return cls(ws, columns, max_row, max_column)
+
+    @classmethod
+    def from_rows(cls, ws, headers: list, rows: list) -> "ColumnarSheet":
+        """
+        헤더와 행 리스트로 적재 (ws 는 flush 대상 워크시트)
+        - 모든 열을 변경 상태로 표시하여 flush 시 전체 기록
+        """
+        max_column = max([len(headers)] + [len(row) for row in rows]) if rows else len(headers)
+        max_row = len(rows) + 1
+        letters = [get_column_letter(c) for c in range(1, max_column + 1)]
+        columns = {letter: [None] * max_row for letter in letters}
+        for c_idx, header in enumerate(headers):
+            columns[letters[c_idx]][0] = header
+        for r_idx, row in enumerate(rows, start=1):
+            for letter, value in zip(letters, row):
+                columns[letter][r_idx] = value
+        sheet = cls(ws, columns, max_row, max_column)
+        sheet._dirty_columns.update(letters)
+        return sheet
+
+    # 셀 접근
+
+    def __getitem__(self, coordinate: str) -> ColumnarCell:
+        col, row = split_coordinate(coordinate)
+        return ColumnarCell(self, col, row)
+
+    def cell(self, row: int, column) -> ColumnarCell:
+        """
+        column: 열 번호(1-based) 또는 열 문자
+        """
+        if isinstance(column, int):
+            column = get_column_letter(column)
+        return ColumnarCell(self, column, row)
+
+    def column(self, letter: str) -> list:
+        """
+        데이터 행(2행~) 값 리스트 복사본
+        """
+        return self._column(letter)[1:self.max_row]
+
+    def set_column(self, letter: str, values: list, start_row: int = 2) -> None:
+        """
+        start_row 부터 열 전체 값을 한 번에 교체
+        """
+        col = self._column(letter)
+        end = start_row - 1 + len(values)
+        if end > self.max_row:
+            self._grow(end)
+        col[start_row - 1:end] = values
+        self._dirty_columns.add(letter)
+        self._cleared.update(
+            (letter, row) for row, value in enumerate(values, start=start_row) if value is None)
+
+    def get_value(self, letter: str, row: int):
+        col = self.columns.get(letter)
+        if col is None or row > self.max_row:
+            return None
+        return col[row - 1]
+
+    def set_value(self, letter: str, row: int, value) -> None:
+        if row > self.max_row:
+            self._grow(row)
+        self._column(letter)[row - 1] = value
+        self._dirty_columns.add(letter)
+        if value is None:
+            self._cleared.add((letter, row))
+
+    def get_style(self, letter: str, row: int, name: str):
+        return self._styles.get((letter, row), {}).get(name)
+
+    def set_style(self, letter: str, row: int, name: str, value) -> None:
+        self._styles.setdefault((letter, row), {})[name] = value
+
+    def headers(self) -> list:
+        return [self.columns[get_column_letter(c)][0] for c in range(1, self.max_column + 1)]
+
+    def data_rows(self) -> list[list]:
+        """
+        2행부터 행 단위 리스트로 변환
+        """
+        cols = [self.columns[get_column_letter(c)] for c in range(1, self.max_column + 1)]
+        return [list(values) for values in zip(*cols)][1:]
+
+    def reorder_rows(self, order: list[int], start_row: int = 2) -> None:
+        """
+        start_row 부터 len(order) 개 행을 order 순서(0-based)로 재배치
+        값과 변경된 서식이 함께 이동
+        """
+        end = start_row - 1 + len(order)
+        for letter, col in self.columns.items():
+            block = col[start_row - 1:end]
+            col[start_row - 1:end] = [block[i] for i in order]
+            self._dirty_columns.add(letter)
+        new_row = {start_row + old: new for new, old in enumerate(order, start=start_row)}
+        self._styles = {(letter, new_row.get(row, row)): styles
+                        for (letter, row), styles in self._styles.items()}
+        self._cleared = {(letter, new_row.get(row, row)) for letter, row in self._cleared}
+
+    # 내부 처리
+
+    def _column(self, letter: str) -> list:
+        col = self.columns.get(letter)
+        if col is None:
+            # 새 열 추가
+            col = [None] * self.max_row
+            self.columns[letter] = col
+            self.max_column = max(self.max_column, column_index_from_string(letter))
+            for c in range(1, self.max_column + 1):
+                self.columns.setdefault(get_column_letter(c), [None] * self.max_row)
+        return col
+
+    def _grow(self, max_row: int) -> None:
+        extra = max_row - self.max_row
+        for col in self.columns.values():
+            col.extend([None] * extra)
+        self.max_row = max_row
+
+    # 반영
+
+    def flush(self, ws=None, values: bool = True) -> None:
+        """
+        변경된 열 값과 서식을 워크시트에 한 번에 반영
+        args:
+            ws: 대상 워크시트 (기본값: 적재 원본)
+            values: False 면 서식만 반영
+        """
+        ws = ws if ws is not None else self.ws
+        if ws is None:
+            return
+        if not values:
+            self._dirty_columns.clear()
+            self._cleared.clear()
+        for letter in sorted(self._dirty_columns, key=column_index_from_string):
+            col_idx = column_index_from_string(letter)
+            for r_idx, value in enumerate(self.columns[letter], start=1):
+                if value is not None:
+                    ws.cell(row=r_idx, column=col_idx, value=value)
+        for letter, row in self._cleared:
+            if self.get_value(letter, row) is None:
+                ws.cell(row=row, column=column_index_from_string(letter)).value = None
+        for (letter, row), styles in self._styles.items():
+            cell = ws.cell(row=row, column=column_index_from_string(letter))
+            for name, value in styles.items():
+                setattr(cell, name, value)
+        self._dirty_columns.clear()
+        self._cleared.clear()
+        self._styles.clear()
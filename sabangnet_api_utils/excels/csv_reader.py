@@ -0,0 +1,161 @@
+"""
+CSV / TSV 주문 파일 읽기
+- 인코딩 자동 판별 (BOM → UTF-8 → CP949(EUC-KR 상위 호환) 순)
+- pyarrow 가 설치되어 있으면 pandas pyarrow 엔진, 없으면 C 엔진 사용 (모든 열을 문자열로 읽은 뒤 변환)
+- 셀 값은 사방넷 주문 엑셀(values_only) 로드와 같은 행 모델로 변환
+  빈 값 → None, 숫자 열(NUMERIC_HEADERS) → int / float, 그 외 열은 문자열 유지 (주문번호 / 우편번호 등 텍스트 셀)
+"""
+
+import codecs
+import csv
+import re
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+
+# 확장자 → 구분자
+CSV_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+# 엑셀 원본에서 숫자 셀인 열 (그 외 열은 텍스트 셀)
+NUMERIC_HEADERS = frozenset({"수량", "정산예정금액", "금액[배송비미포함]", "배송비"})
+
+# 인코딩 판별 표본 크기
+_SAMPLE_BYTES = 1024 * 1024
+
+_INT_RE = re.compile(r"-?(?:0|[1-9]\d{0,14})")
+_FLOAT_RE = re.compile(r"-?(?:0|[1-9]\d{0,14})\.\d+")
+# 시트명에 사용할 수 없는 문자
+_INVALID_TITLE_RE = re.compile(r"[\\/*?:\[\]]")
+
+
+def is_csv_file(file_path) -> bool:
+    return Path(str(file_path)).suffix.lower() in CSV_DELIMITERS
+
+
+def detect_encoding(file_path) -> str:
+    """
+    파일 인코딩 판별
+    return: "utf-8-sig" / "utf-16" / "utf-8" / "cp949"
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(_SAMPLE_BYTES)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        # 엑셀 '유니코드 텍스트' 저장 형식
+        return "utf-16"
+    try:
+        # 표본 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음 (final=False)
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def to_cell_value(text: str):
+    """
+    CSV 문자열 → 셀 값 (엑셀 values_only 행 모델)
+    예시:
+        to_cell_value("")          # None
+        to_cell_value("15000")     # 15000
+        to_cell_value("0.5")       # 0.5
+        to_cell_value("010-1234")  # '010-1234'
+        to_cell_value("00123")     # '00123'
+    """
+    if not isinstance(text, str) or not text:
+        # 빈 값 / 행 길이가 짧아 채워진 결측값
+        return None
+    if _INT_RE.fullmatch(text):
+        return int(text)
+    if _FLOAT_RE.fullmatch(text):
+        return float(text)
+    return text
+
+
+def sheet_title(file_path) -> str:
+    """
+    CSV 를 워크북으로 적재할 때의 시트명 (엑셀과 동일하게 파일명 사용, 31자 제한)
+    """
+    return _INVALID_TITLE_RE.sub("_", Path(str(file_path)).stem)[:31] or "Sheet"
+
+
+def _row_converter(headers: tuple, numeric_columns):
+    """
+    헤더 기준 행 변환 함수 (numeric_columns=None 이면 모든 열 숫자 변환)
+    """
+    numeric = {j for j, header in enumerate(headers) if numeric_columns is None or header in numeric_columns}
+
+    def convert(row) -> tuple:
+        return tuple(
+            to_cell_value(value) if j in numeric else (value if isinstance(value, str) and value else None)
+            for j, value in enumerate(row)
+        )
+    return convert
+
+
+def _convert_rows(rows: Iterator, numeric_columns) -> Iterator[tuple]:
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    headers = tuple(value if isinstance(value, str) and value else None for value in header)
+    yield headers
+    yield from map(_row_converter(headers, numeric_columns), rows)
+
+
+def iter_csv_rows(file_path, numeric_columns=NUMERIC_HEADERS, encoding: str | None = None) -> Iterator[tuple]:
+    """
+    행 단위 스트리밍 읽기 (헤더 포함, 셀 값 변환)
+    """
+    encoding = encoding or detect_encoding(file_path)
+    delimiter = CSV_DELIMITERS[Path(str(file_path)).suffix.lower()]
+    with open(file_path, encoding=encoding, newline="") as f:
+        yield from _convert_rows(csv.reader(f, delimiter=delimiter), numeric_columns)
+
+
+def read_csv_rows(file_path, numeric_columns=NUMERIC_HEADERS) -> list[tuple]:
+    """
+    전체 행 읽기 (헤더 포함, 셀 값 변환)
+    args:
+        numeric_columns: 숫자로 변환할 헤더 (None 이면 모든 열에서 숫자 형태 값 변환)
+    """
+    try:
+        df = pd.read_csv(
+            file_path,
+            sep=CSV_DELIMITERS[Path(str(file_path)).suffix.lower()],
+            header=None,
+            dtype=str,
+            keep_default_na=False,
+            na_values=[],
+            encoding=detect_encoding(file_path),
+            engine=CSV_ENGINE,
+        )
+    except pd.errors.EmptyDataError:
+        return []
+    return list(_convert_rows(df.itertuples(index=False, name=None), numeric_columns))
+
+
+def read_csv_values(file_path) -> list[tuple[str, dict[str, float], list[tuple]]]:
+    """
+    streaming_reader.read_values 와 같은 형식 (시트 1개, 열 너비 없음)
+    return: [(시트명, {}, [행 값 튜플, ...])]
+    """
+    return [(sheet_title(file_path), {}, read_csv_rows(file_path))]
+
+
+def read_csv_frame(file_path) -> pd.DataFrame:
+    """
+    첫 행을 헤더로 하는 DataFrame (pd.read_excel 결과 대응, 숫자 형태 값은 모든 열에서 변환, 빈 셀은 None)
+    """
+    rows = read_csv_rows(file_path, numeric_columns=None)
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame.from_records(rows[1:], columns=list(rows[0]))
@@ -1,10 +1,9 @@
-from openpyxl.styles import Font, PatternFill, Alignment
 import re
 
+from utils.excels.style_registry import apply_style
+
 
 class ExcelColumnHandler:
-    def __init__(self):
-        self.red_font = Font(color="FF0000")
 
     def a_formula_column(self, cell):
         """
@@ -52,7 +51,7 @@ class ExcelColumnHandler:
             num_str = str(cell.value).replace('.', '')
             cell.value = str(num_str)
             cell.number_format = '@'  # 텍스트 형식
-        cell.alignment = Alignment(horizontal='right')
+        apply_style(cell, "align_right")
 
     def f_column(self, cell):
         """
@@ -66,11 +65,7 @@ class ExcelColumnHandler:
 
         # 하이라이팅 조건 확인 및 적용
         if cell.value is not None and self._should_highlight_cell(cell.value):
-            cell.fill = PatternFill(
-                start_color="ADD8E6",
-                end_color="ADD8E6",
-                fill_type="solid"
-            )
+            apply_style(cell, "light_blue_fill")
 
     def l_column(self, cell):
         """
@@ -82,7 +77,7 @@ class ExcelColumnHandler:
         if l_value_str == "신용":
             cell.value = ""
         elif l_value_str == "착불":
-            cell.font = self.red_font
+            apply_style(cell, "red_font_plain")
 
     def h_i_column(self, cell):
         """
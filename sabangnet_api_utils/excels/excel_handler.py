@@ -1,11 +1,25 @@
+import os
 from typing import List
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border
+from openpyxl.styles import PatternFill
 import re
 import pandas as pd
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, column_index_from_string
 import traceback
 from utils.logs.sabangnet_logger import get_logger
+from utils.excels.columnar_sheet import ColumnarSheet
+from utils.excels.row_sort import (
+    STYLES_MOVE, STYLES_RESET, column_values, compact_rows, compile_sort_keys, macro_sort_styles, row_values,
+    sort_order, sort_worksheet_rows,
+)
+from utils.excels.streaming_reader import load_values_workbook
+from utils.excels.csv_reader import is_csv_file
+from utils.excels.style_registry import StyleRegistry, set_default_row_height
+from utils.excels.streaming_writer import StreamingWorkbookWriter
+from utils.excels.parallel_sheets import PendingSheets, submit_sheets
+from utils.excels.formula_eval import FormulaEvaluator, write_cached_values
+from utils.excels.product_lookup import ProductLookupIndex
+from utils.profiling import StepProfiler, profile_step, profiled
 
 """
 주문관리 Excel 파일 매크로 공통 처리 메소드
@@ -18,38 +32,143 @@ from utils.logs.sabangnet_logger import get_logger
 
 
 class ExcelHandler:
-    def __init__(self, ws, wb=None):
+    def __init__(self, ws, wb=None, columnar=False):
         self.ws = ws
         self.wb = wb
         self.last_row = ws.max_row
+        # 컬럼 모드: {id(ws): ColumnarSheet}
+        self._columnar_sheets = {}
+        self.sheet = self.columnar(ws) if columnar else None
+        # 저장 시 수식 캐시 값으로 기록할 계산 결과 {시트명: {(행, 열): 값}}
+        self._formula_values = {}
 
     @classmethod
-    def from_file(cls, file_path, sheet_index=0):
+    def from_file(cls, file_path, sheet_index=0, columnar=False, read_only=False):
         """
         파일 경로로 부터 엑셀 파일 로드
         예시:
             ex = ExcelHandler.from_file(file_path)
             ws = ex.ws
             wb = ex.wb
+
+            # 컬럼 모드: ex.sheet 에 열 단위 인메모리 시트 적재
+            ex = ExcelHandler.from_file(file_path, columnar=True)
+            ex.sheet["F2"].value
+
+            # 읽기 전용 로드: 원본 값만 스트리밍하여 새 워크북 구성 (원본 셀 서식 미포함)
+            ex = ExcelHandler.from_file(file_path, columnar=True, read_only=True)
+
+            # CSV / TSV: 항상 읽기 전용 로드와 같은 값 워크북으로 적재
+            ex = ExcelHandler.from_file("주문.csv")
         """
+        if read_only or is_csv_file(file_path):
+            wb, ws, sheet = load_values_workbook(file_path, sheet_index, columnar=columnar)
+            ex = cls(ws, wb)
+            if sheet is not None:
+                ex._columnar_sheets[id(ws)] = sheet
+                ex.sheet = sheet
+                ex.last_row = sheet.max_row
+            return ex
+
         wb = openpyxl.load_workbook(file_path)
         ws = wb.worksheets[sheet_index]
-        return cls(ws, wb)
-    
-    def save_file(self, file_path):
+        return cls(ws, wb, columnar=columnar)
+
+    # 컬럼 모드 Method
+
+    def columnar(self, ws=None) -> ColumnarSheet:
+        """
+        워크시트를 열 단위 인메모리 시트로 적재 (이미 적재된 경우 재사용)
+        변경 사항은 save_file / happojang_save_file 시점에 일괄 반영
+        예시:
+            sheet = ex.columnar(ws)
+            col_h.f_column(sheet.cell(row, "F"))
+        """
+        if ws is None:
+            ws = self.ws
+        sheet = self._columnar_sheets.get(id(ws))
+        if sheet is None:
+            sheet = ColumnarSheet.from_worksheet(ws)
+            self._columnar_sheets[id(ws)] = sheet
+        return sheet
+
+    def discard_columnar(self, ws) -> None:
+        """
+        워크시트가 직접 재작성된 경우 적재된 컬럼 시트 폐기
+        """
+        sheet = self._columnar_sheets.pop(id(ws), None)
+        if sheet is not None and sheet is self.sheet:
+            self.sheet = None
+
+    def flush_columnar(self) -> None:
+        """
+        적재된 모든 컬럼 시트를 워크시트에 일괄 반영
+        """
+        for sheet in self._columnar_sheets.values():
+            sheet.flush()
+
+    def styles(self, ws=None) -> StyleRegistry:
+        """
+        워크시트가 속한 워크북의 스타일 레지스트리
+        예시:
+            ex.styles(ws).apply(ws["J2"], "red_font")
+        """
+        wb = getattr(ws, "parent", None) or self.wb or self.ws.parent
+        return StyleRegistry.of(wb)
+
+    # 프로파일링 Method
+
+    def enable_profiling(self) -> StepProfiler:
+        """
+        워크북 단계 프로파일링 시작 (환경 변수 SABANGNET_PROFILE 설정 시 자동 시작)
+        정렬 / 시트 분리 / 서식 / VLOOKUP / 저장 등 단계별 실행 시간, 셀 수, 최대 RSS 기록 후 저장 시 로그 출력
+        예시:
+            ex = ExcelHandler.from_file(file_path)
+            ex.enable_profiling()
+        """
+        return StepProfiler.of(self.wb or self.ws.parent, create=True)
+
+    def step(self, name: str, ws=None):
+        """
+        매크로 단계 기록 컨텍스트 (프로파일링 미사용 시 아무것도 하지 않음)
+        예시:
+            with ex.step("F/H/D 수정", ws):
+                ...
+        """
+        return profiled(name, ws if ws is not None else self.ws)
+
+    def log_profile(self, title: str | None = None) -> dict | None:
+        """
+        단계별 프로파일 리포트 로그 출력 (출력 후 프로파일러 분리)
+        """
+        profiler = StepProfiler.pop(self.wb or self.ws.parent)
+        return profiler.log_report(title) if profiler is not None else None
+
+    def save_file(self, file_path, streaming=False):
         """
         엑셀 파일 저장
         예시:
             ex.save_file('file.xlsx')
+            ex.save_file('file.xlsx', streaming=True)  # write-only 스트리밍 저장
         """
-        if file_path.endswith('_매크로_완료.xlsx'):
-            output_path = file_path
-        else:
-            output_path = file_path.replace('.xlsx', '_매크로_완료.xlsx')
-        self.wb.save(output_path)
+        output_path = self.macro_output_path(file_path)
+        self._write_workbook(output_path, streaming)
+        self.log_profile(os.path.basename(output_path))
         return output_path
 
-    def happojang_save_file(self, output_dir="files/excel/happojang", base_name=None, suffix="_매크로_완료"):
+    @staticmethod
+    def macro_output_path(file_path):
+        """
+        매크로 결과 파일 경로 (입력이 CSV / TSV / xlsm 이어도 결과는 xlsx)
+        예시:
+            ExcelHandler.macro_output_path('주문.xlsx')  # '주문_매크로_완료.xlsx'
+            ExcelHandler.macro_output_path('주문.csv')   # '주문_매크로_완료.xlsx'
+        """
+        if file_path.endswith('_매크로_완료.xlsx'):
+            return file_path
+        return os.path.splitext(file_path)[0] + '_매크로_완료.xlsx'
+
+    def happojang_save_file(self, output_dir="files/excel/happojang", base_name=None, suffix="_매크로_완료", streaming=False):
         """
         엑셀 파일 저장 (happojang 규칙 적용)
         
@@ -57,6 +176,7 @@ class ExcelHandler:
             output_dir: 저장할 디렉토리 (프로젝트 루트 기준)
             base_name: 기본 파일명 (확장자 제외). None이면 현재 시트명 사용
             suffix: 파일명 접미사
+            streaming: True면 write-only 워크북으로 행 단위 저장
             
         Returns:
             str: 저장된 파일의 전체 경로
@@ -80,8 +200,23 @@ class ExcelHandler:
         output_path = str(output_path_dir / f"{base_name}{suffix}.xlsx")
         
         # 파일 저장
-        self.wb.save(output_path)
+        self._write_workbook(output_path, streaming)
+        self.log_profile(os.path.basename(output_path))
         return output_path
+
+    @profile_step("저장", target="wb")
+    def _write_workbook(self, output_path, streaming=False):
+        """
+        streaming=True: 컬럼 시트를 flush 하지 않고 write-only 워크북으로 바로 기록
+        convert_formula_to_value(keep_formula=True) 결과가 있으면 저장 후 수식 캐시 값 기록
+        """
+        if streaming:
+            StreamingWorkbookWriter(self.wb, self._columnar_sheets).save(output_path)
+        else:
+            self.flush_columnar()
+            self.wb.save(output_path)
+        if self._formula_values:
+            write_cached_values(output_path, self._formula_values)
     
     def set_auto_filter(self, ws=None):
         """
@@ -92,6 +227,7 @@ class ExcelHandler:
         ws.auto_filter.ref = f"A1:{get_column_letter(ws.max_column)}{ws.max_row}"
 
     # 기본 서식 설정 Method
+    @profile_step("서식")
     def set_basic_format(self, ws=None, header_rgb="006100"):
         """
         폰트, 행높이, 첫 행 배경색, 줄바꿈 해제 등 기본 서식 적용
@@ -102,17 +238,10 @@ class ExcelHandler:
         """
         if ws is None:
             ws = self.ws
-        font = Font(name='맑은 고딕', size=9)
-        green_fill = PatternFill(start_color=header_rgb,
-                                 end_color=header_rgb, fill_type="solid")
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.font = font
-                cell.alignment = Alignment(wrap_text=False)
-            ws.row_dimensions[row[0].row].height = 15
-        for cell in ws[1]:
-            cell.fill = green_fill
-            cell.alignment = Alignment(horizontal='center')
+        styles = self.styles(ws)
+        styles.apply_rows(ws, "body")
+        set_default_row_height(ws)
+        styles.apply_cells(ws[1], styles.header(header_rgb))
 
     # 수식 처리 Method
 
@@ -158,18 +287,33 @@ class ExcelHandler:
             ws[f'A{row}'].number_format = 'General'
             ws[f"A{row}"].value = "=ROW()-1"
 
-    def convert_formula_to_value(self):
+    @profile_step("수식 계산")
+    def convert_formula_to_value(self, ws=None, lookups=None, keep_formula=False):
         """
-        수식 → 값 변환 처리 (모든 시트)
-        (openpyxl은 수식 결과값을 계산하지 않으므로, 실제 값 변환은 Excel에서 복사-값붙여넣기로 처리)
+        수식 → 값 변환 처리 (ws 미지정 시 모든 시트)
+        - 매크로가 기록하는 수식(셀 참조, + - * /, ROW(), SUM, VLOOKUP(..., FALSE))을 파이썬에서 계산
+        - 지원하지 않는 수식은 그대로 유지
+        args:
+            lookups: VLOOKUP 표 딕셔너리 {표 참조: {키: 값}} (예: {"Sheet1!A:B": vlookup_dict})
+            keep_formula: True 면 수식은 유지하고 계산 값을 다음 저장 시 캐시 값으로 함께 기록
+        return: 계산된 수식 셀 수
         예시:
-            convert_formula_to_value(ws)
-        """
-        for row in self.ws.iter_rows():
-            for cell in row:
-                if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                    # 실제 계산은 Excel에서, 여기선 수식 문자열만 제거
-                    cell.value = cell.value
+            ex.convert_formula_to_value(ws)                      # =U2+V2 → 4000
+            ex.convert_formula_to_value(keep_formula=True)       # 저장 직전 호출 (수식 + 캐시 값)
+        """
+        self.flush_columnar()
+        wb = self.wb or self.ws.parent
+        evaluator = FormulaEvaluator(wb, lookups)
+        converted = 0
+        for sheet in ([ws] if ws is not None else wb.worksheets):
+            values = evaluator.evaluate(sheet)
+            converted += len(values)
+            if keep_formula:
+                self._formula_values[sheet.title] = values
+                continue
+            for (row, col), value in values.items():
+                sheet.cell(row=row, column=col).value = value
+        return converted
 
     # 데이터 정리 Method
 
@@ -181,10 +325,8 @@ class ExcelHandler:
         """
         if ws is None:
             ws = self.ws
-        for row in ws.iter_rows():
-            ws.sheet_view.showGridLines = False
-            for cell in row:
-                cell.border = Border()
+        ws.sheet_view.showGridLines = False
+        self.styles(ws).apply_rows(ws, "no_border")
 
     def clear_fills_from_second_row(self):
         """
@@ -193,9 +335,7 @@ class ExcelHandler:
             clear_fills_from_second_row(ws)
         - 두번째 행부터 모든 셀의 배경색을 제거합니다.
         """
-        for row in self.ws.iter_rows(min_row=2):
-            for cell in row:
-                cell.fill = PatternFill(fill_type=None)
+        self.styles(self.ws).apply_rows(self.ws, "no_fill", min_row=2)
 
     def format_phone_number(self, val):
         """
@@ -340,22 +480,21 @@ class ExcelHandler:
         예시:
             set_column_alignment(ws)
         """
-        center = Alignment(horizontal='center')
-        right = Alignment(horizontal='right')
-
         align_map = {
-            'center': {'A', 'B'},
-            'right': {'D', 'E', 'G'}
+            'align_center': ('A', 'B'),
+            'align_right': ('D', 'E', 'G')
         }
         if ws is None:
             ws = self.ws
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-            for cell in row:
-                col_letter = cell.column_letter
-                if col_letter in align_map['center']:
-                    cell.alignment = center
-                elif col_letter in align_map['right']:
-                    cell.alignment = right
+        styles = self.styles(ws)
+        for name, cols in align_map.items():
+            for col in cols:
+                col_idx = column_index_from_string(col)
+                if col_idx > ws.max_column:
+                    continue
+                styles.apply_cells(
+                    (cell for (cell,) in ws.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx)),
+                    name)
 
 
     def sort_dataframe_by_c_b(self, df, c_col='C', b_col='B'):
@@ -389,29 +528,110 @@ class ExcelHandler:
             ex.sort_by_columns([1, 3, 2])
         
         주의:
-        - 열 번호는 1부터 시작 (A열=1, B열=2, ...)
+        - 열 번호는 1부터 시작 (A열=1, B열=2, ...), 음수면 내림차순
         - 정렬은 문자열 비교 기준 ('123' > '1000')
+        - 정렬 범위 셀 서식은 초기화 (이전 출력과 동일, SABANGNET_SORT_MOVE_STYLES=1 이면 값과 함께 이동)
         - 정렬 후 자동으로 행 번호 재설정되지 않음
         필요시 set_row_number() 별도 호출
         """
-        rows = [
-            [self.ws.cell(row=r, column=c).value 
-            for c in range(1, self.ws.max_column + 1)]
-            for r in range(start_row, self.last_row + 1)
-        ]
-        
-        # 정렬 키 함수: 각 열을 문자열로 변환하여 비교
-        rows.sort(key=lambda x: tuple(str(x[i-1]) for i in key_columns))
-        
-        # 기존 데이터 삭제 후 정렬된 데이터 재기록
-        self.ws.delete_rows(start_row, self.last_row - start_row + 1)
-        for ridx, row in enumerate(rows, start=start_row):
-            for cidx, val in enumerate(row, start=1):
-                self.ws.cell(row=ridx, column=cidx, value=val)
-        
+        self.sort_rows(key_columns, start_row=start_row, end_row=self.last_row, key=str,
+                       styles=macro_sort_styles(STYLES_RESET))
+
         # last_row 업데이트
         self.last_row = self.ws.max_row
 
+    @profile_step("정렬")
+    def sort_rows(self, key_columns: List[int], ws=None, start_row: int = 2, end_row: int = None, key=None,
+                  styles: str = STYLES_MOVE) -> list[int]:
+        """
+        행 단위 정렬 (정렬 키를 열별로 한 번만 계산한 뒤 행 순서만 재배치)
+        args:
+            key_columns: 정렬 기준 열 번호 (1-based, 음수면 내림차순)
+            key: 셀 값 → 정렬 키 변환 함수 (기본값: 값 그대로)
+            styles: 셀 서식 처리 (row_sort.STYLES_MOVE / STYLES_KEEP / STYLES_RESET)
+        예시:
+            ex.sort_rows([4], key=to_float)          # D열 숫자 오름차순
+            ex.sort_rows([2, -3], key=str)           # B열 오름차순 → C열 내림차순
+        """
+        if ws is None:
+            ws = self.ws
+        # 컬럼 모드로 적재된 시트는 메모리에서 정렬 (서식 이동 외에는 워크시트에 반영 후 정렬)
+        sheet = self._columnar_sheets.get(id(ws))
+        if sheet is not None and styles != STYLES_MOVE:
+            sheet.flush()
+            self.discard_columnar(ws)
+            sheet = None
+        if sheet is not None:
+            if end_row is None:
+                end_row = sheet.max_row
+            keys = []
+            for col in key_columns:
+                values = sheet._column(get_column_letter(abs(col)))[start_row - 1:end_row]
+                keys.append([key(v) for v in values] if key is not None else values)
+            order = sort_order(keys, [col < 0 for col in key_columns])
+            sheet.reorder_rows(order, start_row)
+            return order
+        return sort_worksheet_rows(ws, key_columns, start_row=start_row, end_row=end_row, key=key, styles=styles)
+
+    def group_rows(self, key_columns: tuple[str, ...], ws=None, start_row: int = 2, end_row: int = None) -> dict[tuple, list[int]]:
+        """
+        키 열 값이 같은 행끼리 그룹핑 (한 번 순회, 그룹 / 행 순서는 시트 순서)
+        args:
+            key_columns: 키 열 문자 (값은 str(값).strip() 으로 비교, 빈 셀은 "None")
+        return: {키 튜플: [행 번호, ...]}
+        예시:
+            ex.group_rows(("C", "J"))  # {("상품", "주소"): [2, 7], ...}
+        """
+        if ws is None:
+            ws = self.ws
+        if end_row is None:
+            end_row = ws.max_row
+        columns = [
+            [str(value).strip() for value in column_values(ws, column_index_from_string(col), start_row, end_row)]
+            for col in key_columns
+        ]
+        groups: dict[tuple, list[int]] = {}
+        for row, key in enumerate(zip(*columns), start=start_row):
+            groups.setdefault(key, []).append(row)
+        return groups
+
+    def delete_rows(self, rows, ws=None) -> int:
+        """
+        여러 행을 한 번에 삭제 (행마다 ws.delete_rows 를 호출한 것과 같은 결과)
+        예시:
+            ex.delete_rows([5, 9, 10])
+        """
+        if ws is None:
+            ws = self.ws
+        if id(ws) in self._columnar_sheets:
+            # 컬럼 시트 변경 사항을 먼저 반영 후 워크시트에서 삭제
+            self._columnar_sheets[id(ws)].flush()
+            self.discard_columnar(ws)
+        return compact_rows(ws, rows)
+
+    def merge_rows_by_key(self, key_columns: tuple[str, ...], merge, ws=None, start_row: int = 2, end_row: int = None) -> list[int]:
+        """
+        키 열 값이 같은 행 병합 후 나머지 행을 한 번에 삭제
+        args:
+            key_columns: 그룹 키 열 문자 (group_rows 참고)
+            merge: merge(ws, rows) - 그룹 첫 행(rows[0])에 병합 값 기록 (중복 그룹만 호출)
+        return: 삭제한 행 번호 (삭제 전 기준, 오름차순)
+        예시:
+            def merge(ws, rows):
+                ws[f"D{rows[0]}"].value = sum(float(ws[f"D{r}"].value or 0) for r in rows)
+            ex.merge_rows_by_key(("C", "J"), merge)
+        """
+        if ws is None:
+            ws = self.ws
+        drop = []
+        for rows in self.group_rows(key_columns, ws, start_row, end_row).values():
+            if len(rows) > 1:
+                merge(ws, rows)
+                drop.extend(rows[1:])
+        drop.sort()
+        self.delete_rows(drop, ws)
+        return drop
+
     # 특수 처리 Method
 
     def process_jeju_address(self, row,ws=None, f_col='F', j_col='J'):
@@ -422,18 +642,15 @@ class ExcelHandler:
         """
         if ws is None:
             ws = self.ws
-        red_font = Font(color="FF0000", bold=True)
-        # RGB(204,255,255) → hex: "CCFFFF"
-        light_blue_fill = PatternFill(
-            start_color="CCFFFF", end_color="CCFFFF", fill_type="solid")
+        styles = self.styles(ws)
         # F열 안내문 추가
         f_val = ws[f'{f_col}{row}'].value
         if f_val and "[3000원 연락해야함]" not in str(f_val):
             ws[f'{f_col}{row}'].value = str(f_val) + " [3000원 연락해야함]"
         # J열 빨간 글씨
-        ws[f'{j_col}{row}'].font = red_font
-        # F열 연한 파란색 배경
-        ws[f'{f_col}{row}'].fill = light_blue_fill
+        styles.apply(ws[f'{j_col}{row}'], "red_font")
+        # F열 연한 파란색 배경 RGB(204,255,255)
+        styles.apply(ws[f'{f_col}{row}'], "cyan_fill")
 
     def process_l_column(self, row, l_col='L'):
         """
@@ -441,12 +658,11 @@ class ExcelHandler:
         예시:
             process_l_column(ws, row=7)
         """
-        red_font = Font(color="FF0000", bold=True)
         l_val = self.ws[f'{l_col}{row}'].value
         if l_val == "신용":
             self.ws[f'{l_col}{row}'].value = ""
         elif l_val == "착불":
-            self.ws[f'{l_col}{row}'].font = red_font
+            self.styles(self.ws).apply(self.ws[f'{l_col}{row}'], "red_font")
 
     def highlight_column(self, col: str, light_color: PatternFill, ws=None, start_row: int = 2, last_row: int = None):
         """
@@ -489,6 +705,7 @@ class ExcelHandler:
             if cell_value is not None and _should_highlight(txt):
                 ws[f"{col}{row}"].fill = light_color
 
+    @profile_step("헤더 서식")
     def set_header_style(self, ws):
         """
         지정한 워크시트의 헤더 행에 배경색, 폰트, 정렬을 일괄 적용
@@ -499,16 +716,8 @@ class ExcelHandler:
             font: 폰트
             alignment: 정렬 
         """
-        white_font = Font(name='맑은 고딕', size=9, color="FFFFFF", bold=True)
-        center_alignment = Alignment(horizontal='center')
-        green_fill = PatternFill(start_color="008000",
-                                 end_color="008000", fill_type="solid")
-        for cell in ws[1]:
-            cell.fill = green_fill
-            cell.font = white_font
-            cell.alignment = center_alignment
-            cell.border = Border()
-            ws.row_dimensions[1].height = 15
+        self.styles(ws).apply_cells(ws[1], "header_white")
+        ws.row_dimensions[1].height = 15
 
     def convert_to_number(self, cell_value):
         """
@@ -518,7 +727,53 @@ class ExcelHandler:
         """
         return float(cell_value) if '.' in str(cell_value) else int(float(cell_value))
 
-    def to_dataframe(self, ws=None, start_row=2, start_col=1, end_row=None, end_col=None):
+    @staticmethod
+    def read_rows(ws, min_row: int = 1, max_row: int = None, min_col: int = 1, max_col: int = None) -> list[tuple]:
+        """
+        행 값 튜플 목록 (범위는 한 번만 계산)
+        - 일반 워크시트: 셀 저장소 직접 조회 (빈 좌표에 셀을 생성하지 않음)
+        - 읽기 전용 워크시트: iter_rows(values_only=True)
+        예시:
+            rows = ExcelHandler.read_rows(ws, min_row=2, max_col=26)
+        """
+        if max_row is None:
+            max_row = ws.max_row
+        if max_col is None:
+            max_col = ws.max_column
+        if max_row < min_row or max_col < min_col:
+            return []
+        if hasattr(ws, "_cells"):
+            return row_values(ws, min_row, max_row, min_col, max_col)
+        return list(ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True))
+
+    def extract(self, ws=None, start_row=2, end_row=None, start_col=1, end_col=None, as_dataframe=False):
+        """
+        헤더(1행)와 데이터 행 일괄 추출
+        args:
+            as_dataframe: True 면 DataFrame (빈 헤더는 Col{열 번호})
+        return: (headers, rows) - rows 는 행 값 튜플 목록 / as_dataframe=True 면 DataFrame
+        예시:
+            headers, rows = ex.extract(ws)
+            df = ex.extract(ws, as_dataframe=True)
+        """
+        if ws is None:
+            ws = self.ws
+        if end_row is None:
+            end_row = ws.max_row
+        if end_col is None:
+            end_col = ws.max_column
+        headers = list(self.read_rows(ws, 1, 1, start_col, end_col)[0])
+        rows = self.read_rows(ws, start_row, end_row, start_col, end_col)
+        if as_dataframe:
+            return self._to_frame(headers, rows, start_col)
+        return headers, rows
+
+    @staticmethod
+    def _to_frame(headers: list, rows: list, start_col: int = 1) -> pd.DataFrame:
+        columns = [header if header else f"Col{col}" for col, header in enumerate(headers, start=start_col)]
+        return pd.DataFrame(rows, columns=columns)
+
+    def to_dataframe(self, ws=None, start_row=2, start_col=1, end_row=None, end_col=None, evaluate=False):
         """
         지정된 워크시트의 데이터를 DataFrame으로 변환
         args:
@@ -527,27 +782,20 @@ class ExcelHandler:
             start_col: 시작 열
             end_row: 끝 행
             end_col: 끝 열
+            evaluate: True 면 수식 셀을 계산 값으로 변환 (워크시트는 변경하지 않음)
         """
         ws = ws or self.ws
-        end_row = end_row or ws.max_row
-        end_col = end_col or ws.max_column
-
-        # 헤더 추출
-        headers = []
+        headers, rows = self.extract(ws, start_row, end_row, start_col, end_col)
 
-        for col in range(start_col, end_col + 1):
-            header = ws.cell(row=1, column=col).value
-            headers.append(header if header else f"Col{col}")
-
-        # 데이터 추출
-        data = []
-        for row in range(start_row, end_row + 1):
-            row_data = []
-            for col in range(start_col, end_col + 1):
-                row_data.append(ws.cell(row=row, column=col).value)
-            data.append(row_data)
+        # 수식 셀은 계산 값으로 대체
+        formula_values = FormulaEvaluator(ws.parent).evaluate(ws) if evaluate else {}
+        if formula_values:
+            rows = [
+                tuple(formula_values.get((row, col), value) for col, value in enumerate(values, start=start_col))
+                for row, values in enumerate(rows, start=start_row)
+            ]
 
-        return pd.DataFrame(data, columns=headers)
+        return self._to_frame(headers, rows, start_col)
 
     def create_split_sheets(self, headers: list, sheet_names: list):
         """
@@ -589,7 +837,7 @@ class ExcelHandler:
         """
         # 각 시트별 행 인덱스 초기화
         site_rows = {sheet: 2 for sheet in site_mapping.keys()}
-        font = Font(name='맑은 고딕', size=9)
+        styles = self.styles()
         
         for row_data in df.itertuples(index=False):
             # 계정명 추출
@@ -609,9 +857,10 @@ class ExcelHandler:
                     current_row = site_rows[sheet]
                     
                     # 데이터 복사
-                    for col_idx, value in enumerate(row_data, 1):
-                        cell = target_sheet.cell(row=current_row, column=col_idx, value=value)
-                        cell.font = font
+                    styles.apply_cells(
+                        (target_sheet.cell(row=current_row, column=col_idx, value=value)
+                         for col_idx, value in enumerate(row_data, 1)),
+                        "body_font")
                     
                     target_sheet.row_dimensions[current_row].height = 15
                     site_rows[sheet] += 1
@@ -713,6 +962,7 @@ class ExcelHandler:
             delete_temp_file(file_path)
         return df
 
+    @profile_step("추출/정렬")
     def preprocess_and_update_ws(self, ws, sort_columns: list[int]):
         """
         1. 헤더/데이터 추출
@@ -728,10 +978,19 @@ class ExcelHandler:
 
         # 3. 원본 시트를 "자동화"로 이름 변경하고 정렬된 데이터로 업데이트
         ws.title = "자동화"
+        # 컬럼 모드로 적재된 시트는 서식만 반영 후 폐기 (값은 아래에서 전체 재작성)
+        sheet = self._columnar_sheets.get(id(ws))
+        if sheet is not None:
+            sheet.flush(values=False)
+            self.discard_columnar(ws)
+            # 읽기 전용 로드 시 워크시트에 헤더가 없으므로 함께 기록
+            for col, header in enumerate(headers, start=1):
+                ws.cell(row=1, column=col, value=header)
         self._update_worksheet_data(ws, data)
 
         return headers, data
 
+    @profile_step("시트 분리")
     def split_and_write_ws_by_site(
         self,
         wb,
@@ -740,7 +999,9 @@ class ExcelHandler:
         sheets_name: list[str],
         site_to_sheet: dict,
         site_col_idx: int = 2,
-    ):
+        formatter=None,
+        max_workers: int | None = None,
+    ) -> PendingSheets | None:
         """
         wb: 워크북
         headers: 헤더
@@ -748,6 +1009,10 @@ class ExcelHandler:
         sheets_name: 생성할 시트명 리스트
         site_to_sheet: {사이트명: 시트명}
         site_col_idx: 사이트 컬럼 인덱스 (1-based) 기본값 2
+        formatter: 병렬 모드 시트 서식 함수 formatter(ex, ws) (피클 가능해야 함)
+            - 지정 시 데이터가 있는 시트는 워커 프로세스에서 생성/서식 적용
+            - 반환된 PendingSheets.result() 호출 시 워크북에 반영
+        max_workers: 병렬 모드 워커 수 (기본값: min(시트 수, CPU 수))
         """
 
         # 4. 시트들 생성
@@ -755,13 +1020,24 @@ class ExcelHandler:
         ws_map = self._create_sheets(
             wb.worksheets[0], headers, filtered_sheets)
 
-        # 5. 각 필터링된 시트에 데이터 삽입
-        self._write_data_to_sheets(data, ws_map, site_to_sheet, site_col_idx)
+        pending = None
+        if formatter is None:
+            # 5. 각 필터링된 시트에 데이터 삽입
+            self._write_data_to_sheets(data, ws_map, site_to_sheet, site_col_idx)
+        else:
+            # 5. 시트별 행 분류 후 워커 프로세스에서 시트 생성/서식 적용
+            sheet_rows = self._group_rows_by_sheet(data, filtered_sheets, site_to_sheet, site_col_idx)
+            for target_ws in ws_map.values():
+                set_default_row_height(target_ws, min_row=2)
+            pending = submit_sheets(
+                wb, headers, {name: rows for name, rows in sheet_rows.items() if rows},
+                formatter, max_workers)
 
         # 6. 컬럼 너비 복사
         self._copy_column_widths(wb)
+        return pending
 
-    def _extract_headers_and_data(self, ws) -> tuple[list, list[list]]:
+    def _extract_headers_and_data(self, ws) -> tuple[list, list]:
         """
         워크시트에서 헤더와 데이터 추출
         args:
@@ -770,69 +1046,36 @@ class ExcelHandler:
             headers: 헤더
             data: 데이터
         """
-        # 헤더 추출
-        headers = [ws.cell(row=1, column=c).value for c in range(
-            1, ws.max_column + 1)]
-
-        # 데이터 추출
-        data = [
-            [ws.cell(row=r, column=c).value for c in range(
-                1, ws.max_column + 1)]
-            for r in range(2, ws.max_row + 1)
-        ]
+        # 컬럼 모드로 적재된 시트는 메모리에서 바로 추출
+        sheet = self._columnar_sheets.get(id(ws))
+        if sheet is not None:
+            return sheet.headers(), sheet.data_rows()
 
-        return headers, data
+        return self.extract(ws)
     
-    def _sort_data(self, data: list[list], sort_columns: list[int]) -> list[list]:
+    def _sort_data(self, data: list, sort_columns: list[int]) -> list:
         """
         데이터 정렬 (컬럼 인덱스) 2025-07-17 srot_columns에 음수 값이 입력되면 역순 정렬되도록 수정
+        열별 정렬 키를 한 번만 계산(compile_sort_keys)한 뒤 행 순서만 정렬
         args:
             data: 데이터
-            sort_columns: 정렬 기준 컬럼 인덱스
+            sort_columns: 정렬 기준 컬럼 인덱스 (음수면 내림차순)
         return:
             sorted_data: 정렬된 데이터
         """
-        logger = get_logger(__name__)
-        
-        def dynamic_key(item):
-            key_tuple_elements = []
-            try:
-                for col_idx in sort_columns:
-                    value = item[abs(col_idx)-1]
-                    # None 처리: 숫자면 inf/-inf, 문자열이면 "", 기타는 ""
-                    if value is None:
-                        # 오름차순: None은 맨 뒤, 내림차순: None은 맨 앞
-                        if col_idx > 0:
-                            value = float('inf') if isinstance(item[abs(col_idx)-1], (int, float)) else ""
-                        else:
-                            value = float('-inf') if isinstance(item[abs(col_idx)-1], (int, float)) else ""
-                    if col_idx > 0:
-                        key_tuple_elements.append(value)
-                    elif col_idx < 0:
-                        if isinstance(value, (int, float)):
-                            key_tuple_elements.append(-value)
-                        elif isinstance(value, str):
-                            key_tuple_elements.append(ReverseComparableString(value))
-                        else:
-                            key_tuple_elements.append(value)
-            except Exception as exc:
-                logger.error(
-                    f"_sort_data dynamic_key() 에러: "
-                    f"item={item}, sort_columns={sort_columns}, "
-                    f"key_tuple_elements={key_tuple_elements}"
-                )
-                raise
-            return tuple(key_tuple_elements)
-        
+        if not sort_columns:
+            return list(data)
         try:
-            return sorted(data, key=dynamic_key)
-        except Exception as exc:
+            keys, descending = compile_sort_keys(data, sort_columns)
+        except IndexError:
+            logger = get_logger(__name__)
             logger.error(
-                f"_sort_data sorted() 에러: "
+                f"_sort_data 정렬 키 에러: "
                 f"data_length={len(data)}, sort_columns={sort_columns}, "
                 f"data_sample={data[:3] if data else 'empty'}\n{traceback.format_exc()}"
             )
             raise
+        return [data[i] for i in sort_order(keys, descending)]
 
     def _update_worksheet_data(self, ws, data: list[list]):
         """
@@ -841,20 +1084,16 @@ class ExcelHandler:
             ws: 워크시트
             data: 데이터
         """
-        font = Font(name='맑은 고딕', size=9)
-        empty_fill = PatternFill()
+        styles = self.styles(ws)
 
         # 정렬된 데이터 다시 삽입 및 기본 스타일 제거
         for row_idx, row_data in enumerate(data, start=2):
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_idx, column=col_idx,
-                               value=value if value or value == 0 else "")
-                cell.fill = empty_fill
-                cell.font = font
-                cell.alignment = Alignment(wrap_text=False)
-                cell.border = Border()
-            ws.row_dimensions[row_idx].height = 15
-            ws.sheet_view.showGridLines = True
+            styles.apply_cells(
+                (ws.cell(row=row_idx, column=col_idx, value=value if value or value == 0 else "")
+                 for col_idx, value in enumerate(row_data, start=1)),
+                "body_reset")
+        set_default_row_height(ws, min_row=2)
+        ws.sheet_view.showGridLines = True
 
     def _create_sheets(self, ws, headers: list, filtered_sheets: list[str]) -> dict:
         """
@@ -889,9 +1128,19 @@ class ExcelHandler:
             ws_map: 시트 매핑
             site_to_sheet: 사이트 매핑
         """
+        sheet_rows = self._group_rows_by_sheet(data, list(ws_map), site_to_sheet, site_col_idx)
+        for sheet_name, target_ws in ws_map.items():
+            self.write_rows(target_ws, sheet_rows[sheet_name])
+
+    def _group_rows_by_sheet(self, data: list[list], sheet_names: list[str], site_to_sheet: dict,
+                             site_col_idx: int = 2) -> dict[str, list[list]]:
+        """
+        사이트 컬럼의 [계정명] 으로 행을 시트별로 분류 (원래 순서 유지)
+        return:
+            {시트명: 행 목록}
+        """
         account_pattern = re.compile(r'^\[([^\]]+)\]')
-        empty_fill = PatternFill()
-        font = Font(name='맑은 고딕', size=9)
+        sheet_rows = {name: [] for name in sheet_names}
 
         for row in data:
             # 사이트 정보 추출
@@ -901,25 +1150,28 @@ class ExcelHandler:
             # 계정명 추출
             match = account_pattern.match(site_value)
             if match:
-                account_name = match.group(1)
-                target_sheet_name = site_to_sheet.get(account_name)
-
-                # 해당 시트에 즉시 데이터 삽입
-                if target_sheet_name and target_sheet_name in ws_map:
-                    target_ws = ws_map[target_sheet_name]
-
-                    # 다음 빈 행에 데이터 삽입 (max_row + 1)
-                    next_row = target_ws.max_row + 1
-
-                    # 행 데이터 삽입
-                    for col_idx, value in enumerate(row, start=1):
-                        cell = target_ws.cell(
-                            row=next_row, column=col_idx, value=value)
-                        cell.fill = empty_fill
-                        cell.font = font
-                        cell.alignment = Alignment(wrap_text=False)
-                    # 행 높이 설정
-                    target_ws.row_dimensions[next_row].height = 15
+                target_sheet_name = site_to_sheet.get(match.group(1))
+                if target_sheet_name in sheet_rows:
+                    sheet_rows[target_sheet_name].append(row)
+        return sheet_rows
+
+    def write_rows(self, ws, rows: list[list], start_row: int = 2):
+        """
+        행 목록을 본문 서식(body_row)으로 기록 후 시트 기본 행 높이 지정
+        args:
+            ws: 워크시트
+            rows: 행 목록
+            start_row: 시작 행
+        """
+        styles = self.styles(ws)
+        for row_idx, row in enumerate(rows, start=start_row):
+            styles.apply_cells(
+                (ws.cell(row=row_idx, column=col_idx, value=value)
+                 for col_idx, value in enumerate(row, start=1)),
+                "body_row")
+
+        # 행 높이 설정 (시트 기본 행 높이)
+        set_default_row_height(ws, min_row=2)
 
     def _copy_column_widths(self, wb):
         """
@@ -939,23 +1191,22 @@ class ExcelHandler:
                     src_width = source_ws.column_dimensions[col_letter].width
                     target_ws.column_dimensions[col_letter].width = src_width
 
-    def create_vlookup_dict(self, wb):
-        vlookup_dict = {}
-        for sheet in wb:
-            if sheet.title == "Sheet1":
-                for row in range(2, sheet.max_row + 1):
-                   vlookup_dict[str(sheet.cell(row=row, column=1).value)] = str(sheet.cell(row=row, column=2).value)
-                del wb[sheet.title]
+    @profile_step("VLOOKUP")
+    def create_vlookup_dict(self, wb, index: ProductLookupIndex | None = None) -> dict[str, str]:
+        """
+        Sheet1 탭(A: 상품 텍스트 → B: 값)의 VLOOKUP 매핑을 만든 뒤 탭 삭제
+        같은 내용의 Sheet1 이 이미 인덱스에 있으면 다시 병합하지 않음 (ProductLookupIndex.lookup)
+        args:
+            index: 조회/병합할 인덱스 (기본값: 프로세스 공용 인덱스)
+        return: {키: 값} (인덱스와 공유하므로 수정하지 않음, Sheet1 이 없으면 빈 딕셔너리)
+        예시:
+            vlookup_dict = ex.create_vlookup_dict(wb)
+            vlookup_dict.get("상품A 1개")
+        """
+        if "Sheet1" not in wb.sheetnames:
+            return {}
+        if index is None:
+            index = ProductLookupIndex.shared()
+        vlookup_dict = index.lookup(wb["Sheet1"])
+        del wb["Sheet1"]
         return vlookup_dict
-
-class ReverseComparableString:
-    def __init__(self, s):
-        self.s = s
-
-    # '작다' (<) 연산을 뒤집어 '크다' (>)로 동작하게 함
-    def __lt__(self, other):
-        return self.s > other.s
-
-    # '같다' (==) 연산은 그대로
-    def __eq__(self, other):
-        return self.s == other.s
\ No newline at end of file
@@ -9,6 +9,7 @@ from pathlib import Path
 from utils.logs.log_utils import write_log
 from typing import List, Dict, Any, Optional
 from utils.logs.sabangnet_logger import get_logger
+from utils.excels.parse_cache import ParseCache
 
 
 logger = get_logger(__name__)
@@ -39,8 +40,9 @@ class ProductRegistrationExcelProcessor:
             List[Dict]: 처리된 데이터 리스트
         """
         try:
-            # Excel 파일 읽기
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            # Excel 파일 읽기 (같은 내용의 파일은 파싱 캐시 사용)
+            df = ParseCache.shared().load(
+                file_path, f"df-{sheet_name}", lambda: pd.read_excel(file_path, sheet_name=sheet_name))
             
             # K(10)부터 AZ(51)까지의 컬럼 선택 (0-based index)
             # K=10, L=11, ..., AZ=51
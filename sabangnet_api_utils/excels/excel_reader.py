@@ -1,13 +1,145 @@
 from utils.sabangnet_path_utils import SabangNetPathUtils
+from utils.excels.parse_cache import ParseCache
+from utils.excels.csv_reader import CSV_DELIMITERS, read_csv_frame
+from bisect import bisect_left
 from pathlib import Path
 from typing import Optional
+import os
+import time
 
 import pandas as pd
 
 
+# 디렉토리 mtime 해상도(커널 타이머 단위) 고려: 스캔 직후 변경분을 놓치지 않도록 이 시간 동안은 매번 재스캔
+_MTIME_SETTLE_NS = 2_000_000_000
+
+
+class ExcelDirectoryIndex:
+    """
+    엑셀 디렉토리 파일 인덱스 (파일명 → 경로, 확장자 우선순위 순)
+    - 디렉토리 mtime 이 바뀐 경우에만 재스캔 (파일 추가 / 삭제 / 이름 변경 시 갱신)
+    - 정확히 일치 / 접두어 / 부분 문자열 검색을 디렉토리 순회 없이 처리
+    예시:
+        index = ExcelDirectoryIndex.of(SabangNetPathUtils.get_excel_file_path())
+        index.find("상품등록")          # 상품등록.xlsx → 상품등록.csv → ... → '상품등록' 포함 파일
+        index.prefix("ali_")           # 'ali_' 로 시작하는 파일들
+    """
+
+    _indexes: dict[Path, "ExcelDirectoryIndex"] = {}
+
+    @classmethod
+    def of(cls, directory: Path, extensions: list[str] | None = None) -> "ExcelDirectoryIndex":
+        """
+        디렉토리별 공용 인덱스
+        """
+        directory = Path(directory)
+        index = cls._indexes.get(directory)
+        if index is None:
+            index = cls._indexes[directory] = cls(directory, extensions or ExcelReader.SUPPORTED_EXTENSIONS)
+        return index
+
+    def __init__(self, directory: Path, extensions: list[str]):
+        self.directory = Path(directory)
+        self.extensions = extensions
+        self._mtime_ns: int | None = None
+        # 파일명 집합 (정확히 일치 확인용)
+        self._names: set[str] = set()
+        # (소문자 stem, 확장자 우선순위, 파일명) - stem 순 정렬 (접두어 검색용)
+        self._entries: list[tuple[str, int, str]] = []
+        self._stems: list[str] = []
+        # 부분 문자열 검색 결과 {소문자 검색어: [파일명, ...]}
+        self._search_cache: dict[str, list[str]] = {}
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        디렉토리가 바뀐 경우 재스캔
+        return: 재스캔 여부
+        """
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if not force and self._mtime_ns is not None and mtime_ns == self._mtime_ns:
+            return False
+
+        names = set()
+        entries = []
+        if mtime_ns is not None:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    stem, ext = os.path.splitext(entry.name)
+                    ext = ext.lower()
+                    if ext in self.extensions and entry.is_file():
+                        names.add(entry.name)
+                        entries.append((stem.lower(), self.extensions.index(ext), entry.name))
+        entries.sort()
+        self._names = names
+        self._entries = entries
+        self._stems = [entry[0] for entry in entries]
+        self._search_cache = {}
+        # 방금 바뀐 디렉토리는 같은 mtime 안에 추가 변경이 있을 수 있으므로 다음 조회 시 재확인
+        settled = mtime_ns is not None and time.time_ns() - mtime_ns > _MTIME_SETTLE_NS
+        self._mtime_ns = mtime_ns if settled else None
+        return True
+
+    def __contains__(self, file_name: str) -> bool:
+        self.refresh()
+        return file_name in self._names
+
+    def _paths(self, names) -> list[Path]:
+        return [self.directory / name for name in names]
+
+    @staticmethod
+    def _by_priority(entries) -> list[str]:
+        return [name for _, _, name in sorted(entries, key=lambda entry: (entry[1], entry[2]))]
+
+    def names(self) -> list[str]:
+        """
+        지원 확장자 파일명 전체 (이름순)
+        """
+        self.refresh()
+        return sorted(self._names)
+
+    def search(self, text: str) -> list[Path]:
+        """
+        stem 에 text 가 포함된 파일 (대소문자 무시, 확장자 우선순위 순)
+        """
+        self.refresh()
+        text = text.lower()
+        names = self._search_cache.get(text)
+        if names is None:
+            names = self._search_cache[text] = self._by_priority(
+                entry for entry in self._entries if text in entry[0])
+        return self._paths(names)
+
+    def prefix(self, text: str) -> list[Path]:
+        """
+        stem 이 text 로 시작하는 파일 (대소문자 무시, 확장자 우선순위 순)
+        """
+        self.refresh()
+        text = text.lower()
+        matched = []
+        for i in range(bisect_left(self._stems, text), len(self._entries)):
+            if not self._stems[i].startswith(text):
+                break
+            matched.append(self._entries[i])
+        return self._paths(self._by_priority(matched))
+
+    def find(self, base_name: str) -> Path | None:
+        """
+        stem 이 정확히 일치하는 파일 (확장자 우선순위 순) → 없으면 stem 에 포함된 첫 파일
+        """
+        self.refresh()
+        for extension in self.extensions:
+            if f"{base_name}{extension}" in self._names:
+                return self.directory / f"{base_name}{extension}"
+        similar = self.search(base_name)
+        return similar[0] if similar else None
+
+
 class ExcelReader:
     # 지원하는 파일 확장자들의 우선순위 (높은 순서부터)
-    SUPPORTED_EXTENSIONS = ['.xlsx', '.xlsm', '.xls', '.csv']
+    SUPPORTED_EXTENSIONS = ['.xlsx', '.xlsm', '.xls', '.csv', '.tsv']
     
     @staticmethod
     def read_excel_file(file_name: str, sheet_name: str) -> pd.DataFrame | str:
@@ -30,8 +162,11 @@ class ExcelReader:
         if not target_file_path.exists():
             raise FileNotFoundError(f"해당 파일을 찾을 수 없습니다. (파일명: {file_name})")
         
-        # 파일 확장자에 따라 적절한 pandas 함수 사용
-        df: pd.DataFrame = ExcelReader._read_file_by_extension(target_file_path, sheet_name)
+        # 파일 확장자에 따라 적절한 pandas 함수 사용 (같은 내용의 파일은 파싱 캐시 사용)
+        df: pd.DataFrame = ParseCache.shared().load(
+            target_file_path, f"df-{sheet_name}",
+            lambda: ExcelReader._read_file_by_extension(target_file_path, sheet_name),
+        )
         return df.fillna("")
     
     @staticmethod
@@ -50,20 +185,11 @@ class ExcelReader:
         if '.' in file_name and any(file_name.lower().endswith(ext) for ext in ExcelReader.SUPPORTED_EXTENSIONS):
             return directory / file_name
         
-        # 확장자가 없는 경우 - 폴더에서 해당 파일명을 가진 파일들을 찾기
+        # 확장자가 없는 경우 - 디렉토리 인덱스에서 해당 파일명 (없으면 유사한 파일) 찾기
         base_name = Path(file_name).stem  # 확장자 제거
-        
-        # 우선순위에 따라 파일 찾기
-        for extension in ExcelReader.SUPPORTED_EXTENSIONS:
-            candidate_file = directory / f"{base_name}{extension}"
-            if candidate_file.exists():
-                return candidate_file
-        
-        # 정확히 일치하는 파일이 없으면 유사한 파일들 찾기
-        similar_files = ExcelReader._find_similar_files(directory, base_name)
-        if similar_files:
-            # 첫 번째로 찾은 파일 반환 (우선순위 순서)
-            return similar_files[0]
+        target_file = ExcelDirectoryIndex.of(directory).find(base_name)
+        if target_file is not None:
+            return target_file
         
         # 아무것도 찾지 못한 경우 원래 파일명 반환 (에러 발생용)
         return directory / f"{base_name}.xlsx"
@@ -80,26 +206,7 @@ class ExcelReader:
         Returns:
             list[Path]: 찾은 파일들의 경로 리스트 (우선순위 순)
         """
-        if not directory.exists():
-            return []
-        
-        similar_files = []
-        
-        # 지원하는 확장자로 끝나는 모든 파일들 검사
-        for file_path in directory.iterdir():
-            if file_path.is_file():
-                file_stem = file_path.stem.lower()
-                file_ext = file_path.suffix.lower()
-                
-                if (file_ext in ExcelReader.SUPPORTED_EXTENSIONS and 
-                    base_name.lower() in file_stem):
-                    similar_files.append(file_path)
-        
-        # 확장자 우선순위에 따라 정렬
-        similar_files.sort(key=lambda x: ExcelReader.SUPPORTED_EXTENSIONS.index(x.suffix.lower()) 
-                          if x.suffix.lower() in ExcelReader.SUPPORTED_EXTENSIONS else 999)
-        
-        return similar_files
+        return ExcelDirectoryIndex.of(directory).search(base_name)
     
     @staticmethod
     def _read_file_by_extension(file_path: Path, sheet_name: str) -> pd.DataFrame:
@@ -117,8 +224,9 @@ class ExcelReader:
         
         if extension in ['.xlsx', '.xlsm', '.xls']:
             return pd.read_excel(file_path, sheet_name=sheet_name)
-        elif extension == '.csv':
-            return pd.read_csv(file_path, sheet_name=sheet_name, encoding='utf-8-sig')  # 한글 지원
+        elif extension in CSV_DELIMITERS:
+            # CSV / TSV 는 시트가 없으므로 sheet_name 무시 (인코딩 자동 판별)
+            return read_csv_frame(file_path)
         else:
             # 기본적으로 엑셀로 시도
             return pd.read_excel(file_path, sheet_name=sheet_name)
@@ -136,9 +244,4 @@ class ExcelReader:
         if not excel_directory.exists():
             return "엑셀 파일이 없습니다."
         
-        available_files = []
-        for file_path in excel_directory.iterdir():
-            if (file_path.is_file() and file_path.suffix.lower() in ExcelReader.SUPPORTED_EXTENSIONS):
-                available_files.append(file_path.name)
-        
-        return sorted(available_files)
\ No newline at end of file
+        return ExcelDirectoryIndex.of(excel_directory).names()
\ No newline at end of file
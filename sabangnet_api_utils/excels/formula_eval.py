@@ -0,0 +1,550 @@
+"""
+매크로 생성 수식 계산
+- openpyxl 은 수식 결과를 계산하지 않으므로 매크로가 기록하는 수식 범위만 파이썬에서 계산
+  (셀 참조, + - * /, 괄호, ROW(), SUM(범위), VLOOKUP(키, 표, 열, FALSE))
+- 같은 모양의 수식(예: =U2+V2, =U3+V3)은 행 상대 위치 기준으로 한 번만 파싱
+- 계산 결과는 값으로 바꾸거나(수식 제거), 저장된 xlsx 에 수식과 함께 캐시 값으로 기록
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from typing import Callable
+from xml.sax.saxutils import escape as xml_escape
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.escape import escape
+from openpyxl.xml.functions import fromstring
+
+
+class FormulaError(Exception):
+    """지원하지 않는 수식 / 순환 참조 (해당 셀은 수식 그대로 유지)"""
+
+
+class ExcelError(str):
+    """엑셀 오류 값 (#N/A, #VALUE!, #DIV/0! 등) - 연산 시 그대로 전파"""
+
+
+NA = ExcelError("#N/A")
+VALUE = ExcelError("#VALUE!")
+DIV0 = ExcelError("#DIV/0!")
+REF = ExcelError("#REF!")
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<num>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+)
+      | (?P<str>"(?:[^"]|"")*")
+      | (?P<func>[A-Za-z][A-Za-z0-9.]*)\s*\(
+      | (?P<bool>TRUE|FALSE)\b
+      | (?P<ref>
+            (?:(?P<sheet>'(?:[^']|'')+'|[^\s!:(),+\-*/&=<>"']+)!)?
+            (?P<c1>\$?[A-Za-z]{1,3})(?P<r1>\$?\d+)?
+            (?::(?P<c2>\$?[A-Za-z]{1,3})(?P<r2>\$?\d+)?)?
+        )
+      | (?P<op>[-+*/(),])
+    )""", re.X)
+
+_BOOLS = {"TRUE": True, "FALSE": False}
+
+
+def _is_formula(cell) -> bool:
+    value = cell._value
+    return cell.data_type == "f" and isinstance(value, str) and value.startswith("=")
+
+
+def _number(value):
+    """
+    산술 연산 피연산자 변환 (빈 셀 → 0, 숫자 문자열 → 숫자, 그 외 문자열 → #VALUE!)
+    """
+    if value is None:
+        return 0
+    if isinstance(value, ExcelError):
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return VALUE
+    return VALUE
+
+
+def _arith(op: str, left, right):
+    left, right = _number(left), _number(right)
+    for value in (left, right):
+        if isinstance(value, ExcelError):
+            return value
+    if op == "+":
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if right == 0:
+        return DIV0
+    return left / right
+
+
+class _Ref:
+    """
+    셀/범위 참조 (행은 수식이 있는 행 기준 상대 위치, $ 고정 시 절대 위치)
+    """
+    __slots__ = ("sheet", "c1", "r1", "c2", "r2", "abs1", "abs2")
+
+    def __init__(self, match, host_row: int):
+        self.sheet = match.group("sheet")
+        if self.sheet and self.sheet.startswith("'"):
+            self.sheet = self.sheet[1:-1].replace("''", "'")
+        self.c1 = column_index_from_string(match.group("c1").lstrip("$").upper())
+        self.r1, self.abs1 = self._row(match.group("r1"), host_row)
+        c2 = match.group("c2")
+        if c2 is None:
+            self.c2, self.r2, self.abs2 = self.c1, self.r1, self.abs1
+        else:
+            self.c2 = column_index_from_string(c2.lstrip("$").upper())
+            self.r2, self.abs2 = self._row(match.group("r2"), host_row)
+        # 전체 열 참조(A:B)는 열 범위로만 허용
+        if (self.r1 is None or self.r2 is None) and c2 is None:
+            raise FormulaError(f"지원하지 않는 참조: {match.group('ref')}")
+
+    @staticmethod
+    def _row(text: str | None, host_row: int):
+        if text is None:
+            return None, True
+        if text.startswith("$"):
+            return int(text[1:]), True
+        return int(text) - host_row, False
+
+    def key(self) -> tuple:
+        return ("ref", self.sheet, self.c1, self.r1, self.abs1, self.c2, self.r2, self.abs2)
+
+    def rows(self, host_row: int) -> tuple[int | None, int | None]:
+        r1 = self.r1 if self.abs1 or self.r1 is None else self.r1 + host_row
+        r2 = self.r2 if self.abs2 or self.r2 is None else self.r2 + host_row
+        return r1, r2
+
+    def label(self, host_row: int) -> str:
+        """
+        행 위치를 확정한 참조 문자열 (예: 'SHEET1!A:B', 'A2:C10')
+        """
+        r1, r2 = self.rows(host_row)
+        start = f"{get_column_letter(self.c1)}{r1 or ''}"
+        end = f"{get_column_letter(self.c2)}{r2 or ''}"
+        sheet = f"{self.sheet.upper()}!" if self.sheet else ""
+        return f"{sheet}{start}:{end}"
+
+    @property
+    def is_range(self) -> bool:
+        return (self.c1, self.r1, self.abs1) != (self.c2, self.r2, self.abs2)
+
+
+class FormulaEvaluator:
+    """
+    워크북 수식 계산기
+    args:
+        lookups: VLOOKUP 표 → 인메모리 딕셔너리 {표 참조 문자열: {str(키): 값 또는 (2열 값, 3열 값, ...)}}
+                 (미등록 표는 워크북 범위에서 첫 사용 시 한 번만 딕셔너리로 구성)
+    예시:
+        evaluator = FormulaEvaluator(wb, lookups={"SHEET1!A:B": {"상품A": "S01"}})
+        values = evaluator.evaluate(ws)   # {(행, 열): 계산 값}
+    """
+
+    def __init__(self, wb, lookups: dict[str, dict] | None = None):
+        self.wb = wb
+        self.lookups = {}
+        for ref_text, table in (lookups or {}).items():
+            self.add_lookup(ref_text, table)
+        self._compiled: dict[tuple, Callable] = {}
+        self._values: dict[tuple, object] = {}
+        self._pending: set[tuple] = set()
+
+    def add_lookup(self, ref_text: str, table: dict) -> None:
+        """
+        VLOOKUP 표 등록 (예: add_lookup("Sheet1!A:B", {"상품A": "S01"}))
+        """
+        match = _TOKEN_RE.fullmatch(ref_text.strip())
+        if match is None or match.group("ref") is None:
+            raise ValueError(f"표 참조 형식 오류: {ref_text}")
+        ref = _Ref(match, 0)
+        self.lookups[ref.label(0)] = {str(key): value for key, value in table.items()}
+
+    # 계산
+
+    def evaluate(self, ws) -> dict[tuple[int, int], object]:
+        """
+        시트의 모든 수식 셀 계산
+        return: {(행, 열): 계산 값} (지원하지 않는 수식은 제외)
+        """
+        results = {}
+        for (row, col), cell in list(ws._cells.items()):
+            if not _is_formula(cell):
+                continue
+            try:
+                results[(row, col)] = self.cell_value(ws, row, col)
+            except FormulaError:
+                continue
+        return results
+
+    def cell_value(self, ws, row: int, col: int):
+        """
+        셀 값 (수식이면 계산 결과, 결과는 캐시)
+        """
+        cell = ws._cells.get((row, col))
+        if cell is None:
+            return None
+        if cell.data_type == "e":
+            return ExcelError(cell._value)
+        if not _is_formula(cell):
+            return cell._value
+
+        key = (ws.title, row, col)
+        if key in self._values:
+            return self._values[key]
+        if key in self._pending:
+            raise FormulaError(f"순환 참조: {ws.title}!{get_column_letter(col)}{row}")
+        self._pending.add(key)
+        try:
+            value = self.compile(cell._value, row)(ws, row)
+        finally:
+            self._pending.discard(key)
+        self._values[key] = value
+        return value
+
+    # 파싱
+
+    def compile(self, formula: str, host_row: int) -> Callable:
+        """
+        수식 문자열 → 계산 함수 fn(ws, 행) (행 상대 위치가 같은 수식은 재사용)
+        """
+        tokens = self._tokenize(formula[1:], host_row)
+        key = tuple(tok.key() if isinstance(tok, _Ref) else tok for tok in tokens)
+        fn = self._compiled.get(key)
+        if fn is None:
+            parser = _Parser(self, tokens)
+            fn = parser.parse()
+            self._compiled[key] = fn
+        return fn
+
+    @staticmethod
+    def _tokenize(text: str, host_row: int) -> list:
+        tokens = []
+        pos = 0
+        end = len(text.rstrip())
+        while pos < end:
+            match = _TOKEN_RE.match(text, pos)
+            if match is None or match.end() == pos:
+                raise FormulaError(f"지원하지 않는 수식: ={text}")
+            pos = match.end()
+            if match.group("num") is not None:
+                num = match.group("num")
+                tokens.append(("num", float(num) if any(ch in num for ch in ".eE") else int(num)))
+            elif match.group("str") is not None:
+                tokens.append(("str", match.group("str")[1:-1].replace('""', '"')))
+            elif match.group("func") is not None:
+                tokens.append(("func", match.group("func").upper()))
+            elif match.group("bool") is not None:
+                tokens.append(("bool", _BOOLS[match.group("bool")]))
+            elif match.group("ref") is not None:
+                tokens.append(_Ref(match, host_row))
+            else:
+                tokens.append(("op", match.group("op")))
+        return tokens
+
+    # 참조 값
+
+    def _sheet(self, ws, ref: _Ref):
+        if ref.sheet is None:
+            return ws
+        for sheet in self.wb.worksheets:
+            if sheet.title.upper() == ref.sheet.upper():
+                return sheet
+        raise FormulaError(f"시트 없음: {ref.sheet}")
+
+    def ref_value(self, ws, row: int, ref: _Ref):
+        r1, _ = ref.rows(row)
+        return self.cell_value(self._sheet(ws, ref), r1, ref.c1)
+
+    def range_values(self, ws, row: int, ref: _Ref) -> list:
+        sheet = self._sheet(ws, ref)
+        r1, r2 = ref.rows(row)
+        r1 = r1 or 1
+        r2 = r2 or sheet.max_row
+        return [self.cell_value(sheet, r, c)
+                for r in range(r1, r2 + 1) for c in range(ref.c1, ref.c2 + 1)]
+
+    def lookup_table(self, ws, row: int, ref: _Ref) -> dict:
+        label = ref.label(row)
+        table = self.lookups.get(label)
+        if table is None:
+            sheet = self._sheet(ws, ref)
+            r1, r2 = ref.rows(row)
+            table = {}
+            for r in range(r1 or 1, (r2 or sheet.max_row) + 1):
+                key = self.cell_value(sheet, r, ref.c1)
+                if key is None:
+                    continue
+                table.setdefault(str(key), tuple(
+                    self.cell_value(sheet, r, c) for c in range(ref.c1 + 1, ref.c2 + 1)))
+            self.lookups[label] = table
+        return table
+
+
+class _Parser:
+    """
+    재귀 하강 파서 (우선순위: 단항 -, * /, + -)
+    """
+
+    def __init__(self, evaluator: FormulaEvaluator, tokens: list):
+        self.ev = evaluator
+        self.tokens = tokens
+        self.pos = 0
+
+    def parse(self) -> Callable:
+        fn = self._expr()
+        if self.pos != len(self.tokens):
+            raise FormulaError("수식 해석 실패")
+        return fn
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take_op(self, *ops):
+        tok = self._peek()
+        if isinstance(tok, tuple) and tok[0] == "op" and tok[1] in ops:
+            self.pos += 1
+            return tok[1]
+        return None
+
+    def _expect(self, op: str) -> None:
+        if self._take_op(op) is None:
+            raise FormulaError(f"'{op}' 누락")
+
+    def _expr(self) -> Callable:
+        left = self._term()
+        while (op := self._take_op("+", "-")) is not None:
+            left = self._binary(op, left, self._term())
+        return left
+
+    def _term(self) -> Callable:
+        left = self._unary()
+        while (op := self._take_op("*", "/")) is not None:
+            left = self._binary(op, left, self._unary())
+        return left
+
+    @staticmethod
+    def _binary(op: str, left: Callable, right: Callable) -> Callable:
+        return lambda ws, row: _arith(op, left(ws, row), right(ws, row))
+
+    def _unary(self) -> Callable:
+        op = self._take_op("-", "+")
+        if op is None:
+            return self._primary()
+        operand = self._unary()
+        if op == "+":
+            return operand
+        return lambda ws, row: _arith("-", 0, operand(ws, row))
+
+    def _primary(self) -> Callable:
+        tok = self._peek()
+        if tok is None:
+            raise FormulaError("수식이 끝남")
+        self.pos += 1
+        if isinstance(tok, _Ref):
+            if tok.is_range:
+                raise FormulaError("범위는 함수 인자로만 사용 가능")
+            ev = self.ev
+            return lambda ws, row: ev.ref_value(ws, row, tok)
+        kind, value = tok
+        if kind in ("num", "str", "bool"):
+            return lambda ws, row: value
+        if kind == "func":
+            return self._function(value)
+        if kind == "op" and value == "(":
+            inner = self._expr()
+            self._expect(")")
+            return inner
+        raise FormulaError(f"예상하지 못한 토큰: {value}")
+
+    def _args(self) -> list:
+        """
+        함수 인자 목록 (단독 참조는 _Ref 그대로, 나머지는 계산 함수)
+        """
+        args = []
+        if self._take_op(")") is not None:
+            return args
+        while True:
+            tok = self._peek()
+            nxt = self.tokens[self.pos + 1] if self.pos + 1 < len(self.tokens) else None
+            if isinstance(tok, _Ref) and nxt in (("op", ","), ("op", ")")):
+                self.pos += 1
+                args.append(tok)
+            else:
+                args.append(self._expr())
+            if self._take_op(")") is not None:
+                return args
+            self._expect(",")
+
+    def _scalar(self, arg) -> Callable:
+        """
+        함수 인자 → 값 계산 함수 (단일 셀 참조는 셀 값, 범위는 #VALUE!)
+        """
+        if not isinstance(arg, _Ref):
+            return arg
+        if arg.is_range:
+            return lambda ws, row: VALUE
+        ev = self.ev
+        return lambda ws, row: ev.ref_value(ws, row, arg)
+
+    def _function(self, name: str) -> Callable:
+        args = self._args()
+        ev = self.ev
+
+        if name == "ROW":
+            if not args:
+                return lambda ws, row: row
+            if len(args) == 1 and isinstance(args[0], _Ref):
+                ref = args[0]
+                return lambda ws, row: ref.rows(row)[0]
+            raise FormulaError("ROW 인자 오류")
+
+        if name == "SUM":
+            def _sum(ws, row):
+                total = 0
+                for arg in args:
+                    if isinstance(arg, _Ref):
+                        for value in ev.range_values(ws, row, arg):
+                            if isinstance(value, ExcelError):
+                                return value
+                            # 참조 셀의 문자열/논리값은 무시 (엑셀 SUM 과 동일)
+                            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                                total += value
+                    else:
+                        total = _arith("+", total, arg(ws, row))
+                        if isinstance(total, ExcelError):
+                            return total
+                return total
+            return _sum
+
+        if name == "VLOOKUP":
+            if len(args) != 4 or not isinstance(args[1], _Ref):
+                raise FormulaError("VLOOKUP 은 정확히 일치(FALSE) 형식만 지원")
+            key_fn, col_fn, exact_fn = self._scalar(args[0]), self._scalar(args[2]), self._scalar(args[3])
+            table_ref = args[1]
+
+            def _vlookup(ws, row):
+                if exact_fn(ws, row) not in (False, 0):
+                    raise FormulaError("VLOOKUP 근사 일치는 지원하지 않음")
+                key = key_fn(ws, row)
+                if isinstance(key, ExcelError):
+                    return key
+                col = _number(col_fn(ws, row))
+                if isinstance(col, ExcelError) or col < 1:
+                    return VALUE
+                col = int(col)
+                found = ev.lookup_table(ws, row, table_ref).get(str(key))
+                if found is None:
+                    return NA
+                if col == 1:
+                    return key
+                if not isinstance(found, (tuple, list)):
+                    return found if col == 2 else REF
+                return found[col - 2] if col - 2 < len(found) else REF
+            return _vlookup
+
+        raise FormulaError(f"지원하지 않는 함수: {name}")
+
+
+# 캐시 값 기록
+
+_FORMULA_CELL_RE = re.compile(
+    r'<c r="(?P<coord>[A-Z]+[0-9]+)"(?P<attrs>[^>]*)>(?P<f><f>[^<]*</f>)(?:<v\s*/>|<v></v>)?</c>'
+)
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _cached_value(value) -> tuple[str, str] | None:
+    """
+    계산 값 → (셀 타입 속성, <v> 내용)
+    """
+    if isinstance(value, ExcelError):
+        return ' t="e"', xml_escape(str(value))
+    if isinstance(value, bool):
+        return ' t="b"', "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return "", repr(value) if isinstance(value, float) else str(value)
+    if isinstance(value, str):
+        return ' t="str"', xml_escape(escape(value))
+    return None
+
+
+def _sheet_paths(archive: zipfile.ZipFile) -> dict[str, str]:
+    """
+    시트명 → 워크시트 XML 경로
+    """
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    rels = fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_PKG_REL_NS}Relationship")}
+    paths = {}
+    for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+        target = targets.get(sheet.get(f"{_REL_NS}id"), "")
+        target = target.lstrip("/")
+        paths[sheet.get("name")] = target if target.startswith("xl/") else f"xl/{target}"
+    return paths
+
+
+def write_cached_values(path: str, values_by_sheet: dict[str, dict[tuple[int, int], object]]) -> int:
+    """
+    저장된 xlsx 의 수식 셀에 계산 값(<v>) 기록 (엑셀 재계산 없이 값 확인/headless 읽기 가능)
+    args:
+        values_by_sheet: {시트명: {(행, 열): 값}} - FormulaEvaluator.evaluate() 결과
+    return: 기록한 셀 수
+    """
+    written = 0
+    with zipfile.ZipFile(path) as archive:
+        paths = _sheet_paths(archive)
+        replaced = {}
+        for title, values in values_by_sheet.items():
+            part = paths.get(title)
+            if part is None or not values:
+                continue
+            by_coord = {f"{get_column_letter(col)}{row}": value for (row, col), value in values.items()}
+
+            def _sub(match):
+                nonlocal written
+                cached = _cached_value(by_coord.get(match.group("coord")))
+                if cached is None:
+                    return match.group(0)
+                written += 1
+                type_attr, text = cached
+                attrs = re.sub(r'\s+t="[^"]*"', "", match.group("attrs"))
+                return f'<c r="{match.group("coord")}"{attrs}{type_attr}>{match.group("f")}<v>{text}</v></c>'
+
+            xml = archive.read(part).decode("utf-8")
+            replaced[part] = _FORMULA_CELL_RE.sub(_sub, xml).encode("utf-8")
+
+        if not replaced:
+            return 0
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(path)))
+        os.close(fd)
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+            for info in archive.infolist():
+                data = replaced.get(info.filename)
+                if data is None:
+                    with archive.open(info) as src, out.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst)
+                else:
+                    out.writestr(info, data)
+    os.replace(tmp_path, path)
+    return written
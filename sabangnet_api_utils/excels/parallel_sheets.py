@@ -0,0 +1,169 @@
+"""
+분리 시트 병렬 생성/서식 처리
+- 계정 시트(OK, IY, BB 등)별로 워커 프로세스에서 시트 생성 → 행 기록 → 서식 적용
+- 워커는 셀 값과 서식 테이블(고유 스타일 목록)만 반환하고 메인 프로세스가 최종 워크북에 조립
+- 메인 프로세스는 워커 실행 중 자동화 시트 서식을 병행 처리
+"""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import copy
+from typing import Callable
+
+import openpyxl
+
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def build_sheet(title: str, headers: list, rows: list[list], formatter: Callable) -> dict:
+    """
+    워커 프로세스: 시트 생성 및 서식 적용 후 export_sheet() 결과 반환
+    args:
+        formatter: formatter(ex, ws) - 피클 가능한 호출 객체 (예: 매크로의 format_split_sheet)
+    """
+    from utils.excels.excel_handler import ExcelHandler
+
+    started = time.perf_counter()
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = title
+    for col, header in enumerate(headers, start=1):
+        ws.cell(row=1, column=col, value=header)
+    ex = ExcelHandler(ws, wb)
+    ex.write_rows(ws, rows)
+    formatter(ex, ws)
+    ex.flush_columnar()
+    payload = export_sheet(ws)
+    payload["seconds"] = time.perf_counter() - started
+    return payload
+
+
+def export_sheet(ws) -> dict:
+    """
+    워크시트 → 피클 가능한 dict
+    - cells: [(행, 열, 값, 스타일 번호)] (스타일 없음: -1)
+    - styles: [(font, fill, border, alignment, number_format, protection)]
+    """
+    wb = ws.parent
+    style_index: dict[tuple, int] = {}
+    styles = []
+    cells = []
+    for (row, col), cell in ws._cells.items():
+        idx = -1
+        if cell.has_style:
+            key = tuple(cell._style)
+            idx = style_index.get(key)
+            if idx is None:
+                idx = style_index[key] = len(styles)
+                array = cell._style
+                styles.append((
+                    wb._fonts[array.fontId], wb._fills[array.fillId], wb._borders[array.borderId],
+                    wb._alignments[array.alignmentId], cell.number_format,
+                    wb._protections[array.protectionId],
+                ))
+        cells.append((row, col, cell.value, idx))
+    return {
+        "title": ws.title,
+        "cells": cells,
+        "styles": styles,
+        "row_heights": {idx: dim.height for idx, dim in ws.row_dimensions.items() if dim.height is not None},
+        "column_widths": {letter: dim.width for letter, dim in ws.column_dimensions.items()
+                          if dim.customWidth},
+        "sheet_format": copy(ws.sheet_format),
+        "freeze_panes": ws.freeze_panes,
+        "auto_filter": ws.auto_filter.ref,
+    }
+
+
+def import_sheet(ws, payload: dict) -> None:
+    """
+    export_sheet() 결과를 워크시트에 기록
+    고유 스타일마다 첫 셀에만 서식 객체를 대입하고 이후 셀은 스타일 ID 복사
+    """
+    arrays: dict[int, object] = {}
+    for row, col, value, idx in payload["cells"]:
+        cell = ws.cell(row=row, column=col, value=value)
+        if idx < 0:
+            continue
+        array = arrays.get(idx)
+        if array is None:
+            font, fill, border, alignment, number_format, protection = payload["styles"][idx]
+            cell.font = font
+            cell.fill = fill
+            cell.border = border
+            cell.alignment = alignment
+            cell.number_format = number_format
+            cell.protection = protection
+            arrays[idx] = copy(cell._style)
+        else:
+            cell._style = copy(array)
+
+    for idx, height in payload["row_heights"].items():
+        ws.row_dimensions[idx].height = height
+    for letter, width in payload["column_widths"].items():
+        ws.column_dimensions[letter].width = width
+    ws.sheet_format = copy(payload["sheet_format"])
+    if payload["freeze_panes"]:
+        ws.freeze_panes = payload["freeze_panes"]
+    if payload["auto_filter"]:
+        ws.auto_filter.ref = payload["auto_filter"]
+
+
+class PendingSheets:
+    """
+    워커에서 처리 중인 시트 목록
+    예시:
+        pending = submit_sheets(wb, headers, {"OK": ok_rows, "IY": iy_rows}, macro.format_split_sheet)
+        ...                              # 메인 프로세스 작업 (자동화 시트 서식 등)
+        pending.result()                 # 워커 결과를 워크북에 반영
+    """
+
+    def __init__(self, wb, futures: dict[str, Future], executor: ProcessPoolExecutor | None):
+        self.wb = wb
+        self.futures = futures
+        self.executor = executor
+
+    @property
+    def titles(self) -> set[str]:
+        return set(self.futures)
+
+    def result(self) -> None:
+        try:
+            for title, future in self.futures.items():
+                payload = future.result()
+                started = time.perf_counter()
+                import_sheet(self.wb[title], payload)
+                logger.info(f"[{title}] 워커 처리 {payload['seconds']:.3f}s, "
+                            f"조립 {time.perf_counter() - started:.3f}s ({len(payload['cells']):,}셀)")
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+            self.futures = {}
+
+
+def submit_sheets(
+    wb,
+    headers: list,
+    sheet_rows: dict[str, list[list]],
+    formatter: Callable,
+    max_workers: int | None = None,
+) -> PendingSheets:
+    """
+    시트별 build_sheet() 를 프로세스 풀에 제출
+    args:
+        sheet_rows: {시트명: 행 목록} - 시트는 wb 에 미리 생성되어 있어야 함
+        max_workers: 워커 수 (기본값: min(시트 수, CPU 수))
+    """
+    if not sheet_rows:
+        return PendingSheets(wb, {}, None)
+    workers = max_workers or min(len(sheet_rows), os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = {
+        title: executor.submit(build_sheet, title, headers, rows, formatter)
+        for title, rows in sheet_rows.items()
+    }
+    return PendingSheets(wb, futures, executor)
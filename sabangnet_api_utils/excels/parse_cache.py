@@ -0,0 +1,297 @@
+"""
+업로드 파일 파싱 결과 캐시 (파일 내용 해시 기준, 기본값 미사용 - 환경 변수로 설정 시에만 사용)
+- 키: 파일 내용 SHA-256 (BatchProcess.file_hash 와 동일 값) → files/cache/<sha256>/<항목>.pkl
+- 항목: 값 전용 결과 (read-only 로드 시트 행, pandas DataFrame 등) - 서식 포함 openpyxl 워크북은 캐시하지 않음
+- 같은 파일을 다시 올리면(실패 후 재실행 등) openpyxl / pandas 파싱 없이 캐시에서 로드
+- 항목은 HMAC-SHA256 서명 후 기록, 서명이 맞는 항목만 unpickle (변조 / 다른 키로 기록된 항목은 삭제)
+  서명 키: 환경 변수 SABANGNET_PARSE_CACHE_SECRET (미설정 시 캐시 디렉토리의 .secret 파일, 권한 600)
+- 용량 상한 초과 시 가장 오래 사용되지 않은 파일(해시 디렉토리)부터 삭제
+  사용량은 프로세스 내 인덱스로 추적 (디렉토리 스캔은 첫 사용 시 / 상한 초과 시에만)
+- 용량 상한: 인자 max_mb 또는 환경 변수 SABANGNET_PARSE_CACHE_MB (기본값 0 = 캐시 미사용)
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import secrets
+import shutil
+import time
+from pathlib import Path
+from typing import Callable
+
+from utils.sabangnet_path_utils import SabangNetPathUtils
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+CACHE_ENV = "SABANGNET_PARSE_CACHE_MB"
+SECRET_ENV = "SABANGNET_PARSE_CACHE_SECRET"
+DEFAULT_CACHE_MB = 0
+
+# 캐시 형식 버전 (항목 구조가 바뀌면 올려서 이전 캐시 무시)
+CACHE_FORMAT = 2
+
+_HASH_BLOCK = 1024 * 1024
+_SECRET_FILE = ".secret"
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def file_hash(file_path) -> str:
+    """
+    파일 내용 SHA-256 (16진수 64자)
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CacheIntegrityError(ValueError):
+    """캐시 항목 서명 불일치 (변조 또는 다른 키로 기록된 항목)"""
+
+
+class ParseCache:
+    """
+    예시:
+        cache = ParseCache.shared()             # SABANGNET_PARSE_CACHE_MB=1024 설정 시 사용
+        df = cache.load(file_path, "df-Sheet1", lambda: pd.read_excel(file_path, sheet_name="Sheet1"))
+
+        # 해시를 이미 알고 있는 경우 (BatchProcess.file_hash)
+        df = cache.get(batch.file_hash, "df-Sheet1")
+    """
+
+    _shared: "ParseCache | None" = None
+
+    @classmethod
+    def shared(cls) -> "ParseCache":
+        """
+        프로세스 공용 캐시 (files/cache)
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, root: str | Path | None = None, max_mb: float | None = None):
+        if max_mb is None:
+            max_mb = float(os.environ.get(CACHE_ENV) or DEFAULT_CACHE_MB)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._root = Path(root) if root is not None else None
+        self._secret: bytes | None = None
+        # 사용량 인덱스 {해시: [크기 합계, 최근 사용 시각]} (첫 사용 시 디렉토리 스캔으로 구성)
+        self._index: dict[str, list] | None = None
+        self._total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def root(self) -> Path:
+        if self._root is None:
+            self._root = SabangNetPathUtils.get_cache_file_path()
+        return self._root
+
+    def _entry_path(self, key: str, name: str) -> Path:
+        return self.root / key / f"{name}.v{CACHE_FORMAT}.pkl"
+
+    @property
+    def secret(self) -> bytes:
+        """
+        HMAC 서명 키 (환경 변수 우선, 없으면 캐시 디렉토리 .secret 파일 - 최초 사용 시 생성)
+        """
+        if self._secret is None:
+            env = os.environ.get(SECRET_ENV)
+            self._secret = env.encode("utf-8") if env else self._file_secret()
+        return self._secret
+
+    def _file_secret(self) -> bytes:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / _SECRET_FILE
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # 다른 프로세스가 생성 중이면 기록이 끝날 때까지 대기
+            for _ in range(50):
+                secret = path.read_bytes()
+                if secret:
+                    return secret
+                time.sleep(0.01)
+            raise RuntimeError(f"파싱 캐시 서명 키 파일이 비어 있음: {path}")
+        secret = secrets.token_bytes(32)
+        with os.fdopen(fd, "wb") as f:
+            f.write(secret)
+        return secret
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self.secret, payload, hashlib.sha256).digest()
+
+    def _read(self, path: Path):
+        """
+        서명 확인 후 unpickle (서명 불일치 시 CacheIntegrityError, unpickle 하지 않음)
+        """
+        data = path.read_bytes()
+        signature, payload = data[:_DIGEST_SIZE], data[_DIGEST_SIZE:]
+        if len(signature) != _DIGEST_SIZE or not hmac.compare_digest(signature, self._sign(payload)):
+            raise CacheIntegrityError("서명 불일치")
+        return pickle.loads(payload)
+
+    def get(self, key: str, name: str):
+        """
+        캐시 항목 로드 (없거나 읽기 실패 시 None)
+        """
+        if not self.enabled:
+            return None
+        path = self._entry_path(key, name)
+        try:
+            value = self._read(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 변조 / 기록 중단 / 라이브러리 버전 변경 등으로 깨진 항목은 삭제 후 재파싱
+            logger.warning(f"파싱 캐시 로드 실패, 항목 삭제: {path.name} ({e})")
+            self._remove_file(key, path)
+            return None
+        # 최근 사용 시각 갱신 (LRU 삭제 기준)
+        try:
+            os.utime(path.parent)
+        except OSError:
+            pass
+        entry = self._usage_index().get(key)
+        if entry is not None:
+            entry[1] = time.time()
+        return value
+
+    def put(self, key: str, name: str, value) -> None:
+        """
+        캐시 항목 기록 (임시 파일에 기록 후 교체) 후 용량 상한 적용
+        기록 실패는 경고만 남기고 무시 (캐시는 원본 파싱의 대체 경로일 뿐)
+        """
+        if not self.enabled:
+            return
+        # 인덱스는 기록 전에 구성 (기록할 항목이 스캔에 중복 포함되지 않도록)
+        self._usage_index()
+        path = self._entry_path(key, name)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            signature = self._sign(payload)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            with open(tmp_path, "wb") as f:
+                f.write(signature)
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"파싱 캐시 기록 실패: {path.name} ({e})")
+            return
+        self._track(key, len(signature) + len(payload) - previous)
+        if self._total > self.max_bytes:
+            self.evict(keep=key)
+
+    def load(self, file_path, name: str, loader: Callable, key: str | None = None):
+        """
+        캐시 항목이 있으면 로드, 없으면 loader() 로 파싱 후 기록
+        args:
+            file_path: 원본 파일 경로
+            name: 항목 이름 (읽는 방식별, 예: "workbook", "values", "df-Sheet1")
+            loader: 캐시 미적중 시 호출할 파싱 함수
+            key: 파일 해시 (없으면 파일 내용으로 계산)
+        """
+        if not self.enabled:
+            return loader()
+        key = key or file_hash(file_path)
+        value = self.get(key, name)
+        if value is not None:
+            logger.info(f"[{os.path.basename(str(file_path))}] 파싱 캐시 사용: {name} ({key[:12]})")
+            return value
+        value = loader()
+        self.put(key, name, value)
+        return value
+
+    def _scan(self) -> dict[str, list]:
+        """
+        해시 디렉토리별 [크기, 최근 사용 시각] (다른 프로세스가 기록한 항목 포함)
+        """
+        index = {}
+        if not self.root.is_dir():
+            return index
+        for entry in os.scandir(self.root):
+            if not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                index[entry.name] = [size, entry.stat().st_mtime]
+            except FileNotFoundError:
+                # 다른 프로세스에서 삭제 중인 항목
+                continue
+        return index
+
+    def _usage_index(self) -> dict[str, list]:
+        if self._index is None:
+            self._reindex()
+        return self._index
+
+    def _reindex(self) -> None:
+        self._index = self._scan()
+        self._total = sum(size for size, _ in self._index.values())
+
+    def _track(self, key: str, size_delta: int) -> None:
+        entry = self._usage_index().setdefault(key, [0, 0.0])
+        entry[0] += size_delta
+        entry[1] = time.time()
+        self._total += size_delta
+
+    def _remove_file(self, key: str, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        if self._index is not None and key in self._index:
+            self._track(key, -size)
+
+    @property
+    def usage_bytes(self) -> int:
+        """
+        인덱스 기준 사용량 (byte)
+        """
+        self._usage_index()
+        return self._total
+
+    def evict(self, keep: str | None = None) -> int:
+        """
+        용량 상한을 넘으면 가장 오래 사용되지 않은 해시 디렉토리부터 삭제
+        args:
+            keep: 삭제하지 않을 해시 (방금 기록한 파일)
+        return: 삭제한 디렉토리 수
+        """
+        # 상한 초과 시에만 디렉토리를 다시 읽어 다른 프로세스의 기록 / 삭제 반영
+        self._reindex()
+        removed = 0
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            del self._index[key]
+            self._total -= size
+            removed += 1
+        if removed:
+            logger.info(f"파싱 캐시 정리: {removed}건 삭제 (사용량 {self._total / (1024 * 1024):.1f}MB)")
+        return removed
+
+    def clear(self) -> None:
+        """
+        캐시 전체 삭제
+        """
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+        self._index = {}
+        self._total = 0
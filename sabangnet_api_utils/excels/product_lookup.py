@@ -0,0 +1,244 @@
+"""
+상품 VLOOKUP 인덱스
+- 파일별 매핑: Sheet1(A: 상품 텍스트 → B: 값) 탭 내용 해시(sheet_digest) → {키: 값}
+  같은 내용의 Sheet1 은 한 번만 병합(merge_sheet)하고 이후 실행은 해시로 찾은 매핑 사용 (탭 재병합 없음)
+  다른 파일의 키는 섞이지 않음 (매핑은 Sheet1 내용 단위)
+- 프로세스 공용 인덱스(shared): 매핑 LRU (전체 키 수 max_entries 초과 시 가장 오래 조회되지 않은 매핑부터 제거)
+- DB(product_lookup_sheet / product_lookup): 병합된 매핑을 해시 단위로 저장, 등록 버전 기준으로 미러링
+  API 프로세스: 매크로 실행 후 sync_file_lookups 로 처음 보는 Sheet1 만 기록, refresh 로 다른 프로세스 등록분 반영
+  매크로 워커 프로세스: 풀 시작 시 API 프로세스 인덱스의 매핑을 받아 시작 (seed_shared)
+"""
+
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+import openpyxl
+
+from utils.excels.csv_reader import is_csv_file
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# 인덱스 최대 키 수 (모든 매핑 합계)
+MAX_ENTRIES = 200_000
+
+
+LOOKUP_SHEET = "Sheet1"
+
+
+def sheet_items(ws) -> Iterator[tuple[str, str]]:
+    """
+    Sheet1 탭 A:B 항목 (2행부터, 키 또는 값이 빈 행 제외, 문자열로 변환)
+    """
+    for key, value in ws.iter_rows(min_row=2, max_col=2, values_only=True):
+        if key is not None and value is not None:
+            yield str(key), str(value)
+
+
+def sheet_digest(items: Iterable[tuple[str, str]]) -> str:
+    """
+    Sheet1 항목 내용 해시 (SHA-256, 항목 순서 포함)
+    예시:
+        sheet_digest(sheet_items(wb["Sheet1"]))
+    """
+    digest = hashlib.sha256()
+    for key, value in items:
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class ProductLookupIndex:
+    """
+    예시:
+        # 매크로: 파일의 Sheet1 매핑 (처음 보는 내용만 병합)
+        lookup = ProductLookupIndex.shared().lookup(wb["Sheet1"])
+        lookup.get("상품A 1개")                   # 'S0001'
+
+        # API 프로세스: DB 동기화
+        index = ProductLookupIndex.shared()
+        await index.refresh(session)             # 다른 프로세스가 등록한 해시 반영
+        index.add(digest, mapping)               # 처음 보는 매핑 → 미반영 목록
+        await index.flush(session, "주문.xlsx")   # 미반영 매핑 DB 기록
+    """
+
+    _shared: "ProductLookupIndex | None" = None
+
+    @classmethod
+    def shared(cls) -> "ProductLookupIndex":
+        """
+        프로세스 공용 인덱스
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        # {해시: {키: 값}} - 최근 조회 순
+        self._sheets: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._entries = 0
+        # DB 에 등록된 해시 {해시: 등록 버전} (매핑은 필요할 때 load 로 조회)
+        self.known: dict[str, int] = {}
+        # 동기화된 DB 버전
+        self.version = 0
+        # DB 미반영 매핑 {해시: {키: 값}}
+        self.pending: dict[str, dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        """메모리에 있는 전체 키 수"""
+        return self._entries
+
+    def __contains__(self, digest) -> bool:
+        return digest in self._sheets
+
+    def get(self, digest: str) -> dict[str, str] | None:
+        """
+        해시의 매핑 (메모리에 없으면 None, 조회 시 최근 사용으로 이동)
+        """
+        mapping = self._sheets.get(digest)
+        if mapping is not None:
+            self._sheets.move_to_end(digest)
+        return mapping
+
+    def add(self, digest: str, mapping: dict[str, str], pending: bool = True) -> None:
+        """
+        매핑 추가 (pending: DB 에 없는 매핑이면 미반영 목록에 추가)
+        """
+        if digest in self._sheets:
+            self._entries -= len(self._sheets.pop(digest))
+        self._sheets[digest] = mapping
+        self._entries += len(mapping)
+        if pending and digest not in self.known:
+            self.pending[digest] = mapping
+        # 방금 추가한 매핑은 남기고 오래된 매핑부터 제거
+        while self._entries > self.max_entries and len(self._sheets) > 1:
+            _, evicted = self._sheets.popitem(last=False)
+            self._entries -= len(evicted)
+
+    def merge_sheet(self, ws, digest: str | None = None) -> dict[str, str]:
+        """
+        Sheet1 탭 A:B 를 읽어 매핑 생성 후 추가 (같은 키가 여러 행이면 마지막 행 값)
+        DB 기록은 API 프로세스의 sync_file_lookups 에서 (워커 프로세스는 미반영 목록을 쌓지 않음)
+        """
+        mapping = dict(sheet_items(ws))
+        if digest is None:
+            digest = sheet_digest(sheet_items(ws))
+        self.add(digest, mapping, pending=False)
+        logger.info(f"[{ws.title}] VLOOKUP 인덱스 병합: {len(mapping)}건 (전체 {self._entries}건)")
+        return mapping
+
+    def lookup(self, ws) -> dict[str, str]:
+        """
+        Sheet1 탭의 매핑 - 같은 내용이 이미 인덱스에 있으면 병합 없이 반환, 처음 보는 내용만 병합
+        반환 매핑은 인덱스와 공유하므로 수정하지 않음
+        """
+        digest = sheet_digest(sheet_items(ws))
+        mapping = self.get(digest)
+        if mapping is not None:
+            logger.info(f"[{ws.title}] VLOOKUP 인덱스 사용: {len(mapping)}건 ({digest[:12]})")
+            return mapping
+        return self.merge_sheet(ws, digest)
+
+    def snapshot(self) -> list[tuple[str, dict[str, str]]]:
+        """
+        메모리의 매핑 목록 (워커 프로세스 seed_shared 인자)
+        """
+        return list(self._sheets.items())
+
+    async def refresh(self, session) -> int:
+        """
+        DB 에서 현재 버전 이후 등록된 해시 반영 (매핑은 load 시 조회)
+        return: 반영된 해시 수
+        """
+        from repository.product_lookup_repository import ProductLookupRepository
+
+        sheets = await ProductLookupRepository(session).get_sheets_since(self.version)
+        for digest, version in sheets:
+            self.known[digest] = version
+            self.pending.pop(digest, None)
+            self.version = max(self.version, version)
+        return len(sheets)
+
+    async def load(self, session, digest: str) -> dict[str, str] | None:
+        """
+        해시의 매핑 (메모리에 없고 DB 에 등록된 해시면 DB 에서 조회, 없으면 None)
+        """
+        from repository.product_lookup_repository import ProductLookupRepository
+
+        mapping = self.get(digest)
+        if mapping is None and digest in self.known:
+            mapping = await ProductLookupRepository(session).get_sheet_entries(digest)
+            self.add(digest, mapping, pending=False)
+        return mapping
+
+    async def flush(self, session, source_file: str | None = None) -> int:
+        """
+        미반영 매핑을 DB 에 기록 후 DB 등록분 재동기화
+        return: 동기화된 DB 버전
+        """
+        from repository.product_lookup_repository import ProductLookupRepository
+
+        # 기록 중(await) 다른 코루틴이 추가한 매핑은 다음 flush 대상으로 유지
+        pending, self.pending = self.pending, {}
+        repo = ProductLookupRepository(session)
+        try:
+            for digest, mapping in pending.items():
+                self.known[digest] = await repo.add_sheet(digest, mapping, source_file)
+        except Exception:
+            self.pending = {**{d: m for d, m in pending.items() if d not in self.known}, **self.pending}
+            raise
+        # 다른 프로세스의 등록분 포함하여 현재 버전 이후 반영
+        await self.refresh(session)
+        return self.version
+
+
+def seed_shared(items: list[tuple[str, dict[str, str]]]) -> None:
+    """
+    워커 프로세스 초기화 - API 프로세스 인덱스의 매핑으로 공용 인덱스 시작 (ProcessPoolExecutor initializer)
+    """
+    index = ProductLookupIndex.shared()
+    for digest, mapping in items:
+        index.add(digest, mapping, pending=False)
+
+
+def read_lookup_sheet(file_path: str) -> list[tuple[str, str]]:
+    """
+    파일의 Sheet1 탭 (A, B) 항목 (읽기 전용 로드, CSV 이거나 탭이 없으면 빈 목록)
+    """
+    if is_csv_file(file_path):
+        return []
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        if LOOKUP_SHEET not in wb.sheetnames:
+            return []
+        return list(sheet_items(wb[LOOKUP_SHEET]))
+    finally:
+        wb.close()
+
+
+async def sync_file_lookups(session, file_path: str) -> int:
+    """
+    업로드 파일의 Sheet1 매핑을 DB VLOOKUP 인덱스에 기록 (매크로 실행 후 API 프로세스에서 호출)
+    - 같은 내용(해시)이 이미 등록되어 있으면 기록하지 않음
+    - 매핑은 이 프로세스 인덱스에도 추가 (이후 시작하는 매크로 워커에 전달)
+    return: 동기화된 DB 버전
+    """
+    items = await asyncio.to_thread(read_lookup_sheet, file_path)
+    index = ProductLookupIndex.shared()
+    await index.refresh(session)
+    if not items:
+        return index.version
+    digest = sheet_digest(items)
+    if digest not in index:
+        index.add(digest, dict(items))
+    if not index.pending:
+        return index.version
+    return await index.flush(session, os.path.basename(file_path))
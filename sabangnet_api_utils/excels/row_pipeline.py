@@ -0,0 +1,122 @@
+"""
+행 규칙 파이프라인
+- 매크로가 열 단위 규칙(rule)을 등록하면 한 번의 행 순회로 모든 규칙을 순서대로 적용
+- 시트 조건(sheets)으로 시트별 규칙을 같은 순회 안에서 분기
+- 열 규칙(add_column)은 행 순회 후 열 전체를 한 번에 변환 (column_rules 참고)
+- 규칙별 누적 실행 시간/호출 수를 기록하여 병목 규칙 확인
+- 워크북 프로파일링(SABANGNET_PROFILE) 시 run 1회를 파이프라인 이름의 단계로 기록
+"""
+
+import time
+from typing import Callable
+
+from utils.profiling import profiled
+from utils.excels.column_rules import transform_column
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class RowRule:
+    """
+    행 규칙
+    args:
+        name: 규칙 이름 (타이밍 리포트 표시용)
+        func: func(ws, row) - ws 는 openpyxl 워크시트 또는 ColumnarSheet
+        sheets: 적용 대상 판단 함수 sheets(ws) -> bool (None 이면 모든 시트)
+        column: 열 규칙 대상 열 문자 (None 이면 행 규칙)
+    """
+    __slots__ = ("name", "func", "sheets", "column", "seconds", "calls")
+
+    def __init__(self, name: str, func: Callable, sheets: Callable | None = None,
+                 column: str | None = None):
+        self.name = name
+        self.func = func
+        self.sheets = sheets
+        self.column = column
+        self.seconds = 0.0
+        self.calls = 0
+
+
+class RowPipeline:
+    """
+    예시:
+        pre = RowPipeline("알리 ERP 전처리")
+        pre.add("F<-Z", lambda ws, row: ...)
+        pre.add("D=U+V", lambda ws, row: ...)
+        pre.add_column("P 정수", "P", convert_int_values)
+        pre.run(ws)                  # 2행~마지막 행 1회 순회 후 P열 일괄 변환
+        pre.log_timings()
+    """
+
+    def __init__(self, name: str, timing: bool = True):
+        self.name = name
+        self.timing = timing
+        self.rules: list[RowRule] = []
+
+    def add(self, name: str, func: Callable, sheets: Callable | None = None) -> "RowPipeline":
+        self.rules.append(RowRule(name, func, sheets))
+        return self
+
+    def add_column(self, name: str, column: str, func: Callable,
+                   sheets: Callable | None = None) -> "RowPipeline":
+        """
+        열 규칙 등록 - func(values) -> values 또는 (values, number_formats)
+        행 규칙 순회가 끝난 뒤 등록 순서대로 열 전체에 한 번 적용
+        """
+        self.rules.append(RowRule(name, func, sheets, column))
+        return self
+
+    def run(self, ws, start_row: int = 2, end_row: int | None = None, reverse: bool = False) -> None:
+        """
+        ws 의 start_row ~ end_row 를 한 번 순회하며 적용 대상 행 규칙을 등록 순서대로 실행한 뒤 열 규칙 적용
+        args:
+            reverse: True 면 마지막 행부터 역순 순회
+        """
+        # 워크북 프로파일링 중이면 파이프라인 이름으로 단계 기록
+        with profiled(self.name, ws):
+            self._run(ws, start_row, end_row, reverse)
+
+    def _run(self, ws, start_row: int, end_row: int | None, reverse: bool) -> None:
+        if end_row is None:
+            end_row = ws.max_row
+        targets = [rule for rule in self.rules if rule.sheets is None or rule.sheets(ws)]
+        rules = [rule for rule in targets if rule.column is None]
+        col_rules = [rule for rule in targets if rule.column is not None]
+        rows = range(end_row, start_row - 1, -1) if reverse else range(start_row, end_row + 1)
+        perf_counter = time.perf_counter
+
+        if rules and not self.timing:
+            funcs = [rule.func for rule in rules]
+            for row in rows:
+                for func in funcs:
+                    func(ws, row)
+        elif rules:
+            for row in rows:
+                for rule in rules:
+                    started = perf_counter()
+                    rule.func(ws, row)
+                    rule.seconds += perf_counter() - started
+            for rule in rules:
+                rule.calls += len(rows)
+
+        for rule in col_rules:
+            started = perf_counter()
+            transform_column(ws, rule.column, rule.func, start_row, end_row)
+            rule.seconds += perf_counter() - started
+            rule.calls += len(rows)
+
+    def timings(self) -> list[tuple[str, float, int]]:
+        """
+        규칙별 (이름, 누적 초, 호출 수) - 누적 시간 내림차순
+        """
+        return sorted(((rule.name, rule.seconds, rule.calls) for rule in self.rules),
+                      key=lambda item: item[1], reverse=True)
+
+    def log_timings(self) -> None:
+        total = sum(rule.seconds for rule in self.rules)
+        lines = [f"[{self.name}] 규칙별 실행 시간 (합계 {total:.3f}s)"]
+        for name, seconds, calls in self.timings():
+            lines.append(f"  {name:<20} {seconds:8.3f}s  {calls:>8}회")
+        logger.info("\n".join(lines))
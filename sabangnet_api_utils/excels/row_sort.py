@@ -0,0 +1,252 @@
+"""
+행 정렬 공용 처리
+- 정렬 키를 열 단위로 한 번만 계산하고 행 순서(permutation)만 정렬
+- 오름차순/내림차순 혼합은 하위 키부터 안정 정렬을 반복하여 처리 (비교 래퍼 불필요)
+- 정렬 결과는 워크시트 셀 저장소(ws._cells)의 행 번호만 바꿔 반영 (행 삭제/재생성 없음)
+- 여러 행 삭제도 같은 방식으로 한 번에 당겨 올림 (compact_rows)
+- 행 목록 정렬 키는 열마다 값 형식을 한 번만 검사해 미리 계산 (compile_sort_keys)
+- 셀 서식 처리는 styles 로 선택 (STYLES_MOVE / STYLES_KEEP / STYLES_RESET)
+  기존 매크로 정렬은 이전 출력 서식 유지 (macro_sort_styles), SABANGNET_SORT_MOVE_STYLES=1 이면 서식도 값과 함께 이동
+"""
+
+import os
+from bisect import bisect_left
+from copy import copy
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from typing import Callable, Iterable, Sequence
+
+from openpyxl.styles.cell_style import StyleArray
+
+
+# 셀이 없는 좌표의 조회 기본값
+_EMPTY_CELL = SimpleNamespace(value=None)
+
+# 형식이 섞인 열의 정렬 순위 (숫자 → 날짜/시간 → 문자열 → 기타, 빈 값은 "" 로 문자열)
+_TYPE_RANKS = {bool: 0, int: 0, float: 0, datetime: 1, date: 2, time: 3, timedelta: 4, str: 5}
+_OTHER_RANK = 6
+_NUMERIC_TYPES = {bool, int, float}
+
+# 정렬 시 셀 서식 처리
+STYLES_MOVE = "move"    # 서식이 값과 함께 이동 (엑셀 정렬과 동일)
+STYLES_KEEP = "keep"    # 서식은 위치에 유지, 값만 이동 (행 위치에 값 재기록과 동일)
+STYLES_RESET = "reset"  # 정렬 범위 서식 초기화 (행 삭제 후 값 재기록과 동일)
+
+# 설정 시 기존 매크로 정렬도 서식을 값과 함께 이동 (예: SABANGNET_SORT_MOVE_STYLES=1)
+MOVE_STYLES_ENV = "SABANGNET_SORT_MOVE_STYLES"
+
+
+def macro_sort_styles(legacy: str) -> str:
+    """
+    기존 매크로 정렬의 서식 처리 (MOVE_STYLES_ENV 설정 시 STYLES_MOVE, 아니면 이전 동작 legacy)
+    예시:
+        ex.sort_rows([2, 3], key=str, styles=macro_sort_styles(STYLES_RESET))
+    """
+    return STYLES_MOVE if os.environ.get(MOVE_STYLES_ENV) else legacy
+
+
+def sort_order(keys: Sequence[Sequence], descending: Sequence[bool] | None = None) -> list[int]:
+    """
+    정렬된 행 순서 계산
+    args:
+        keys: 정렬 키 열 목록 (keys[i][n] = n번째 행의 i번째 정렬 키)
+        descending: 키별 내림차순 여부 (기본값: 모두 오름차순)
+    return:
+        정렬 후 순서대로 나열한 원래 행 인덱스 (0-based)
+    예시:
+        sort_order([["b", "a", "b"], [2, 1, 1]], [False, True])  # [1, 0, 2]
+    """
+    if not keys:
+        return []
+    if descending is None:
+        descending = [False] * len(keys)
+    order = list(range(len(keys[0])))
+    # 하위 키부터 안정 정렬 (reverse=True 도 동일 키의 원래 순서 유지)
+    for column, reverse in reversed(list(zip(keys, descending))):
+        order.sort(key=column.__getitem__, reverse=reverse)
+    return order
+
+
+def column_values(ws, column: int, start_row: int, end_row: int) -> list:
+    """
+    열 값 목록 (빈 좌표에 셀을 생성하지 않음)
+    """
+    cells = ws._cells
+    values = []
+    for row in range(start_row, end_row + 1):
+        cell = cells.get((row, column))
+        values.append(cell.value if cell is not None else None)
+    return values
+
+
+def row_values(ws, min_row: int, max_row: int, min_col: int, max_col: int) -> list[tuple]:
+    """
+    행 값 튜플 목록 (빈 좌표에 셀을 생성하지 않음)
+    ws.cell / iter_rows 는 좌표마다 셀 조회·생성 함수를 거치므로 셀 저장소를 직접 조회
+    """
+    get = ws._cells.get
+    columns = range(min_col, max_col + 1)
+    return [tuple([get((row, column), _EMPTY_CELL).value for column in columns]) for row in range(min_row, max_row + 1)]
+
+
+def reorder_rows(ws, order: Sequence[int], start_row: int, styles: str = STYLES_MOVE) -> None:
+    """
+    start_row 부터 len(order) 개 행을 order 순서로 재배치
+    셀 객체를 그대로 옮기며 행 높이는 위치에 유지
+    args:
+        order: sort_order() 결과 (0-based, start_row 기준)
+        styles: 셀 서식 처리 (STYLES_MOVE / STYLES_KEEP / STYLES_RESET)
+    """
+    end_row = start_row + len(order) - 1
+    cells = ws._cells
+    rows: dict[int, list] = {}
+    for (row, column) in [key for key in cells if start_row <= key[0] <= end_row]:
+        rows.setdefault(row, []).append(cells.pop((row, column)))
+    # 위치별 원래 서식 (STYLES_KEEP)
+    kept = {(cell.row, cell.column): cell._style for row_cells in rows.values() for cell in row_cells} \
+        if styles == STYLES_KEEP else None
+    for new_row, old_idx in enumerate(order, start=start_row):
+        for cell in rows.get(start_row + old_idx, ()):
+            cell.row = new_row
+            cells[(new_row, cell.column)] = cell
+            if styles == STYLES_RESET:
+                cell._style = StyleArray()
+            elif kept is not None:
+                style = kept.get((new_row, cell.column))
+                cell._style = copy(style) if style is not None else StyleArray()
+    if kept:
+        # 서식이 있던 위치에 옮겨 온 셀이 없으면 빈 셀로 서식 유지
+        for (row, column), style in kept.items():
+            if (row, column) not in cells:
+                ws.cell(row=row, column=column)._style = copy(style)
+
+
+def compact_rows(ws, drop_rows: Iterable[int]) -> int:
+    """
+    여러 행을 한 번에 삭제하고 아래 행을 당겨 올림
+    ws.delete_rows(row) 를 아래 행부터 행마다 호출한 것과 같은 결과 (셀 값/서식 이동, 행 높이는 위치에 유지)
+    행마다 호출하면 삭제할 때마다 아래 전체 행을 옮기므로 O(삭제 행 수 × 행 수) → 셀 저장소를 한 번만 재배치
+    return: 삭제한 행 수
+    예시:
+        compact_rows(ws, [5, 9, 10])  # 5, 9, 10행 삭제 (11행 → 8행)
+    """
+    drop = sorted(set(drop_rows))
+    if not drop:
+        return 0
+    drop_set = set(drop)
+    cells = ws._cells
+    moved = [cells.pop(key) for key in [key for key in cells if key[0] >= drop[0]]]
+    for cell in moved:
+        row = cell.row
+        if row in drop_set:
+            continue
+        # 이 행보다 위에서 삭제되는 행 수만큼 당김
+        cell.row = row - bisect_left(drop, row)
+        cells[(cell.row, cell.column)] = cell
+    return len(drop)
+
+
+def sort_worksheet_rows(
+    ws,
+    key_columns: Sequence[int],
+    start_row: int = 2,
+    end_row: int | None = None,
+    key: Callable | None = None,
+    styles: str = STYLES_MOVE,
+) -> list[int]:
+    """
+    워크시트 행 정렬
+    args:
+        key_columns: 정렬 기준 열 번호 (1-based, 음수면 내림차순) 예: [2, -4]
+        key: 셀 값 → 정렬 키 변환 함수 (기본값: 값 그대로)
+        styles: 셀 서식 처리 (reorder_rows 참고)
+    return:
+        적용된 행 순서
+    """
+    if end_row is None:
+        end_row = ws.max_row
+    if end_row < start_row:
+        return []
+    keys = []
+    for col in key_columns:
+        values = column_values(ws, abs(col), start_row, end_row)
+        keys.append([key(v) for v in values] if key is not None else values)
+    order = sort_order(keys, [col < 0 for col in key_columns])
+    reorder_rows(ws, order, start_row, styles)
+    return order
+
+
+def typed_key(value) -> tuple:
+    """
+    형식이 섞인 열의 정렬 키 (형식 순위, 값) - 서로 비교할 수 없는 형식끼리도 정렬 가능
+    예시:
+        sorted([3, "a", 1.5], key=typed_key)  # [1.5, 3, 'a']
+    """
+    rank = _TYPE_RANKS.get(type(value), _OTHER_RANK)
+    return (rank, value) if rank != _OTHER_RANK else (rank, str(value))
+
+
+def compile_sort_keys(rows: Sequence[Sequence], sort_columns: Sequence[int]) -> tuple[list[list], list[bool]]:
+    """
+    행 목록의 열별 정렬 키 계산 (sort_order 입력)
+    - 빈 값(None)은 ""
+    - 열마다 값 형식을 한 번만 검사: 한 형식(숫자 / 문자열 / 날짜 등)이면 값 그대로, 섞여 있으면 typed_key
+    args:
+        sort_columns: 정렬 기준 열 번호 (1-based, 음수면 내림차순)
+    return: (열별 키 목록, 열별 내림차순 여부)
+    예시:
+        keys, descending = compile_sort_keys(rows, [2, 3, -5])
+        rows = [rows[i] for i in sort_order(keys, descending)]
+    """
+    keys = []
+    for col in sort_columns:
+        idx = abs(col) - 1
+        values = ["" if row[idx] is None else row[idx] for row in rows]
+        types = set(map(type, values))
+        if len(types) > 1 and not types <= _NUMERIC_TYPES:
+            values = list(map(typed_key, values))
+        keys.append(values)
+    return keys, [col < 0 for col in sort_columns]
+
+
+class DescendingKey:
+    """
+    내림차순 비교 래퍼 (대소 비교를 뒤집음, 피클 가능)
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __reduce__(self):
+        return DescendingKey, (self.value,)
+
+
+def row_key(sort_columns: Sequence[int]) -> Callable[[Sequence], tuple]:
+    """
+    행(값 리스트) → 단일 정렬 키 (ExcelHandler._sort_data 와 동일한 순서)
+    - 빈 값(None)은 ""
+    - 값은 typed_key 로 비교 (한 형식만 있는 열은 값 순서와 동일)
+    - 음수 열은 내림차순 (DescendingKey)
+    외부 정렬(정렬된 런 병합)처럼 행 순서 대신 키 하나로 비교해야 하는 경우 사용
+    예시:
+        sorted(rows, key=row_key([2, -4]))
+    """
+    columns = [(abs(col) - 1, col < 0) for col in sort_columns]
+
+    def key(row):
+        parts = []
+        for idx, descending in columns:
+            value = row[idx]
+            if value is None:
+                value = ""
+            value = typed_key(value)
+            parts.append(DescendingKey(value) if descending else value)
+        return tuple(parts)
+    return key
@@ -0,0 +1,151 @@
+"""
+행 번호 기반 시트 분리
+- 원본 시트 셀 저장소(ws._cells)를 한 번만 읽어 행 목록으로 보관
+- 계정별 행 번호(rows_by_sheet)도 행 목록에서 한 번만 계산
+- 자동화 시트 / 계정별 시트를 행 목록에서 바로 생성 (copy_worksheet, 셀 단위 재조회 없음)
+- 같은 워크북 안에서 서식 ID(StyleArray)를 그대로 공유
+"""
+
+from collections import defaultdict
+from copy import copy
+from typing import Callable, Sequence
+
+from openpyxl.cell import Cell
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import get_column_letter
+
+from utils.excels.row_sort import sort_order
+
+
+class SheetRowSplitter:
+    """
+    예시:
+        rows = SheetRowSplitter(ws)
+        rows.emit_copy(wb, "자동화", index=0)
+        rows_by_sheet = rows.group_rows(2, lambda value: "OK" if "[오케이마트]" in str(value) else None)
+        rows.emit_rows(wb, "OK", rows_by_sheet["OK"], row_number="=ROW()-1")
+    주의:
+        분리가 끝날 때까지 원본 시트를 수정하지 않아야 함 (셀 객체를 참조로 보관)
+    """
+
+    def __init__(self, ws, last_col: int | None = None, col_widths: Sequence | None = None):
+        self.ws = ws
+        self.last_row = ws.max_row
+        self.last_col = last_col or ws.max_column
+        if col_widths is None:
+            col_widths = [ws.column_dimensions[get_column_letter(c)].width
+                          for c in range(1, self.last_col + 1)]
+        self.col_widths = list(col_widths)
+
+        # 행 번호 → {열 번호: 셀}
+        self.rows: dict[int, dict[int, Cell]] = defaultdict(dict)
+        for (row, col), cell in ws._cells.items():
+            self.rows[row][col] = cell
+
+    def value(self, row: int, col: int):
+        cell = self.rows[row].get(col) if row in self.rows else None
+        return cell.value if cell is not None else None
+
+    def group_rows(self, column: int, classify: Callable, start_row: int = 2) -> dict[str, list[int]]:
+        """
+        시트별 행 번호 매핑
+        args:
+            column: 분류 기준 열 번호 (1-based)
+            classify: 셀 값 → 시트명 (해당 없으면 None)
+        """
+        rows_by_sheet = defaultdict(list)
+        for row in range(start_row, self.last_row + 1):
+            sheet_name = classify(self.value(row, column))
+            if sheet_name is not None:
+                rows_by_sheet[sheet_name].append(row)
+        return rows_by_sheet
+
+    def sort_rows(self, row_indices: list[int], key_columns: Sequence[int], key: Callable | None = None) -> list[int]:
+        """
+        행 번호 목록 정렬 (ExcelHandler.sort_rows 와 같은 안정 정렬, 음수 열은 내림차순)
+        """
+        keys = []
+        for col in key_columns:
+            values = [self.value(row, abs(col)) for row in row_indices]
+            keys.append([key(v) for v in values] if key is not None else values)
+        order = sort_order(keys, [col < 0 for col in key_columns])
+        return [row_indices[idx] for idx in order]
+
+    def emit_copy(self, wb, title: str, index: int | None = None):
+        """
+        원본 시트 전체 복사본 생성 (wb.copy_worksheet 와 같은 결과)
+        - 값, 서식, 하이퍼링크, 메모, 행/열 크기, 병합, 페이지 설정
+        """
+        if title in wb.sheetnames:
+            del wb[title]
+        target = wb.create_sheet(title, index)
+        for row, cells in self.rows.items():
+            for col, src in cells.items():
+                cell = Cell(target, row=row, column=col)
+                cell._value = src._value
+                cell.data_type = src.data_type
+                if src.has_style:
+                    cell._style = copy(src._style)
+                if src.hyperlink:
+                    cell._hyperlink = copy(src.hyperlink)
+                if src.comment:
+                    cell.comment = copy(src.comment)
+                target._add_cell(cell)
+
+        for attr in ("row_dimensions", "column_dimensions"):
+            dims = getattr(target, attr)
+            for key, dim in getattr(self.ws, attr).items():
+                dims[key] = copy(dim)
+                dims[key].worksheet = target
+
+        target.sheet_format = copy(self.ws.sheet_format)
+        target.sheet_properties = copy(self.ws.sheet_properties)
+        target.merged_cells = copy(self.ws.merged_cells)
+        target.page_margins = copy(self.ws.page_margins)
+        target.page_setup = copy(self.ws.page_setup)
+        target.print_options = copy(self.ws.print_options)
+        return target
+
+    def emit_rows(
+        self,
+        wb,
+        title: str,
+        row_indices: Sequence[int],
+        style: Callable | None = None,
+        row_number: str | None = None,
+    ):
+        """
+        지정 행들로 새 시트 생성 (제목행 값과 열 너비 복사, 데이터 행은 1~last_col 열 전체)
+        args:
+            style: style(원본 셀, 대상 셀) - 원본 서식 조합별 첫 셀에만 호출 후 서식 ID 복사
+                   (None 이면 값만 복사)
+            row_number: A열 순번 값 (예: "=ROW()-1")
+        """
+        if title in wb.sheetnames:
+            del wb[title]
+        target = wb.create_sheet(title)
+
+        for c in range(1, self.last_col + 1):
+            target._add_cell(Cell(target, row=1, column=c, value=self.value(1, c)))
+            target.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
+
+        styles: dict[tuple, StyleArray] = {}
+        for target_row, r in enumerate(row_indices, start=2):
+            src_cells = self.rows.get(r, {})
+            for c in range(1, self.last_col + 1):
+                src = src_cells.get(c)
+                cell = Cell(target, row=target_row, column=c,
+                            value=src.value if src is not None else None)
+                target._add_cell(cell)
+                if style is None:
+                    continue
+                key = tuple(src._style) if src is not None and src.has_style else ()
+                copied = styles.get(key)
+                if copied is None:
+                    style(src if src is not None else Cell(self.ws, row=r, column=c), cell)
+                    copied = styles[key] = copy(cell._style)
+                else:
+                    cell._style = copy(copied)
+            if row_number is not None:
+                target[f"A{target_row}"].value = row_number
+        return target
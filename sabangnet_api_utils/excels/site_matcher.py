@@ -0,0 +1,65 @@
+"""
+사이트명 키워드 매칭
+- 전체 키워드를 하나의 정규식(alternation)으로 컴파일해 한 번에 검색
+- 원문(B열 사이트 값 등)별로 한 번만 판정해 규칙 묶음으로 변환 후 캐시
+  (행마다 키워드별 `in` 검색을 반복하지 않음)
+"""
+
+import re
+from typing import Any, Callable, Iterable
+
+
+# 캐시 최대 건수 (초과 시 비움)
+MAX_CACHE = 10000
+
+
+class SiteMatcher:
+    """
+    args:
+        keywords: 사이트 키워드 목록
+        build: 포함된 키워드 집합 → 규칙 묶음 (기본값: 키워드 집합 그대로)
+    예시:
+        matcher = SiteMatcher(["쿠팡", "토스"])
+        matcher.match("[오케이마트] 쿠팡")        # frozenset({'쿠팡'})
+        matcher.match("[오케이마트] 11번가")      # frozenset()
+
+        lengths = SiteMatcher(["쿠팡", "티몬"], build=lambda found: 13 if "쿠팡" in found else None)
+        lengths.match("쿠팡")  # 13
+    """
+
+    def __init__(self, keywords: Iterable[str], build: Callable[[frozenset], Any] | None = None):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.build = build
+        # 긴 키워드 우선 (정규식은 포함 여부 판정에만 사용)
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        self._pattern = re.compile(alternation) if self.keywords else None
+        self._by_keywords: dict[frozenset, Any] = {}
+        self._cache: dict[str, Any] = {}
+
+    def find(self, text: str) -> frozenset:
+        """
+        원문에 포함된 키워드 전체 (겹치는 키워드 포함, 예: '카카오톡스토어' → {'카카오톡스토어', '톡스토어'})
+        """
+        if self._pattern is None or self._pattern.search(text) is None:
+            return frozenset()
+        return frozenset(k for k in self.keywords if k in text)
+
+    def match(self, text: str):
+        """
+        원문 → 규칙 묶음 (원문별 최초 1회만 계산)
+        """
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+        found = self.find(text)
+        if self.build is None:
+            rule = found
+        else:
+            rule = self._by_keywords.get(found)
+            if rule is None:
+                rule = self._by_keywords[found] = self.build(found)
+        if len(self._cache) >= MAX_CACHE:
+            self._cache.clear()
+        self._cache[text] = rule
+        return rule
@@ -0,0 +1,92 @@
+"""
+읽기 전용 스트리밍 엑셀 로드
+- openpyxl read_only 모드로 원본을 행 단위(values_only)로 읽어 새 워크북에 적재
+- 원본 셀 서식은 읽지 않음 (값, 시트명, 열 너비만 유지)
+- 대상 시트는 컬럼 모드(ColumnarSheet)로 바로 적재 가능
+- 같은 내용의 파일은 파싱 캐시(ParseCache)에서 값 행을 로드
+- CSV / TSV 원본도 같은 값 행으로 적재 (csv_reader)
+"""
+
+from xml.etree.ElementTree import iterparse
+
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from utils.excels.columnar_sheet import ColumnarSheet
+from utils.excels.parse_cache import ParseCache
+from utils.excels.csv_reader import is_csv_file, read_csv_values
+
+
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def read_column_widths(ro_ws) -> dict[str, float]:
+    """
+    read-only 워크시트의 열 너비 조회
+    read-only 모드는 column_dimensions 를 제공하지 않으므로 시트 XML 의 <cols> 만 파싱
+    return: {열 문자: 너비}
+    """
+    widths = {}
+    src = ro_ws._get_source()
+    try:
+        for _, element in iterparse(src, events=("start",)):
+            tag = element.tag
+            if tag == f"{_SHEET_NS}col":
+                width = element.get("width")
+                if width is None:
+                    continue
+                for col_idx in range(int(element.get("min")), int(element.get("max")) + 1):
+                    widths[get_column_letter(col_idx)] = float(width)
+            elif tag == f"{_SHEET_NS}sheetData":
+                # <cols> 는 항상 <sheetData> 앞에 위치
+                break
+    finally:
+        src.close()
+    return widths
+
+
+def read_values(file_path: str) -> list[tuple[str, dict[str, float], list[tuple]]]:
+    """
+    원본을 read-only 로 스트리밍하여 시트별 값 행 조회 (CSV / TSV 는 시트 1개)
+    return: [(시트명, {열 문자: 너비}, [행 값 튜플, ...]), ...]
+    """
+    if is_csv_file(file_path):
+        return read_csv_values(file_path)
+    src_wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return [
+            (src_ws.title, read_column_widths(src_ws), list(src_ws.iter_rows(values_only=True)))
+            for src_ws in src_wb.worksheets
+        ]
+    finally:
+        src_wb.close()
+
+
+def load_values_workbook(file_path: str, sheet_index: int = 0, columnar: bool = False):
+    """
+    원본을 read-only 로 스트리밍하여 값만 담은 새 워크북 생성
+    같은 내용의 파일은 파싱 캐시(ParseCache)의 값 행을 재사용
+    args:
+        file_path: 엑셀 파일 경로
+        sheet_index: 처리 대상 시트 인덱스
+        columnar: True 면 대상 시트를 ColumnarSheet 로 적재 (워크시트 셀은 저장 시점까지 비어 있음)
+    return:
+        (wb, ws, sheet) - sheet 는 columnar=False 인 경우 None
+    """
+    sheets = ParseCache.shared().load(file_path, "values", lambda: read_values(file_path))
+    wb = Workbook()
+    wb.remove(wb.active)
+    sheet = None
+    for idx, (title, widths, rows) in enumerate(sheets):
+        ws = wb.create_sheet(title=title)
+        for letter, width in widths.items():
+            ws.column_dimensions[letter].width = width
+
+        if columnar and idx == sheet_index:
+            headers = list(rows[0]) if rows else []
+            sheet = ColumnarSheet.from_rows(ws, headers, [list(row) for row in rows[1:]])
+        else:
+            for row in rows:
+                ws.append(row)
+    return wb, wb.worksheets[sheet_index], sheet
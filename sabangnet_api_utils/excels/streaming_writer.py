@@ -0,0 +1,120 @@
+"""
+스트리밍 엑셀 저장
+- 완성된 워크북을 openpyxl write-only 워크북으로 행 단위 기록
+- 컬럼 모드(ColumnarSheet) 값은 워크시트 셀로 flush 하지 않고 바로 기록
+- 서식은 원본 셀 스타일 단위로 캐시하여 재사용
+"""
+
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+from utils.excels.columnar_sheet import ColumnarSheet
+
+
+class StreamingWorkbookWriter:
+    """
+    write-only 워크북 저장기
+    예시:
+        writer = StreamingWorkbookWriter(ex.wb, columnar_sheets={id(ws): sheet})
+        writer.save("output.xlsx")
+
+    유지 항목: 셀 값/서식, 열 너비, 행 높이(기본 행 높이 포함), 자동 필터, 틀 고정, 눈금선 표시
+    미지원 항목: 병합 셀, 조건부 서식, 데이터 유효성 (매크로에서 사용하지 않음)
+    """
+
+    _STYLE_ATTRS = ("font", "fill", "border", "alignment", "number_format", "protection")
+
+    def __init__(self, wb, columnar_sheets: dict[int, ColumnarSheet] | None = None):
+        self.wb = wb
+        self.columnar_sheets = columnar_sheets or {}
+
+    def save(self, output_path: str) -> str:
+        out_wb = Workbook(write_only=True)
+        for ws in self.wb.worksheets:
+            out_ws = out_wb.create_sheet(title=ws.title)
+            self._copy_sheet_layout(ws, out_ws)
+            self._write_rows(ws, out_ws, self.columnar_sheets.get(id(ws)))
+        out_wb.save(output_path)
+        return output_path
+
+    def _copy_sheet_layout(self, ws, out_ws) -> None:
+        """
+        행 기록 전에 설정해야 하는 시트 속성 복사
+        """
+        for letter, dim in ws.column_dimensions.items():
+            if dim.width:
+                out_ws.column_dimensions[letter].width = dim.width
+            if dim.hidden:
+                out_ws.column_dimensions[letter].hidden = True
+        if ws.auto_filter.ref:
+            out_ws.auto_filter.ref = ws.auto_filter.ref
+        if ws.freeze_panes:
+            out_ws.freeze_panes = ws.freeze_panes
+        out_ws.sheet_view.showGridLines = ws.sheet_view.showGridLines
+        out_ws.sheet_format = copy(ws.sheet_format)
+        if ws.sheet_properties.tabColor is not None:
+            out_ws.sheet_properties.tabColor = copy(ws.sheet_properties.tabColor)
+
+    def _write_rows(self, ws, out_ws, sheet: ColumnarSheet | None) -> None:
+        max_row = ws.max_row
+        max_col = ws.max_column
+        columns = []
+        if sheet is not None:
+            max_row = max(max_row, sheet.max_row)
+            max_col = max(max_col, sheet.max_column)
+            columns = [sheet.columns.get(get_column_letter(c)) for c in range(1, max_col + 1)]
+
+        # 워크시트 셀 직접 조회 (ws.cell() 은 빈 좌표에도 셀을 생성하므로 사용하지 않음)
+        cells = ws._cells
+        row_dims = ws.row_dimensions
+        style_cache = {}
+
+        for r in range(1, max_row + 1):
+            # write-only 시트는 행 기록 시점에 row_dimensions 를 참조
+            if r in row_dims and row_dims[r].height is not None:
+                out_ws.row_dimensions[r].height = row_dims[r].height
+
+            row = []
+            for c in range(1, max_col + 1):
+                cell = cells.get((r, c))
+                value = cell.value if cell is not None else None
+                overrides = None
+                if sheet is not None:
+                    col = columns[c - 1]
+                    if col is not None and r <= len(col):
+                        value = col[r - 1]
+                    overrides = sheet._styles.get((get_column_letter(c), r))
+
+                has_style = cell is not None and cell.has_style
+                if not has_style and not overrides:
+                    row.append(value)
+                    continue
+                row.append(self._styled_cell(out_ws, value, cell if has_style else None,
+                                             overrides, style_cache))
+            out_ws.append(row)
+
+    def _styled_cell(self, out_ws, value, src_cell, overrides: dict | None, style_cache: dict):
+        """
+        동일 스타일 조합은 최초 1회만 서식 객체를 생성하고 이후 StyleArray 복사
+        """
+        key = (
+            tuple(src_cell._style) if src_cell is not None else None,
+            tuple(sorted(overrides.items())) if overrides else None,
+        )
+        new_cell = WriteOnlyCell(out_ws, value)
+        cached = style_cache.get(key)
+        if cached is not None:
+            new_cell._style = copy(cached)
+            return new_cell
+
+        if src_cell is not None:
+            for name in self._STYLE_ATTRS:
+                setattr(new_cell, name, copy(getattr(src_cell, name)))
+        if overrides:
+            for name, style in overrides.items():
+                setattr(new_cell, name, style)
+        style_cache[key] = copy(new_cell._style)
+        return new_cell
@@ -0,0 +1,166 @@
+"""
+공용 스타일 레지스트리
+- 프로젝트에서 쓰는 서식(본문 폰트, 헤더, 빨간 글씨, 하늘색 배경, 테두리 없음 등)을 NamedStyle 로 워크북에 1회 등록
+- 셀 적용 시 Font/Alignment 객체를 매번 생성·비교하지 않고 등록된 스타일 ID 만 복사
+- 지정한 서식 요소만 덮어쓰므로 기존 cell.font = ... 방식과 결과 동일
+"""
+
+from weakref import WeakKeyDictionary
+
+from openpyxl.styles import Font, PatternFill, Alignment, Border, NamedStyle
+from openpyxl.styles.cell_style import StyleArray
+
+
+# 서식 요소 → StyleArray 속성
+_PART_IDS = {
+    "font": "fontId",
+    "fill": "fillId",
+    "border": "borderId",
+    "alignment": "alignmentId",
+    "protection": "protectionId",
+}
+
+BODY_FONT = Font(name='맑은 고딕', size=9)
+RED_FONT = Font(color="FF0000", bold=True)
+
+
+def solid_fill(rgb: str) -> PatternFill:
+    return PatternFill(start_color=rgb, end_color=rgb, fill_type="solid")
+
+
+# 이름: 적용할 서식 요소
+STYLES = {
+    "body": {"font": BODY_FONT, "alignment": Alignment(wrap_text=False)},
+    "body_font": {"font": BODY_FONT},
+    # 재작성 행 기본 서식 (배경/테두리 초기화 포함)
+    "body_reset": {"font": BODY_FONT, "alignment": Alignment(wrap_text=False),
+                   "fill": PatternFill(), "border": Border()},
+    "body_row": {"font": BODY_FONT, "alignment": Alignment(wrap_text=False), "fill": PatternFill()},
+    "header": {"fill": solid_fill("006100"), "alignment": Alignment(horizontal='center')},
+    "header_white": {"font": Font(name='맑은 고딕', size=9, color="FFFFFF", bold=True),
+                     "fill": solid_fill("008000"), "alignment": Alignment(horizontal='center'),
+                     "border": Border()},
+    "red_font": {"font": RED_FONT},
+    "red_font_plain": {"font": Font(color="FF0000")},
+    "blue_fill": {"fill": solid_fill("CCE8FF")},
+    "cyan_fill": {"fill": solid_fill("CCFFFF")},
+    "light_blue_fill": {"fill": solid_fill("ADD8E6")},
+    "no_fill": {"fill": PatternFill(fill_type=None)},
+    "no_border": {"border": Border()},
+    "align_center": {"alignment": Alignment(horizontal='center')},
+    "align_right": {"alignment": Alignment(horizontal='right')},
+    "align_left": {"alignment": Alignment(horizontal='left')},
+}
+
+NAMED_STYLE_PREFIX = "sabangnet_"
+DEFAULT_ROW_HEIGHT = 15
+
+
+class StyleRegistry:
+    """
+    워크북별 스타일 레지스트리
+    예시:
+        styles = StyleRegistry.of(ws.parent)
+        styles.apply(ws["J2"], "red_font")
+        styles.apply_rows(ws, "body", min_row=2)
+    """
+
+    _registries: "WeakKeyDictionary" = WeakKeyDictionary()
+
+    @classmethod
+    def of(cls, wb) -> "StyleRegistry":
+        registry = cls._registries.get(wb)
+        if registry is None:
+            registry = cls(wb)
+            cls._registries[wb] = registry
+        return registry
+
+    def __init__(self, wb):
+        self.wb = wb
+        # {이름: [(StyleArray 속성, ID), ...]}
+        self._ids: dict[str, list[tuple[str, int]]] = {}
+        self._parts: dict[str, dict] = {}
+        for name, parts in STYLES.items():
+            self.register(name, **parts)
+
+    def register(self, name: str, **parts) -> None:
+        """
+        스타일 등록 (이미 등록된 이름이면 무시)
+        예시:
+            styles.register("header_0000FF", fill=solid_fill("0000FF"))
+        """
+        if name in self._ids:
+            return
+        style_name = f"{NAMED_STYLE_PREFIX}{name}"
+        if style_name in self.wb.named_styles:
+            named = self.wb._named_styles[style_name]
+        else:
+            named = NamedStyle(name=style_name, **parts)
+            self.wb.add_named_style(named)
+        array = named.as_tuple()
+        self._ids[name] = [(_PART_IDS[part], getattr(array, _PART_IDS[part])) for part in parts]
+        self._parts[name] = parts
+
+    def header(self, rgb: str = "006100") -> str:
+        """
+        헤더 배경색별 스타일 이름 (기본 006100 외 색상은 최초 사용 시 등록)
+        """
+        if rgb == "006100":
+            return "header"
+        name = f"header_{rgb}"
+        self.register(name, fill=solid_fill(rgb), alignment=Alignment(horizontal='center'))
+        return name
+
+    def apply(self, cell, name: str) -> None:
+        """
+        등록된 스타일의 서식 요소만 셀에 적용
+        - openpyxl 셀: 스타일 ID 직접 복사
+        - ColumnarCell 등 StyleArray 가 없는 셀: 속성 대입으로 처리
+        """
+        if not hasattr(cell, "_style"):
+            for part, value in self._parts[name].items():
+                setattr(cell, part, value)
+            return
+        self.apply_cells((cell,), name)
+
+    def apply_cells(self, cells, name: str) -> None:
+        ids = self._ids[name]
+        for cell in cells:
+            style = cell._style
+            if style is None:
+                # 서식이 없는 새 셀은 StyleArray 가 지연 생성됨
+                style = cell._style = StyleArray()
+            for attr, style_id in ids:
+                setattr(style, attr, style_id)
+
+    def apply_rows(self, ws, name: str, min_row: int = 1, max_row: int | None = None) -> None:
+        """
+        범위 내 모든 셀에 스타일 적용
+        """
+        for row in ws.iter_rows(min_row=min_row, max_row=max_row):
+            self.apply_cells(row, name)
+
+
+def apply_style(cell, name: str) -> None:
+    """
+    셀이 속한 워크북의 레지스트리로 스타일 적용
+    워크북을 알 수 없는 ColumnarCell 은 속성 대입으로 처리
+    """
+    ws = getattr(cell, "parent", None)
+    if ws is None:
+        for part, value in STYLES[name].items():
+            setattr(cell, part, value)
+        return
+    StyleRegistry.of(ws.parent).apply(cell, name)
+
+
+def set_default_row_height(ws, height: float = DEFAULT_ROW_HEIGHT, min_row: int = 1) -> None:
+    """
+    시트 기본 행 높이 지정 (행마다 row_dimensions 를 만들지 않음)
+    min_row 이후 개별 높이가 지정된 행도 같은 높이로 맞춤
+    """
+    ws.sheet_format.defaultRowHeight = height
+    ws.sheet_format.customHeight = True
+    for idx, dim in ws.row_dimensions.items():
+        if idx >= min_row and dim.height is not None:
+            dim.height = height
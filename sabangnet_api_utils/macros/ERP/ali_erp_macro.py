@@ -1,27 +1,56 @@
 import openpyxl
 from utils.excels.excel_handler import ExcelHandler
 from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.row_pipeline import RowPipeline
+from utils.excels.column_rules import convert_int_values, quantity_suffix
+from utils.excels.chunked_processor import ChunkedSheetProcessor, DEFAULT_CHUNK_ROWS
+from utils.excels.product_lookup import ProductLookupIndex
 
 
 class ERPAliMacro:
-    def __init__(self, file_path):
-        self.ex = ExcelHandler.from_file(file_path)
+    def __init__(self, file_path, streaming=False, read_only=False, parallel=False,
+                 chunked=False, memory_mb=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        args:
+            file_path: 엑셀 파일 경로
+            streaming: True 면 write-only 워크북으로 행 단위 저장
+            read_only: True 면 원본을 읽기 전용으로 스트리밍 로드 (원본 셀 서식 미포함)
+            parallel: True 면 분리된 계정 시트(OK, IY)를 시트별 워커 프로세스에서 생성/서식 적용
+            chunked: True 면 원본 전체를 적재하지 않고 chunk_rows 행 단위로 처리 (대용량 파일)
+            memory_mb: 청크 모드 정렬 메모리 상한 (초과 시 임시 파일로 분할 정렬)
+        """
         self.file_path = file_path
+        self.streaming = streaming
+        self.parallel = parallel
+        self.chunked = chunked
+        if chunked:
+            self.processor = ChunkedSheetProcessor(file_path, chunk_rows=chunk_rows, memory_mb=memory_mb)
+            self.ex = self.processor.ex
+        else:
+            self.ex = ExcelHandler.from_file(file_path, read_only=read_only)
         self.ws = self.ex.ws
         self.wb = self.ex.wb
+        self.vlookup_dict = {}
+        self._post = None
+
+    def __getstate__(self):
+        """
+        병렬 모드 워커 전달용 상태 (워크북, 핸들러, 규칙 파이프라인 제외)
+        """
+        state = self.__dict__.copy()
+        state.update(ex=None, ws=None, wb=None, _post=None)
+        return state
 
     def ali_erp_macro_run(self):
-        col_h = ExcelColumnHandler()
+        if self.chunked:
+            return self._chunked_run()
+
+        # 분리 전 규칙: 원본 시트 1회 순회
+        pre = self._pre_pipeline()
+        pre.run(self.ws)
 
-        for row in range(2, self.ws.max_row + 1):
-            self._z_to_f_column(row)
-            self._f_column_process(self.ws[f'F{row}'])
-            self._i_to_h_column(self.ws[f'I{row}'], self.ws[f'H{row}'])
-            col_h.d_column(
-                # =U2+V2
-                self.ws[f'D{row}'], self.ws[f'U{row}'], self.ws[f'V{row}'])
         # sheet1 vlookup 딕셔너리 생성 후 삭제
-        vlookup_dict = self.ex.create_vlookup_dict(self.wb)
+        self.vlookup_dict = self.ex.create_vlookup_dict(self.wb)
 
         # 시트 설정
         sheets_name = ["OK", "IY"]
@@ -34,58 +63,118 @@ class ERPAliMacro:
         sort_columns = [2, 3, 5]
         print("시트별 정렬, 시트 분리 시작...")
         headers, data = self.ex.preprocess_and_update_ws(self.ws, sort_columns)
-        self.ex.split_and_write_ws_by_site(
+        pending = self.ex.split_and_write_ws_by_site(
             wb=self.wb,
             headers=headers,
             data=data,
             sheets_name=sheets_name,
             site_to_sheet=site_to_sheet,
             site_col_idx=2,
+            formatter=self.format_split_sheet if self.parallel else None,
         )
         print("시트별 정렬, 시트 분리 완료")
 
         print("시트별 서식, 디자인 적용 시작...")
+        # 병렬 모드: 워커가 계정 시트를 처리하는 동안 나머지 시트(자동화) 처리
+        skip = pending.titles if pending is not None else set()
         for ws in self.wb.worksheets:
-            self.ex.set_header_style(ws)
-            if ws.max_row <= 1:
-                continue
-            for row in range(2, ws.max_row + 1):
-                if ws.title != "자동화":
-                    col_h.a_value_column(ws[f"A{row}"])
-                else:
-                    col_h.a_formula_column(ws[f"A{row}"])
-                self._jeju_address_column(ws, row, ws[f"J{row}"])
-                col_h.convert_int_column(ws[f"P{row}"])
-                col_h.convert_int_column(ws[f"Q{row}"])
-                # VLOOKUP 적용
-                self._vlookup_column(ws[f"F{row}"], ws[f"S{row}"], vlookup_dict)
-            print(f"[{ws.title}] 서식 및 디자인 적용 완료")
-
-        output_path = self.ex.save_file(self.file_path)
+            if ws.title not in skip:
+                self.format_split_sheet(self.ex, ws)
+        if pending is not None:
+            pending.result()
+        pre.log_timings()
+        self._post_pipeline().log_timings()
+
+        output_path = self.ex.save_file(self.file_path, streaming=self.streaming)
         print(f"✓ 알리 ERP 자동화 완료! 최종 파일: {output_path}")
         return output_path
 
-    def _z_to_f_column(self, row):
+    def _chunked_run(self):
         """
-        Z열 -> F열 복사
+        청크 모드: 분리 전 규칙 → 외부 정렬 → 시트 분리/분리 후 규칙을 청크 단위로 처리
         """
-        self.ws[f'F{row}'].value = self.ws[f'Z{row}'].value
+        pre = self._pre_pipeline()
+        output_path = ExcelHandler.macro_output_path(self.file_path)
+        self.processor.process(
+            output_path,
+            sort_columns=[2, 3, 5],
+            sheets_name=["OK", "IY"],
+            site_to_sheet={"오케이마트": "OK", "아이예스": "IY"},
+            pre=pre,
+            post=self._post_pipeline(),
+            lookup=self._merge_lookup,
+        )
+        pre.log_timings()
+        self._post_pipeline().log_timings()
+        print(f"✓ 알리 ERP 자동화 완료! 최종 파일: {output_path}")
+        return output_path
 
-    def _f_column_process(self, cell):
+    def _merge_lookup(self, src_wb):
         """
-        F열 처리
+        청크 모드: 읽기 전용 원본의 Sheet1 매핑 (같은 내용이 이미 인덱스에 있으면 다시 병합하지 않음)
+        """
+        if "Sheet1" in src_wb.sheetnames:
+            self.vlookup_dict = ProductLookupIndex.shared().lookup(src_wb["Sheet1"])
+        else:
+            self.vlookup_dict = {}
+
+    def format_split_sheet(self, ex, ws):
+        """
+        헤더 서식 및 분리 후 규칙 적용
+        args:
+            ex: 시트가 속한 워크북의 ExcelHandler (병렬 모드에서는 워커 워크북 핸들러)
+        """
+        if self.ex is None:
+            # 병렬 모드 워커 프로세스
+            self.ex = ex
+        ex.set_header_style(ws)
+        if ws.max_row <= 1:
+            return
+        self._post_pipeline().run(ws)
+        print(f"[{ws.title}] 서식 및 디자인 적용 완료")
+
+    def _pre_pipeline(self) -> RowPipeline:
+        """
+        분리 전 규칙: 원본 시트 1회 순회
+        """
+        col_h = ExcelColumnHandler()
+        pre = RowPipeline("알리 ERP 분리 전")
+        pre.add("F<-Z 복사", self._z_to_f_column)
+        pre.add("I->H 전화번호", lambda ws, row: self._i_to_h_column(ws[f'I{row}'], ws[f'H{row}']))
+        # =U2+V2
+        pre.add("D=U+V", lambda ws, row: col_h.d_column(ws[f'D{row}'], ws[f'U{row}'], ws[f'V{row}']))
+        # F 수량 표기 (' * 3' → ' 3개'): 행 순회 후 열 단위 일괄 변환
+        pre.add_column("F 수량 표기", "F", quantity_suffix)
+        return pre
+
+    def _post_pipeline(self) -> RowPipeline:
+        """
+        분리 후 규칙: 시트별 1회 순회
+        """
+        if self._post is not None:
+            return self._post
+        col_h = ExcelColumnHandler()
+        post = RowPipeline("알리 ERP 분리 후")
+        post.add("A 순번", lambda ws, row: col_h.a_value_column(ws[f"A{row}"]),
+                 sheets=lambda ws: ws.title != "자동화")
+        post.add("A 순번 수식", lambda ws, row: col_h.a_formula_column(ws[f"A{row}"]),
+                 sheets=lambda ws: ws.title == "자동화")
+        post.add("J 제주", lambda ws, row: self._jeju_address_column(ws, row, ws[f"J{row}"]))
+        # VLOOKUP 적용
+        post.add("S VLOOKUP", lambda ws, row: self._vlookup_column(
+            ws[f"F{row}"], ws[f"S{row}"], self.vlookup_dict))
+        post.add_column("P 정수", "P", convert_int_values)
+        post.add_column("Q 정수", "Q", convert_int_values)
+        self._post = post
+        return post
+
+    def _z_to_f_column(self, ws, row):
+        """
+        Z열 -> F열 복사
+        args:
+            ws: 워크시트 또는 ColumnarSheet
         """
-        if cell.value:
-            txt = str(cell.value).strip()
-            if txt.endswith(" * 1"):
-                cell.value = txt[:-4]
-            elif " * " in txt:
-                parts = txt.split(" * ")
-                if len(parts) >= 2:
-                    suffix = parts[-1].strip()
-                    if suffix.isdigit() and suffix != "1":
-                        base_text = " * ".join(parts[:-1])
-                        cell.value = f"{base_text} {suffix}개"
+        ws[f'F{row}'].value = ws[f'Z{row}'].value
 
     def _i_to_h_column(self, i_cell, h_cell):
         """
@@ -112,7 +201,7 @@ class ERPAliMacro:
         """
         if cell.value and "제주" in str(cell.value):
             self.ex.process_jeju_address(
-                ws, row, f_col='F', j_col='J')
+                row, ws=ws, f_col='F', j_col='J')
 
     def _vlookup_column(self, key_cell, value_cell, vlookup_dict):
         """
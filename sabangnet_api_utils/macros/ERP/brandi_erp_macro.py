@@ -3,9 +3,10 @@ from utils.excels.excel_column_handler import ExcelColumnHandler
 
 
 class ERPBrandiMacro:
-    def __init__(self, file_path):
+    def __init__(self, file_path, streaming=False):
         self.ex = ExcelHandler.from_file(file_path)
         self.file_path = file_path
+        self.streaming = streaming
         self.ws = self.ex.ws
 
     def brandi_erp_macro_run(self):
@@ -21,19 +22,20 @@ class ERPBrandiMacro:
         print('정렬 및 데이터 업데이트 완료')
 
         print('서식 적용 시작...')
-        for row in range(2, ws.max_row + 1):
-            col_h.d_column(ws[f"D{row}"], ws[f"O{row}"],
-                           ws[f"P{row}"], ws[f"V{row}"])
-            col_h.f_column(ws[f"F{row}"])
-            col_h.h_i_column(ws[f"H{row}"])
-            col_h.h_i_column(ws[f"I{row}"])
-            col_h.a_formula_column(ws[f"A{row}"])
-            self._jeju_address_column(ws, row, ws[f"J{row}"])  # 확인필요
-            col_h.e_column(ws[f"E{row}"])
-            col_h.convert_int_column(ws[f"P{row}"])
+        with self.ex.step("F/H/D 수정", ws):
+            for row in range(2, ws.max_row + 1):
+                col_h.d_column(ws[f"D{row}"], ws[f"O{row}"],
+                               ws[f"P{row}"], ws[f"V{row}"])
+                col_h.f_column(ws[f"F{row}"])
+                col_h.h_i_column(ws[f"H{row}"])
+                col_h.h_i_column(ws[f"I{row}"])
+                col_h.a_formula_column(ws[f"A{row}"])
+                self._jeju_address_column(ws, row, ws[f"J{row}"])  # 확인필요
+                col_h.e_column(ws[f"E{row}"])
+                col_h.convert_int_column(ws[f"P{row}"])
         print(f'[{ws.title}] 서식 적용 완료')
 
-        output_path = self.ex.save_file(self.file_path)
+        output_path = self.ex.save_file(self.file_path, streaming=self.streaming)
         print(f"브랜디 ERP 자동화 완료!\n처리된 파일: {output_path}")
         return output_path
 
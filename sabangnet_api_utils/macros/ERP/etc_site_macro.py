@@ -1,28 +1,48 @@
-from openpyxl.styles import Font, Alignment
 from utils.excels.excel_handler import ExcelHandler
 from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.style_registry import apply_style
+from utils.excels.row_pipeline import RowPipeline
+from utils.excels.column_rules import convert_int_values, format_mobile_numbers
+from utils.excels.site_matcher import SiteMatcher
+
+
+# 주문 번호 숫자 변환 대상 사이트
+NUMERIC_SITES = SiteMatcher(["에이블리", "오늘의집", "쿠팡", "텐바이텐",
+                             "NS홈쇼핑", "그립", "보리보리", "카카오선물하기", "톡스토어", "토스"])
 
 
 class ERPEtcSiteMacro:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, streaming: bool = False, read_only: bool = False,
+                 parallel: bool = False):
         self.file_path = file_path
-        self.ex = ExcelHandler.from_file(file_path)
+        self.streaming = streaming
+        self.parallel = parallel
+        self.ex = ExcelHandler.from_file(file_path, read_only=read_only)
         self.ws = self.ex.ws
         self.wb = self.ex.wb
         self.order_dict = set()
         self.toss_order_info = {}
+        self._post = None
 
-    def etc_site_macro_run(self):
-        col_h = ExcelColumnHandler()
+    def __getstate__(self):
+        """
+        병렬 모드 워커 전달용 상태 (워크북, 핸들러, 규칙 파이프라인 제외)
+        """
+        state = self.__dict__.copy()
+        state.update(ex=None, ws=None, wb=None, _post=None)
+        return state
 
-        for row in range(2, self.ws.max_row + 1):
-            self._overlap_by_site_column(self.ws[f"B{row}"], row)
-            self._toss_process_column(self.ws[f"B{row}"], row)
-            self._order_num_by_site_column(self.ws[f"B{row}"])
-            self._kakao_jeju_process_column(
-                self.ws[f"B{row}"], self.ws[f"J{row}"], self.ws[f"F{row}"])
-            col_h.h_i_column(self.ws[f"H{row}"])
-            col_h.h_i_column(self.ws[f"I{row}"])
+    def etc_site_macro_run(self):
+        # 분리 전 규칙: 원본 시트 1회 순회
+        pre = RowPipeline("기타 사이트 ERP 분리 전")
+        pre.add("사이트별 중복 주문", lambda ws, row: self._overlap_by_site_column(ws[f"B{row}"], row))
+        pre.add("토스 주문", lambda ws, row: self._toss_process_column(ws[f"B{row}"], row))
+        pre.add("B 주문번호", lambda ws, row: self._order_num_by_site_column(ws[f"B{row}"]))
+        pre.add("카카오 제주", lambda ws, row: self._kakao_jeju_process_column(
+            ws[f"B{row}"], ws[f"J{row}"], ws[f"F{row}"]))
+        pre.add_column("H 전화번호", "H", format_mobile_numbers)
+        pre.add_column("I 전화번호", "I", format_mobile_numbers)
+        pre.run(self.ws)
 
         self._toss_order_info_process()
 
@@ -38,35 +58,62 @@ class ERPEtcSiteMacro:
         sort_columns = [2, 3, -4, 5, 6]
         print("시트별 정렬, 시트 분리 시작...")
         headers, data = self.ex.preprocess_and_update_ws(self.ws, sort_columns)
-        self.ex.split_and_write_ws_by_site(
+        pending = self.ex.split_and_write_ws_by_site(
             wb=self.wb,
             headers=headers,
             data=data,
             sheets_name=sheets_name,
             site_to_sheet=site_to_sheet,
             site_col_idx=2,
+            formatter=self.format_split_sheet if self.parallel else None,
         )
         print("시트별 정렬, 시트 분리 완료")
 
         print("시트별 서식, 디자인 적용 시작...")
+        # 병렬 모드: 워커가 계정 시트를 처리하는 동안 나머지 시트(자동화) 처리
+        skip = pending.titles if pending is not None else set()
         for ws in self.wb.worksheets:
-            self.ex.set_header_style(ws)
-            if ws.max_row <= 1:
-                continue
-            for row in range(2, ws.max_row + 1):
-                col_h.a_value_column(ws[f"A{row}"])
-                col_h.d_column(ws[f"D{row}"],ws[f"U{row}"], ws[f"V{row}"])
-                col_h.e_column(ws[f"E{row}"])
-                col_h.f_column(ws[f"F{row}"])
-                col_h.l_column(ws[f"L{row}"])
-                col_h.convert_int_column(ws[f"P{row}"])
-                self._v_column_red_font(ws[f"V{row}"])
-            print(f"[{ws.title}] 서식 및 디자인 적용 완료")
-
-        output_path = self.ex.save_file(self.file_path)
+            if ws.title not in skip:
+                self.format_split_sheet(self.ex, ws)
+        if pending is not None:
+            pending.result()
+        pre.log_timings()
+        self._post_pipeline().log_timings()
+
+        output_path = self.ex.save_file(self.file_path, streaming=self.streaming)
         print(f"✓ 기타 사이트 ERP 자동화 완료! 최종 파일: {output_path}")
         return output_path
 
+    def format_split_sheet(self, ex, ws):
+        """
+        헤더 서식 및 분리 후 규칙 적용
+        args:
+            ex: 시트가 속한 워크북의 ExcelHandler (병렬 모드에서는 워커 워크북 핸들러)
+        """
+        ex.set_header_style(ws)
+        if ws.max_row <= 1:
+            return
+        self._post_pipeline().run(ws)
+        print(f"[{ws.title}] 서식 및 디자인 적용 완료")
+
+    def _post_pipeline(self) -> RowPipeline:
+        """
+        분리 후 규칙: 시트별 1회 순회
+        """
+        if self._post is not None:
+            return self._post
+        col_h = ExcelColumnHandler()
+        post = RowPipeline("기타 사이트 ERP 분리 후")
+        post.add("A 순번", lambda ws, row: col_h.a_value_column(ws[f"A{row}"]))
+        post.add("D=U+V", lambda ws, row: col_h.d_column(ws[f"D{row}"], ws[f"U{row}"], ws[f"V{row}"]))
+        post.add("E", lambda ws, row: col_h.e_column(ws[f"E{row}"]))
+        post.add("F", lambda ws, row: col_h.f_column(ws[f"F{row}"]))
+        post.add("L", lambda ws, row: col_h.l_column(ws[f"L{row}"]))
+        post.add("V 빨간 글씨", lambda ws, row: self._v_column_red_font(ws[f"V{row}"]))
+        post.add_column("P 정수", "P", convert_int_values)
+        self._post = post
+        return post
+
     def _overlap_by_site_column(self, b_cell, row):
         """
         각 사이트별 중복 주문 처리
@@ -124,10 +171,7 @@ class ERPEtcSiteMacro:
         args:
             cell: 주문 번호 셀
         """
-        site_list = ["에이블리", "오늘의집", "쿠팡", "텐바이텐",
-                     "NS홈쇼핑", "그립", "보리보리", "카카오선물하기", "톡스토어", "토스"]
-        cell_text = str(cell.value)
-        if any(site in cell_text for site in site_list):
+        if NUMERIC_SITES.match(str(cell.value)):
             order_num = cell.value
             if order_num is not None and str(order_num).replace('.', '').isdigit():
                 cell.value = int(float(order_num))
@@ -154,5 +198,5 @@ class ERPEtcSiteMacro:
             v_cell: V 컬럼 셀
         """
         if v_cell.value == 0:
-            v_cell.font = Font(color="FF0000", bold=True)
-            v_cell.alignment = Alignment(horizontal='right')
+            apply_style(v_cell, "red_font")
+            apply_style(v_cell, "align_right")
@@ -1,26 +1,43 @@
 from openpyxl.cell import Cell
 from utils.excels.excel_handler import ExcelHandler
 from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.row_pipeline import RowPipeline
+from utils.excels.column_rules import convert_int_values
+
+
+def _is_auto_sheet(ws) -> bool:
+    return ws.title == "자동화"
 
 
 class ERPGmaAucMacro:
-    def __init__(self, file_path: str):
-        self.ex = ExcelHandler.from_file(file_path)
+    def __init__(self, file_path: str, streaming: bool = False, read_only: bool = False,
+                 parallel: bool = False):
+        self.ex = ExcelHandler.from_file(file_path, read_only=read_only)
         self.file_path = file_path
+        self.streaming = streaming
+        self.parallel = parallel
         self.ws = self.ex.ws
         self.wb = self.ex.wb
         self.basket_dict = {}
         self.headers = None
+        self._post = None
+
+    def __getstate__(self):
+        """
+        병렬 모드 워커 전달용 상태 (워크북, 핸들러, 규칙 파이프라인 제외)
+        """
+        state = self.__dict__.copy()
+        state.update(ex=None, ws=None, wb=None, _post=None)
+        return state
 
     def gauc_erp_macro_run(self):
-        col_h = ExcelColumnHandler()
         self.basket_set = set()
 
         # 장바구니 중복 값 0으로 초기화
-        for row in range(2, self.ws.max_row + 1):
-            self._add_basket_dict(
-                self.ws[f"Q{row}"], self.ws[f"V{row}"])
-            
+        pre = RowPipeline("G,옥 ERP 분리 전")
+        pre.add("장바구니 중복", lambda ws, row: self._add_basket_dict(ws[f"Q{row}"], ws[f"V{row}"]))
+        pre.run(self.ws)
+
         # 시트 설정
         sheets_name = ["OK,CL,BB", "IY"]
         site_to_sheet = {
@@ -34,47 +51,71 @@ class ERPGmaAucMacro:
         sort_columns = [2, 3, -5]
         print("시트별 정렬, 시트 분리 시작...")
         headers, data = self.ex.preprocess_and_update_ws(self.ws, sort_columns)
-
-        # 배송비 적용
-        for row in range(self.ws.max_row, 1, -1):
-            self._shipping_costs_column(self.ws[f"Q{row}"], self.ws[f"V{row}"])
-
-        self.ex.split_and_write_ws_by_site(
+        pending = self.ex.split_and_write_ws_by_site(
             wb=self.wb,
             headers=headers,
             data=data,
             sheets_name=sheets_name,
             site_to_sheet=site_to_sheet,
             site_col_idx=2,
+            formatter=self.format_split_sheet if self.parallel else None,
         )
         print("시트별 정렬, 시트 분리 완료")
 
         print("시트별 서식, 디자인 적용 시작...")
+        # 병렬 모드: 워커가 계정 시트를 처리하는 동안 나머지 시트(자동화) 처리
+        skip = pending.titles if pending is not None else set()
         for ws in self.wb.worksheets:
-            self.ex.set_header_style(ws)
-            if ws.max_row <= 1:
-                continue
-            for row in range(2, ws.max_row + 1):
-                if ws.title != "자동화":
-                    col_h.a_value_column(ws[f"A{row}"])
-                else:
-                    col_h.a_formula_column(ws[f"A{row}"])
-                col_h.d_column(
-                    ws[f"D{row}"], ws[f"O{row}"], ws[f"P{row}"], ws[f"V{row}"])
-                col_h.e_column(ws[f"E{row}"])
-                col_h.f_column(ws[f"F{row}"])
-                col_h.l_column(ws[f"L{row}"])
-                col_h.convert_int_column(ws[f"P{row}"])
-                col_h.convert_int_column(ws[f"R{row}"])
-                col_h.convert_int_column(ws[f"S{row}"])
-                col_h.convert_int_column(ws[f"V{row}"])
-
-            print(f"[{ws.title}] 서식 및 디자인 적용 완료")
-
-        output_path = self.ex.save_file(self.file_path)
+            if ws.title not in skip:
+                self.format_split_sheet(self.ex, ws)
+        if pending is not None:
+            pending.result()
+        pre.log_timings()
+        self._post_pipeline().log_timings()
+
+        output_path = self.ex.save_file(self.file_path, streaming=self.streaming)
         print(f"✓ G,옥 ERP 자동화 완료! 최종 파일: {output_path}")
         return output_path
 
+    def format_split_sheet(self, ex, ws):
+        """
+        헤더 서식 및 분리 후 규칙 적용
+        args:
+            ex: 시트가 속한 워크북의 ExcelHandler (병렬 모드에서는 워커 워크북 핸들러)
+        """
+        ex.set_header_style(ws)
+        if ws.max_row <= 1:
+            return
+        self._post_pipeline().run(ws, reverse=_is_auto_sheet(ws))
+        print(f"[{ws.title}] 서식 및 디자인 적용 완료")
+
+    def _post_pipeline(self) -> RowPipeline:
+        """
+        분리 후 규칙: 시트별 1회 순회
+        자동화 시트는 정렬된 원본이므로 배송비(마지막 행 우선 적용)를 같은 역순 순회에서 처리
+        분리 시트 데이터는 배송비 적용 전에 추출되므로 기존 순서와 결과 동일
+        """
+        if self._post is not None:
+            return self._post
+        col_h = ExcelColumnHandler()
+        is_auto = _is_auto_sheet
+        post = RowPipeline("G,옥 ERP 분리 후")
+        post.add("배송비", lambda ws, row: self._shipping_costs_column(ws[f"Q{row}"], ws[f"V{row}"]),
+                 sheets=is_auto)
+        post.add("A 순번", lambda ws, row: col_h.a_value_column(ws[f"A{row}"]),
+                 sheets=lambda ws: not is_auto(ws))
+        post.add("A 순번 수식", lambda ws, row: col_h.a_formula_column(ws[f"A{row}"]), sheets=is_auto)
+        post.add("D", lambda ws, row: col_h.d_column(
+            ws[f"D{row}"], ws[f"O{row}"], ws[f"P{row}"], ws[f"V{row}"]))
+        post.add("E", lambda ws, row: col_h.e_column(ws[f"E{row}"]))
+        post.add("F", lambda ws, row: col_h.f_column(ws[f"F{row}"]))
+        post.add("L", lambda ws, row: col_h.l_column(ws[f"L{row}"]))
+        # 정수 변환은 행 규칙(D 합계 등) 이후 열 단위로 일괄 적용
+        for col in ("P", "R", "S", "V"):
+            post.add_column(f"{col} 정수", col, convert_int_values)
+        self._post = post
+        return post
+
     def _add_basket_dict(self, basket_cell: Cell, shipping_cell: Cell):
         """
         장바구니 중복 값 추가
@@ -1,16 +1,44 @@
 from utils.excels.excel_handler import ExcelHandler
 from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.row_pipeline import RowPipeline
+from utils.excels.chunked_processor import ChunkedSheetProcessor, DEFAULT_CHUNK_ROWS
+from utils.excels.product_lookup import ProductLookupIndex
 
 
 class ERPZigzagMacro:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, streaming: bool = False, read_only: bool = False,
+                 parallel: bool = False, chunked: bool = False, memory_mb: float | None = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """
+        args:
+            chunked: True 면 원본 전체를 적재하지 않고 chunk_rows 행 단위로 처리 (대용량 파일)
+            memory_mb: 청크 모드 정렬 메모리 상한 (초과 시 임시 파일로 분할 정렬)
+        """
         self.file_path = file_path
-        self.ex = ExcelHandler.from_file(file_path)
+        self.streaming = streaming
+        self.parallel = parallel
+        self.chunked = chunked
+        if chunked:
+            self.processor = ChunkedSheetProcessor(file_path, chunk_rows=chunk_rows, memory_mb=memory_mb)
+            self.ex = self.processor.ex
+        else:
+            self.ex = ExcelHandler.from_file(file_path, read_only=read_only)
         self.ws = self.ex.ws
         self.wb = self.ex.wb
+        self.vlookup_dict = {}
+        self._post = None
+
+    def __getstate__(self):
+        """
+        병렬 모드 워커 전달용 상태 (워크북, 핸들러, 규칙 파이프라인 제외)
+        """
+        state = self.__dict__.copy()
+        state.update(ex=None, ws=None, wb=None, _post=None)
+        return state
 
     def zigzag_erp_macro_run(self) -> str:
-        col_h = ExcelColumnHandler()
+        if self.chunked:
+            return self._chunked_run()
 
         # 시트 설정
         sheets_name = ["OK", "IY"]
@@ -25,40 +53,93 @@ class ERPZigzagMacro:
         headers, data = self.ex.preprocess_and_update_ws(self.ws, sort_columns)
 
         # sheet1 vlookup 딕셔너리 생성 후 삭제
-        vlookup_dict = self.ex.create_vlookup_dict(self.wb)
+        self.vlookup_dict = self.ex.create_vlookup_dict(self.wb)
 
-        self.ex.split_and_write_ws_by_site(
+        pending = self.ex.split_and_write_ws_by_site(
             wb=self.wb,
             headers=headers,
             data=data,
             sheets_name=sheets_name,
             site_to_sheet=site_to_sheet,
             site_col_idx=2,
+            formatter=self.format_split_sheet if self.parallel else None,
         )
         print("시트별 정렬, 시트 분리 완료")
 
         print("시트별 서식, 디자인 적용 시작...")
+        # 병렬 모드: 워커가 계정 시트를 처리하는 동안 나머지 시트(자동화) 처리
+        skip = pending.titles if pending is not None else set()
         for ws in self.wb.worksheets:
-            self.ex.set_header_style(ws)
-            if ws.max_row <= 1:
-                continue
-            for row in range(2, ws.max_row + 1):
-                if ws.title != "자동화":
-                    col_h.a_value_column(ws[f"A{row}"])
-                else:
-                    col_h.a_formula_column(ws[f"A{row}"])
-                col_h.d_column(ws[f"D{row}"], ws[f"U{row}"],
-                               ws[f"V{row}"])  # =U2+V2
-                col_h.e_column(ws[f"E{row}"])
-                col_h.f_column(ws[f"F{row}"])
-                # VLOOKUP 적용
-                self._vlookup_column(ws[f"M{row}"], ws[f"V{row}"], vlookup_dict)
-            print(f"[{ws.title}] 서식 및 디자인 적용 완료")
+            if ws.title not in skip:
+                self.format_split_sheet(self.ex, ws)
+        if pending is not None:
+            pending.result()
+        self._post_pipeline().log_timings()
+
+        output_path = self.ex.save_file(self.file_path, streaming=self.streaming)
+        print(f"✓ 지그재그 자동화 완료! 최종 파일: {output_path}")
+        return output_path
 
-        output_path = self.ex.save_file(self.file_path)
+    def _chunked_run(self) -> str:
+        """
+        청크 모드: 외부 정렬 → 시트 분리/분리 후 규칙을 청크 단위로 처리
+        """
+        output_path = ExcelHandler.macro_output_path(self.file_path)
+        self.processor.process(
+            output_path,
+            sort_columns=[2, 3, 5],
+            sheets_name=["OK", "IY"],
+            site_to_sheet={"오케이마트": "OK", "아이예스": "IY"},
+            post=self._post_pipeline(),
+            lookup=self._merge_lookup,
+        )
+        self._post_pipeline().log_timings()
         print(f"✓ 지그재그 자동화 완료! 최종 파일: {output_path}")
         return output_path
 
+    def _merge_lookup(self, src_wb):
+        """
+        청크 모드: 읽기 전용 원본의 Sheet1 매핑 (같은 내용이 이미 인덱스에 있으면 다시 병합하지 않음)
+        """
+        if "Sheet1" in src_wb.sheetnames:
+            self.vlookup_dict = ProductLookupIndex.shared().lookup(src_wb["Sheet1"])
+        else:
+            self.vlookup_dict = {}
+
+    def format_split_sheet(self, ex, ws):
+        """
+        헤더 서식 및 분리 후 규칙 적용
+        args:
+            ex: 시트가 속한 워크북의 ExcelHandler (병렬 모드에서는 워커 워크북 핸들러)
+        """
+        ex.set_header_style(ws)
+        if ws.max_row <= 1:
+            return
+        self._post_pipeline().run(ws)
+        print(f"[{ws.title}] 서식 및 디자인 적용 완료")
+
+    def _post_pipeline(self) -> RowPipeline:
+        """
+        분리 후 규칙: 시트별 1회 순회
+        """
+        if self._post is not None:
+            return self._post
+        col_h = ExcelColumnHandler()
+        post = RowPipeline("지그재그 ERP 분리 후")
+        post.add("A 순번", lambda ws, row: col_h.a_value_column(ws[f"A{row}"]),
+                 sheets=lambda ws: ws.title != "자동화")
+        post.add("A 순번 수식", lambda ws, row: col_h.a_formula_column(ws[f"A{row}"]),
+                 sheets=lambda ws: ws.title == "자동화")
+        # =U2+V2
+        post.add("D=U+V", lambda ws, row: col_h.d_column(ws[f"D{row}"], ws[f"U{row}"], ws[f"V{row}"]))
+        post.add("E", lambda ws, row: col_h.e_column(ws[f"E{row}"]))
+        post.add("F", lambda ws, row: col_h.f_column(ws[f"F{row}"]))
+        # VLOOKUP 적용
+        post.add("V VLOOKUP", lambda ws, row: self._vlookup_column(
+            ws[f"M{row}"], ws[f"V{row}"], self.vlookup_dict))
+        self._post = post
+        return post
+
     def _vlookup_column(self, key_cell, value_cell, vlookup_dict):
         """
         VLOOKUP 적용
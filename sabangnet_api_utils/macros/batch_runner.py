@@ -0,0 +1,331 @@
+"""
+ERP / 합포장 매크로 일괄 실행
+- 디렉토리(파일명으로 매크로 판별) 또는 매니페스트(파일, 매크로 목록)를 입력으로 받아 프로세스 풀에서 실행
+- 파일별 실행 시간, 입력/출력 행 수를 JSON 요약 파일로 기록
+
+실행:
+    python -m utils.macros.batch_runner ./files/excel/erp --workers 4 --summary batch_summary.json
+    python -m utils.macros.batch_runner manifest.json
+    python -m utils.macros.batch_runner ./files/excel/erp --profile   # 파일별 단계 프로파일 로그
+
+매니페스트 형식 (JSON):
+    [
+        {"file": "./files/excel/erp/지그재그-ERP용.xlsx", "macro": "erp.zigzag"},
+        {"file": "./files/excel/기타사이트-합포장용.xlsx", "macro": "happojang.etc_site", "options": {"streaming": true}}
+    ]
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import openpyxl
+
+from utils.profiling import PROFILE_ENV, JobProgress, MacroCancelledError
+from utils.excels.csv_reader import is_csv_file, iter_csv_rows, sheet_title
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# 매크로 이름 → (모듈, 클래스 또는 함수, 실행 메소드 (함수면 None))
+MACROS = {
+    "erp.etc_site": ("utils.macros.ERP.etc_site_macro", "ERPEtcSiteMacro", "etc_site_macro_run"),
+    "erp.zigzag": ("utils.macros.ERP.zigzag_erp_macro", "ERPZigzagMacro", "zigzag_erp_macro_run"),
+    "erp.ali": ("utils.macros.ERP.ali_erp_macro", "ERPAliMacro", "ali_erp_macro_run"),
+    "erp.brandi": ("utils.macros.ERP.brandi_erp_macro", "ERPBrandiMacro", "brandi_erp_macro_run"),
+    "erp.gauc": ("utils.macros.ERP.g_a_erp_macro", "ERPGmaAucMacro", "gauc_erp_macro_run"),
+    "happojang.etc_site": ("utils.macros.happojang.etc_site_merge_packaging", "etc_site_merge_packaging", None),
+    "happojang.zigzag": ("utils.macros.happojang.zigzag_merge_packaging", "zigzag_merge_packaging", None),
+    "happojang.ali": ("utils.macros.happojang.ali_merge_packaging", "ali_merge_packaging", None),
+    "happojang.brandy": ("utils.macros.happojang.brandy_merge_packaging", "brandy_merge_packaging", None),
+    "happojang.gok": ("utils.macros.happojang.gok_merge_packaging", "gok_merge_packaging", None),
+}
+
+# 파일명 키워드 → 몰 (위에서부터 먼저 일치하는 키워드 사용)
+MALL_KEYWORDS = [
+    ("지그재그", "zigzag"), ("zigzag", "zigzag"),
+    ("알리", "ali"), ("ali", "ali"),
+    ("브랜디", "brandi"), ("brandi", "brandi"), ("brandy", "brandi"),
+    ("G,옥", "gauc"), ("지마켓", "gauc"), ("옥션", "gauc"), ("gauc", "gauc"), ("gok", "gauc"),
+    ("기타", "etc_site"), ("etc", "etc_site"),
+]
+
+# 영문 키워드는 단어 단위로만 일치 (예: "retail" 의 "ali", "gokart" 의 "gok" 제외)
+_MALL_PATTERNS = [
+    (re.compile(rf"(?<![a-z]){re.escape(keyword.lower())}(?![a-z])" if keyword.isascii()
+                else re.escape(keyword.lower())), mall)
+    for keyword, mall in MALL_KEYWORDS
+]
+
+# 합포장 매크로의 몰 이름
+HAPPOJANG_MALLS = {"etc_site": "etc_site", "zigzag": "zigzag", "ali": "ali", "brandi": "brandy", "gauc": "gok"}
+
+EXCEL_SUFFIXES = {".xlsx", ".xlsm", ".csv", ".tsv"}
+
+
+def detect_macro(file_path: str | Path) -> str | None:
+    """
+    파일명으로 매크로 판별 ('합포장' 포함 시 합포장, 그 외 ERP)
+    예시:
+        detect_macro("지그재그-[기본양식]-ERP용.xlsx")   # 'erp.zigzag'
+        detect_macro("test-[기본양식]-합포장용.xlsx")     # None (몰 판별 불가)
+        detect_macro("retail_orders.xlsx")              # None ("ali" 는 단어 단위로만 일치)
+    """
+    name = Path(file_path).stem
+    lowered = name.lower()
+    mall = next((m for pattern, m in _MALL_PATTERNS if pattern.search(lowered)), None)
+    if mall is None:
+        return None
+    if "합포장" in name or "happojang" in lowered:
+        return f"happojang.{HAPPOJANG_MALLS[mall]}"
+    return f"erp.{mall}"
+
+
+def load_jobs(source: str | Path, macro: str | None = None) -> list[dict]:
+    """
+    작업 목록 구성
+    args:
+        source: 디렉토리 또는 매니페스트(JSON) 경로
+        macro: 디렉토리 입력 시 모든 파일에 적용할 매크로 (기본값: 파일명으로 판별)
+    return: [{"file": 경로, "macro": 매크로 이름 또는 None, "options": {}}]
+    """
+    source = Path(source)
+    if source.is_dir():
+        files = sorted(p for p in source.iterdir()
+                       if p.suffix.lower() in EXCEL_SUFFIXES and not p.name.startswith("~$")
+                       and not p.stem.endswith("_매크로_완료"))
+        return [{"file": str(p), "macro": macro or detect_macro(p), "options": {}} for p in files]
+
+    with open(source, encoding="utf-8") as f:
+        entries = json.load(f)
+    base = source.parent
+    jobs = []
+    for entry in entries:
+        file_path = Path(entry["file"])
+        if not file_path.is_absolute() and not file_path.exists():
+            file_path = base / file_path
+        jobs.append({
+            "file": str(file_path),
+            "macro": entry.get("macro") or macro or detect_macro(file_path),
+            "options": entry.get("options") or {},
+        })
+    return jobs
+
+
+def sheet_row_counts(file_path: str) -> dict[str, int]:
+    """
+    시트별 데이터 행 수 (헤더 제외, 읽기 전용 로드)
+    예시:
+        sheet_row_counts("./files/excel/erp/알리-ERP용.xlsx")   # {"Sheet": 400, "Sheet1": 120}
+    """
+    if is_csv_file(file_path):
+        return {sheet_title(file_path): max(sum(1 for _ in iter_csv_rows(file_path)) - 1, 0)}
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return {ws.title: max((ws.max_row or 1) - 1, 0) for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def _macro_target(macro: str):
+    if macro not in MACROS:
+        raise ValueError(f"알 수 없는 매크로: {macro} (지원: {', '.join(MACROS)})")
+    module_name, attr, method = MACROS[macro]
+    return getattr(importlib.import_module(module_name), attr), method
+
+
+def macro_options(macro: str) -> dict[str, inspect.Parameter]:
+    """
+    매크로가 받는 옵션 {이름: 파라미터} (첫 번째 인자인 파일 경로 제외)
+    예시:
+        list(macro_options("erp.zigzag"))   # ['streaming', 'read_only', 'parallel', 'chunked', ...]
+    """
+    target, _ = _macro_target(macro)
+    params = list(inspect.signature(target).parameters.values())
+    return {p.name: p for p in params[1:] if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)}
+
+
+def validate_options(macro: str, options: dict | None = None) -> dict:
+    """
+    작업 등록 전 옵션 검증 (매크로별 지원 옵션, 기본값이 bool / int 인 옵션의 타입)
+    return: 옵션 dict (None 이면 {})
+    raise: ValueError
+    예시:
+        validate_options("erp.etc_site", {"chunked": True})   # ValueError (청크 모드는 알리 / 지그재그 ERP 만 지원)
+    """
+    options = options or {}
+    supported = macro_options(macro)
+    unknown = sorted(set(options) - set(supported))
+    if unknown:
+        raise ValueError(f"[{macro}] 지원하지 않는 옵션: {', '.join(unknown)} (지원: {', '.join(supported) or '없음'})")
+    for name, value in options.items():
+        default = supported[name].default
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"[{macro}] {name} 옵션은 true / false 여야 함: {value!r}")
+        elif isinstance(default, int) and (isinstance(value, bool) or not isinstance(value, int) or value <= 0):
+            raise ValueError(f"[{macro}] {name} 옵션은 양의 정수여야 함: {value!r}")
+    return options
+
+
+def run_macro(file_path: str, macro: str, options: dict | None = None) -> str:
+    """
+    매크로 1건 실행 후 결과 파일 경로 반환
+    """
+    target, method = _macro_target(macro)
+    options = options or {}
+    if method is None:
+        return target(file_path, **options)
+    return getattr(target(file_path, **options), method)()
+
+
+def run_job(job: dict) -> dict:
+    """
+    워커 프로세스: 작업 1건 실행 (예외는 결과에 기록, 작업 큐 취소 시 status "cancelled")
+    """
+    result = {
+        "file": job["file"],
+        "macro": job["macro"],
+        "status": "failed",
+        "output": None,
+        "seconds": 0.0,
+        "input_rows": None,
+        "output_rows": None,
+        "error": None,
+        "pid": os.getpid(),
+    }
+    started = time.perf_counter()
+    try:
+        if job["macro"] is None:
+            raise ValueError("파일명으로 매크로를 판별할 수 없음 (매니페스트 또는 --macro 로 지정)")
+        result["input_rows"] = sheet_row_counts(job["file"])
+        started = time.perf_counter()
+        output = run_macro(job["file"], job["macro"], job.get("options"))
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["output"] = output
+        result["output_rows"] = sheet_row_counts(output)
+        result["status"] = "ok"
+    except MacroCancelledError as e:
+        # 작업 큐 취소 요청 (단계 사이에서 중단)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["status"] = "cancelled"
+        result["error"] = str(e)
+    except Exception as e:
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    return result
+
+
+def run_queued_job(job: dict, state, cancels, interval: float) -> dict:
+    """
+    워커 프로세스: 작업 큐 진행률 보고 / 취소 확인을 켜고 run_job 실행 (macro_job_queue 에서 사용)
+    """
+    with JobProgress(job["batch_id"], state, cancels, interval).activate():
+        return run_job(job)
+
+
+def run_batch(jobs: list[dict], max_workers: int | None = None, summary_path: str | None = None) -> dict:
+    """
+    작업 목록을 프로세스 풀에서 실행하고 요약 반환 (summary_path 지정 시 JSON 저장)
+    args:
+        max_workers: 워커 수 (기본값: min(작업 수, CPU 수)), 1 이면 현재 프로세스에서 순차 실행
+    """
+    started_at = datetime.now()
+    started = time.perf_counter()
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1) or 1
+    # 결과는 입력 순서대로 기록
+    results = [None] * len(jobs)
+
+    # 옵션 오류 작업은 실행하지 않고 실패로 기록
+    runnable = []
+    for idx, job in enumerate(jobs):
+        error = _option_error(job)
+        if error is None:
+            runnable.append(idx)
+        else:
+            results[idx] = {"file": job["file"], "macro": job["macro"], "status": "failed", "output": None,
+                            "seconds": 0.0, "input_rows": None, "output_rows": None, "error": error, "pid": None}
+            _log_result(results[idx])
+
+    if workers == 1:
+        for idx in runnable:
+            results[idx] = run_job(jobs[idx])
+            _log_result(results[idx])
+    elif runnable:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_job, jobs[idx]): idx for idx in runnable}
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                _log_result(results[idx])
+
+    summary = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - started, 3),
+        "workers": workers,
+        "total": len(results),
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "cancelled": sum(r["status"] == "cancelled" for r in results),
+        "jobs": results,
+    }
+    if summary_path:
+        Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    logger.info(f"일괄 처리 완료: {summary['succeeded']}/{summary['total']}건 성공, "
+                f"{summary['failed']}건 실패, {summary['cancelled']}건 취소, {summary['seconds']:.1f}s")
+    return summary
+
+
+def _option_error(job: dict) -> str | None:
+    """
+    작업 옵션 검증 오류 메시지 (매크로 미판별은 run_job 에서 기록)
+    """
+    if job["macro"] is None:
+        return None
+    try:
+        validate_options(job["macro"], job.get("options"))
+    except ValueError as e:
+        return f"ValueError: {e}"
+    return None
+
+
+def _log_result(result: dict) -> None:
+    name = Path(result["file"]).name
+    if result["status"] == "ok":
+        logger.info(f"[{result['macro']}] {name} 완료 {result['seconds']:.2f}s → {result['output']}")
+    elif result["status"] == "cancelled":
+        logger.warning(f"[{result['macro']}] {name} 취소: {result['error']}")
+    else:
+        logger.error(f"[{result['macro']}] {name} 실패: {result['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ERP / 합포장 매크로 일괄 실행")
+    parser.add_argument("source", help="입력 디렉토리 또는 매니페스트(JSON) 경로")
+    parser.add_argument("--macro", choices=sorted(MACROS), help="모든 파일에 적용할 매크로 (기본값: 파일명으로 판별)")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수")
+    parser.add_argument("--summary", default="batch_summary.json", help="요약 JSON 저장 경로")
+    parser.add_argument("--profile", action="store_true", help="파일별 단계 프로파일 로그 출력")
+    args = parser.parse_args()
+
+    if args.profile:
+        # 워커 프로세스에 상속
+        os.environ[PROFILE_ENV] = "1"
+
+    summary = run_batch(load_jobs(args.source, args.macro), args.workers, args.summary)
+    print(f"{summary['succeeded']}/{summary['total']}건 성공, {summary['cancelled']}건 취소 "
+          f"({summary['seconds']:.1f}s) → {args.summary}")
+    raise SystemExit(1 if summary["failed"] else 0)
@@ -12,11 +12,12 @@ from openpyxl.utils import get_column_letter
 from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from utils.excels.excel_handler import ExcelHandler
+from utils.excels.style_registry import StyleRegistry
+from utils.macros.happojang.incremental import incremental_merge_packaging
 
 
 # 설정 상수
 MALL_NAME = "알리익스프레스"
-RED_FONT = Font(color="FF0000", bold=True)
 
 
 class ALIProductUtils:
@@ -82,8 +83,6 @@ class ALIProductUtils:
 FONT_MALGUN = Font(name="맑은 고딕", size=9)
 HDR_FILL = PatternFill(start_color="006100",
                        end_color="006100", fill_type="solid")
-BLUE_FILL = PatternFill(start_color="CCE8FF",
-                        end_color="CCE8FF", fill_type="solid")
 JEJU_FILL = PatternFill(start_color="DDEBF7",
                         end_color="DDEBF7", fill_type="solid")
 NO_BORDER = Border()
@@ -125,11 +124,12 @@ def calculate_d_column_with_numbers(ws: Worksheet) -> None:
 
 def copy_product_info(ws: Worksheet) -> None:
     """Z열 상품정보를 F열로 복사하고 정리"""
+    styles = StyleRegistry.of(ws.parent)
     for row in range(2, ws.max_row + 1):
         z_val = ws[f"Z{row}"].value
         ws[f"F{row}"].value = ALIProductUtils.clean_product_text(z_val)
         if ALIProductUtils.check_multiple_quantities(ws[f"F{row}"].value):
-            ws[f"F{row}"].fill = BLUE_FILL
+            styles.apply(ws[f"F{row}"], "blue_fill")
 
 
 def process_phones(ws: Worksheet) -> None:
@@ -144,16 +144,20 @@ def process_phones(ws: Worksheet) -> None:
 def process_jeju_orders(ex: ExcelHandler) -> None:
     """제주도 주문 처리"""
     ws = ex.ws
+    styles = StyleRegistry.of(ws.parent)
     for row in range(2, ws.max_row + 1):
         if ALIProductUtils.is_jeju_address(ws[f"J{row}"].value):
-            ws[f"J{row}"].font = RED_FONT
+            styles.apply(ws[f"J{row}"], "red_font")
             if "[3000원 연락해야함]" not in str(ws[f"F{row}"].value):
                 ws[f"F{row}"].value = f"{ws[f'F{row}'].value} [3000원 연락해야함]"
-            ws[f"F{row}"].fill = BLUE_FILL
+            styles.apply(ws[f"F{row}"], "blue_fill")
 
 
-def ali_merge_packaging(input_path: str) -> str:
+def ali_merge_packaging(input_path: str, streaming: bool = False, incremental: bool = False) -> str:
     """알리익스프레스 주문 합포장 자동화 처리"""
+    if incremental:
+        # 같은 날 이미 처리한 주문은 건너뛰고 새 주문만 기존 결과 파일에 반영
+        return incremental_merge_packaging("ali", input_path, streaming=streaming)
     # Excel 파일 로드
     ex = ExcelHandler.from_file(input_path)
     ws = ex.ws
@@ -205,18 +209,20 @@ def ali_merge_packaging(input_path: str) -> str:
     
     # 21. S열 VLOOKUP 처리 (Sheet1이 있는 경우)
     if "Sheet1" in ex.wb.sheetnames:
-        lookup_map = ALIProductUtils.build_lookup_map(ex.wb["Sheet1"])
-        for row in range(2, ws.max_row + 1):
-            m_val = str(ws[f"M{row}"].value)
-            ws[f"S{row}"].value = lookup_map.get(m_val, "S")
+        with ex.step("VLOOKUP", ws):
+            lookup_map = ALIProductUtils.build_lookup_map(ex.wb["Sheet1"])
+            for row in range(2, ws.max_row + 1):
+                m_val = str(ws[f"M{row}"].value)
+                ws[f"S{row}"].value = lookup_map.get(m_val, "S")
     
     # 22. 시트 분리 (OK, IY)
     splitter = ALISheetSplitter(ws)
-    rows_by_sheet = splitter.get_rows_by_sheet()
+    with ex.step("시트 분리", ex.wb):
+        rows_by_sheet = splitter.get_rows_by_sheet()
     
-    for sheet_name, row_indices in rows_by_sheet.items():
-        if row_indices:  # 해당 사이트의 데이터가 있는 경우만
-            splitter.copy_to_new_sheet(ex.wb, sheet_name, row_indices)
+        for sheet_name, row_indices in rows_by_sheet.items():
+            if row_indices:  # 해당 사이트의 데이터가 있는 경우만
+                splitter.copy_to_new_sheet(ex.wb, sheet_name, row_indices)
 
     # # 24. 시트 순서 정리
     # desired = ["자동화", "OK", "IY", "Sheet1"]
@@ -224,9 +230,12 @@ def ali_merge_packaging(input_path: str) -> str:
     #     if name in ex.wb.sheetnames:
     #         ex.wb._sheets.insert(0, ex.wb._sheets.pop(ex.wb.sheetnames.index(name)))
             
+    # 수식(순번, 금액 등) 계산 값을 캐시 값으로 함께 기록 - 엑셀 재계산 없이 값 확인 가능
+    ex.convert_formula_to_value(keep_formula=True)
+
     # 저장
     base_name = Path(input_path).stem  # 확장자 제거한 파일명
-    output_path = ex.happojang_save_file(base_name=base_name)
+    output_path = ex.happojang_save_file(base_name=base_name, streaming=streaming)
     
     print(f"◼︎ [{MALL_NAME}] 합포장 자동화 완료!")
     
@@ -269,16 +278,16 @@ class ALISheetSplitter:
         new_ws = wb.create_sheet(sheet_name)
         
         # 헤더와 열 너비 복사
+        headers = ExcelHandler.read_rows(self.ws, 1, 1, max_col=self.last_col)[0]
         for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
+            new_ws.cell(row=1, column=c, value=headers[c - 1])
             new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
         
         # 데이터 복사
+        rows = ExcelHandler.read_rows(self.ws, max_col=self.last_col)
         for idx, r in enumerate(row_indices, start=2):
-            for c in range(1, self.last_col + 1):
-                new_ws.cell(row=idx, column=c, 
-                          value=self.ws.cell(row=r, column=c).value)
+            for c, value in enumerate(rows[r - 1], start=1):
+                new_ws.cell(row=idx, column=c, value=value)
             new_ws[f"A{idx}"].value = "=ROW()-1"
 
 
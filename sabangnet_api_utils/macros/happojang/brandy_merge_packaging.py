@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 import re
-from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -13,6 +12,9 @@ from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.styles import Alignment
 
 from utils.excels.excel_handler import ExcelHandler
+from utils.excels.column_rules import format_phone_numbers, transform_column
+from utils.excels.row_sort import STYLES_KEEP, macro_sort_styles
+from utils.macros.happojang.incremental import incremental_merge_packaging
 
 
 # 설정 상수
@@ -38,74 +40,62 @@ class BrandyProductProcessor:
 
 class BrandyOrderMerger:
     """브랜디 주문 데이터 그룹핑 및 병합 처리"""
-    
+
+    # C열(상품번호), J열(수령인) 기준 그룹
+    KEY_COLUMNS = ("C", "J")
+
     def __init__(self, ws: Worksheet):
         self.ws = ws
-        self.groups = defaultdict(list)
-        
-    def group_by_product_and_receiver(self) -> None:
-        """C열(상품번호)와 J열(수령인) 기준으로 그룹핑"""
+
+    def merge_group(self, ws: Worksheet, rows: List[int]) -> None:
+        """중복 그룹 병합 (첫 행에 D열 합계 / F열 모델명 결합 기록)"""
+        base_row = rows[0]  # 첫 행 유지
+        print(f"📦 중복 발견: {'|'.join(str(ws[f'{col}{base_row}'].value).strip() for col in self.KEY_COLUMNS)} - 행번호: {rows}")
+
+        # D열 금액 합산
+        total_d = 0.0
+        for row in rows:
+            cell_val = ws[f"D{row}"].value
+            if isinstance(cell_val, str) and cell_val.startswith("="):
+                # 수식이 있는 경우 O+P+V 각각 계산
+                o_val = float(ws[f"O{row}"].value or 0)
+                p_val = float(ws[f"P{row}"].value or 0)
+                v_val = float(ws[f"V{row}"].value or 0)
+                total_d += (o_val + p_val + v_val)
+            else:
+                total_d += float(cell_val or 0)
+        ws[f"D{base_row}"].value = total_d
+
+        # G열 수량 합산 2025-07-16 수량은 합산처리 대상 제외
+        # total_g = 0
+        # for row in rows:
+        #     g_val = ws[f"G{row}"].value
+        #     if g_val is not None:
+        #         try:
+        #             total_g += float(str(g_val).strip() or 0)
+        #         except ValueError:
+        #             pass  # 숫자로 변환할 수 없는 경우 무시
+        # ws[f"G{base_row}"].value = total_g
+
+        # F열 모델명 결합
+        models = []
+        for row in rows:
+            model = ws[f"F{row}"].value
+            if model:
+                clean_model = BrandyProductProcessor.clean_product_text(model)
+                if clean_model:
+                    models.append(clean_model)
+        ws[f"F{base_row}"].value = " + ".join(models)
+
+    def merge(self, ex: ExcelHandler) -> List[int]:
+        """
+        그룹별 병합 후 나머지 행을 한 번에 삭제
+        return: 삭제한 행 번호 (삭제 전 기준)
+        """
         print("🔍 그룹핑 시작...")
-        for row in range(2, self.ws.max_row + 1):
-            c_value = str(self.ws[f'C{row}'].value).strip()
-            j_value = str(self.ws[f'J{row}'].value).strip()
-            key = f"{c_value}|{j_value}"
-            
-            self.groups[key].append(row)
-            if len(self.groups[key]) > 1:
-                print(f"📦 중복 발견: {key} - 행번호: {self.groups[key]}")
-        
-        print(f"📊 총 그룹 수: {len(self.groups)}, 중복 그룹: {sum(1 for g in self.groups.values() if len(g) > 1)}")
-            
-    def merge_rows(self) -> List[int]:
-        """그룹별 데이터 병합 처리"""
-        rows_to_delete = []
-        
-        for rows in self.groups.values():
-            if len(rows) == 1:  # 중복 없음
-                continue
-                
-            base_row = rows[0]  # 첫 행 유지
-            
-            # D열 금액 합산
-            total_d = 0.0
-            for row in rows:
-                cell_val = self.ws[f"D{row}"].value
-                if isinstance(cell_val, str) and cell_val.startswith("="):
-                    # 수식이 있는 경우 O+P+V 각각 계산
-                    o_val = float(self.ws[f"O{row}"].value or 0)
-                    p_val = float(self.ws[f"P{row}"].value or 0)
-                    v_val = float(self.ws[f"V{row}"].value or 0)
-                    total_d += (o_val + p_val + v_val)
-                else:
-                    total_d += float(cell_val or 0)
-            self.ws[f"D{base_row}"].value = total_d
-            
-            # G열 수량 합산 2025-07-16 수량은 합산처리 대상 제외
-            # total_g = 0
-            # for row in rows:
-            #     g_val = self.ws[f"G{row}"].value
-            #     if g_val is not None:
-            #         try:
-            #             total_g += float(str(g_val).strip() or 0)
-            #         except ValueError:
-            #             pass  # 숫자로 변환할 수 없는 경우 무시
-            # self.ws[f"G{base_row}"].value = total_g
-            
-            # F열 모델명 결합
-            models = []
-            for row in rows:
-                model = self.ws[f"F{row}"].value
-                if model:
-                    clean_model = BrandyProductProcessor.clean_product_text(model)
-                    if clean_model:
-                        models.append(clean_model)
-            self.ws[f"F{base_row}"].value = " + ".join(models)
-            
-            # 나머지 행은 삭제 대상으로 표시
-            rows_to_delete.extend(rows[1:])
-            
-        return sorted(rows_to_delete, reverse=True)  # 역순 정렬(삭제용)
+        deleted = ex.merge_rows_by_key(self.KEY_COLUMNS, self.merge_group, ws=self.ws)
+        print(f"📊 중복 병합 완료: {len(deleted)}행 삭제")
+        return deleted
 
 class BrandySheetProcessor:
     """브랜디 시트 분리 및 자동화 로직 적용"""
@@ -129,19 +119,19 @@ class BrandySheetProcessor:
         new_ws = wb.create_sheet(sheet_name)
         
         # 헤더와 열 너비 복사
+        headers = ExcelHandler.read_rows(self.ws, 1, 1, max_col=self.last_col)[0]
         for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
+            new_ws.cell(row=1, column=c, value=headers[c - 1])
             new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
             
         return new_ws
 
     def copy_sheet_data(self, ws: Worksheet) -> None:
         """시트에 데이터 행 복사"""
-        for r in range(2, self.last_row + 1):
-            for c in range(1, self.last_col + 1):
-                ws.cell(row=r, column=c, 
-                       value=self.ws.cell(row=r, column=c).value)
+        rows = ExcelHandler.read_rows(self.ws, 2, self.last_row, max_col=self.last_col)
+        for r, values in enumerate(rows, start=2):
+            for c, value in enumerate(values, start=1):
+                ws.cell(row=r, column=c, value=value)
             ws[f"A{r}"].value = "=ROW()-1"
 
     def apply_automation_logic(self, ws: Worksheet) -> None:
@@ -159,33 +149,25 @@ class BrandySheetProcessor:
 
         self.sort_by_d_column_numeric(ws)
 
-        # 4. 그룹핑 및 병합 (정렬은 나중에)
-        merger = BrandyOrderMerger(ws)
-        merger.group_by_product_and_receiver()
-        rows_to_delete = merger.merge_rows()
+        # 4. 그룹핑 및 병합 (중복 행은 한 번에 삭제, 정렬은 나중에)
+        BrandyOrderMerger(ws).merge(ex)
 
         # 6. F열 모델명 정리 (모든 행에 대해 "1개" 제거)
-        left_alignment = Alignment(horizontal='left')
+        styles = ex.styles(ws)
         
         for row in range(2, ws.max_row + 1):
             model_value = ws[f'F{row}'].value
             if model_value:
                 ws[f'F{row}'].value = BrandyProductProcessor.clean_product_text(model_value)
             # F열 왼쪽 정렬 적용
-            ws[f'F{row}'].alignment = left_alignment
-        
-        # 중복 행 삭제 (역순으로)
-        for row_idx in rows_to_delete:
-            ws.delete_rows(row_idx)
+            styles.apply(ws[f'F{row}'], "align_left")
 
         # 7. A열 순번 재설정
         ex.set_row_number(ws)
         
         # 8. 전화번호 처리 (H열, I열)
-        for row in range(2, self.last_row + 1):
-            for col in ('H', 'I'):
-                cell_value = ws[f'{col}{row}'].value
-                ws[f'{col}{row}'].value = ex.format_phone_number(cell_value)
+        for col in ('H', 'I'):
+            transform_column(ws, col, format_phone_numbers, end_row=self.last_row)
         
         # 9. 제주도 주문 처리
         for row in range(2, self.last_row + 1):
@@ -195,15 +177,9 @@ class BrandySheetProcessor:
 
         # 10. 문자열→숫자 변환 2025-07-16 숫자처리 대상 조정
         ex.convert_numeric_strings(cols=("D", "O", "P", "U", "V"))
-        # H열 왼쪽정렬 
-        for row in range(1, ws.max_row + 1):
-            ws[f"H{row}"].alignment = Alignment(horizontal='left')
-        # I열 왼쪽정렬 
-        for row in range(1, ws.max_row + 1):
-            ws[f"I{row}"].alignment = Alignment(horizontal='left')
-        # Q열 왼쪽정렬 
-        for row in range(1, ws.max_row + 1):
-            ws[f"Q{row}"].alignment = Alignment(horizontal='left')
+        # H, I, Q열 왼쪽정렬 
+        for col in ('H', 'I', 'Q'):
+            styles.apply_cells((ws[f"{col}{row}"] for row in range(1, ws.max_row + 1)), "align_left")
 
         # 11. 열 정렬
         ex.set_column_alignment()
@@ -278,45 +254,43 @@ class BrandySheetProcessor:
         D열을 숫자 기준으로 오름차순 정렬
         문자열 정렬이 아닌 실제 숫자값 기준으로 정렬
         """
-        # 데이터를 읽어서 (행번호, 전체행데이터, D열숫자값) 튜플로 구성
-        data_rows = []
-        for row in range(2, ws.max_row + 1):
-            row_data = [ws.cell(row=row, column=c).value for c in range(1, ws.max_column + 1)]
-            d_value = ws.cell(row=row, column=4).value  # D열 (4번째 열)
-            
+        def d_numeric(value) -> float:
             # D열 값을 숫자로 변환 시도
             try:
-                d_numeric = float(d_value) if d_value is not None else 0.0
+                return float(value) if value is not None else 0.0
             except (ValueError, TypeError):
-                d_numeric = 0.0
-                
-            data_rows.append((row, row_data, d_numeric))
-        
-        # D열 숫자값 기준으로 오름차순 정렬
-        data_rows.sort(key=lambda x: x[2])
-        
-        # 정렬된 데이터를 다시 시트에 쓰기
-        for idx, (original_row, row_data, d_numeric) in enumerate(data_rows, start=2):
-            for col_idx, value in enumerate(row_data, start=1):
-                # 2025-07-16 엑셀에서 None이 입력되면 이전 값으로 처리되어 빈값으로 대치
-                if value is None:
-                    value = ""
-                ws.cell(row=idx, column=col_idx, value=value)
-
-def brandy_merge_packaging(input_path: str) -> str:
+                return 0.0
+
+        # D열 숫자값 기준으로 오름차순 정렬 (행 순서만 재배치, 서식은 위치에 유지)
+        ExcelHandler(ws).sort_rows([4], ws=ws, key=d_numeric, styles=macro_sort_styles(STYLES_KEEP))
+
+        # 2025-07-16 엑셀에서 None이 입력되면 이전 값으로 처리되어 빈값으로 대치
+        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, max_col=ws.max_column):
+            for cell in row:
+                if cell.value is None:
+                    cell.value = ""
+
+def brandy_merge_packaging(input_path: str, streaming: bool = False, incremental: bool = False) -> str:
     """브랜디 주문 합포장 자동화 처리"""
+    if incremental:
+        # 같은 날 이미 처리한 주문은 건너뛰고 새 주문만 기존 결과 파일에 반영
+        return incremental_merge_packaging("brandy", input_path, streaming=streaming)
     # Excel 파일 로드
     ex = ExcelHandler.from_file(input_path)
     
     # 첫 번째 시트에 자동화 로직 적용
     source_ws = ex.ws
     splitter = BrandySheetProcessor(source_ws)
-    splitter.apply_automation_logic(source_ws)
+    with ex.step("자동화 처리", source_ws):
+        splitter.apply_automation_logic(source_ws)
     print(f"◼︎ [{MALL_NAME}] 자동화 처리 완료")
     
+    # 수식(순번, 금액 등) 계산 값을 캐시 값으로 함께 기록 - 엑셀 재계산 없이 값 확인 가능
+    ex.convert_formula_to_value(keep_formula=True)
+
     # 저장
     base_name = Path(input_path).stem  # 확장자 제거한 파일명
-    output_path = ex.happojang_save_file(base_name=base_name)
+    output_path = ex.happojang_save_file(base_name=base_name, streaming=streaming)
     ex.wb.close()
     
     print(f"◼︎ [{MALL_NAME}] 합포장 자동화 완료!")
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 import re
-from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Set
 
@@ -10,13 +9,17 @@ from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.worksheet import Worksheet
 from utils.excels.excel_handler import ExcelHandler
+from utils.excels.sheet_splitter import SheetRowSplitter
+from utils.excels.row_sort import STYLES_RESET, macro_sort_styles
+from utils.excels.site_matcher import SiteMatcher
+from utils.excels.column_rules import format_phone_numbers, transform_column
+from utils.excels.style_registry import StyleRegistry
+from utils.macros.happojang.incremental import incremental_merge_packaging
 
 import pandas as pd
 
 # 설정 상수
 MALL_NAME = "기타사이트"
-RED_FONT = Font(color="FF0000", bold=True)
-BLUE_FILL = PatternFill(start_color="CCFFFF", end_color="CCFFFF", fill_type="solid")
 
 # 시트 분리 설정 
 ACCOUNT_MAPPING = {
@@ -61,6 +64,42 @@ class ETCSiteConfig:
         "그립", "보리보리", "카카오선물하기", "톡스토어", "토스"
     }
 
+    @classmethod
+    def rule(cls, site: str) -> ETCSiteRule:
+        """
+        B열 사이트 값 → 사이트 규칙 묶음 (사이트 값별 최초 1회만 판정)
+        예시:
+            rule = ETCSiteConfig.rule("[오케이마트] 쿠팡")
+            rule.order_length  # 13
+        """
+        return _SITE_RULES.match(site)
+
+
+class ETCSiteRule:
+    """사이트 값 하나에 적용되는 규칙 묶음"""
+    __slots__ = ("order_length", "delivery_split", "free_delivery", "numeric", "coupang", "toss")
+
+    def __init__(self, found: frozenset):
+        # 주문번호 길이: ORDER_NUMBER_LENGTHS 선언 순서상 첫 번째 일치 사이트 기준
+        self.order_length = next(
+            (length for site_name, length in ETCSiteConfig.ORDER_NUMBER_LENGTHS.items()
+             if site_name in found),
+            None,
+        )
+        self.delivery_split = bool(found & ETCSiteConfig.DELIVERY_SPLIT_SITES)
+        self.free_delivery = bool(found & ETCSiteConfig.FREE_DELIVERY_SITES)
+        self.numeric = bool(found & ETCSiteConfig.NUMERIC_SITES)
+        self.coupang = "쿠팡" in found
+        self.toss = "토스" in found
+
+
+_SITE_RULES = SiteMatcher(
+    [*ETCSiteConfig.ORDER_NUMBER_LENGTHS, *ETCSiteConfig.DELIVERY_SPLIT_SITES,
+     *ETCSiteConfig.FREE_DELIVERY_SITES, *ETCSiteConfig.NUMERIC_SITES, "쿠팡", "토스"],
+    build=ETCSiteRule,
+)
+
+
 class ETCOrderUtils:
     """주문번호 처리 유틸리티"""
     
@@ -88,25 +127,26 @@ def process_order_numbers(ws: Worksheet) -> None:
     사이트별 주문번호 처리
     """
     for row in range(2, ws.max_row + 1):
-        site = str(ws[f"B{row}"].value or "")
+        rule = ETCSiteConfig.rule(str(ws[f"B{row}"].value or ""))
         order_raw = str(ws[f"E{row}"].value or "")
         
         # 사이트별 주문번호 길이 제한 적용
-        for site_name, length in ETCSiteConfig.ORDER_NUMBER_LENGTHS.items():
-            if site_name in site:
-                ws[f"E{row}"].value = order_raw[:length]
-                break
+        if rule.order_length is not None:
+            ws[f"E{row}"].value = order_raw[:rule.order_length]
                 
         # 쿠팡 특수 처리
-        if "쿠팡" in site and "/" in order_raw:
+        if rule.coupang and "/" in order_raw:
             slash_count = order_raw.count("/")
             pure_length = len(order_raw.replace("/", ""))
             each_len = pure_length // (slash_count + 1)
             ws[f"E{row}"].value = order_raw[:each_len]
 
 
-def etc_site_merge_packaging(input_path: str) -> str:
+def etc_site_merge_packaging(input_path: str, streaming: bool = False, incremental: bool = False) -> str:
     """기타사이트 주문 합포장 자동화 처리 (VBA 매크로 14단계 시트분리 포함)"""
+    if incremental:
+        # 같은 날 이미 처리한 주문은 건너뛰고 새 주문만 기존 결과 파일에 반영
+        return incremental_merge_packaging("etc_site", input_path, streaming=streaming)
     # Excel 파일 로드
     ex = ExcelHandler.from_file(input_path)
     ws = ex.ws
@@ -114,7 +154,8 @@ def etc_site_merge_packaging(input_path: str) -> str:
     # ========== VBA 매크로 단계: 원본 시트 자동화 처리 ==========
     # 원본 시트에 자동화 로직 적용 (행 분할 포함)
     splitter = ETCSheetManager(ws, ACCOUNT_MAPPING)
-    splitter.apply_automation_logic(ws)
+    with ex.step("자동화 처리", ws):
+        splitter.apply_automation_logic(ws)
     
     # ========== 자동화 시트 생성 (맨 앞에 위치) ==========
     # 매크로가 적용된 전체 시트를 "자동화" 이름으로 맨 앞에 복사
@@ -122,24 +163,28 @@ def etc_site_merge_packaging(input_path: str) -> str:
     
     # ========== VBA 매크로 14단계: 시트분리 (OK, BB, IY) ==========
     # 자동화 처리가 완료된 원본 시트에서 시트분리 수행
-    rows_by_sheet = splitter.get_rows_by_sheet()
+    with ex.step("시트 분리", ex.wb):
+        rows_by_sheet = splitter.get_rows_by_sheet()
     
-    # 모든 필수 시트 생성 (데이터 유무와 무관하게 OK, BB, IY 시트 생성)
-    for sheet_name in REQUIRED_SHEETS:
-        splitter.copy_to_new_sheet_simple(
-            ex.wb,
-            sheet_name, 
-            rows_by_sheet.get(sheet_name, [])
-        )
+        # 모든 필수 시트 생성 (데이터 유무와 무관하게 OK, BB, IY 시트 생성)
+        for sheet_name in REQUIRED_SHEETS:
+            splitter.copy_to_new_sheet_simple(
+                ex.wb,
+                sheet_name, 
+                rows_by_sheet.get(sheet_name, [])
+            )
     
     # 원본 시트 삭제 (자동화 시트로 대체되었으므로)
     original_sheet_name = ws.title
     if original_sheet_name in ex.wb.sheetnames and original_sheet_name != "자동화":
         del ex.wb[original_sheet_name]
     
+    # 수식(순번, 금액 등) 계산 값을 캐시 값으로 함께 기록 - 엑셀 재계산 없이 값 확인 가능
+    ex.convert_formula_to_value(keep_formula=True)
+
     # 저장
     base_name = Path(input_path).stem  # 확장자 제거한 파일명
-    output_path = ex.happojang_save_file(base_name=base_name)
+    output_path = ex.happojang_save_file(base_name=base_name, streaming=streaming)
     ex.wb.close()
     
     return output_path
@@ -150,6 +195,7 @@ class ETCDeliveryFeeHandler:
     
     def __init__(self, ws: Worksheet):
         self.ws = ws
+        self.styles = StyleRegistry.of(ws.parent)
         
     def process_delivery_fee(self) -> None:
         """
@@ -161,7 +207,7 @@ class ETCDeliveryFeeHandler:
         - 분할된 행에 대한 재처리 포함
         """
         for row in range(2, self.ws.max_row + 1):
-            site = str(self.ws[f"B{row}"].value or "")
+            rule = ETCSiteConfig.rule(str(self.ws[f"B{row}"].value or ""))
             order_text = str(self.ws[f"X{row}"].value or "")
             v_cell = self.ws[f"V{row}"]
             
@@ -183,42 +229,42 @@ class ETCDeliveryFeeHandler:
             if v_value is None or v_value == "":
                 
                 # 배송비 분할 대상
-                if any(s in site for s in ETCSiteConfig.DELIVERY_SPLIT_SITES) and "/" in order_text:
+                if rule.delivery_split and "/" in order_text:
                     count = len(order_text.split("/"))
                     # 기본 배송비 3000원 적용 후 분할
                     if count > 0:
                         v_cell.value = round(3000 / count)
-                        v_cell.font = RED_FONT
+                        self.styles.apply(v_cell, "red_font")
 
                 # 무료배송
-                elif any(s in site for s in ETCSiteConfig.FREE_DELIVERY_SITES):
+                elif rule.free_delivery:
                     v_cell.value = 0
-                    v_cell.font = RED_FONT
+                    self.styles.apply(v_cell, "red_font")
 
                 # 토스 (3만원 이상 무료)
-                elif "토스" in site:
+                elif rule.toss:
                     v_cell.value = 0 if u_val > 30000 else 3000
-                    v_cell.font = RED_FONT
+                    self.styles.apply(v_cell, "red_font")
                     
             else:
                 # V열에 값이 있는 경우 기존 로직 적용
                 
                 # 배송비 분할 대상
-                if any(s in site for s in ETCSiteConfig.DELIVERY_SPLIT_SITES) and "/" in order_text:
+                if rule.delivery_split and "/" in order_text:
                     count = len(order_text.split("/"))
                     if v_val > 3000 and count > 0:
                         v_cell.value = round(v_val / count)
-                        v_cell.font = RED_FONT
+                        self.styles.apply(v_cell, "red_font")
 
                 # 무료배송
-                elif any(s in site for s in ETCSiteConfig.FREE_DELIVERY_SITES):
+                elif rule.free_delivery:
                     v_cell.value = 0
-                    v_cell.font = RED_FONT
+                    self.styles.apply(v_cell, "red_font")
 
                 # 토스 (3만원 이상 무료)
-                elif "토스" in site:
+                elif rule.toss:
                     v_cell.value = 0 if u_val > 30000 else 3000
-                    v_cell.font = RED_FONT
+                    self.styles.apply(v_cell, "red_font")
 
 
 class ETCSpecialCaseHandler:
@@ -226,6 +272,7 @@ class ETCSpecialCaseHandler:
     
     def __init__(self, ws: Worksheet):
         self.ws = ws
+        self.styles = StyleRegistry.of(ws.parent)
         
     def process_kakao_jeju(self) -> None:
         """카카오 + 제주도 주문 처리"""
@@ -238,10 +285,10 @@ class ETCSpecialCaseHandler:
                 f_cell = self.ws[f"F{row}"]
                 if "[3000원 연락해야함]" not in str(f_cell.value):
                     f_cell.value = f"{f_cell.value} [3000원 연락해야함]"
-                f_cell.fill = BLUE_FILL
+                self.styles.apply(f_cell, "cyan_fill")
                 
                 # J열 빨간색 굵게
-                self.ws[f"J{row}"].font = RED_FONT
+                self.styles.apply(self.ws[f"J{row}"], "red_font")
                 
     def process_l_column(self) -> None:
         """L열 신용/착불 처리"""
@@ -250,7 +297,7 @@ class ETCSpecialCaseHandler:
             if val == "신용":
                 self.ws[f"L{row}"].value = ""
             elif val == "착불":
-                self.ws[f"L{row}"].font = RED_FONT
+                self.styles.apply(self.ws[f"L{row}"], "red_font")
 
 
 class ETCSheetManager:
@@ -266,28 +313,30 @@ class ETCSheetManager:
             ws.column_dimensions[get_column_letter(c)].width
             for c in range(1, self.last_col + 1)
         ]
+        self._rows: SheetRowSplitter | None = None
 
     def get_rows_by_sheet(self) -> Dict[str, List[int]]:
         """
         시트별 행 번호 매핑 생성 (VBA ExtractBracketText 로직 구현)
         자동화 처리가 완료된 원본 시트에서 현재 상태를 기준으로 매핑
         """
-        rows_by_sheet = defaultdict(list)
-        
-        # 현재 시트의 실제 최대 행 수를 사용 (분할된 행 포함)
-        current_max_row = self.ws.max_row
-        
-        for r in range(2, current_max_row + 1):
-            # B열에서 [계정명] 추출 (VBA ExtractBracketText와 동일)
-            account = ETCOrderUtils.extract_bracket_text(self.ws[f"B{r}"].value)
-            
-            # 각 시트의 계정 목록과 정확히 비교
+        # B열에서 [계정명] 추출 후 각 시트의 계정 목록과 정확히 비교
+        def classify(value):
+            account = ETCOrderUtils.extract_bracket_text(value)
             for sheet_name, accounts in self.account_mapping.items():
                 if account in accounts:
-                    rows_by_sheet[sheet_name].append(r)
-                    break
-                    
-        return rows_by_sheet
+                    return sheet_name
+            return None
+
+        return self.row_splitter().group_rows(2, classify)
+
+    def row_splitter(self) -> SheetRowSplitter:
+        """
+        자동화 처리 완료 후 원본 시트 행 목록 (분할된 행 포함, 최초 호출 시 한 번만 생성)
+        """
+        if self._rows is None:
+            self._rows = SheetRowSplitter(self.ws, last_col=self.last_col, col_widths=self.col_widths)
+        return self._rows
 
     def create_empty_sheet(self, wb, sheet_name: str) -> Worksheet:
         """빈 시트 생성 (헤더와 열 너비만 복사) - VBA 매크로와 동일"""
@@ -298,9 +347,9 @@ class ETCSheetManager:
         new_ws = wb.create_sheet(sheet_name)
         
         # 제목행 복사 (VBA: sourceSheet.Rows(1).Copy destSheet.Rows(1))
+        headers = ExcelHandler.read_rows(self.ws, 1, 1, max_col=self.last_col)[0]
         for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
+            new_ws.cell(row=1, column=c, value=headers[c - 1])
             # 열너비 복사 (VBA: destSheet.Columns(c).ColumnWidth = colWidth(c))
             new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
             
@@ -311,11 +360,11 @@ class ETCSheetManager:
         if not row_indices:
             return
             
+        rows = ExcelHandler.read_rows(self.ws, max_col=self.last_col)
         target_row = 2
         for r in row_indices:
-            for c in range(1, self.last_col + 1):
-                ws.cell(row=target_row, column=c, 
-                       value=self.ws.cell(row=r, column=c).value)
+            for c, value in enumerate(rows[r - 1], start=1):
+                ws.cell(row=target_row, column=c, value=value)
             target_row += 1
         
         # A열 순번 재부여 (VBA: destSheet.Cells(r, "A").Value = r - 1)
@@ -330,64 +379,39 @@ class ETCSheetManager:
         VBA와 동일한 방식으로 새 시트 생성
         - 원본 시트의 처리된 데이터를 각 계정명별로 복사만 수행
         - 추가 자동화 로직 적용하지 않음 (VBA 매크로와 동일)
+        - B열, C열 기준 정렬 후 A열 순번 재부여 "=ROW()-1"
         """
-        new_ws = self.create_empty_sheet(wb, sheet_name)
-        if row_indices:
-            self.copy_sheet_data_simple(new_ws, row_indices)
-    
-    def copy_sheet_data_simple(self, ws: Worksheet, row_indices: List[int]) -> None:
-        """
-        VBA와 동일한 방식으로 시트에 데이터 행 복사
-        - 원본 시트의 현재 상태(분할된 행 포함)를 그대로 복사
-        - A열 순번만 재부여
-        """
-        if not row_indices:
-            return
-            
-        target_row = 2
-        for r in row_indices:
-            for c in range(1, self.last_col + 1):
-                original_value = self.ws.cell(row=r, column=c).value
-                ws.cell(row=target_row, column=c, value=original_value)
-                
-                # 원본 시트의 셀 서식도 복사
-                original_cell = self.ws.cell(row=r, column=c)
-                new_cell = ws.cell(row=target_row, column=c)
-                
-                # 폰트 복사
-                if original_cell.font:
-                    new_cell.font = Font(
-                        color=original_cell.font.color,
-                        bold=original_cell.font.bold,
-                        name=original_cell.font.name,
-                        size=original_cell.font.size
-                    )
-                
-                # 배경색 복사
-                if original_cell.fill:
-                    new_cell.fill = PatternFill(
-                        start_color=original_cell.fill.start_color,
-                        end_color=original_cell.fill.end_color,
-                        fill_type=original_cell.fill.fill_type
-                    )
-                
-                # 정렬 복사
-                if original_cell.alignment:
-                    new_cell.alignment = Alignment(
-                        horizontal=original_cell.alignment.horizontal,
-                        vertical=original_cell.alignment.vertical
-                    )
-            
-            target_row += 1
-        
-        # 데이터가 2행 이상 있는 경우 정렬 수행
-        if target_row > 3:  # 헤더(1행) + 데이터(2행 이상)
-            ex = ExcelHandler(ws)
-            ex.sort_by_columns([2, 3])  # B열, C열 기준 정렬
-        
-        # A열 순번 재부여 "=ROW()-1"
-        for r in range(2, target_row):
-            ws[f"A{r}"].value = "=ROW()-1"
+        rows = self.row_splitter()
+        row_indices = list(row_indices or [])
+        style = self._copy_cell_style
+        if len(row_indices) >= 2:
+            row_indices = rows.sort_rows(row_indices, [2, 3], key=str)
+            # 데이터 2행 이상이면 정렬(sort_by_columns)과 같이 복사한 서식 초기화 (이전 출력과 동일)
+            if macro_sort_styles(STYLES_RESET) == STYLES_RESET:
+                style = None
+        rows.emit_rows(wb, sheet_name, row_indices, style=style, row_number="=ROW()-1")
+
+    @staticmethod
+    def _copy_cell_style(original_cell, new_cell) -> None:
+        """원본 셀의 폰트(색상/굵기/글꼴/크기), 배경색, 정렬(가로/세로)만 복사"""
+        if original_cell.font:
+            new_cell.font = Font(
+                color=original_cell.font.color,
+                bold=original_cell.font.bold,
+                name=original_cell.font.name,
+                size=original_cell.font.size
+            )
+        if original_cell.fill:
+            new_cell.fill = PatternFill(
+                start_color=original_cell.fill.start_color,
+                end_color=original_cell.fill.end_color,
+                fill_type=original_cell.fill.fill_type
+            )
+        if original_cell.alignment:
+            new_cell.alignment = Alignment(
+                horizontal=original_cell.alignment.horizontal,
+                vertical=original_cell.alignment.vertical
+            )
 
     def apply_automation_logic(self, ws: Worksheet) -> None:
         """자동화 로직 적용 (VBA 매크로 21단계까지의 모든 로직)"""
@@ -410,10 +434,8 @@ class ETCSheetManager:
         process_order_numbers(ws)
         
         # 6. 전화번호 처리
-        for row in range(2, ws.max_row + 1):
-            for col in ('H', 'I'):
-                cell_value = ws[f'{col}{row}'].value
-                ws[f'{col}{row}'].value = ex.format_phone_number(cell_value)
+        for col in ('H', 'I'):
+            transform_column(ws, col, format_phone_numbers)
         
         # 7. 특수 케이스 처리
         special = ETCSpecialCaseHandler(ws)
@@ -430,8 +452,7 @@ class ETCSheetManager:
         # 10. 열 정렬
         ex.set_column_alignment()
         # F열 왼쪽정렬 
-        for row in range(1, ws.max_row + 1):
-            ws[f"F{row}"].alignment = Alignment(horizontal='left')
+        ex.styles(ws).apply_cells((ws[f"F{row}"] for row in range(1, ws.max_row + 1)), "align_left")
 
         # 11. 배경·테두리 제거, A열 순번 설정
         self.set_row_number(ws)  # 자체 정의한 메서드 사용
@@ -512,18 +533,10 @@ class ETCSheetManager:
 
     def create_automation_sheet(self, wb) -> None:
         """
-        매크로가 적용된 전체 시트를 "자동화"라는 이름으로 맨 앞에 복사
+        매크로가 적용된 전체 시트를 "자동화"라는 이름으로 맨 앞에 생성
+        (기존 "자동화" 시트는 삭제, 원본 행 목록에서 바로 생성)
         """
-        # 기존 "자동화" 시트가 있으면 삭제
-        if "자동화" in wb.sheetnames:
-            del wb["자동화"]
-        
-        # 현재 워크시트를 복사하여 "자동화" 시트 생성
-        automation_ws = wb.copy_worksheet(self.ws)
-        automation_ws.title = "자동화"
-        
-        # "자동화" 시트를 맨 앞으로 이동
-        wb.move_sheet(automation_ws, offset=-len(wb.sheetnames) + 1)
+        self.row_splitter().emit_copy(wb, "자동화", index=0)
 
 if __name__ == "__main__":
     excel_file_path = "/Users/smith/Documents/github/OKMart/sabangnet_API/files/test-[기본양식]-합포장용.xlsx"
@@ -7,9 +7,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.styles import Alignment
 from openpyxl.utils import get_column_letter
 from utils.excels.excel_handler import ExcelHandler
+from utils.macros.happojang.incremental import incremental_merge_packaging
 
 
 # 설정 상수
@@ -136,9 +136,9 @@ class GokSheetManager:
         new_ws = wb.create_sheet(sheet_name)
         
         # 헤더와 열 너비 복사
+        headers = ExcelHandler.read_rows(self.ws, 1, 1, max_col=self.last_col)[0]
         for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
+            new_ws.cell(row=1, column=c, value=headers[c - 1])
             new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
             
         return new_ws
@@ -148,10 +148,10 @@ class GokSheetManager:
         if not row_indices:
             return
             
+        rows = ExcelHandler.read_rows(self.ws, max_col=self.last_col)
         for idx, r in enumerate(row_indices, start=2):
-            for c in range(1, self.last_col + 1):
-                ws.cell(row=idx, column=c, 
-                       value=self.ws.cell(row=r, column=c).value)
+            for c, value in enumerate(rows[r - 1], start=1):
+                ws.cell(row=idx, column=c, value=value)
             ws[f"A{idx}"].value = "=ROW()-1"
 
     def apply_automation_logic(self, ws: Worksheet) -> None:
@@ -192,8 +192,7 @@ class GokSheetManager:
         ex.clear_fills_from_second_row()
         ex.clear_borders()
         # F열 왼쪽정렬 
-        for row in range(1, ws.max_row + 1):
-            ws[f"F{row}"].alignment = Alignment(horizontal='left')
+        ex.styles(ws).apply_cells((ws[f"F{row}"] for row in range(1, ws.max_row + 1)), "align_left")
         clear_l_column(ws)
 
     def copy_to_new_sheet(self, 
@@ -209,31 +208,39 @@ class GokSheetManager:
         self.apply_automation_logic(new_ws)
 
 
-def gok_merge_packaging(file_path: str) -> str:
+def gok_merge_packaging(file_path: str, streaming: bool = False, incremental: bool = False) -> str:
     """G옥 주문 합포장 자동화 처리"""
+    if incremental:
+        # 같은 날 이미 처리한 주문은 건너뛰고 새 주문만 기존 결과 파일에 반영
+        return incremental_merge_packaging("gok", file_path, streaming=streaming)
     # Excel 파일 로드
     ex = ExcelHandler.from_file(file_path)
     
     # 첫 번째 시트(원본)에 자동화 로직 적용
     source_ws = ex.ws
     splitter = GokSheetManager(source_ws, ACCOUNT_MAPPING)
-    splitter.apply_automation_logic(source_ws)
+    with ex.step("자동화 처리", source_ws):
+        splitter.apply_automation_logic(source_ws)
     
     # 계정별 시트 분리 및 필수 시트 생성
     splitter = GokSheetManager(source_ws, ACCOUNT_MAPPING)
-    rows_by_sheet = splitter.get_rows_by_sheet()
+    with ex.step("시트 분리", ex.wb):
+        rows_by_sheet = splitter.get_rows_by_sheet()
     
-    # 모든 필수 시트 생성 (데이터 유무와 무관)
-    for sheet_name in REQUIRED_SHEETS:
-        splitter.copy_to_new_sheet(
-            ex.wb,
-            sheet_name, 
-            rows_by_sheet.get(sheet_name, [])
-        )
+        # 모든 필수 시트 생성 (데이터 유무와 무관)
+        for sheet_name in REQUIRED_SHEETS:
+            splitter.copy_to_new_sheet(
+                ex.wb,
+                sheet_name, 
+                rows_by_sheet.get(sheet_name, [])
+            )
     
+    # 수식(순번, 금액 등) 계산 값을 캐시 값으로 함께 기록 - 엑셀 재계산 없이 값 확인 가능
+    ex.convert_formula_to_value(keep_formula=True)
+
     # 저장
     base_name = Path(file_path).stem  # 확장자 제거한 파일명
-    output_path = ex.happojang_save_file(base_name=base_name)
+    output_path = ex.happojang_save_file(base_name=base_name, streaming=streaming)
     ex.wb.close()
     
     print(f"◼︎ [{MALL_NAME}] 합포장 자동화 완료!")
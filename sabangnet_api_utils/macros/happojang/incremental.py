@@ -0,0 +1,306 @@
+"""
+합포장 증분 처리
+- 몰 / 날짜 / 원본 파일명(확장자 제외)별로 이미 처리해 결과 파일에 기록한 주문(사방넷주문번호, 없으면 주문번호)을
+  상태 파일에 기록 (같은 날 다른 원본 파일은 별도 결과 파일로 처리)
+- 재실행 시 새로 들어온 주문(델타)만 같은 매크로로 처리한 뒤 기존 결과 파일에 반영
+  - 시트별로 델타 행을 추가하고 매크로 정렬 기준으로 재정렬 (같은 수취인 묶음 안으로 이동)
+  - 병합 규칙이 있는 몰(브랜디)은 같은 그룹(상품번호|수령인)의 기존 행에 병합
+- 상태 파일이 없거나 결과 파일이 없으면 전체 처리
+- 행 단위 규칙만 델타에 적용되므로, 장바구니 단위 배송비처럼 여러 행을 함께 보는 규칙은
+  델타 주문끼리만 적용됨 (기존 주문과 같은 장바구니의 늦은 주문은 전체 재처리 권장)
+
+실행:
+    ali_merge_packaging(input_path, incremental=True)
+    python -m utils.macros.batch_runner manifest.json   # options: {"incremental": true}
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable
+
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.formula.translate import Translator
+from openpyxl.utils import get_column_letter
+
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.parallel_sheets import export_sheet
+from utils.excels.streaming_reader import read_values
+from utils.sabangnet_path_utils import SabangNetPathUtils
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# 주문 식별 열 헤더 (앞에서부터 먼저 있는 열 사용)
+KEY_HEADERS = ("사방넷주문번호", "주문번호")
+
+# 결과 파일에서 반영하지 않는 시트 (VLOOKUP 원본 탭)
+SKIP_SHEETS = {"Sheet1"}
+
+JEJU_NOTE = " [3000원 연락해야함]"
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value) if value not in (None, "") else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _brandy_group_key(ws, row: int) -> str:
+    """
+    BrandyOrderMerger 와 같은 그룹 키 (C열|J열)
+    """
+    return f"{str(ws[f'C{row}'].value).strip()}|{str(ws[f'J{row}'].value).strip()}"
+
+
+def _brandy_merge(ws, row: int, delta_ws, delta_row: int) -> None:
+    """
+    기존 그룹 행에 델타 행 병합 (D열 금액 합산, F열 모델명 결합)
+    """
+    ws[f"D{row}"].value = _to_float(ws[f"D{row}"].value) + _to_float(delta_ws[f"D{delta_row}"].value)
+    models = [str(value) for value in (ws[f"F{row}"].value, delta_ws[f"F{delta_row}"].value) if value]
+    # 제주 안내문은 병합된 모델명 끝에 한 번만 (process_jeju_address 와 동일)
+    jeju = any(JEJU_NOTE in model for model in models)
+    merged = " + ".join(model.replace(JEJU_NOTE, "").strip() for model in models)
+    ws[f"F{row}"].value = merged + JEJU_NOTE if jeju else merged
+
+
+@dataclass(frozen=True)
+class HappojangMall:
+    """
+    몰별 증분 처리 설정
+    args:
+        macro: (모듈, 함수) - 합포장 매크로
+        sort_columns: 결과 시트 정렬 기준 열 (매크로와 동일)
+        sort_key: 정렬 키 변환 함수
+        group_key / merge: 병합 규칙 (같은 그룹 키의 기존 행에 델타 행 병합)
+    """
+    macro: tuple[str, str]
+    sort_columns: tuple[int, ...] = (2, 3)
+    sort_key: Callable = str
+    group_key: Callable | None = None
+    merge: Callable | None = None
+
+
+MALLS = {
+    "etc_site": HappojangMall(("utils.macros.happojang.etc_site_merge_packaging", "etc_site_merge_packaging")),
+    "zigzag": HappojangMall(("utils.macros.happojang.zigzag_merge_packaging", "zigzag_merge_packaging")),
+    "ali": HappojangMall(("utils.macros.happojang.ali_merge_packaging", "ali_merge_packaging")),
+    "gok": HappojangMall(("utils.macros.happojang.gok_merge_packaging", "gok_merge_packaging")),
+    "brandy": HappojangMall(
+        ("utils.macros.happojang.brandy_merge_packaging", "brandy_merge_packaging"),
+        sort_columns=(4,), sort_key=_to_float, group_key=_brandy_group_key, merge=_brandy_merge,
+    ),
+}
+
+
+class HappojangState:
+    """
+    몰 / 날짜 / 원본 파일별 처리 상태 (files/happojang_state/<몰>/<YYYY-MM-DD>/<원본 파일명>.json)
+    {"mall", "date", "source", "output": 결과 파일 경로, "keys": [처리한 주문 키, ...], "updated_at"}
+    """
+
+    def __init__(self, mall: str, day: str, source: str, output: str | None = None,
+                 keys: list[str] | None = None):
+        self.mall = mall
+        self.date = day
+        self.source = source
+        self.output = output
+        self.keys: set[str] = set(keys or [])
+
+    @staticmethod
+    def path_of(mall: str, day: str, source: str) -> Path:
+        return SabangNetPathUtils.get_happojang_state_path() / mall / day / f"{source}.json"
+
+    @classmethod
+    def load(cls, mall: str, day: str | None, source: str) -> "HappojangState":
+        """
+        args:
+            source: 원본 파일명 (확장자 제외, 예: Path(input_path).stem)
+        """
+        day = day or date.today().isoformat()
+        path = cls.path_of(mall, day, source)
+        if not path.exists():
+            return cls(mall, day, source)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(mall, day, source, data.get("output"), data.get("keys"))
+
+    def save(self) -> None:
+        path = self.path_of(self.mall, self.date, self.source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "mall": self.mall,
+                "date": self.date,
+                "source": self.source,
+                "output": self.output,
+                "keys": sorted(self.keys),
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @property
+    def has_output(self) -> bool:
+        return bool(self.output) and os.path.exists(self.output)
+
+
+def order_keys(headers: tuple, rows: list[tuple]) -> list[str]:
+    """
+    행별 주문 키 (KEY_HEADERS 열 값, 비어 있으면 행 전체 값 + 같은 값 행 중 순번의 해시)
+    - 값이 모두 같은 키 없는 행이 여러 개여도 행마다 다른 키 (순번은 같은 값 행 사이의 순서라
+      다른 주문이 앞에 추가되어도 바뀌지 않음)
+    """
+    key_idx = next((headers.index(h) for h in KEY_HEADERS if h in headers), None)
+    keys = []
+    seen: dict[str, int] = {}
+    for row in rows:
+        value = row[key_idx] if key_idx is not None and key_idx < len(row) else None
+        if value in (None, ""):
+            digest = hashlib.sha1(repr(row).encode("utf-8")).hexdigest()
+            index = seen.get(digest, 0)
+            seen[digest] = index + 1
+            value = "row:" + hashlib.sha1(f"{digest}:{index}".encode("utf-8")).hexdigest()
+        keys.append(str(value))
+    return keys
+
+
+def _write_delta(path: str, sheets: list, delta_rows: list[tuple]) -> None:
+    """
+    원본과 같은 시트 구성으로 델타 파일 생성 (대상 시트: 헤더 + 델타 행, 그 외 시트는 그대로)
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+    for idx, (title, widths, rows) in enumerate(sheets):
+        ws = wb.create_sheet(title=title)
+        for letter, width in widths.items():
+            ws.column_dimensions[letter].width = width
+        for row in (rows[:1] + delta_rows) if idx == 0 else rows:
+            ws.append(row)
+    wb.save(path)
+
+
+def _append_row(ws, payload_rows: dict, row: int, target: int) -> None:
+    """
+    export_sheet 결과의 한 행을 target 행에 기록 (서식 포함, 수식은 행 번호 이동)
+    """
+    for col, value, style in payload_rows.get(row, ()):
+        if isinstance(value, str) and value.startswith("="):
+            origin = f"{get_column_letter(col)}{row}"
+            value = Translator(value, origin=origin).translate_formula(f"{get_column_letter(col)}{target}")
+        cell = ws.cell(row=target, column=col, value=value)
+        if style is not None:
+            cell.font, cell.fill, cell.border, cell.alignment, cell.number_format, cell.protection = style
+
+
+def patch_output(output_path: str, delta_path: str, mall: HappojangMall) -> dict[str, int]:
+    """
+    델타 결과 파일의 시트별 행을 기존 결과 파일에 반영 후 정렬
+    return: {시트명: 반영 행 수}
+    """
+    wb = openpyxl.load_workbook(output_path)
+    delta_wb = openpyxl.load_workbook(delta_path)
+    patched = {}
+    for delta_ws in delta_wb.worksheets:
+        if delta_ws.title in SKIP_SHEETS or delta_ws.max_row < 2:
+            continue
+        if delta_ws.title not in wb.sheetnames:
+            logger.warning(f"[{delta_ws.title}] 기존 결과 파일에 없는 시트 - 반영 생략")
+            continue
+        ws = wb[delta_ws.title]
+        headers = [cell.value for cell in ws[1]]
+        if [cell.value for cell in delta_ws[1]][:len(headers)] != headers:
+            logger.warning(f"[{delta_ws.title}] 헤더가 달라 반영 생략")
+            continue
+
+        payload = export_sheet(delta_ws)
+        rows: dict[int, list] = {}
+        for row, col, value, idx in payload["cells"]:
+            rows.setdefault(row, []).append((col, value, payload["styles"][idx] if idx >= 0 else None))
+
+        groups = None
+        if mall.group_key is not None:
+            groups = {mall.group_key(ws, row): row for row in range(2, ws.max_row + 1)}
+        merged = appended = 0
+        for row in range(2, delta_ws.max_row + 1):
+            if groups is not None:
+                key = mall.group_key(delta_ws, row)
+                if key in groups:
+                    mall.merge(ws, groups[key], delta_ws, row)
+                    merged += 1
+                    continue
+            target = ws.max_row + 1
+            _append_row(ws, rows, row, target)
+            height = payload["row_heights"].get(row)
+            if height is not None:
+                ws.row_dimensions[target].height = height
+            if groups is not None:
+                groups[key] = target
+            appended += 1
+
+        ExcelHandler(ws, wb).sort_rows(list(mall.sort_columns), ws=ws, key=mall.sort_key)
+        patched[ws.title] = merged + appended
+        logger.info(f"[{ws.title}] 증분 반영: 추가 {appended}행, 병합 {merged}행")
+    wb.save(output_path)
+    return patched
+
+
+def incremental_merge_packaging(mall_name: str, input_path: str, day: str | None = None,
+                                streaming: bool = False) -> str:
+    """
+    합포장 증분 처리
+    args:
+        mall_name: MALLS 키 (etc_site / zigzag / ali / gok / brandy)
+        day: 처리 기준 날짜 (YYYY-MM-DD, 기본값: 오늘)
+    return: 결과 파일 경로 (최초 실행 시 새 결과 파일, 이후 같은 파일에 반영)
+    """
+    mall = MALLS[mall_name]
+    module_name, attr = mall.macro
+    macro = getattr(importlib.import_module(module_name), attr)
+    state = HappojangState.load(mall_name, day, Path(input_path).stem)
+
+    sheets = read_values(input_path)
+    title, widths, rows = sheets[0]
+    headers, body = (tuple(rows[0]), rows[1:]) if rows else ((), [])
+    keys = order_keys(headers, body)
+
+    if not state.has_output:
+        output_path = macro(input_path, streaming=streaming)
+        state.output = output_path
+        state.keys = set(keys)
+        state.save()
+        logger.info(f"[{mall_name} {state.date}] 전체 처리: {len(keys)}건")
+        return output_path
+
+    delta_rows = [row for row, key in zip(body, keys) if key not in state.keys]
+    missing = len(state.keys - set(keys))
+    if missing:
+        logger.warning(f"[{mall_name} {state.date}] 이전 처리 주문 중 {missing}건이 새 파일에 없음 (결과 파일에서 삭제되지 않음)")
+    if not delta_rows:
+        logger.info(f"[{mall_name} {state.date}] 새 주문 없음 - 기존 결과 사용: {state.output}")
+        return state.output
+
+    with tempfile.TemporaryDirectory(prefix="happojang_delta_") as tmp:
+        # 매크로 결과 파일명이 기존 결과와 겹치지 않도록 델타 전용 파일명 사용
+        delta_input = os.path.join(tmp, f"{Path(input_path).stem}.delta-{os.getpid()}.xlsx")
+        _write_delta(delta_input, sheets, delta_rows)
+        delta_output = macro(delta_input, streaming=streaming)
+    try:
+        patch_output(state.output, delta_output, mall)
+    finally:
+        os.remove(delta_output)
+
+    state.keys.update(keys)
+    state.save()
+    logger.info(f"[{mall_name} {state.date}] 증분 처리: 새 주문 {len(delta_rows)}건 → {state.output}")
+    return state.output
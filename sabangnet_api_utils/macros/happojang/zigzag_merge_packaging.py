@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 import re
-from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List
 
@@ -11,11 +10,13 @@ from openpyxl.utils import get_column_letter
 from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from utils.excels.excel_handler import ExcelHandler
+from utils.excels.sheet_splitter import SheetRowSplitter
+from utils.excels.style_registry import StyleRegistry
+from utils.macros.happojang.incremental import incremental_merge_packaging
 
 
 # 설정 상수
 MALL_NAME = "지그재그"
-BLUE_FILL = PatternFill(start_color="CCE8FF", end_color="CCE8FF", fill_type="solid")
 
 # 시트 분리 설정 
 ACCOUNT_MAPPING = {
@@ -81,6 +82,7 @@ def highlight_multiple_items(ws: Worksheet) -> None:
     🔄 ExcelHandler 후보
     F열에서 다중 수량 항목 파란색 배경으로 강조
     """
+    styles = StyleRegistry.of(ws.parent)
     for row in range(2, ws.max_row + 1):
         f_cell = ws[f"F{row}"]
         clean_text = ZIGZAGDataCleanerUtils.clean_product_text(f_cell.value)
@@ -88,7 +90,7 @@ def highlight_multiple_items(ws: Worksheet) -> None:
         
         # '개' 문자가 2회 이상 등장하면 파란색 배경
         if clean_text.count("개") >= 2:
-            f_cell.fill = BLUE_FILL
+            styles.apply(f_cell, "blue_fill")
 
 
 class ZIGZAGSheetSplitter:
@@ -104,17 +106,25 @@ class ZIGZAGSheetSplitter:
             ws.column_dimensions[get_column_letter(c)].width
             for c in range(1, self.last_col + 1)
         ]
+        self._rows: SheetRowSplitter | None = None
 
     def get_rows_by_sheet(self) -> Dict[str, List[int]]:
         """사이트별 행 번호 매핑 생성"""
-        site_rows = defaultdict(list)
-        for r in range(2, self.last_row + 1):
-            text = str(self.ws[f"B{r}"].value or "")
+        def classify(value):
+            text = str(value or "")
             if "[오케이마트]" in text:
-                site_rows["OK"].append(r)
-            elif "[아이예스]" in text:
-                site_rows["IY"].append(r)
-        return site_rows
+                return "OK"
+            if "[아이예스]" in text:
+                return "IY"
+            return None
+
+        return self.row_splitter().group_rows(2, classify)
+
+    def row_splitter(self) -> SheetRowSplitter:
+        """원본 시트 행 목록 (최초 호출 시 한 번만 생성)"""
+        if self._rows is None:
+            self._rows = SheetRowSplitter(self.ws, last_col=self.last_col, col_widths=self.col_widths)
+        return self._rows
 
     def copy_to_new_sheet(self, 
                          wb: Workbook, 
@@ -127,32 +137,24 @@ class ZIGZAGSheetSplitter:
         new_ws = wb.create_sheet(sheet_name)
         
         # 헤더와 열 너비 복사
+        headers = ExcelHandler.read_rows(self.ws, 1, 1, max_col=self.last_col)[0]
         for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
+            new_ws.cell(row=1, column=c, value=headers[c - 1])
             new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
         
         # 데이터 복사
+        rows = ExcelHandler.read_rows(self.ws, max_col=self.last_col)
         for idx, r in enumerate(row_indices, start=2):
-            for c in range(1, self.last_col + 1):
-                new_ws.cell(row=idx, column=c, 
-                          value=self.ws.cell(row=r, column=c).value)
+            for c, value in enumerate(rows[r - 1], start=1):
+                new_ws.cell(row=idx, column=c, value=value)
             new_ws[f"A{idx}"].value = "=ROW()-1"
 
     def create_automation_sheet(self, wb) -> None:
         """
-        매크로가 적용된 전체 시트를 "자동화"라는 이름으로 맨 앞에 복사
+        매크로가 적용된 전체 시트를 "자동화"라는 이름으로 맨 앞에 생성
+        (기존 "자동화" 시트는 삭제, 원본 행 목록에서 바로 생성)
         """
-        # 기존 "자동화" 시트가 있으면 삭제
-        if "자동화" in wb.sheetnames:
-            del wb["자동화"]
-        
-        # 현재 워크시트를 복사하여 "자동화" 시트 생성
-        automation_ws = wb.copy_worksheet(self.ws)
-        automation_ws.title = "자동화"
-        
-        # "자동화" 시트를 맨 앞으로 이동
-        wb.move_sheet(automation_ws, offset=-len(wb.sheetnames) + 1)
+        self.row_splitter().emit_copy(wb, "자동화", index=0)
 
     def copy_to_new_sheet_simple(self, 
                                 wb: Workbook, 
@@ -160,31 +162,17 @@ class ZIGZAGSheetSplitter:
                                 row_indices: List[int] = None) -> None:
         """
         VBA와 동일한 방식으로 새 시트 생성
-        - 원본 시트의 처리된 데이터를 각 계정명별로 복사만 수행
+        - 원본 시트의 처리된 데이터를 각 계정명별로 복사만 수행 (값만 복사)
         - 추가 자동화 로직 적용하지 않음
         """
-        if sheet_name in wb.sheetnames:
-            del wb[sheet_name]
-            
-        new_ws = wb.create_sheet(sheet_name)
-        
-        # 헤더와 열 너비 복사
-        for c in range(1, self.last_col + 1):
-            new_ws.cell(row=1, column=c, 
-                       value=self.ws.cell(row=1, column=c).value)
-            new_ws.column_dimensions[get_column_letter(c)].width = self.col_widths[c - 1]
-        
-        # 데이터 복사 (행이 있는 경우만)
-        if row_indices:
-            for idx, r in enumerate(row_indices, start=2):
-                for c in range(1, self.last_col + 1):
-                    new_ws.cell(row=idx, column=c, 
-                              value=self.ws.cell(row=r, column=c).value)
-                new_ws[f"A{idx}"].value = "=ROW()-1"
+        self.row_splitter().emit_rows(wb, sheet_name, row_indices or [], row_number="=ROW()-1")
 
 
-def zigzag_merge_packaging(input_path: str) -> str:
+def zigzag_merge_packaging(input_path: str, streaming: bool = False, incremental: bool = False) -> str:
     """지그재그 주문 합포장 자동화 처리"""
+    if incremental:
+        # 같은 날 이미 처리한 주문은 건너뛰고 새 주문만 기존 결과 파일에 반영
+        return incremental_merge_packaging("zigzag", input_path, streaming=streaming)
     # Excel 파일 로드
     ex = ExcelHandler.from_file(input_path)
     ws = ex.ws
@@ -198,10 +186,11 @@ def zigzag_merge_packaging(input_path: str) -> str:
     
     # 3. M열 → V열 VLOOKUP 처리
     if "Sheet1" in ex.wb.sheetnames:
-        lookup_map = ZIGZAGDataCleanerUtils.build_lookup_map(ex.wb["Sheet1"])
-        for row in range(2, ws.max_row + 1):
-            m_val = str(ws[f"M{row}"].value)
-            ws[f"V{row}"].value = lookup_map.get(m_val, "")
+        with ex.step("VLOOKUP", ws):
+            lookup_map = ZIGZAGDataCleanerUtils.build_lookup_map(ex.wb["Sheet1"])
+            for row in range(2, ws.max_row + 1):
+                m_val = str(ws[f"M{row}"].value)
+                ws[f"V{row}"].value = lookup_map.get(m_val, "")
     
     # 4. D열 수식 설정 (=U+V)
     ex.autofill_d_column(formula="=U{row}+V{row}")
@@ -229,24 +218,28 @@ def zigzag_merge_packaging(input_path: str) -> str:
     
     # ========== 시트분리 (OK, IY) ==========
     # 자동화 처리가 완료된 원본 시트에서 시트분리 수행
-    rows_by_sheet = splitter.get_rows_by_sheet()
+    with ex.step("시트 분리", ex.wb):
+        rows_by_sheet = splitter.get_rows_by_sheet()
     
-    # 모든 필수 시트 생성 (데이터 유무와 무관하게 OK, IY 시트 생성)
-    for sheet_name in REQUIRED_SHEETS:
-        splitter.copy_to_new_sheet_simple(
-            ex.wb,
-            sheet_name, 
-            rows_by_sheet.get(sheet_name, [])
-        )
+        # 모든 필수 시트 생성 (데이터 유무와 무관하게 OK, IY 시트 생성)
+        for sheet_name in REQUIRED_SHEETS:
+            splitter.copy_to_new_sheet_simple(
+                ex.wb,
+                sheet_name, 
+                rows_by_sheet.get(sheet_name, [])
+            )
     
     # 원본 시트 삭제 (자동화 시트로 대체되었으므로)
     original_sheet_name = ws.title
     if original_sheet_name in ex.wb.sheetnames and original_sheet_name != "자동화":
         del ex.wb[original_sheet_name]
     
+    # 수식(순번, 금액 등) 계산 값을 캐시 값으로 함께 기록 - 엑셀 재계산 없이 값 확인 가능
+    ex.convert_formula_to_value(keep_formula=True)
+
     # 저장
     base_name = Path(input_path).stem  # 확장자 제거한 파일명
-    output_path = ex.happojang_save_file(base_name=base_name)
+    output_path = ex.happojang_save_file(base_name=base_name, streaming=streaming)
     ex.wb.close()
     
     return output_path
@@ -0,0 +1,294 @@
+"""
+매크로 비동기 실행 (이벤트 루프에서 분리)
+- 매크로(CPU 작업)를 전용 프로세스 풀에서 loop.run_in_executor 로 실행 → 실행 중에도 다른 요청 처리
+- 워커 프로세스는 spawn 으로 시작 (실행 중인 서버 프로세스의 스레드 / 이벤트 루프 / DB 연결을 fork 하지 않음)
+- 동시 실행 수: max_workers (환경 변수 SABANGNET_MACRO_WORKERS, 기본값 min(CPU 수, 4))
+- 대기열 상한: max_pending (환경 변수 SABANGNET_MACRO_PENDING, 기본값 max_workers × 4)
+  실행 중 + 대기 작업이 상한이면 submit() 이 MacroQueueFullError 발생 (block=True 면 자리가 날 때까지 대기)
+- submit() 은 작업 id 반환 → status(job_id) 로 조회하거나 wait(job_id) 로 결과 대기
+- 작업 실행 / 결과 형식은 batch_runner.run_job 과 동일
+- session_factory 지정 시(shared 기본값) 완료 작업의 입력 파일 Sheet1 을 DB VLOOKUP 인덱스에 기록
+- 워커 프로세스는 이 프로세스의 VLOOKUP 인덱스 매핑으로 시작 (이미 본 Sheet1 은 워커에서 다시 병합하지 않음)
+
+API: controller/macro_router.py (/macro/runs)
+
+예시 (FastAPI):
+    executor = MacroExecutor.shared()
+
+    @router.post("/macro/{macro}")
+    async def submit_macro(macro: str, file_path: str):
+        try:
+            job_id = await executor.submit(file_path, macro)
+        except MacroQueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        return {"job_id": job_id}
+
+    @router.get("/macro/jobs/{job_id}")
+    async def macro_status(job_id: str):
+        return executor.status(job_id)
+
+    # 결과까지 대기 (동기 호출 대체)
+    output_path = await executor.run(file_path, "happojang.etc_site")
+"""
+
+import asyncio
+import multiprocessing
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from core.db import AsyncSessionLocal
+from utils.excels.product_lookup import ProductLookupIndex, seed_shared, sync_file_lookups
+from utils.macros.batch_runner import run_job, validate_options
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+WORKERS_ENV = "SABANGNET_MACRO_WORKERS"
+PENDING_ENV = "SABANGNET_MACRO_PENDING"
+
+# 워커 프로세스 시작 방식 (작업 큐의 공유 상태 Manager 도 같은 방식)
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# 조회용으로 보관하는 완료 작업 수 (초과 시 오래된 완료 작업부터 삭제)
+KEEP_FINISHED = 1000
+
+
+class MacroQueueFullError(RuntimeError):
+    """실행 중 + 대기 작업 수가 상한에 도달"""
+
+
+class MacroJobError(RuntimeError):
+    """매크로 실행 실패 (run() 에서 발생)"""
+
+    def __init__(self, result: dict):
+        self.result = result
+        super().__init__(f"[{result['macro']}] {os.path.basename(result['file'])} 실패: {result['error']}")
+
+
+class MacroJob:
+    """
+    작업 상태: queued → running → ok / failed / cancelled
+    """
+
+    def __init__(self, file_path: str, macro: str, options: dict | None = None):
+        self.id = uuid.uuid4().hex
+        self.file = file_path
+        self.macro = macro
+        self.options = options or {}
+        self.status = "queued"
+        self.submitted_at = datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.result: dict | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("ok", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        result = self.result or {}
+        return {
+            "job_id": self.id,
+            "file": self.file,
+            "macro": self.macro,
+            "status": self.status,
+            "submitted_at": self.submitted_at.isoformat(timespec="seconds"),
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "output": result.get("output"),
+            "seconds": result.get("seconds"),
+            "error": result.get("error"),
+        }
+
+
+class MacroExecutor:
+    """
+    매크로 프로세스 풀 실행기
+    - 동시 실행 / 대기열 세마포어는 이벤트 루프별로 생성 (다른 루프에서 사용하면 새로 생성)
+    """
+
+    _shared: "MacroExecutor | None" = None
+
+    @classmethod
+    def shared(cls) -> "MacroExecutor":
+        """
+        프로세스 공용 실행기 (DB VLOOKUP 인덱스 동기화 포함)
+        """
+        if cls._shared is None:
+            cls._shared = cls(session_factory=AsyncSessionLocal)
+        return cls._shared
+
+    def __init__(self, max_workers: int | None = None, max_pending: int | None = None, session_factory=None):
+        """
+        args:
+            session_factory: 비동기 세션 팩토리 (None 이면 VLOOKUP 인덱스 동기화 생략)
+        """
+        if max_workers is None:
+            max_workers = int(os.environ.get(WORKERS_ENV) or min(os.cpu_count() or 1, 4))
+        if max_pending is None:
+            max_pending = int(os.environ.get(PENDING_ENV) or max_workers * 4)
+        self.max_workers = max(max_workers, 1)
+        self.max_pending = max(max_pending, 0)
+        self.session_factory = session_factory
+        self.jobs: "OrderedDict[str, MacroJob]" = OrderedDict()
+        self._pool: ProcessPoolExecutor | None = None
+        self._run_slots: asyncio.Semaphore | None = None
+        self._admission: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # 실행 슬롯을 잡고 프로세스 풀에서 실행 중인 작업 수 (작업 큐 작업 포함)
+        self.busy = 0
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=MP_CONTEXT,
+                initializer=seed_shared, initargs=(ProductLookupIndex.shared().snapshot(),),
+            )
+        return self._pool
+
+    def _semaphores(self) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        # 실행 중인 이벤트 루프에 묶인 세마포어 (루프가 바뀌면 이전 루프의 작업은 더 이상 실행되지 않으므로 새로 생성)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._run_slots = asyncio.Semaphore(self.max_workers)
+            self._admission = asyncio.Semaphore(self.max_workers + self.max_pending)
+        return self._run_slots, self._admission
+
+    @property
+    def active(self) -> int:
+        """실행 중 + 대기 작업 수"""
+        return sum(not job.done for job in self.jobs.values())
+
+    async def run_in_pool(self, fn, *args, on_start=None):
+        """
+        실행 슬롯을 잡은 뒤 프로세스 풀에서 fn(*args) 실행 (작업 큐 작업도 동시 실행 수 max_workers 안에서 실행)
+        - on_start: 슬롯을 잡고 풀에 넘기기 직전 호출
+        - 워커 비정상 종료(BrokenProcessPool, 메모리 부족 등) 시 다음 작업부터 풀 재생성 후 예외 전달
+          (풀 전체를 종료하지 않으므로 다른 작업의 대기 중 future 는 취소되지 않음)
+        """
+        run_slots, _ = self._semaphores()
+        async with run_slots:
+            if on_start is not None:
+                on_start()
+            self.busy += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+            except BrokenProcessPool:
+                self._pool = None
+                raise
+            finally:
+                self.busy -= 1
+
+    async def submit(self, file_path: str, macro: str, options: dict | None = None, block: bool = False) -> str:
+        """
+        작업 등록 후 작업 id 반환
+        args:
+            macro: batch_runner.MACROS 이름 (예: "erp.ali", "happojang.etc_site")
+            options: 매크로 인자 (예: {"streaming": True}, 지원하지 않는 옵션이면 ValueError)
+            block: 대기열이 가득 찬 경우 True 면 자리가 날 때까지 대기, False 면 MacroQueueFullError
+        """
+        options = validate_options(macro, options)
+        _, admission = self._semaphores()
+        if admission.locked() and not block:
+            raise MacroQueueFullError(
+                f"매크로 대기열 가득 참: 실행 {self.max_workers} + 대기 {self.max_pending}건")
+        await admission.acquire()
+
+        job = MacroJob(str(file_path), macro, options)
+        self.jobs[job.id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        self._trim()
+        logger.info(f"[{macro}] 작업 등록 {job.id} ({os.path.basename(job.file)}, 진행 중 {self.active}건)")
+        return job.id
+
+    async def _run(self, job: MacroJob) -> dict:
+        _, admission = self._semaphores()
+
+        def start():
+            job.status = "running"
+            job.started_at = datetime.now()
+
+        try:
+            payload = {"file": job.file, "macro": job.macro, "options": job.options}
+            try:
+                result = await self.run_in_pool(run_job, payload, on_start=start)
+            except Exception as e:
+                # 매크로 예외는 run_job 이 결과에 기록 → 여기서는 풀 / 전달 오류만 처리
+                result = {"file": job.file, "macro": job.macro, "status": "failed", "output": None,
+                          "seconds": 0.0, "error": f"{type(e).__name__}: {e}"}
+            job.result = result
+            job.status = result["status"]
+        finally:
+            job.finished_at = datetime.now()
+            if not job.done:
+                job.status = "failed"
+            admission.release()
+        if job.status == "ok":
+            logger.info(f"[{job.macro}] 작업 완료 {job.id} {result['seconds']:.2f}s → {result['output']}")
+            await self._sync_lookups(job)
+        else:
+            logger.error(f"[{job.macro}] 작업 실패 {job.id}: {result['error']}")
+        return result
+
+    async def _sync_lookups(self, job: MacroJob) -> None:
+        """
+        입력 파일 Sheet1 → DB VLOOKUP 인덱스 (실패해도 작업 결과에는 영향 없음)
+        """
+        if self.session_factory is None:
+            return
+        try:
+            async with self.session_factory() as session:
+                await sync_file_lookups(session, job.file)
+        except Exception as e:
+            logger.error(f"[{job.macro}] VLOOKUP 인덱스 동기화 실패 {job.id}: {type(e).__name__}: {e}")
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - KEEP_FINISHED, 0)]:
+            del self.jobs[job_id]
+
+    def _job(self, job_id: str) -> MacroJob:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"작업 없음: {job_id}")
+        return job
+
+    def status(self, job_id: str) -> dict:
+        """
+        작업 상태 조회 (to_dict 형식)
+        """
+        return self._job(job_id).to_dict()
+
+    async def wait(self, job_id: str, timeout: float | None = None) -> dict:
+        """
+        작업 완료까지 대기 후 결과 반환 (batch_runner.run_job 결과 형식)
+        timeout 초과 시 asyncio.TimeoutError (작업은 계속 실행)
+        """
+        job = self._job(job_id)
+        return await asyncio.wait_for(asyncio.shield(job.task), timeout)
+
+    async def run(self, file_path: str, macro: str, options: dict | None = None, block: bool = True) -> str:
+        """
+        작업 등록 후 완료까지 대기, 결과 파일 경로 반환 (실패 시 MacroJobError)
+        """
+        result = await self.wait(await self.submit(file_path, macro, options, block=block))
+        if result["status"] != "ok":
+            raise MacroJobError(result)
+        return result["output"]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        프로세스 풀 종료 (애플리케이션 종료 시)
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+            self._pool = None
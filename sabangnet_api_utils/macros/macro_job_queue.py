@@ -0,0 +1,364 @@
+"""
+매크로 작업 큐 (batch_process 테이블 기반, 로컬 워커)
+- enqueue() → batch_process 행 등록 (work_status 매크로_대기, total_records 입력 행 수, 입력 파일 크기 / SHA-256)
+- 워커 루프(start)가 interval 초마다 대기 작업을 등록 순으로 가져와 MacroExecutor 프로세스 풀에서 실행
+  (/macro/runs 작업과 실행 슬롯 공유, 빈 슬롯만큼만 가져옴)
+  run_after 로 예약 시각을 지정하면 그 이후에만 실행 (대용량 파일을 비업무 시간에 처리)
+- 진행률: 워커 프로세스가 처리 행 수 / 현재 단계를 공유 상태에 보고 → interval 초마다 success_records 갱신
+  청크 처리 매크로는 청크 단위 행 수, 그 외 매크로는 단계 이름만 갱신되고 완료 시 전체 행 수 기록
+- 취소: cancel() → 대기 작업은 바로 취소, 실행중 작업은 다음 단계 시작 전에 중단 (MacroCancelledError)
+  다른 프로세스에서 MacroJobRepository.request_cancel 로 요청해도 다음 주기에 반영
+- 여러 프로세스(uvicorn 워커, 서버)가 같은 큐를 처리: 가져간 작업에 worker_id 기록, interval 초마다 heartbeat_at 갱신
+- 중단 작업 복구: heartbeat 가 stale_after 초 이상 끊긴 작업(워커 종료)과 같은 worker_id 의 이전 워커가 가져간 작업
+  (재시작)을 대기로 되돌린 뒤 등록 순으로 다시 실행 - 살아 있는 다른 워커의 작업은 그대로 유지
+  worker_id 기본값은 호스트:pid (환경 변수 SABANGNET_MACRO_WORKER_ID 로 지정 시 프로세스마다 달라야 함)
+- 행 매핑: batch_name = {"macro", "options"} JSON, file_url = 입력 경로, file_name = 결과 파일 경로
+- 완료 작업의 입력 파일 Sheet1 은 DB VLOOKUP 인덱스(product_lookup)에 기록 (sync_file_lookups)
+
+API: controller/macro_router.py (/macro/jobs)
+
+예시 (FastAPI):
+    queue = MacroJobQueue.shared()
+
+    @app.on_event("startup")
+    async def start_macro_queue():
+        await queue.start()
+
+    @router.post("/macro/jobs")
+    async def enqueue_macro(macro: str, file_path: str):
+        return {"batch_id": await queue.enqueue(file_path, macro)}
+
+    @router.get("/macro/jobs/{batch_id}")
+    async def macro_job(batch_id: int):
+        return await queue.status(batch_id)
+
+    @router.delete("/macro/jobs/{batch_id}")
+    async def cancel_macro_job(batch_id: int):
+        return {"work_status": await queue.cancel(batch_id)}
+"""
+
+import asyncio
+import json
+import os
+import socket
+from contextlib import suppress
+from datetime import datetime, timedelta
+
+from core.db import AsyncSessionLocal
+from models.batch_process import BatchProcess
+from repository.macro_job_repository import (
+    MacroJobRepository, JOB_CANCEL_REQUESTED, JOB_CANCELLED, JOB_DONE, JOB_FAILED,
+)
+from utils.excels.parse_cache import file_hash
+from utils.excels.product_lookup import sync_file_lookups
+from utils.macros.batch_runner import run_queued_job, sheet_row_counts, validate_options
+from utils.macros.macro_executor import MP_CONTEXT, MacroExecutor
+from utils.logs.sabangnet_logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# 진행률 / heartbeat 기록, 대기 작업 조회 주기 (초)
+DEFAULT_INTERVAL = 2.0
+
+# heartbeat 가 이 시간(초) 이상 갱신되지 않은 실행중 작업은 중단된 것으로 보고 대기로 되돌림
+DEFAULT_STALE_AFTER = 120.0
+
+WORKER_ID_ENV = "SABANGNET_MACRO_WORKER_ID"
+
+
+def encode_job_name(macro: str, options: dict | None = None) -> str:
+    """
+    batch_name 값
+    예시:
+        encode_job_name("erp.ali", {"streaming": True})   # '{"macro": "erp.ali", "options": {"streaming": true}}'
+    """
+    return json.dumps({"macro": macro, "options": options or {}}, ensure_ascii=False)
+
+
+def decode_job_name(batch_name: str) -> tuple[str, dict]:
+    """
+    batch_name → (매크로 이름, 옵션)
+    """
+    value = json.loads(batch_name)
+    return value["macro"], value.get("options") or {}
+
+
+def job_to_dict(job: BatchProcess, live: dict | None = None) -> dict:
+    """
+    작업 상태 (live: 실행중 작업의 공유 상태 {"rows", "step"})
+    """
+    macro, options = decode_job_name(job.batch_name)
+    total = job.total_records or 0
+    rows = job.success_records or 0
+    if live:
+        rows = max(rows, live.get("rows") or 0)
+    return {
+        "batch_id": job.batch_id,
+        "macro": macro,
+        "options": options,
+        "file": job.file_url,
+        "output": job.file_name if job.work_status == JOB_DONE else None,
+        "work_status": job.work_status,
+        "total_records": total,
+        "success_records": rows,
+        "progress": round(min(rows / total, 1.0) * 100, 1) if total else None,
+        "step": live.get("step") if live else None,
+        "started_at": job.date_from.isoformat(timespec="seconds") if job.date_from else None,
+        "finished_at": job.date_to.isoformat(timespec="seconds") if job.date_to else None,
+        "error": job.error_message,
+    }
+
+
+def _file_info(file_path: str) -> tuple[int, int, str]:
+    """
+    (첫 시트 데이터 행 수, 파일 크기, SHA-256)
+    """
+    rows = next(iter(sheet_row_counts(file_path).values()), 0)
+    return rows, os.path.getsize(file_path), file_hash(file_path)
+
+
+class MacroJobQueue:
+    """
+    batch_process 기반 매크로 작업 큐 + 워커 루프 (하나의 이벤트 루프에서 사용)
+    """
+
+    _shared: "MacroJobQueue | None" = None
+
+    @classmethod
+    def shared(cls) -> "MacroJobQueue":
+        """
+        프로세스 공용 작업 큐 (MacroExecutor.shared() 프로세스 풀 사용)
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, session_factory=None, executor: MacroExecutor | None = None,
+                 interval: float = DEFAULT_INTERVAL, stale_after: float = DEFAULT_STALE_AFTER,
+                 worker_id: str | None = None):
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.executor = executor or MacroExecutor.shared()
+        self.interval = interval
+        self.stale_after = stale_after
+        self.worker_id = worker_id or os.environ.get(WORKER_ID_ENV) or f"{socket.gethostname()}:{os.getpid()}"
+        # {batch_id: 실행 태스크}
+        self.running: dict[int, asyncio.Task] = {}
+        # 가져왔지만 아직 실행 슬롯을 기다리는 batch_id
+        self._waiting: set[int] = set()
+        # {batch_id: DB 에 마지막으로 기록한 처리 행 수}
+        self._reported: dict[int, int] = {}
+        self._manager = None
+        self._state = None
+        self._cancels = None
+        self._loop_task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def _shared_state(self):
+        """
+        워커 프로세스와 공유하는 (진행 상태, 취소 요청) dict
+        """
+        if self._manager is None:
+            self._manager = MP_CONTEXT.Manager()
+            self._state = self._manager.dict()
+            self._cancels = self._manager.dict()
+        return self._state, self._cancels
+
+    async def enqueue(self, file_path: str, macro: str, options: dict | None = None,
+                      run_after: datetime | None = None, created_by: str | None = None) -> int:
+        """
+        작업 등록 후 batch_id 반환
+        args:
+            macro: batch_runner.MACROS 이름 (예: "erp.ali", "happojang.etc_site")
+            options: 매크로 인자 (예: {"streaming": True}, 지원하지 않는 옵션이면 ValueError)
+            run_after: 예약 시작 시각 (None 이면 바로 실행 대상)
+        """
+        options = validate_options(macro, options)
+        file_path = str(file_path)
+        total, size, digest = await asyncio.to_thread(_file_info, file_path)
+        job = BatchProcess(
+            batch_name=encode_job_name(macro, options),
+            original_filename=os.path.basename(file_path),
+            file_url=file_path,
+            file_size=size,
+            file_hash=digest,
+            date_from=run_after,
+            total_records=total,
+            success_records=0,
+            created_by=created_by,
+        )
+        async with self.session_factory() as session:
+            job = await MacroJobRepository(session).add_job(job)
+        logger.info(f"[{macro}] 작업 큐 등록 {job.batch_id} ({job.original_filename}, {total:,}행"
+                    f"{', 예약 ' + run_after.isoformat(timespec='minutes') if run_after else ''})")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job.batch_id
+
+    async def cancel(self, batch_id: int) -> str | None:
+        """
+        작업 취소 요청 후 변경된 상태 반환 (작업이 없으면 None)
+        - 실행중 작업은 JOB_CANCEL_REQUESTED → 다음 단계 시작 전에 중단되면 JOB_CANCELLED
+        """
+        async with self.session_factory() as session:
+            status = await MacroJobRepository(session).request_cancel(batch_id)
+        if status == JOB_CANCEL_REQUESTED and batch_id in self.running:
+            self._shared_state()[1][batch_id] = True
+        return status
+
+    async def status(self, batch_id: int) -> dict:
+        """
+        작업 상태 조회 (job_to_dict 형식, 실행중이면 워커 보고 값 반영)
+        """
+        async with self.session_factory() as session:
+            job = await MacroJobRepository(session).get_job(batch_id)
+        if job is None:
+            raise KeyError(f"작업 없음: {batch_id}")
+        live = self._shared_state()[0].get(batch_id) if batch_id in self.running else None
+        return job_to_dict(job, live)
+
+    def _stale_before(self) -> datetime:
+        return datetime.now() - timedelta(seconds=self.stale_after)
+
+    async def resume(self) -> int:
+        """
+        워커 루프 시작 시 호출 - 같은 worker_id 의 이전 워커가 실행하던 작업과 heartbeat 가 끊긴 작업을 대기로 되돌림
+        """
+        async with self.session_factory() as session:
+            count = await MacroJobRepository(session).requeue_interrupted(self._stale_before(), self.worker_id)
+        if count:
+            logger.info(f"중단된 매크로 작업 {count}건 대기열 복구 ({self.worker_id})")
+        return count
+
+    async def start(self) -> None:
+        """
+        워커 루프 시작 (애플리케이션 시작 시, 이미 실행 중이면 무시)
+        """
+        if self._loop_task is None or self._loop_task.done():
+            self._wakeup = asyncio.Event()
+            self._loop_task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def run_forever(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        await self.resume()
+        while True:
+            try:
+                await self._tick()
+            except Exception as e:
+                # DB 연결 오류 등 → 다음 주기에 재시도
+                logger.error(f"매크로 작업 큐 처리 실패: {type(e).__name__}: {e}")
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            self._wakeup.clear()
+
+    async def _tick(self) -> None:
+        async with self.session_factory() as session:
+            repo = MacroJobRepository(session)
+            await self._sync_running(repo)
+            # 다른 워커가 종료되어 heartbeat 가 끊긴 작업 복구
+            requeued = await repo.requeue_interrupted(self._stale_before())
+            if requeued:
+                logger.info(f"응답 없는 워커의 매크로 작업 {requeued}건 대기열 복구")
+            loop = asyncio.get_running_loop()
+            # 빈 실행 슬롯만큼만 가져옴 (/macro/runs 작업과 슬롯을 기다리는 큐 작업 제외)
+            free = self.executor.max_workers - self.executor.busy - len(self._waiting)
+            for job in await repo.claim_jobs(free, self.worker_id):
+                self._waiting.add(job.batch_id)
+                self.running[job.batch_id] = loop.create_task(self._execute(job))
+
+    async def _sync_running(self, repo: MacroJobRepository) -> None:
+        """
+        실행중 작업의 heartbeat / 처리 행 수 기록 + DB 의 취소 요청을 워커에 전달
+        """
+        if not self.running:
+            return
+        await repo.heartbeat(self.running, self.worker_id)
+        state, cancels = self._shared_state()
+        progress = {}
+        for batch_id in self.running:
+            rows = (state.get(batch_id) or {}).get("rows")
+            if rows and rows != self._reported.get(batch_id):
+                progress[batch_id] = rows
+        if progress:
+            await repo.update_progress(progress, self.worker_id)
+            self._reported.update(progress)
+        for batch_id in await repo.get_cancel_requested(self.running):
+            cancels[batch_id] = True
+
+    async def _execute(self, job: BatchProcess) -> dict:
+        batch_id = job.batch_id
+        macro, options = decode_job_name(job.batch_name)
+        state, cancels = self._shared_state()
+        payload = {"file": job.file_url, "macro": macro, "options": options, "batch_id": batch_id}
+
+        def start():
+            self._waiting.discard(batch_id)
+            logger.info(f"[{macro}] 작업 시작 {batch_id} ({job.original_filename})")
+
+        try:
+            # MacroExecutor 실행 슬롯 안에서 실행 (워커 비정상 종료 시 풀 재생성은 run_in_pool 에서 처리)
+            result = await self.executor.run_in_pool(
+                run_queued_job, payload, state, cancels, self.interval, on_start=start)
+        except Exception as e:
+            result = {"file": job.file_url, "macro": macro, "status": "failed", "output": None,
+                      "seconds": 0.0, "error": f"{type(e).__name__}: {e}"}
+
+        rows = (state.get(batch_id) or {}).get("rows") or 0
+        values = {"date_to": datetime.now(), "error_message": result.get("error")}
+        if result["status"] == "ok":
+            values.update(work_status=JOB_DONE, success_records=job.total_records, fail_records=0,
+                          file_name=result["output"])
+            logger.info(f"[{macro}] 작업 완료 {batch_id} {result['seconds']:.2f}s → {result['output']}")
+        elif result["status"] == "cancelled":
+            values.update(work_status=JOB_CANCELLED, success_records=rows)
+            logger.info(f"[{macro}] 작업 취소 {batch_id}: {result['error']}")
+        else:
+            values.update(work_status=JOB_FAILED, success_records=rows,
+                          fail_records=max((job.total_records or 0) - rows, 0))
+            logger.error(f"[{macro}] 작업 실패 {batch_id}: {result['error']}")
+        try:
+            async with self.session_factory() as session:
+                if result["status"] == "ok":
+                    await self._sync_lookups(session, macro, job.file_url)
+                if not await MacroJobRepository(session).update_job(batch_id, owner=self.worker_id, **values):
+                    # heartbeat 가 끊겨 다른 워커가 복구해 간 작업 → 결과 기록하지 않음
+                    logger.warning(f"[{macro}] 작업 {batch_id} 은 다른 워커로 넘어가 결과를 기록하지 않음")
+        except Exception as e:
+            # 기록 실패 시 실행중으로 남음 → heartbeat 가 끊겨 stale_after 후 대기로 복구되어 다시 실행
+            logger.error(f"[{macro}] 작업 결과 기록 실패 {batch_id}: {type(e).__name__}: {e}")
+        finally:
+            self.running.pop(batch_id, None)
+            self._waiting.discard(batch_id)
+            self._reported.pop(batch_id, None)
+            state.pop(batch_id, None)
+            cancels.pop(batch_id, None)
+        return result
+
+    @staticmethod
+    async def _sync_lookups(session, macro: str, file_path: str) -> None:
+        """
+        입력 파일 Sheet1 → DB VLOOKUP 인덱스 (실패해도 작업 결과에는 영향 없음)
+        """
+        try:
+            await sync_file_lookups(session, file_path)
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"[{macro}] VLOOKUP 인덱스 동기화 실패 ({os.path.basename(file_path)}): "
+                         f"{type(e).__name__}: {e}")
+
+    async def stop(self) -> None:
+        """
+        워커 루프 종료 (실행중 작업은 끝날 때까지 대기, 애플리케이션 종료 시)
+        """
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._loop_task
+            self._loop_task = None
+        if self.running:
+            await asyncio.gather(*self.running.values(), return_exceptions=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
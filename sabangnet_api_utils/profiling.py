@@ -0,0 +1,305 @@
+"""
+매크로 단계별 프로파일링 / 작업 진행률 보고 (웹 프레임워크 의존 없음)
+- ExcelHandler 등 엑셀 처리 모듈과 워커 프로세스에서 사용
+"""
+
+import os
+import sys
+import json
+import time
+import inspect
+import functools
+from contextlib import contextmanager, nullcontext
+from weakref import WeakKeyDictionary
+from utils.logs.sabangnet_logger import get_logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+logger = get_logger(__name__)
+
+
+# 환경 변수가 설정되어 있으면 워크북별 프로파일러 자동 생성 (예: SABANGNET_PROFILE=1)
+PROFILE_ENV = "SABANGNET_PROFILE"
+
+
+def _rss_mb() -> float | None:
+    """
+    현재 프로세스 최대 RSS (MB, Linux: KB 단위 / macOS: byte 단위)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _workbook_of(target):
+    """
+    워크북 / 워크시트 / ColumnarSheet → 워크북
+    """
+    if target is None:
+        return None
+    if hasattr(target, "worksheets"):
+        return target
+    ws = getattr(target, "ws", None) or target
+    return getattr(ws, "parent", None)
+
+
+def _cell_count(target) -> int:
+    """
+    단계 대상(워크북 / 워크시트 / ColumnarSheet)의 셀 수
+    """
+    if target is None:
+        return 0
+    if hasattr(target, "worksheets"):
+        return sum(_cell_count(ws) for ws in target.worksheets)
+    cells = getattr(target, "_cells", None)
+    if cells is not None:
+        return len(cells)
+    # ColumnarSheet
+    return (getattr(target, "max_row", 0) or 0) * (getattr(target, "max_column", 0) or 0)
+
+
+class StepProfiler:
+    """
+    워크북별 단계 프로파일러 - 이름 붙인 단계마다 실행 시간 / 대상 셀 수 / 최대 RSS 기록
+    같은 (단계, 시트) 는 합산하여 호출 수와 함께 기록
+    예시:
+        profiler = StepProfiler.of(wb, create=True)
+        with profiler.step("정렬", ws):
+            ...
+        profiler.log_report("알리 ERP")
+
+        # 환경 변수 SABANGNET_PROFILE=1 이면 ExcelHandler 단계가 자동 기록되고 저장 시 리포트 출력
+    """
+
+    _profilers: "WeakKeyDictionary" = WeakKeyDictionary()
+
+    @classmethod
+    def of(cls, wb, create: bool | None = None) -> "StepProfiler | None":
+        """
+        워크북의 프로파일러 (create=None 이면 PROFILE_ENV 설정 시에만 생성)
+        """
+        if wb is None:
+            return None
+        profiler = cls._profilers.get(wb)
+        if profiler is None and (create or (create is None and os.environ.get(PROFILE_ENV))):
+            profiler = cls(getattr(wb, "active", None) and wb.active.title)
+            cls._profilers[wb] = profiler
+        return profiler
+
+    @classmethod
+    def pop(cls, wb) -> "StepProfiler | None":
+        """
+        워크북의 프로파일러 분리 (리포트 출력 후 재사용 방지)
+        """
+        return cls._profilers.pop(wb, None) if wb is not None else None
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+        self.started = time.perf_counter()
+        # {(단계, 시트): 기록}
+        self.steps: dict[tuple, dict] = {}
+        self._depth = 0
+
+    @contextmanager
+    def step(self, name: str, target=None):
+        """
+        단계 실행 구간 기록
+        args:
+            name: 단계 이름 (예: "정렬", "시트 분리", "저장")
+            target: 단계 대상 워크북 / 워크시트 (셀 수, 시트명 기록용)
+        """
+        # 기록은 단계 시작 시점에 생성 (중첩 단계가 상위 단계 아래에 표시되도록)
+        sheet = getattr(target, "title", None) if not hasattr(target, "worksheets") else None
+        record = self.steps.get((name, sheet))
+        if record is None:
+            record = self.steps[(name, sheet)] = {
+                "step": name, "sheet": sheet, "depth": self._depth, "calls": 0, "seconds": 0.0,
+                "cells": 0, "cells_added": 0, "peak_rss_mb": None, "rss_delta_mb": 0.0,
+            }
+        rss_before = _rss_mb()
+        cells_before = _cell_count(target)
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - started
+            self._depth -= 1
+            rss = _rss_mb()
+            cells = _cell_count(target)
+            record["calls"] += 1
+            record["seconds"] += seconds
+            record["cells"] = max(record["cells"], cells)
+            record["cells_added"] += cells - cells_before
+            if rss is not None:
+                record["peak_rss_mb"] = round(rss, 1)
+                record["rss_delta_mb"] = round(record["rss_delta_mb"] + rss - rss_before, 1)
+
+    def report(self) -> dict:
+        """
+        return: {"name", "seconds", "peak_rss_mb", "steps": [{"step", "sheet", "calls", "seconds", "cells", ...}]}
+        - 단계는 처음 실행된 순서
+        """
+        steps = [dict(record, seconds=round(record["seconds"], 4)) for record in self.steps.values()]
+        return {
+            "name": self.name,
+            "seconds": round(time.perf_counter() - self.started, 4),
+            "peak_rss_mb": round(_rss_mb(), 1) if resource is not None else None,
+            "steps": steps,
+        }
+
+    def log_report(self, title: str | None = None) -> dict:
+        """
+        단계별 표 + JSON 한 줄(로그 수집용)로 리포트 출력
+        """
+        report = self.report()
+        title = title or self.name
+        lines = [f"[{title}] 단계별 프로파일 (전체 {report['seconds']:.3f}s, 최대 RSS {report['peak_rss_mb']}MB)"]
+        for record in report["steps"]:
+            label = "  " * record["depth"] + record["step"]
+            if record["sheet"]:
+                label += f" [{record['sheet']}]"
+            lines.append(
+                f"  {label:<28} {record['seconds']:8.3f}s  {record['calls']:>4}회  "
+                f"셀 {record['cells']:>9,} (+{record['cells_added']:,})  "
+                f"RSS {record['peak_rss_mb']}MB (+{record['rss_delta_mb']}MB)"
+            )
+        logger.info("\n".join(lines))
+        logger.info("profile " + json.dumps(dict(report, title=title), ensure_ascii=False))
+        return report
+
+
+def profiled(name: str, target):
+    """
+    대상 워크북에 프로파일러가 있으면 단계 기록, 없으면 아무것도 하지 않는 컨텍스트
+    작업 큐에서 실행 중이면 단계 시작 전에 취소 요청 확인 (job_checkpoint)
+    예시:
+        with profiled("F/H/D 수정", ws):
+            pipeline.run(ws)
+    """
+    job_checkpoint(name)
+    profiler = StepProfiler.of(_workbook_of(target))
+    return profiler.step(name, target) if profiler is not None else nullcontext()
+
+
+def profile_step(name: str, target: str | None = None):
+    """
+    ExcelHandler 메소드 단계 기록 데코레이터
+    args:
+        name: 단계 이름
+        target: 대상 인자 이름 (기본값: 인자 ws → wb → self.ws 순), "wb" 지정 시 인자가 없으면 self.wb
+    예시:
+        @profile_step("정렬")
+        def sort_rows(self, key_columns, ws=None, ...):
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            job_checkpoint(name)
+            arguments = signature.bind_partial(self, *args, **kwargs).arguments
+            names = (target,) if target else ("ws", "wb")
+            obj = next((arguments[n] for n in names if arguments.get(n) is not None), None)
+            if obj is None:
+                obj = getattr(self, target or "ws", None) or self.ws
+            profiler = StepProfiler.of(_workbook_of(obj))
+            if profiler is None:
+                return func(self, *args, **kwargs)
+            with profiler.step(name, obj):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# 매크로 작업 진행률 / 취소 (작업 큐 워커 프로세스)
+
+
+class MacroCancelledError(RuntimeError):
+    """작업 취소 요청으로 매크로 중단 (단계 사이에서 발생)"""
+
+
+class JobProgress:
+    """
+    워커 프로세스에서 실행 중인 작업의 진행률 보고 / 취소 확인
+    - 단계(ExcelHandler.step / profile_step, 청크 처리) 시작 시 checkpoint → 취소 요청이면 MacroCancelledError
+      (취소 조회는 checkpoint 마다 - 요청 후 첫 단계 경계에서 바로 중단)
+    - 진행 상태(Manager dict) 기록은 interval 초마다 한 번 (청크 처리처럼 보고가 잦아도 IPC 비용 일정)
+    예시:
+        progress = JobProgress(batch_id, state, cancels, interval=2.0)
+        with progress.activate():
+            run_job(job)
+        state[batch_id]   # {"rows": 처리 행 수, "step": 현재 단계}
+    """
+
+    _current: "JobProgress | None" = None
+
+    @classmethod
+    def current(cls) -> "JobProgress | None":
+        return cls._current
+
+    def __init__(self, job_id, state, cancels, interval: float = 2.0):
+        self.job_id = job_id
+        self.state = state
+        self.cancels = cancels
+        self.interval = interval
+        self.rows = 0
+        self.step: str | None = None
+        self._reported = 0.0
+
+    @contextmanager
+    def activate(self):
+        previous, JobProgress._current = JobProgress._current, self
+        try:
+            yield self
+        finally:
+            JobProgress._current = previous
+            self._flush()
+
+    def checkpoint(self, step: str | None = None) -> None:
+        """
+        단계 시작 시 호출 - 취소 요청 확인, 현재 단계 기록
+        """
+        if step is not None:
+            self.step = step
+        if self.cancels.get(self.job_id):
+            raise MacroCancelledError(f"작업 취소 요청 ({self.step or '시작 전'} 단계 전 중단)")
+        self.report()
+
+    def report(self, rows: int | None = None, step: str | None = None) -> None:
+        """
+        처리 행 수 / 단계 갱신 (공유 상태 기록은 interval 초마다)
+        """
+        if rows is not None:
+            self.rows = rows
+        if step is not None:
+            self.step = step
+        if time.monotonic() - self._reported >= self.interval:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._reported = time.monotonic()
+        self.state[self.job_id] = {"rows": self.rows, "step": self.step}
+
+
+def job_checkpoint(step: str | None = None) -> None:
+    """
+    실행 중인 작업이 있으면 취소 확인 / 단계 기록 (작업 큐 밖에서는 아무것도 하지 않음)
+    """
+    progress = JobProgress._current
+    if progress is not None:
+        progress.checkpoint(step)
+
+
+def report_progress(rows: int, step: str | None = None) -> None:
+    """
+    실행 중인 작업이 있으면 처리 행 수 보고 (작업 큐 밖에서는 아무것도 하지 않음)
+    """
+    progress = JobProgress._current
+    if progress is not None:
+        progress.report(rows, step)
@@ -43,6 +43,18 @@ class SabangNetPathUtils:
         os.makedirs(cls.get_files_path() / "logs", exist_ok=True)
         return cls.get_files_path() / "logs"
     
+    @classmethod
+    def get_cache_file_path(cls) -> Path:
+        # root/files/cache/
+        os.makedirs(cls.get_files_path() / "cache", exist_ok=True)
+        return cls.get_files_path() / "cache"
+
+    @classmethod
+    def get_happojang_state_path(cls) -> Path:
+        # root/files/happojang_state/
+        os.makedirs(cls.get_files_path() / "happojang_state", exist_ok=True)
+        return cls.get_files_path() / "happojang_state"
+
     @classmethod
     def get_xml_template_path(cls) -> Path:
         # root/files/xml/templates/
@@ -0,0 +1,65 @@
+"""
+테스트 공용 설정
+- 애플리케이션은 저장소 디렉토리를 utils / models / repository 로 import
+  (배포 환경과 같은 경로가 없으면 sabangnet_api_* 패키지를 같은 이름으로 연결)
+"""
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PACKAGE_ALIASES = {
+    "utils": "sabangnet_api_utils",
+    "models": "sabangnet_api_models",
+    "repository": "sabangnet_api_repository",
+}
+
+def _register_aliases() -> None:
+    """
+    별칭 패키지를 모두 sys.modules 에 등록한 뒤 __init__ 실행
+    (sabangnet_api_models/__init__.py 처럼 다른 별칭을 import 하는 패키지도 순서와 관계없이 로드)
+    """
+    modules = []
+    for alias, package in PACKAGE_ALIASES.items():
+        path = ROOT / package
+        spec = importlib.util.spec_from_file_location(
+            alias, path / "__init__.py", submodule_search_locations=[str(path)])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[alias] = module
+        modules.append((module, spec))
+    for module, spec in modules:
+        try:
+            spec.loader.exec_module(module)
+        except ImportError:
+            # 선택 의존성(sqlalchemy 등)이 없으면 __init__ 재노출만 생략 (하위 모듈은 그대로 import 가능)
+            pass
+
+
+try:
+    import utils.excels  # noqa: F401
+except ImportError:
+    _register_aliases()
+
+
+@pytest.fixture
+def make_ws():
+    """
+    행 목록 → 워크시트 (첫 행 헤더)
+    예시:
+        ws = make_ws([["A", "B"], [1, 2]])
+    """
+    def make(rows, title="Sheet"):
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = title
+        for row in rows:
+            ws.append(row)
+        return ws
+    return make
@@ -0,0 +1,82 @@
+import pytest
+
+from utils.macros import batch_runner
+from utils.macros.batch_runner import detect_macro, macro_options, run_batch, validate_options
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("지그재그-[기본양식]-ERP용.xlsx", "erp.zigzag"),
+    ("기타사이트-[기본양식]-합포장용.xlsx", "happojang.etc_site"),
+    ("ali_orders.xlsx", "erp.ali"),
+    ("ALI-happojang.xlsx", "happojang.ali"),
+    ("brandy-합포장.xlsx", "happojang.brandy"),
+    ("gok_2024.xlsx", "erp.gauc"),
+    ("orders-etc.csv", "erp.etc_site"),
+    # 영문 키워드가 다른 단어의 일부인 경우는 판별하지 않음
+    ("retail_orders.xlsx", None),
+    ("sketch.xlsx", None),
+    ("gokart.xlsx", None),
+    ("test-[기본양식]-합포장용.xlsx", None),
+])
+def test_detect_macro(name, expected):
+    assert detect_macro(name) == expected
+
+
+def test_run_batch_counts_cancelled_separately(monkeypatch):
+    statuses = {"a.xlsx": "ok", "b.xlsx": "failed", "c.xlsx": "cancelled"}
+
+    def fake_run_job(job):
+        return {"file": job["file"], "macro": job["macro"], "status": statuses[job["file"]],
+                "output": None, "seconds": 0.0, "error": None}
+
+    monkeypatch.setattr(batch_runner, "run_job", fake_run_job)
+    jobs = [{"file": name, "macro": "erp.ali", "options": {}} for name in statuses]
+    summary = run_batch(jobs, max_workers=1)
+    assert (summary["succeeded"], summary["failed"], summary["cancelled"]) == (1, 1, 1)
+    assert [r["status"] for r in summary["jobs"]] == ["ok", "failed", "cancelled"]
+
+
+def test_chunked_option_only_for_ali_and_zigzag_erp():
+    chunked = {macro for macro in batch_runner.MACROS if "chunked" in macro_options(macro)}
+    assert chunked == {"erp.ali", "erp.zigzag"}
+
+
+@pytest.mark.parametrize("macro, options", [
+    ("erp.ali", {"chunked": True, "chunk_rows": 5000, "memory_mb": 256}),
+    ("erp.brandi", {"streaming": True}),
+    ("happojang.etc_site", {"incremental": True}),
+    ("happojang.gok", None),
+])
+def test_validate_options_accepts_supported(macro, options):
+    assert validate_options(macro, options) == (options or {})
+
+
+@pytest.mark.parametrize("macro, options, message", [
+    ("erp.etc_site", {"chunked": True}, "지원하지 않는 옵션: chunked"),
+    ("happojang.zigzag", {"read_only": True}, "지원하지 않는 옵션: read_only"),
+    ("erp.zigzag", {"streaming": "yes"}, "true / false"),
+    ("erp.ali", {"chunk_rows": 0}, "양의 정수"),
+    ("erp.unknown", {}, "알 수 없는 매크로"),
+])
+def test_validate_options_rejects(macro, options, message):
+    with pytest.raises(ValueError, match=message):
+        validate_options(macro, options)
+
+
+def test_run_batch_skips_jobs_with_invalid_options(monkeypatch):
+    ran = []
+
+    def fake_run_job(job):
+        ran.append(job["file"])
+        return {"file": job["file"], "macro": job["macro"], "status": "ok", "output": None, "seconds": 0.0,
+                "error": None}
+
+    monkeypatch.setattr(batch_runner, "run_job", fake_run_job)
+    jobs = [
+        {"file": "a.xlsx", "macro": "erp.etc_site", "options": {"chunked": True}},
+        {"file": "b.xlsx", "macro": "erp.zigzag", "options": {"chunked": True}},
+    ]
+    summary = run_batch(jobs, max_workers=1)
+    assert ran == ["b.xlsx"]
+    assert summary["jobs"][0]["status"] == "failed"
+    assert "chunked" in summary["jobs"][0]["error"]
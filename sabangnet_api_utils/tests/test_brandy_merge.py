@@ -0,0 +1,78 @@
+import random
+from collections import defaultdict
+
+import openpyxl
+import pytest
+from openpyxl.styles import Font
+
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.row_sort import compact_rows
+from utils.macros.happojang.brandy_merge_packaging import BrandyOrderMerger
+
+
+def _brandy_ws(rows: int, seed: int = 0):
+    """
+    브랜디 형식 시트 (C: 상품번호, D: 금액/수식, F: 모델명, J: 수령인, O/P/V: 금액 항목, 중복 그룹 포함)
+    """
+    rng = random.Random(seed)
+    ws = openpyxl.Workbook().active
+    ws.append([f"H{col}" for col in range(1, 23)])
+    for row in range(2, rows + 2):
+        values = [None] * 22
+        values[0] = row - 1
+        values[2] = f"P{rng.randint(1, rows // 3)}"
+        values[3] = f"=O{row}+P{row}+V{row}" if rng.random() < 0.3 else rng.choice([1000, 2500.5, "3000", None])
+        values[5] = rng.choice(["모델A 1개", "모델B", "", None, "모델C 2개"])
+        values[9] = f"수령인{rng.randint(1, 4)}"
+        values[14], values[15], values[21] = rng.randint(0, 9000), rng.choice([0, 500, None]), 3000
+        ws.append(values)
+        ws[f"F{row}"].font = Font(bold=row % 2 == 0)
+    return ws
+
+
+def _legacy_merge(ws) -> None:
+    """
+    기존 구현: C|J 그룹 병합 후 중복 행을 아래부터 ws.delete_rows 로 한 행씩 삭제
+    """
+    merger = BrandyOrderMerger(ws)
+    groups = defaultdict(list)
+    for row in range(2, ws.max_row + 1):
+        groups[f"{str(ws[f'C{row}'].value).strip()}|{str(ws[f'J{row}'].value).strip()}"].append(row)
+    rows_to_delete = []
+    for rows in groups.values():
+        if len(rows) > 1:
+            merger.merge_group(ws, rows)
+            rows_to_delete.extend(rows[1:])
+    for row in sorted(rows_to_delete, reverse=True):
+        ws.delete_rows(row)
+
+
+def _snapshot(ws) -> list[tuple]:
+    return [
+        tuple((cell.value, cell.font.b) for cell in row)
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=22)
+    ]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_one_pass_merge_matches_legacy(seed):
+    legacy = _brandy_ws(120, seed)
+    _legacy_merge(legacy)
+
+    ws = _brandy_ws(120, seed)
+    deleted = BrandyOrderMerger(ws).merge(ExcelHandler(ws))
+
+    assert deleted
+    assert ws.max_row == legacy.max_row
+    assert _snapshot(ws) == _snapshot(legacy)
+
+
+@pytest.mark.parametrize("drop", [[2], [5, 9, 10], [2, 3, 4, 31], list(range(2, 32, 2))])
+def test_compact_rows_matches_delete_rows(drop):
+    expected = _brandy_ws(30)
+    for row in sorted(drop, reverse=True):
+        expected.delete_rows(row)
+
+    ws = _brandy_ws(30)
+    assert compact_rows(ws, drop) == len(drop)
+    assert _snapshot(ws) == _snapshot(expected)
@@ -0,0 +1,99 @@
+import openpyxl
+import pytest
+
+from utils.excels.column_rules import (
+    clean_model_names, convert_int_values, convert_to_numbers, format_mobile_numbers, format_phone_numbers,
+    jeju_mask, quantity_suffix, transform_column,
+)
+from utils.excels.columnar_sheet import ColumnarSheet
+from utils.excels.excel_column_handler import ExcelColumnHandler
+from utils.excels.excel_handler import ExcelHandler
+
+
+PHONES = [
+    "01012345678", "010-1234-5678", "0212345678", "021234567", "0311234567", "050712345678",
+    "07012345678", "0101234567", "010 1234 5678", "12345", "abc", "", None, 0, 1012345678,
+]
+
+
+@pytest.fixture
+def ex():
+    return ExcelHandler(openpyxl.Workbook().active)
+
+
+def _cell_results(rule, values):
+    """셀 단위 규칙을 임시 셀에 적용한 결과 (값, 표시 형식)"""
+    ws = openpyxl.Workbook().active
+    out = []
+    for row, value in enumerate(values, start=1):
+        cell = ws.cell(row=row, column=1, value=value)
+        rule(cell)
+        out.append((cell.value, cell.number_format))
+    return out
+
+
+def test_format_phone_numbers_matches_cell_rule(ex):
+    assert format_phone_numbers(PHONES) == [ex.format_phone_number(v) for v in PHONES]
+
+
+def test_format_phone_numbers_examples():
+    assert format_phone_numbers(["01012345678", "0212345678", "050712345678", None]) == [
+        "010-1234-5678", "02-1234-5678", "0507-1234-5678", ""]
+    assert format_phone_numbers([]) == []
+
+
+def test_format_mobile_numbers_matches_cell_rule():
+    col_h = ExcelColumnHandler()
+    expected = [value for value, _ in _cell_results(col_h.h_i_column, PHONES)]
+    assert format_mobile_numbers(PHONES) == expected
+
+
+def test_convert_int_values_matches_cell_rule():
+    values = ["1,234", " 56 ", "0", ".", ",", "1.5", "12345678901234567", "abc", "", None, 7, 3.5]
+    col_h = ExcelColumnHandler()
+    expected = _cell_results(col_h.convert_int_column, values)
+    new_values, formats = convert_int_values(values)
+    assert new_values == [value for value, _ in expected]
+    assert [fmt or "General" for fmt in formats] == [fmt for _, fmt in expected]
+
+
+def test_convert_to_numbers():
+    values = ["1", "2.5", 3, 4.0, "-7", "0.0"]
+    col_h = ExcelColumnHandler()
+    result = convert_to_numbers(values)
+    assert result == [col_h._convert_to_number(v) for v in values]
+    assert [type(v) for v in result] == [int, float, int, float, int, float]
+
+
+def test_clean_model_names(ex):
+    values = ["상품A 1개", "상품B 2개", "상품 1개 세트 1개", "", None, 0]
+    assert clean_model_names(values) == [ex.clean_model_name(v) for v in values]
+
+
+def test_quantity_suffix():
+    values = ["상품 * 1", "상품 * 3", "묶음 * 2 * 4", "상품 * x", "  상품 * 1  ", "상품", "", None]
+    assert quantity_suffix(values) == ["상품", "상품 3개", "묶음 * 2 4개", "상품 * x", "상품", "상품", "", None]
+
+
+def test_jeju_mask():
+    values = ["제주특별자치도 제주시", "서울시 강남구", "서귀포시", None, ""]
+    assert jeju_mask(values) == [True, False, False, False, False]
+    assert jeju_mask(values, r"제주|서귀포") == [True, False, True, False, False]
+
+
+def test_transform_column_worksheet(make_ws):
+    ws = make_ws([["P"], ["1,000"], ["abc"], [None], ["12345678901234567"]])
+    transform_column(ws, "A", convert_int_values)
+    assert [ws.cell(row=r, column=1).value for r in range(2, 6)] == [1000, "abc", None, "12345678901234567"]
+    assert ws["A2"].number_format == "0"
+    assert ws["A3"].number_format == "General"
+    assert ws["A5"].number_format == "@"
+
+
+def test_transform_column_columnar(make_ws):
+    ws = make_ws([["H"], ["01012345678"], ["0212345678"]])
+    sheet = ColumnarSheet.from_worksheet(ws)
+    transform_column(sheet, "A", format_phone_numbers)
+    assert [sheet.get_value("A", r) for r in (2, 3)] == ["010-1234-5678", "02-1234-5678"]
+    sheet.flush()
+    assert ws["A3"].value == "02-1234-5678"
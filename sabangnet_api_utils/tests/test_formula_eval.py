@@ -0,0 +1,104 @@
+import openpyxl
+import pytest
+
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.formula_eval import DIV0, NA, VALUE, FormulaError, FormulaEvaluator
+
+
+@pytest.fixture
+def wb():
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "자동화"
+    ws.append(["순번", "상품", "수량", "금액", "", "", "단가", "배송비"])
+    ws.append(["=ROW()-1", "상품A", 2, "=G2*C2+H2", None, None, 1000, 2500])
+    ws.append(["=ROW()-1", "상품B", 1, "=G3*C3+H3", None, None, "500", None])
+    lookup = wb.create_sheet("Sheet1")
+    lookup.append(["상품A", "S01", "빨강"])
+    lookup.append(["상품B", "S02", "파랑"])
+    return wb
+
+
+def evaluate(wb, formula, row=2):
+    ws = wb["자동화"]
+    ws[f"J{row}"] = formula
+    return FormulaEvaluator(wb).cell_value(ws, row, 10)
+
+
+def test_row_and_arithmetic(wb):
+    values = FormulaEvaluator(wb).evaluate(wb["자동화"])
+    assert values[(2, 1)] == 1
+    assert values[(3, 1)] == 2
+    assert values[(2, 4)] == 4500
+    # 숫자 문자열은 숫자로, 빈 셀은 0 으로 계산
+    assert values[(3, 4)] == 500
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("=(C2+1)*-2", -6),
+    ("=G2/4", 250),
+    ("=SUM(C2:C3)", 3),
+    ("=SUM(G2:H3, 10)", 3510),   # 문자열 "500" 은 SUM 에서 무시
+    ("=ROW(B7)", 7),
+    ("=D2+A3", 4502),            # 수식 셀 참조
+])
+def test_supported_formulas(wb, formula, expected):
+    assert evaluate(wb, formula) == expected
+
+
+def test_vlookup(wb):
+    assert evaluate(wb, "=VLOOKUP(B2,Sheet1!A:C,2,FALSE)") == "S01"
+    assert evaluate(wb, "=VLOOKUP(B3,Sheet1!$A$1:$C$2,3,0)", row=3) == "파랑"
+    assert evaluate(wb, '=VLOOKUP("없음",Sheet1!A:B,2,FALSE)') == NA
+
+
+def test_vlookup_registered_table(wb):
+    ws = wb["자동화"]
+    ws["J2"] = "=VLOOKUP(B2,Sheet1!A:B,2,FALSE)"
+    evaluator = FormulaEvaluator(wb, lookups={"Sheet1!A:B": {"상품A": "등록값"}})
+    assert evaluator.cell_value(ws, 2, 10) == "등록값"
+
+
+def test_error_values(wb):
+    assert evaluate(wb, "=G2/0") == DIV0
+    assert evaluate(wb, "=B2+1") == VALUE
+    assert evaluate(wb, "=SUM(C2, B2)") == 2          # 참조 셀 문자열은 무시
+    assert evaluate(wb, '=SUM(C2, "x")') == VALUE      # 직접 입력한 문자열은 오류
+
+
+@pytest.mark.parametrize("formula", [
+    "=IF(C2>1,1,0)",                      # 미지원 함수
+    "=VLOOKUP(B2,Sheet1!A:B,2,TRUE)",     # 근사 일치
+    "=없는시트!A1",
+    "=J2+1",                              # 순환 참조
+])
+def test_unsupported_formula_raises(wb, formula):
+    with pytest.raises(FormulaError):
+        evaluate(wb, formula)
+
+
+def test_convert_formula_to_value_keeps_unsupported(wb):
+    ws = wb["자동화"]
+    ws["J2"] = "=IF(C2>1,1,0)"
+    ex = ExcelHandler(ws)
+    converted = ex.convert_formula_to_value(ws)
+    assert converted == 4
+    assert [ws["A2"].value, ws["A3"].value, ws["D2"].value, ws["D3"].value] == [1, 2, 4500, 500]
+    assert ws["J2"].value == "=IF(C2>1,1,0)"
+
+
+def test_keep_formula_writes_cached_values(wb, tmp_path):
+    ws = wb["자동화"]
+    ws["J2"] = "=IF(C2>1,1,0)"
+    ex = ExcelHandler(ws, wb)
+    ex.convert_formula_to_value(keep_formula=True)
+    path = str(tmp_path / "out.xlsx")
+    ex._write_workbook(path)
+
+    formulas = openpyxl.load_workbook(path)["자동화"]
+    assert formulas["A2"].value == "=ROW()-1"
+    assert formulas["D2"].value == "=G2*C2+H2"
+    cached = openpyxl.load_workbook(path, data_only=True)["자동화"]
+    assert [cached["A2"].value, cached["A3"].value, cached["D2"].value] == [1, 2, 4500]
+    # 계산하지 못한 수식은 캐시 값 없이 유지
+    assert cached["J2"].value is None
@@ -0,0 +1,44 @@
+import pytest
+
+from utils.macros.happojang.incremental import HappojangState, order_keys
+from utils.sabangnet_path_utils import SabangNetPathUtils
+
+
+HEADERS = ("사방넷주문번호", "수취인명", "상품명")
+
+
+@pytest.fixture
+def state_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(SabangNetPathUtils, "get_happojang_state_path", classmethod(lambda cls: tmp_path))
+    return tmp_path
+
+
+def test_order_keys_use_key_column():
+    rows = [("1001", "홍길동", "A"), ("1002", "홍길동", "A")]
+    assert order_keys(HEADERS, rows) == ["1001", "1002"]
+
+
+def test_order_keys_duplicate_keyless_rows_are_distinct():
+    rows = [(None, "홍길동", "A"), (None, "홍길동", "A"), ("", "홍길동", "A")]
+    keys = order_keys(HEADERS, rows)
+    assert len(set(keys)) == 3
+    assert all(key.startswith("row:") for key in keys)
+
+
+def test_order_keys_keyless_stable_when_other_rows_added():
+    row = (None, "홍길동", "A")
+    before = order_keys(HEADERS, [row, row])
+    after = order_keys(HEADERS, [("1001", "김철수", "B"), (None, "김철수", "C"), row, row])
+    assert after[2:] == before
+
+
+def test_state_is_per_source_file(state_root):
+    state = HappojangState.load("ali", "2026-01-01", "orders_am")
+    state.output = "out.xlsx"
+    state.keys = {"1001"}
+    state.save()
+
+    assert (state_root / "ali" / "2026-01-01" / "orders_am.json").exists()
+    assert HappojangState.load("ali", "2026-01-01", "orders_am").keys == {"1001"}
+    other = HappojangState.load("ali", "2026-01-01", "orders_pm")
+    assert other.keys == set() and other.output is None
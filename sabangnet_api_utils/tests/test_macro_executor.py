@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# core.db (애플리케이션 DB 설정) 가 있는 환경에서만 실행
+pytest.importorskip("core.db")
+
+from utils.macros.macro_executor import MacroExecutor, MacroQueueFullError
+
+
+@pytest.fixture
+def executor():
+    executor = MacroExecutor(max_workers=1, max_pending=1)
+    # 프로세스 대신 스레드에서 run_job 실행 (없는 파일 → 바로 실패 결과)
+    executor._pool = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_pool_uses_spawn():
+    executor = MacroExecutor(max_workers=1)
+    try:
+        assert executor.pool._mp_context.get_start_method() == "spawn"
+    finally:
+        executor.shutdown()
+
+
+def test_semaphores_follow_running_loop(executor):
+    async def semaphores():
+        first = executor._semaphores()
+        assert executor._semaphores() == first
+        return first
+
+    assert asyncio.run(semaphores()) != asyncio.run(semaphores())
+
+
+def test_submit_on_new_loop(executor, tmp_path):
+    missing = str(tmp_path / "없는파일.xlsx")
+
+    async def run_jobs():
+        # 실행 1 + 대기 1 을 넘는 작업은 자리가 날 때까지 대기 (세마포어 경합)
+        job_ids = [await executor.submit(missing, "erp.ali", block=True) for _ in range(4)]
+        return [await executor.wait(job_id) for job_id in job_ids]
+
+    for _ in range(2):
+        results = asyncio.run(run_jobs())
+        assert [result["status"] for result in results] == ["failed"] * 4
+
+
+def test_queue_full(executor, tmp_path):
+    missing = str(tmp_path / "없는파일.xlsx")
+
+    async def overfill():
+        await executor.submit(missing, "erp.ali")
+        await executor.submit(missing, "erp.ali")
+        with pytest.raises(MacroQueueFullError):
+            await executor.submit(missing, "erp.ali")
+
+    asyncio.run(overfill())
+
+
+def _busy(executor):
+    return executor.busy
+
+
+def _broken():
+    raise BrokenProcessPool("worker died")
+
+
+def test_run_in_pool_holds_run_slot(executor):
+    started = []
+
+    async def run():
+        run_slots, _ = executor._semaphores()
+        busy = await executor.run_in_pool(_busy, executor, on_start=lambda: started.append(run_slots.locked()))
+        return busy, run_slots.locked()
+
+    assert asyncio.run(run()) == (1, False)
+    assert started == [True]
+    assert executor.busy == 0
+
+
+def test_run_in_pool_resets_broken_pool(executor):
+    pool = executor._pool
+
+    async def run():
+        with pytest.raises(BrokenProcessPool):
+            await executor.run_in_pool(_broken)
+
+    asyncio.run(run())
+    assert executor._pool is None
+    assert executor.busy == 0
+    pool.shutdown()
@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models.batch_process import BatchProcess
+from repository.macro_job_repository import (
+    JOB_CANCEL_REQUESTED, JOB_CANCELLED, JOB_DONE, JOB_QUEUED, JOB_RUNNING, MacroJobRepository,
+)
+
+
+# batch_process 의 ARRAY 열은 sqlite 에서 만들 수 없어 필요한 열만 직접 생성
+DDL = """
+CREATE TABLE batch_process (
+    batch_id INTEGER PRIMARY KEY AUTOINCREMENT, target_table TEXT, target_table_ids TEXT, batch_name TEXT,
+    original_filename TEXT, file_name TEXT, file_url TEXT, file_size INTEGER, file_hash TEXT,
+    date_from TIMESTAMP, date_to TIMESTAMP, total_records INTEGER, success_records INTEGER,
+    fail_records INTEGER, skip_records INTEGER, error_message TEXT, created_by TEXT, work_status TEXT,
+    worker_id TEXT, heartbeat_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def _run(scenario):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.execute(text(DDL))
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            return await scenario(sessions)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+async def _add_jobs(sessions, count: int) -> list[int]:
+    async with sessions() as session:
+        repo = MacroJobRepository(session)
+        return [(await repo.add_job(BatchProcess(batch_name=f"job{n}"))).batch_id for n in range(count)]
+
+
+async def _statuses(sessions) -> dict[int, tuple]:
+    async with sessions() as session:
+        rows = await session.execute(text("SELECT batch_id, work_status, worker_id FROM batch_process"))
+        return {batch_id: (status, worker) for batch_id, status, worker in rows}
+
+
+def test_claim_records_owner():
+    async def scenario(sessions):
+        await _add_jobs(sessions, 3)
+        async with sessions() as session:
+            jobs = await MacroJobRepository(session).claim_jobs(2, "host:1")
+        assert [job.worker_id for job in jobs] == ["host:1", "host:1"]
+        assert all(job.heartbeat_at is not None for job in jobs)
+        return await _statuses(sessions)
+
+    assert _run(scenario) == {1: (JOB_RUNNING, "host:1"), 2: (JOB_RUNNING, "host:1"), 3: (JOB_QUEUED, None)}
+
+
+def test_requeue_keeps_live_workers_jobs():
+    async def scenario(sessions):
+        await _add_jobs(sessions, 3)
+        async with sessions() as session:
+            repo = MacroJobRepository(session)
+            await repo.claim_jobs(1, "host:1")    # 살아 있는 다른 워커
+            await repo.claim_jobs(1, "host:2")    # 이 워커의 이전 실행 (재시작)
+            await repo.claim_jobs(1, "host:3")    # 종료된 워커 (heartbeat 끊김)
+            await repo.update_job(3, heartbeat_at=datetime.now() - timedelta(minutes=10))
+            stale_before = datetime.now() - timedelta(minutes=2)
+            # 다른 워커가 시작될 때: 응답 없는 워커의 작업만 복구
+            assert await repo.requeue_interrupted(stale_before) == 1
+            # host:2 로 재시작: 이전 실행의 작업도 복구
+            assert await repo.requeue_interrupted(stale_before, "host:2") == 1
+        return await _statuses(sessions)
+
+    assert _run(scenario) == {1: (JOB_RUNNING, "host:1"), 2: (JOB_QUEUED, None), 3: (JOB_QUEUED, None)}
+
+
+def test_requeue_cancels_stale_cancel_requests():
+    async def scenario(sessions):
+        await _add_jobs(sessions, 2)
+        async with sessions() as session:
+            repo = MacroJobRepository(session)
+            await repo.claim_jobs(2, "host:1")
+            await repo.request_cancel(1)
+            await repo.request_cancel(2)
+            await repo.update_job(2, heartbeat_at=datetime.now() - timedelta(minutes=10))
+            await repo.requeue_interrupted(datetime.now() - timedelta(minutes=2))
+        return await _statuses(sessions)
+
+    assert _run(scenario) == {1: (JOB_CANCEL_REQUESTED, "host:1"), 2: (JOB_CANCELLED, None)}
+
+
+def test_owner_guards_updates():
+    async def scenario(sessions):
+        await _add_jobs(sessions, 1)
+        async with sessions() as session:
+            repo = MacroJobRepository(session)
+            await repo.claim_jobs(1, "host:1")
+            await repo.update_job(1, heartbeat_at=datetime.now() - timedelta(minutes=10))
+            await repo.requeue_interrupted(datetime.now() - timedelta(minutes=2))
+            await repo.claim_jobs(1, "host:2")
+            # 복구 전 워커의 진행률 / 결과는 기록하지 않음
+            await repo.update_progress({1: 50}, "host:1")
+            assert not await repo.update_job(1, owner="host:1", work_status=JOB_DONE)
+            await repo.update_progress({1: 70}, "host:2")
+            assert await repo.update_job(1, owner="host:2", work_status=JOB_DONE)
+            job = await repo.get_job(1)
+            await session.refresh(job)
+            return job.work_status, job.success_records
+
+    assert _run(scenario) == (JOB_DONE, 70)
@@ -0,0 +1,106 @@
+import os
+import pickle
+
+import pytest
+
+from utils.excels import parse_cache
+from utils.excels.parse_cache import CACHE_ENV, SECRET_ENV, ParseCache
+
+
+KEY_A = "a" * 64
+KEY_B = "b" * 64
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(SECRET_ENV, "test-secret")
+    return ParseCache(root=tmp_path / "cache", max_mb=1)
+
+
+class Unpickled(Exception):
+    pass
+
+
+def _explode():
+    raise Unpickled()
+
+
+class Payload:
+    """unpickle 되면 예외 발생 (서명 확인 전 unpickle 여부 확인용)"""
+    def __reduce__(self):
+        return _explode, ()
+
+
+def test_disabled_by_default(monkeypatch, tmp_path):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    cache = ParseCache(root=tmp_path)
+    assert not cache.enabled
+    calls = []
+    assert cache.load(__file__, "values", lambda: calls.append(1) or "parsed") == "parsed"
+    assert cache.load(__file__, "values", lambda: calls.append(1) or "parsed") == "parsed"
+    assert len(calls) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_round_trip(cache):
+    rows = [("Sheet", {"A": 10}, [("헤더",), (1,)])]
+    cache.put(KEY_A, "values", rows)
+    assert cache.get(KEY_A, "values") == rows
+    calls = []
+    assert cache.load(__file__, "values", lambda: calls.append(1) or "parsed", key=KEY_A) == rows
+    assert calls == []
+
+
+def test_tampered_entry_is_not_unpickled(cache):
+    cache.put(KEY_A, "values", ["ok"])
+    path = cache._entry_path(KEY_A, "values")
+    signature = path.read_bytes()[:32]
+    # 서명은 그대로 두고 내용만 바꾼 항목
+    path.write_bytes(signature + pickle.dumps(Payload()))
+    assert cache.get(KEY_A, "values") is None
+    assert not path.exists()
+
+
+def test_entry_signed_with_other_secret_is_rejected(cache, monkeypatch):
+    cache.put(KEY_A, "values", ["ok"])
+    monkeypatch.setenv(SECRET_ENV, "other-secret")
+    other = ParseCache(root=cache.root, max_mb=1)
+    assert other.get(KEY_A, "values") is None
+
+
+def test_secret_file_created_when_env_missing(tmp_path, monkeypatch):
+    monkeypatch.delenv(SECRET_ENV, raising=False)
+    cache = ParseCache(root=tmp_path / "cache", max_mb=1)
+    cache.put(KEY_A, "values", [1])
+    secret_path = cache.root / ".secret"
+    assert len(secret_path.read_bytes()) == 32
+    if os.name == "posix":
+        assert secret_path.stat().st_mode & 0o777 == 0o600
+    assert ParseCache(root=cache.root, max_mb=1).get(KEY_A, "values") == [1]
+
+
+def test_put_tracks_usage_without_rescanning(cache, monkeypatch):
+    scans = []
+    original = ParseCache._scan
+    monkeypatch.setattr(ParseCache, "_scan", lambda self: scans.append(1) or original(self))
+    for n in range(5):
+        cache.put(f"{n:064d}", "values", [n])
+    assert len(scans) == 1
+    on_disk = sum(f.stat().st_size for d in cache.root.iterdir() if d.is_dir() for f in d.iterdir())
+    assert cache.usage_bytes == on_disk
+
+
+def test_evicts_least_recently_used(cache):
+    blob = "x" * 400_000
+    cache.put(KEY_A, "values", blob)
+    cache.put(KEY_B, "values", blob)
+    # A 를 최근 사용으로 갱신 후 상한 초과
+    assert cache.get(KEY_A, "values") == blob
+    cache.put("c" * 64, "values", blob)
+    assert cache.get(KEY_B, "values") is None
+    assert cache.get(KEY_A, "values") == blob
+    assert cache.usage_bytes <= cache.max_bytes
+
+
+def test_workbooks_are_not_cached():
+    assert not hasattr(parse_cache, "load_workbook")
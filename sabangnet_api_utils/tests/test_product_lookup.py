@@ -0,0 +1,163 @@
+import asyncio
+import sys
+import types
+
+import openpyxl
+import pytest
+
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.product_lookup import (
+    ProductLookupIndex, read_lookup_sheet, seed_shared, sheet_digest, sheet_items, sync_file_lookups,
+)
+
+
+def _order_workbook(lookups: list[tuple]):
+    wb = openpyxl.Workbook()
+    wb.active.append(["순번", "사이트"])
+    sheet = wb.create_sheet("Sheet1")
+    sheet.append(["상품", "코드"])
+    for row in lookups:
+        sheet.append(list(row))
+    return wb
+
+
+class FakeRepository:
+    """product_lookup_sheet / product_lookup 테이블 대신 메모리 {해시: (버전, {키: 값})}"""
+    sheets: dict = {}
+    added: list = []
+
+    def __init__(self, session):
+        pass
+
+    async def get_sheets_since(self, version=0):
+        return sorted(((h, ver) for h, (ver, _) in self.sheets.items() if ver > version), key=lambda r: r[1])
+
+    async def get_sheet_entries(self, sheet_hash):
+        return dict(self.sheets.get(sheet_hash, (0, {}))[1])
+
+    async def add_sheet(self, sheet_hash, entries, source_file=None):
+        if sheet_hash not in self.sheets:
+            self.added.append(sheet_hash)
+            self.sheets[sheet_hash] = (max((ver for ver, _ in self.sheets.values()), default=0) + 1, dict(entries))
+        return self.sheets[sheet_hash][0]
+
+
+@pytest.fixture(autouse=True)
+def shared_index(monkeypatch):
+    monkeypatch.setattr(ProductLookupIndex, "_shared", None)
+
+
+@pytest.fixture
+def fake_repository(monkeypatch):
+    FakeRepository.sheets = {}
+    FakeRepository.added = []
+    module = types.ModuleType("repository.product_lookup_repository")
+    module.ProductLookupRepository = FakeRepository
+    monkeypatch.setitem(sys.modules, "repository.product_lookup_repository", module)
+    return FakeRepository
+
+
+def test_vlookup_dict_is_per_file():
+    first = _order_workbook([("상품A", "S01"), ("상품B", "S02")])
+    second = _order_workbook([("상품C", "S03")])
+    lookup_a = ExcelHandler(first.active, first).create_vlookup_dict(first)
+    lookup_b = ExcelHandler(second.active, second).create_vlookup_dict(second)
+    assert "Sheet1" not in first.sheetnames
+    assert lookup_a == {"상품A": "S01", "상품B": "S02"}
+    # 앞 파일의 키가 다음 파일 조회에 섞이지 않음
+    assert lookup_b == {"상품C": "S03"}
+
+
+def test_same_sheet_is_not_merged_again(monkeypatch):
+    merged = []
+    merge_sheet = ProductLookupIndex.merge_sheet
+
+    def spy(self, ws, digest=None):
+        merged.append(ws.title)
+        return merge_sheet(self, ws, digest)
+
+    monkeypatch.setattr(ProductLookupIndex, "merge_sheet", spy)
+    lookups = [("상품A", "S01"), ("상품B", "S02")]
+    first = _order_workbook(lookups)
+    lookup = ExcelHandler(first.active, first).create_vlookup_dict(first)
+    # 두 번째 실행: 같은 내용의 Sheet1 → 병합 없이 같은 매핑
+    second = _order_workbook(lookups)
+    assert ExcelHandler(second.active, second).create_vlookup_dict(second) is lookup
+    assert merged == ["Sheet1"]
+    assert "Sheet1" not in second.sheetnames
+    # 값이 하나라도 다르면 새로 병합
+    third = _order_workbook([("상품A", "S01"), ("상품B", "S09")])
+    assert ExcelHandler(third.active, third).create_vlookup_dict(third)["상품B"] == "S09"
+    assert merged == ["Sheet1", "Sheet1"]
+
+
+def test_digest_matches_read_only_load(tmp_path):
+    path = str(tmp_path / "주문.xlsx")
+    wb = _order_workbook([("상품A", "S01"), (None, "S09"), (1005, 7)])
+    wb.save(path)
+    assert sheet_digest(sheet_items(wb["Sheet1"])) == sheet_digest(read_lookup_sheet(path))
+    assert sheet_digest([("a", "bc")]) != sheet_digest([("ab", "c")])
+
+
+def test_lru_evicts_least_recently_used():
+    index = ProductLookupIndex(max_entries=3)
+    index.add("a", {"1": "x", "2": "y"}, pending=False)
+    index.add("b", {"3": "z"}, pending=False)
+    index.get("a")
+    index.add("c", {"4": "w"}, pending=False)
+    assert "b" not in index and "a" in index and "c" in index
+    assert len(index) == 3
+
+
+def test_worker_merge_does_not_queue_pending():
+    wb = _order_workbook([("상품A", "S01")])
+    index = ProductLookupIndex()
+    index.lookup(wb["Sheet1"])
+    assert index.pending == {}
+
+
+def test_seed_shared():
+    wb = _order_workbook([("상품A", "S01")])
+    source = ProductLookupIndex()
+    lookup = source.lookup(wb["Sheet1"])
+    seed_shared(source.snapshot())
+    assert ProductLookupIndex.shared().lookup(wb["Sheet1"]) == lookup
+
+
+def test_read_lookup_sheet(tmp_path):
+    path = str(tmp_path / "주문.xlsx")
+    _order_workbook([("상품A", "S01"), (None, "S09"), (1005, 7)]).save(path)
+    assert read_lookup_sheet(path) == [("상품A", "S01"), ("1005", "7")]
+    csv_path = tmp_path / "주문.csv"
+    csv_path.write_text("a,b\n", encoding="utf-8")
+    assert read_lookup_sheet(str(csv_path)) == []
+
+
+def test_sync_file_lookups_registers_new_sheets_once(tmp_path, fake_repository):
+    known = _order_workbook([("상품Z", "S99")])
+    fake_repository.sheets = {sheet_digest(sheet_items(known["Sheet1"])): (1, {"상품Z": "S99"})}
+    path = str(tmp_path / "주문.xlsx")
+    _order_workbook([("상품A", "S01"), ("상품B", "S02")]).save(path)
+
+    assert asyncio.run(sync_file_lookups(None, path)) == 2
+    digest = sheet_digest(read_lookup_sheet(path))
+    assert fake_repository.sheets[digest] == (2, {"상품A": "S01", "상품B": "S02"})
+    index = ProductLookupIndex.shared()
+    assert index.pending == {} and index.known[digest] == 2
+    # 이미 등록된 내용이면 기록하지 않음
+    assert asyncio.run(sync_file_lookups(None, path)) == 2
+    assert fake_repository.added == [digest]
+    # 다른 프로세스가 등록한 해시 → DB 에서 매핑 조회
+    assert asyncio.run(index.load(None, sheet_digest([("상품Z", "S99")]))) == {"상품Z": "S99"}
+
+
+def test_flush_keeps_pending_on_failure(fake_repository, monkeypatch):
+    async def fail(self, sheet_hash, entries, source_file=None):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(FakeRepository, "add_sheet", fail)
+    index = ProductLookupIndex()
+    index.add("a", {"1": "x"})
+    with pytest.raises(RuntimeError):
+        asyncio.run(index.flush(None))
+    assert index.pending == {"a": {"1": "x"}}
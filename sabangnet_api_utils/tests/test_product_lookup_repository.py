@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models.base_model import Base
+from models.macro.product_lookup import ProductLookupSheet, ProductLookupVersion
+from repository.product_lookup_repository import VERSION_ROW_ID, ProductLookupRepository
+
+
+# product_lookup 의 BIGINT 기본 키는 sqlite 에서 자동 증가하지 않아 직접 생성
+DDL = """
+CREATE TABLE product_lookup (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, sheet_hash TEXT NOT NULL, lookup_key TEXT NOT NULL,
+    lookup_value TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (sheet_hash, lookup_key)
+)
+"""
+
+
+def _run(scenario):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                ProductLookupSheet.__table__, ProductLookupVersion.__table__,
+            ])
+            await conn.execute(text(DDL))
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as session:
+            session.add(ProductLookupVersion(id=VERSION_ROW_ID, version=0))
+            await session.commit()
+        try:
+            return await scenario(sessions)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+def test_add_sheet_registers_each_hash_once():
+    async def scenario(sessions):
+        async with sessions() as session:
+            repo = ProductLookupRepository(session)
+            assert await repo.add_sheet("h1", {"상품A": "S01", "상품B": "S02"}, "주문.xlsx") == 1
+            assert await repo.add_sheet("h2", {"상품A": "S09"}) == 2
+            # 이미 등록된 해시: 기록 / 버전 증가 없음
+            assert await repo.add_sheet("h1", {"상품A": "S01", "상품B": "S02"}) == 1
+            assert await repo.get_version() == 2
+            assert await repo.get_sheets_since(1) == [("h2", 2)]
+            # 같은 키라도 해시별로 따로 조회
+            return await repo.get_sheet_entries("h1"), await repo.get_sheet_entries("h2")
+
+    assert _run(scenario) == ({"상품A": "S01", "상품B": "S02"}, {"상품A": "S09"})
@@ -0,0 +1,34 @@
+import pytest
+
+from utils.profiling import JobProgress, MacroCancelledError, job_checkpoint, report_progress
+
+
+def test_cancel_checked_on_every_checkpoint():
+    state, cancels = {}, {}
+    progress = JobProgress(1, state, cancels, interval=3600)
+    with pytest.raises(MacroCancelledError, match="정렬"):
+        with progress.activate():
+            job_checkpoint("읽기")
+            # 보고 주기(interval) 안이어도 다음 단계 경계에서 바로 중단
+            cancels[1] = True
+            job_checkpoint("정렬")
+    assert state[1] == {"rows": 0, "step": "정렬"}
+
+
+def test_report_is_throttled():
+    state, cancels = {}, {}
+    progress = JobProgress(1, state, cancels, interval=3600)
+    with progress.activate():
+        job_checkpoint("읽기")
+        assert state[1] == {"rows": 0, "step": "읽기"}
+        report_progress(500, "청크 기록")
+        job_checkpoint("저장")
+        assert state[1] == {"rows": 0, "step": "읽기"}
+    # 종료 시 마지막 상태 기록
+    assert state[1] == {"rows": 500, "step": "저장"}
+
+
+def test_outside_job_is_noop():
+    job_checkpoint("정렬")
+    report_progress(10)
+    assert JobProgress.current() is None
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from utils.excels.excel_handler import ExcelHandler
+from utils.excels.row_sort import compile_sort_keys, row_key, sort_order, typed_key
+
+
+ROWS = [
+    ("b", 2, None),
+    ("a", 1, "x"),
+    (None, 3, 5),
+    ("a", 2.5, datetime(2025, 1, 1)),
+    ("b", 1, 1.5),
+]
+
+
+def _sorted(rows, sort_columns):
+    keys, descending = compile_sort_keys(rows, sort_columns)
+    return [rows[i] for i in sort_order(keys, descending)]
+
+
+def test_blank_becomes_empty_string():
+    keys, descending = compile_sort_keys(ROWS, [1])
+    assert keys == [["b", "a", "", "a", "b"]]
+    assert descending == [False]
+
+
+def test_single_type_column_keeps_values():
+    # int / float 혼합은 숫자 한 형식으로 보고 값 그대로
+    keys, _ = compile_sort_keys(ROWS, [2])
+    assert keys == [[2, 1, 3, 2.5, 1]]
+
+
+def test_mixed_column_uses_typed_key():
+    keys, _ = compile_sort_keys(ROWS, [3])
+    assert keys == [[typed_key(value) for value in ("", "x", 5, datetime(2025, 1, 1), 1.5)]]
+    # 숫자 → 날짜 → 문자열 순
+    assert [row[2] for row in _sorted(ROWS, [3])] == [1.5, 5, datetime(2025, 1, 1), None, "x"]
+
+
+def test_ascending_and_descending():
+    assert [row[:2] for row in _sorted(ROWS, [1, 2])] == [(None, 3), ("a", 1), ("a", 2.5), ("b", 1), ("b", 2)]
+    assert [row[:2] for row in _sorted(ROWS, [1, -2])] == [(None, 3), ("a", 2.5), ("a", 1), ("b", 2), ("b", 1)]
+    assert [row[:2] for row in _sorted(ROWS, [-1, 2])] == [("b", 1), ("b", 2), ("a", 1), ("a", 2.5), (None, 3)]
+
+
+def test_descending_is_stable():
+    rows = [("a", 1), ("b", 1), ("c", 2), ("d", 1)]
+    assert [row[0] for row in _sorted(rows, [-2])] == ["c", "a", "b", "d"]
+
+
+@pytest.mark.parametrize("sort_columns", [[1], [2, 3], [-1, 2], [3, -2], [-3, -1]])
+def test_matches_row_key(sort_columns):
+    assert _sorted(ROWS, sort_columns) == sorted(ROWS, key=row_key(sort_columns))
+
+
+def test_sort_data():
+    ex = ExcelHandler(openpyxl.Workbook().active)
+    assert ex._sort_data(ROWS, []) == ROWS
+    assert ex._sort_data(ROWS, [1, -2]) == _sorted(ROWS, [1, -2])
+    with pytest.raises(IndexError):
+        ex._sort_data(ROWS, [9])